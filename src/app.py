@@ -6,6 +6,7 @@ from src.components.featured_content import render_featured_content
 from src.components.recommendations import render_recommendations
 from src.components.trending import render_trending
 from src.utils.database import get_db_connection
+from src.utils.search_index import search_index
 from src.utils.config import APP_CONFIG
 
 # Load views
@@ -28,9 +29,18 @@ st.set_page_config(
 # Sidebar content (full length, options below heading)
 st.sidebar.title(APP_CONFIG["title"])
 
-# Database Connection Status
-conn = get_db_connection()
-if conn is not None:
+# Database Connection Status (return the pooled connection straight away)
+try:
+    get_db_connection().close()
+    db_connected = True
+except Exception:
+    db_connected = False
+
+# Load or build the search index in the background so the first searches find it ready
+if db_connected:
+    search_index.warm()
+
+if db_connected:
     st.sidebar.markdown(
         '<div style="background-color:#e8f5e9;padding:2px 0;border-radius:6px;margin-bottom:10px;">'
         '<span style="color:#388e3c;font-size:14px;">🟢 DB Status: Connected</span>'
@@ -11,6 +11,7 @@ import uuid
 import ipaddress
 from utils.database import execute_query, execute_update
 from utils.config import ADMIN_CONFIG
+from src.utils.metrics_export import read_snapshots
 
 def hash_password(password):
     """Hash password using SHA-256."""
@@ -36,7 +37,7 @@ def validate_session(session_id, ip_address):
     FROM USER_SESSIONS
     WHERE session_id = %s AND ip_address = %s
     """
-    result = execute_query(query, [session_id, ip_address])
+    result = execute_query(query, [session_id, ip_address], ttl=0)
 
     if result.empty:
         return False
@@ -96,7 +97,7 @@ def verify_credentials(username, password):
     AND status = 'FAILED'
     AND timestamp > DATEADD(minute, -15, CURRENT_TIMESTAMP())
     """
-    result = execute_query(query, [username])
+    result = execute_query(query, [username], ttl=0)
 
     if not result.empty and result.iloc[0]['attempts'] >= 5:
         log_activity(username, "LOGIN_ATTEMPT", "FAILED_RATE_LIMIT")
@@ -108,7 +109,7 @@ def verify_credentials(username, password):
     FROM ADMIN_USERS
     WHERE username = %s
     """
-    result = execute_query(query, [username])
+    result = execute_query(query, [username], ttl=0)
 
     if result.empty:
         log_activity(username, "LOGIN_ATTEMPT", "FAILED_USER_NOT_FOUND")
@@ -368,21 +369,70 @@ def export_data(export_options):
         st.error(f"Error during export: {str(e)}")
         return []
 
+def merge_metric_values(values, maximum):
+    """Merge one metric field across processes: numbers are summed (or maxed), lists united."""
+    values = [value for value in values if value is not None]
+    if not values:
+        return None
+    if isinstance(values[0], dict):
+        return {key: merge_metric_values([value.get(key) for value in values], maximum) for key in values[0]}
+    if isinstance(values[0], list):
+        return sorted({item for value in values for item in value})
+    if maximum or not isinstance(values[0], (int, float)):
+        return max(values)
+    return sum(values)
+
+def combine_process_metrics(snapshots, name, maxed=()):
+    """Combine the ``name`` metrics every app process published, None if none did.
+
+    Counters are summed over the processes; fields in ``maxed`` and
+    timestamps take the largest value instead.
+    """
+    published = [snapshot['metrics'][name] for snapshot in snapshots if name in snapshot['metrics']]
+    if not published:
+        return None
+    return {field: merge_metric_values([metrics.get(field) for metrics in published], field in maxed)
+            for field in published[0]}
+
 def get_system_metrics():
     """Get current system metrics."""
     metrics = {}
 
-    # Database connection pool
-    query = """
-    SELECT
-        COUNT(*) as active_connections,
-        MAX(created_at) as last_connection
-    FROM CONNECTION_POOL
-    WHERE status = 'ACTIVE'
-    """
-    result = execute_query(query)
-    if not result.empty:
-        metrics['db_connections'] = result.iloc[0]
+    # Pool, cache, catalog, index and outbound API metrics of the app processes, from their published snapshots
+    snapshots = read_snapshots()
+
+    # Database connection pools
+    pool_stats = combine_process_metrics(snapshots, 'db_pool')
+    if pool_stats:
+        metrics['db_connections'] = {
+            'active_connections': pool_stats['in_use'],
+            'idle_connections': pool_stats['idle'],
+            'total_connections': pool_stats['total'],
+            'max_connections': pool_stats['max_size'],
+            'waits': pool_stats['waits'],
+            'timeouts': pool_stats['timeouts'],
+            'last_connection': pool_stats['last_connection']
+        }
+
+    # Query result caches
+    query_cache = combine_process_metrics(snapshots, 'query_cache')
+    if query_cache:
+        lookups = query_cache['hits'] + query_cache['misses']
+        query_cache['hit_rate'] = query_cache['hits'] / lookups if lookups else 0.0
+        metrics['query_cache'] = query_cache
+
+    # Schema catalogs and search indexes hold the same tables and documents in every process
+    schema_catalog = combine_process_metrics(snapshots, 'schema_catalog', maxed=('tables', 'age'))
+    if schema_catalog:
+        metrics['schema_catalog'] = schema_catalog
+    search_index = combine_process_metrics(snapshots, 'search_index', maxed=('documents', 'terms'))
+    if search_index:
+        metrics['search_index'] = search_index
+
+    # Image caches
+    image_cache = combine_process_metrics(snapshots, 'image_cache', maxed=('rate_limited_for',))
+    if image_cache:
+        metrics['image_cache'] = image_cache
 
     # Pipeline performance
     query = """
@@ -427,6 +477,17 @@ def get_system_metrics():
     if not result.empty:
         metrics['api_performance'] = result
 
+    # Outbound calls to Unsplash, Google Maps, OpenAI and image hosts, per app process
+    providers = [dict(stats, provider=provider, process=snapshot['process'])
+                 for snapshot in snapshots
+                 for provider, stats in snapshot['metrics'].get('http_client', {}).items()
+                 if stats['requests'] or stats['rejected']]
+    if providers:
+        providers = pd.DataFrame(providers)
+        if providers['process'].nunique() > 1:
+            providers['provider'] = providers['provider'] + ' (' + providers['process'] + ')'
+        metrics['provider_performance'] = providers
+
     return metrics
 
 def update_system_health():
@@ -716,11 +777,75 @@ def render_admin_portal():
 
         if 'db_connections' in metrics:
             st.write("#### Database Connections")
-            st.metric(
-                "Active Connections",
-                metrics['db_connections']['active_connections'],
-                f"Last connection: {metrics['db_connections']['last_connection']}"
-            )
+            db_connections = metrics['db_connections']
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                st.metric(
+                    "Active Connections",
+                    f"{db_connections['active_connections']} / {db_connections['max_connections']}",
+                    f"Last connection: {db_connections['last_connection']}"
+                )
+            with col2:
+                st.metric("Idle Connections", db_connections['idle_connections'])
+            with col3:
+                st.metric(
+                    "Checkout Waits",
+                    db_connections['waits'],
+                    f"{db_connections['timeouts']} timeouts",
+                    delta_color="inverse"
+                )
+
+        if 'query_cache' in metrics:
+            st.write("#### Query Cache")
+            query_cache = metrics['query_cache']
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                st.metric(
+                    "Hit Rate",
+                    f"{query_cache['hit_rate']:.0%}",
+                    f"{query_cache['hits']} hits / {query_cache['misses']} misses",
+                    delta_color="off"
+                )
+            with col2:
+                st.metric(
+                    "Cached Results",
+                    query_cache['entries'],
+                    f"{query_cache['bytes'] / 1024 / 1024:.1f} of {query_cache['max_bytes'] / 1024 / 1024:.0f} MB",
+                    delta_color="off"
+                )
+            with col3:
+                st.metric(
+                    "Invalidations",
+                    query_cache['invalidations'],
+                    f"{query_cache['evictions']} evictions",
+                    delta_color="off"
+                )
+
+        if 'image_cache' in metrics:
+            st.write("#### Image Cache")
+            image_cache = metrics['image_cache']
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                st.metric(
+                    "Cache Hits",
+                    image_cache['memory_hits'] + image_cache['disk_hits'],
+                    f"{image_cache['disk_hits']} from disk, {image_cache['negative_hits']} without results",
+                    delta_color="off"
+                )
+            with col2:
+                st.metric(
+                    "Unsplash Requests",
+                    image_cache['api_requests'],
+                    f"{image_cache['api_errors']} errors",
+                    delta_color="inverse"
+                )
+            with col3:
+                st.metric(
+                    "Rate Limited",
+                    image_cache['rate_limited'],
+                    f"paused {image_cache['rate_limited_for']:.0f}s" if image_cache['rate_limited_for'] else "not paused",
+                    delta_color="off"
+                )
 
         if 'pipeline_performance' in metrics:
             st.write("#### Pipeline Performance")
@@ -742,8 +867,10 @@ def render_admin_portal():
             )
             st.plotly_chart(fig)
 
-        if 'api_performance' in metrics:
+        if 'api_performance' in metrics or 'provider_performance' in metrics:
             st.write("#### API Performance")
+
+        if 'api_performance' in metrics:
             fig = px.bar(
                 metrics['api_performance'],
                 x='endpoint',
@@ -752,6 +879,23 @@ def render_admin_portal():
             )
             st.plotly_chart(fig)
 
+        if 'provider_performance' in metrics:
+            providers = metrics['provider_performance']
+            latency_columns = [column for column in ['p50_latency', 'p95_latency'] if column in providers]
+            if latency_columns:
+                fig = px.bar(
+                    providers,
+                    x='provider',
+                    y=latency_columns,
+                    barmode='group',
+                    title='External API Latency (seconds)'
+                )
+                st.plotly_chart(fig)
+            st.dataframe(providers.reindex(columns=[
+                'provider', 'requests', 'errors', 'retries', 'rate_limited', 'throttled', 'rejected',
+                'avg_latency', 'p95_latency', 'max_latency', 'last_error'
+            ]))
+
     with tab4:
         st.subheader("Data Management")
 
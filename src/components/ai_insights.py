@@ -144,6 +144,33 @@ def render_preservation_priorities(priority_data: dict):
     for phase in priority_data['implementation_timeline']:
         st.write(f"- {phase}")
 
+def render_scorecard_history(history: pd.DataFrame):
+    """Render the score history from the stored site scorecards"""
+    st.subheader("Score History")
+
+    if len(history) < 2:
+        st.info("Score history appears once the scorecard job has run on at least two days.")
+        return
+
+    df = history.rename(columns={
+        'assessment_date': 'Assessment Date',
+        'overall_health_score': 'Health Score',
+        'overall_potential_score': 'Tourism Potential',
+        'risk_assessment_score': 'Risk Score'
+    }).melt(id_vars='Assessment Date', var_name='Score', value_name='Value')
+
+    fig = px.line(
+        df,
+        x='Assessment Date',
+        y='Value',
+        color='Score',
+        title='Scores Over Time',
+        markers=True
+    )
+    fig.update_layout(yaxis_range=[0, 1])
+
+    st.plotly_chart(fig, use_container_width=True)
+
 def render_ai_insights(site_id: int, ai_analysis):
     """Main function to render all AI insights"""
     st.title("AI-Powered Heritage Site Insights")
@@ -1,28 +1,27 @@
 import streamlit as st
 import pandas as pd
 import plotly.express as px
-import googlemaps
 from PIL import Image
-import requests
 from io import BytesIO
 from utils.config import (
     DISCOVERY_CONFIG,
-    GOOGLE_MAPS_API_KEY,
-    UNSPLASH_API_KEY
+    GOOGLE_MAPS_API_KEY
 )
 from utils.database import execute_query
+from utils.http_client import google_maps_client, http_client
+from utils.site_metrics import site_metrics_source
+from utils.unsplash import get_image
 
 def get_heritage_sites(search_query=None, state=None, heritage_type=None, risk_level=None):
     """Fetch heritage sites with filters."""
-    query = """
+    query = f"""
     SELECT
         h.*,
-        COUNT(DISTINCT v.visit_date) as visit_days,
-        SUM(v.visitor_count) as total_visitors,
-        AVG(u.rating) as avg_rating
+        COALESCE(m.visit_days, 0) as visit_days,
+        COALESCE(m.total_visitors, 0) as total_visitors,
+        COALESCE(m.avg_rating, 0) as avg_rating
     FROM HERITAGE_SITES h
-    LEFT JOIN VISITOR_STATS v ON h.site_id = v.site_id
-    LEFT JOIN USER_INTERACTIONS u ON h.site_id = u.site_id
+    LEFT JOIN {site_metrics_source()} m ON h.site_id = m.site_id
     WHERE 1=1
     """
     params = []
@@ -45,9 +44,6 @@ def get_heritage_sites(search_query=None, state=None, heritage_type=None, risk_l
         params.append(risk_level)
 
     query += """
-    GROUP BY h.site_id, h.name, h.description, h.location, h.latitude, h.longitude,
-             h.state, h.city, h.established_year, h.heritage_type, h.unesco_status,
-             h.risk_level, h.health_index
     ORDER BY total_visitors DESC, avg_rating DESC
     LIMIT %s
     """
@@ -67,28 +63,12 @@ def get_art_forms(site_id):
 
 def get_site_image(site_name):
     """Fetch a relevant image for the heritage site from Unsplash."""
-    try:
-        response = requests.get(
-            f"https://api.unsplash.com/search/photos",
-            params={
-                "query": f"{site_name} india heritage",
-                "per_page": 1
-            },
-            headers={
-                "Authorization": f"Client-ID {UNSPLASH_API_KEY}"
-            }
-        )
-        data = response.json()
-        if data['results']:
-            return data['results'][0]['urls']['regular']
-    except Exception as e:
-        st.warning(f"Could not fetch image: {str(e)}")
-    return None
+    return get_image(f"{site_name} india heritage")
 
 def get_street_view(latitude, longitude):
     """Get Google Street View image for a location."""
     try:
-        gmaps = googlemaps.Client(key=GOOGLE_MAPS_API_KEY)
+        gmaps = google_maps_client(GOOGLE_MAPS_API_KEY)
         street_view = gmaps.streetview(
             location=(latitude, longitude),
             size=(600, 400),
@@ -167,7 +147,7 @@ def render_cultural_discovery():
                 # Display site image
                 image_url = get_site_image(site['name'])
                 if image_url:
-                    response = requests.get(image_url)
+                    response = http_client.get('images', image_url)
                     image = Image.open(BytesIO(response.content))
                     if image:
                         st.image(image, use_container_width=True)
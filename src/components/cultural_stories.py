@@ -2,22 +2,19 @@ import streamlit as st
 import pandas as pd
 import plotly.express as px
 from utils.database import execute_query
+from utils.site_metrics import site_metrics_source
 from utils.config import STORIES_CONFIG
 
 def get_heritage_sites():
     """Fetch heritage sites with their details."""
-    query = """
+    query = f"""
     SELECT
         h.*,
-        COUNT(DISTINCT v.visit_date) as visit_days,
-        SUM(v.visitor_count) as total_visitors,
-        AVG(u.rating) as avg_rating
+        COALESCE(m.visit_days, 0) as visit_days,
+        COALESCE(m.total_visitors, 0) as total_visitors,
+        COALESCE(m.avg_rating, 0) as avg_rating
     FROM HERITAGE_SITES h
-    LEFT JOIN VISITOR_STATS v ON h.site_id = v.site_id
-    LEFT JOIN USER_INTERACTIONS u ON h.site_id = u.site_id
-    GROUP BY h.site_id, h.name, h.description, h.location, h.latitude, h.longitude,
-             h.state, h.city, h.established_year, h.heritage_type, h.unesco_status,
-             h.risk_level, h.health_index
+    LEFT JOIN {site_metrics_source()} m ON h.site_id = m.site_id
     """
     return execute_query(query)
 
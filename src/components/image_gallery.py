@@ -1,43 +1,64 @@
 import streamlit as st
-from unsplash.api import Api
-from unsplash.auth import Auth
-from src.utils.config import UNSPLASH_ACCESS_KEY, UNSPLASH_SECRET_KEY, UNSPLASH_REDIRECT_URI
-
-# Initialize Unsplash API
-auth = Auth(
-    client_id=UNSPLASH_ACCESS_KEY,
-    client_secret=UNSPLASH_SECRET_KEY,
-    redirect_uri=UNSPLASH_REDIRECT_URI
-)
-api = Api(auth)
+from src.utils.thumbnails import iter_local_images
+from src.utils.unsplash import image_service
+
+# Shown in a card until its image is resolved
+LOADING_IMAGE = "https://via.placeholder.com/400x200?text=Loading..."
+
+def image_slot():
+    """Card image placeholder to fill with fill_image_slots once the image is known."""
+    slot = st.empty()
+    slot.image(LOADING_IMAGE, use_container_width=True)
+    return slot
+
+def fill_image_slots(slots, default, rendition='card'):
+    """Fill (query, slot) card placeholders as their images resolve, ``default`` when there is none.
+
+    Slots show the local thumbnail of the image once it is in the store,
+    falling back to the remote URL if the thumbnail cannot be made.
+    """
+    slots_by_query = {}
+    for query, slot in slots:
+        slots_by_query.setdefault(query, []).append(slot)
+
+    def show(query, image):
+        for slot in slots_by_query[query]:
+            slot.image(image, use_container_width=True)
+
+    def found_images():
+        for query, image_url in image_service.iter_images(list(slots_by_query), default):
+            # Placeholder defaults are shown as they are, not made into thumbnails
+            if image_url and image_url != default:
+                yield query, image_url
+            else:
+                show(query, default)
+
+    for query, image in iter_local_images(found_images(), rendition):
+        show(query, image)
+
+def fill_photo_slots(slots, rendition='gallery'):
+    """Fill (image URL, slot) placeholders with the local renditions of the images as they are ready."""
+    slots = list(slots)
+    for index, image in iter_local_images(((index, url) for index, (url, _) in enumerate(slots)), rendition):
+        slots[index][1].image(image, use_container_width=True)
 
 def fetch_unsplash_images(query, count=9):
     """Fetch images from Unsplash API based on a query."""
-    try:
-        photos = api.search_photos(query, per_page=count)
-        return [photo.urls.regular for photo in photos]
-    except Exception as e:
-        st.error(f"Failed to fetch images from Unsplash: {e}")
-        return []
+    return image_service.image_urls(query, count)
 
 def render_image_gallery(site_name, count=5):
     """Render a gallery of images for a heritage site."""
-    try:
-        # Search for images related to the site
-        photos = api.search_photos(site_name, per_page=count)
-
-        if photos:
-            # Create columns for the gallery
-            cols = st.columns(count)
-
-            # Display images in columns
-            for idx, photo in enumerate(photos):
-                with cols[idx]:
-                    st.image(photo.urls.regular, use_container_width=True)
-                    st.caption(f"Photo by {photo.user.name} on Unsplash")
-        else:
-            st.info("No images found for this site.")
-
-    except Exception as e:
-        st.error(f"Error loading images: {str(e)}")
-        return None
+    # Search for images related to the site
+    photos = image_service.photos(site_name, count)
+
+    if photos:
+        # Create columns for the gallery
+        cols = st.columns(count)
+
+        # Display images in columns
+        for idx, photo in enumerate(photos):
+            with cols[idx]:
+                st.image(photo['url'], use_container_width=True)
+                st.caption(f"Photo by {photo['author'] or 'unknown'} on Unsplash")
+    else:
+        st.info("No images found for this site.")
@@ -2,27 +2,24 @@ import streamlit as st
 import pandas as pd
 import folium
 from streamlit_folium import folium_static
-import googlemaps
 from utils.config import (
     GOOGLE_MAPS_API_KEY,
     MAPS_CONFIG
 )
 from utils.database import execute_query
+from utils.http_client import google_maps_client
+from utils.site_metrics import site_metrics_source
 
 def get_heritage_sites():
     """Fetch all heritage sites with their details."""
-    query = """
+    query = f"""
     SELECT
         h.*,
-        COUNT(DISTINCT v.visit_date) as visit_days,
-        SUM(v.visitor_count) as total_visitors,
-        AVG(u.rating) as avg_rating
+        COALESCE(m.visit_days, 0) as visit_days,
+        COALESCE(m.total_visitors, 0) as total_visitors,
+        COALESCE(m.avg_rating, 0) as avg_rating
     FROM HERITAGE_SITES h
-    LEFT JOIN VISITOR_STATS v ON h.site_id = v.site_id
-    LEFT JOIN USER_INTERACTIONS u ON h.site_id = u.site_id
-    GROUP BY h.site_id, h.name, h.description, h.location, h.latitude, h.longitude,
-             h.state, h.city, h.established_year, h.heritage_type, h.unesco_status,
-             h.risk_level, h.health_index
+    LEFT JOIN {site_metrics_source()} m ON h.site_id = m.site_id
     """
     return execute_query(query)
 
@@ -75,7 +72,7 @@ def add_site_markers(map_obj, sites_df):
 def calculate_route(origin, destination, waypoints=None):
     """Calculate route between points using Google Maps API."""
     try:
-        gmaps = googlemaps.Client(key=GOOGLE_MAPS_API_KEY)
+        gmaps = google_maps_client(GOOGLE_MAPS_API_KEY)
 
         # Prepare waypoints if provided
         if waypoints:
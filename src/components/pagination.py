@@ -46,3 +46,45 @@ def render_pagination(current_page=1, total_pages=10):
     # Store current page in session state
     if 'current_page' not in st.session_state:
         st.session_state.current_page = current_page
+
+def get_page_cursor(key, reset_on=None):
+    """Keyset cursor of the page currently shown in a listing (None for the first page).
+
+    The listing goes back to its first page whenever ``reset_on`` (e.g. the
+    selected filters and sort order) changes.
+    """
+    state = st.session_state.setdefault(f"{key}_pagination", {'cursors': [None], 'reset_on': reset_on})
+    if state['reset_on'] != reset_on:
+        state['cursors'] = [None]
+        state['reset_on'] = reset_on
+    return state['cursors'][-1]
+
+def render_cursor_pagination(key, next_cursor, total_count=None, page_size=None):
+    """Render Previous/Next controls for a keyset-paginated listing.
+
+    Visited page cursors are kept in session state, so Previous re-reads the
+    earlier page from its stored cursor instead of counting rows with OFFSET.
+    """
+    state = st.session_state[f"{key}_pagination"]
+    current_page = len(state['cursors'])
+    total_pages = None
+    if total_count is not None and page_size:
+        total_pages = max(1, -(-total_count // page_size))
+
+    col1, col2, col3 = st.columns([1, 3, 1])
+
+    with col1:
+        if current_page > 1 and st.button("Previous", key=f"{key}_prev_page"):
+            state['cursors'].pop()
+            st.rerun()
+
+    with col2:
+        if total_pages is not None:
+            st.markdown(f"Page {current_page} of {total_pages}")
+        else:
+            st.markdown(f"Page {current_page}")
+
+    with col3:
+        if next_cursor is not None and st.button("Next", key=f"{key}_next_page"):
+            state['cursors'].append(next_cursor)
+            st.rerun()
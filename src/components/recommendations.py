@@ -1,5 +1,5 @@
 import streamlit as st
-from src.utils.database import get_related_sites, get_heritage_sites
+from src.utils.database import get_related_sites, get_heritage_sites, get_site_id_by_name
 
 def render_recommendations():
     """Render the recommendations section with AI-powered suggestions."""
@@ -11,9 +11,13 @@ def render_recommendations():
         st.info("No recommendations available at the moment.")
         return
 
-    # Use the first site as a reference point for recommendations
-    reference_site = all_sites[0]
-    recommended_sites = get_related_sites(reference_site['site_id'])
+    # Recommend sites related to the last site viewed, else to the most visited one
+    reference_site_id = None
+    if st.session_state.get('selected_site'):
+        reference_site_id = get_site_id_by_name(st.session_state['selected_site'])
+    if reference_site_id is None:
+        reference_site_id = all_sites[0]['site_id']
+    recommended_sites = get_related_sites(reference_site_id)
 
     if not recommended_sites:
         st.info("No recommendations available at the moment.")
@@ -30,4 +34,7 @@ def render_recommendations():
             st.markdown(f"**{site['location']}**")
             st.markdown(f"*{site['heritage_type']}*")
             st.markdown(f"Risk Level: {site['risk_level']}")
-            st.button("View Details", key=f"rec_{idx}")
+            if st.button("View Details", key=f"rec_{idx}"):
+                st.session_state['selected_site'] = site['name']
+                st.session_state['current_view'] = 'site_details'
+                st.rerun()
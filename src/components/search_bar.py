@@ -1,7 +1,14 @@
 import streamlit as st
-from src.utils.config import DISCOVERY_CONFIG, UNSPLASH_ACCESS_KEY
-from src.utils.database import get_heritage_sites, get_art_forms, get_cultural_events
-import requests
+from src.utils.config import DISCOVERY_CONFIG
+from src.utils.database import (
+    count_art_forms, count_cultural_events, count_heritage_sites,
+    get_art_forms_page, get_cultural_events_page, get_heritage_sites_page
+)
+from src.services.federated_search import federated_search
+from src.utils.facets import facet_index
+from src.utils.typeahead import get_suggestions, normalize
+from src.components.image_gallery import fill_image_slots, image_slot
+from src.components.pagination import get_page_cursor, render_cursor_pagination
 
 # City to State mapping
 CITY_STATE_MAPPING = {
@@ -26,32 +33,19 @@ CITY_STATE_MAPPING = {
     "Kaziranga": "Assam"
 }
 
+# Search type -> page and count functions of its results
+SEARCH_PAGES = {
+    "Heritage Sites": (get_heritage_sites_page, count_heritage_sites),
+    "Art Forms": (get_art_forms_page, count_art_forms),
+    "Cultural Events": (get_cultural_events_page, count_cultural_events)
+}
+
 def get_state_from_city(city):
     """Get state name from city name using the mapping."""
     return CITY_STATE_MAPPING.get(city, "")
 
-def get_site_image(query):
-    """Fetch a relevant image from Unsplash."""
-    try:
-        response = requests.get(
-            "https://api.unsplash.com/search/photos",
-            params={
-                "query": f"{query}",
-                "per_page": 1
-            },
-            headers={
-                "Authorization": f"Client-ID {UNSPLASH_ACCESS_KEY}"
-            }
-        )
-        data = response.json()
-        if data['results']:
-            return data['results'][0]['urls']['regular']
-    except Exception as e:
-        st.warning(f"Could not fetch image: {str(e)}")
-    return None
-
 def display_results_grid(items, item_type):
-    """Display items in a 4-column grid."""
+    """Display items in a 4-column grid; with item_type "All" each item's 'result_type' picks its card."""
     if not items:
         st.info(f"No {item_type} available.")
         return
@@ -59,18 +53,21 @@ def display_results_grid(items, item_type):
     num_cols = 4
     num_rows = (len(items) + num_cols - 1) // num_cols
 
+    # Cards are laid out with image placeholders, filled in after the grid
+    image_slots = []
     for row in range(num_rows):
         cols = st.columns(num_cols)
         for col in range(num_cols):
             idx = row * num_cols + col
             if idx < len(items):
                 item = items[idx]
+                card_type = item['result_type'] if item_type == "All" else item_type
                 with cols[col]:
                     st.markdown('<div class="result-card">', unsafe_allow_html=True)
 
                     # Get image based on item type
-                    if item_type == "Heritage Sites":
-                        image_url = get_site_image(f"{item['name']} {item['heritage_type']} {item['location']}")
+                    if card_type == "Heritage Sites":
+                        image_query = f"{item['name']} {item['heritage_type']} {item['location']}"
                         content = f"""
                             <h3 class="result-title">{item['name']}</h3>
                             <p class="result-details"><strong>Location:</strong> {item['location']}{f", {item.get('state', '')}" if item.get('state') else ''}</p>
@@ -81,8 +78,8 @@ def display_results_grid(items, item_type):
                             {f"<p class='result-details'><strong>Historical Significance:</strong> {item.get('historical_significance', '')}</p>" if 'historical_significance' in item else ''}
                             {f"<p class='result-details'><strong>Conservation Efforts:</strong> {item.get('conservation_efforts', '')}</p>" if 'conservation_efforts' in item else ''}
                         """
-                    elif item_type == "Art Forms":
-                        image_url = get_site_image(f"{item['name']} {item['category']} {item['origin_state']}")
+                    elif card_type == "Art Forms":
+                        image_query = f"{item['name']} {item['category']} {item['origin_state']}"
                         content = f"""
                             <h3 class="result-title">{item['name']}</h3>
                             <p class="result-details"><strong>Category:</strong> {item['category']}</p>
@@ -94,7 +91,7 @@ def display_results_grid(items, item_type):
                             {f"<p class='result-details'><strong>Cultural Significance:</strong> {item.get('cultural_significance', '')}</p>" if 'cultural_significance' in item else ''}
                         """
                     else:  # Cultural Events
-                        image_url = get_site_image(f"{item['name']} {item['event_type']} {item['location']}")
+                        image_query = f"{item['name']} {item['event_type']} {item['location']}"
                         state = get_state_from_city(item['location'])
                         content = f"""
                             <h3 class="result-title">{item['name']}</h3>
@@ -107,15 +104,100 @@ def display_results_grid(items, item_type):
                             {f"<p class='result-details'><strong>Highlights:</strong> {item.get('highlights', '')}</p>" if 'highlights' in item else ''}
                         """
 
-                    if image_url:
-                        st.image(image_url, use_container_width=True)
-                    else:
-                        st.image("https://via.placeholder.com/400x200?text=No+Image", use_container_width=True)
+                    image_slots.append((image_query, image_slot()))
 
                     st.markdown('<div class="result-content">', unsafe_allow_html=True)
                     st.markdown(content, unsafe_allow_html=True)
                     st.markdown('</div></div>', unsafe_allow_html=True)
 
+    fill_image_slots(image_slots, "https://via.placeholder.com/400x200?text=No+Image")
+
+def use_suggestion(text):
+    """Put a picked suggestion in the search box and search for it."""
+    st.session_state['main_search'] = text
+    st.session_state['suggestion_selected'] = True
+
+def render_suggestions(search_query, search_type):
+    """Show typeahead suggestions for the text typed so far as clickable buttons."""
+    suggestions = [suggestion for suggestion in get_suggestions(search_query, search_type)
+                   if suggestion['normalized'] != normalize(search_query)]
+    if not suggestions:
+        return
+
+    num_cols = 4
+    for row in range(0, len(suggestions), num_cols):
+        cols = st.columns(num_cols)
+        for index, (col, suggestion) in enumerate(zip(cols, suggestions[row:row + num_cols]), start=row):
+            with col:
+                # Events and sites can share a name, so the position keeps the widget key unique
+                st.button(
+                    suggestion['text'],
+                    key=f"suggestion_{index}_{suggestion['kind']}",
+                    help=suggestion['kind'].replace('_', ' ').title(),
+                    on_click=use_suggestion,
+                    args=(suggestion['text'],),
+                    use_container_width=True
+                )
+
+def display_federated_results(found):
+    """Display the merged "All" search results with a match count per type."""
+    if found['missing']:
+        st.warning(f"{', '.join(found['missing'])} took too long to search; showing the other results.")
+
+    if not found['results']:
+        st.info("No results found matching your search criteria.")
+        return
+
+    st.markdown(f"### Found {len(found['results'])} results")
+    st.caption(" · ".join(f"{facet['label']} ({facet['count']})" for facet in found['facets'].values()))
+    st.markdown('<div class="search-results">', unsafe_allow_html=True)
+    display_results_grid(found['results'], "All")
+    st.markdown('</div>', unsafe_allow_html=True)
+
+def display_search_page(search_type, filters):
+    """Display one page of a type's search results, most relevant first, with paging controls."""
+    get_page, count = SEARCH_PAGES[search_type]
+    cursor = get_page_cursor('search_results', reset_on=(search_type, filters))
+    page = get_page(filters, 'relevance', cursor, DISCOVERY_CONFIG['page_size'])
+    total_results = count(filters)
+
+    if not page['items']:
+        st.info("No results found matching your search criteria.")
+        return
+
+    st.markdown(f"### Found {total_results} results")
+    st.markdown('<div class="search-results">', unsafe_allow_html=True)
+    st.markdown(f"### {search_type} ({total_results})")
+    display_results_grid(page['items'], search_type)
+    st.markdown('</div>', unsafe_allow_html=True)
+
+    render_cursor_pagination('search_results', page['next_cursor'], total_results, DISCOVERY_CONFIG['page_size'])
+
+def facet_counts(doc_type, search_query, selection_keys, selected=None):
+    """Live value counts of a type's facets for the query and the filters currently picked.
+
+    ``selection_keys`` maps each facet field to the session state key of its
+    filter widget, read before the widgets are drawn on this run; ``selected``
+    adds values picked some other way.
+    """
+    selected = dict(selected or {})
+    for field, key in selection_keys.items():
+        value = st.session_state.get(key)
+        if value is not None and value != "None":
+            selected[field] = value
+    return facet_index.counts(doc_type, search_query or None, selected)
+
+def facet_selectbox(label, counts, key):
+    """Filter selectbox over a facet's values, each shown with its number of matches."""
+    options = ["None"] + sorted(counts, key=str)
+    return st.selectbox(
+        label,
+        options,
+        index=0,
+        key=key,
+        format_func=lambda value: value if value == "None" else f"{value} ({counts[value]})"
+    )
+
 def render_search_bar():
     # Add custom CSS for fixed image sizes and consistent card appearance
     st.markdown("""
@@ -181,6 +263,9 @@ def render_search_bar():
         label_visibility="collapsed"
     )
 
+    if search_query:
+        render_suggestions(search_query, search_type)
+
     # Initialize use_advanced_filters
     use_advanced_filters = False
 
@@ -190,24 +275,22 @@ def render_search_bar():
 
         if use_advanced_filters:
             if search_type == "Heritage Sites":
+                # UNESCO is selected by checking exactly one of its two boxes
+                unesco_selected = {(True, False): True, (False, True): False}.get(
+                    (st.session_state.get('filter_unesco', False), st.session_state.get('filter_non_unesco', False)))
+                counts = facet_counts('heritage_sites', search_query, {
+                    'state': 'filter_site_state',
+                    'heritage_type': 'filter_heritage_type',
+                    'risk_level': 'filter_site_risk_level'
+                }, {'unesco_status': unesco_selected})
                 col1, col2, col3, col4 = st.columns(4)
 
                 with st.container():
                     with col1:
-                        state = st.selectbox(
-                            "State",
-                            ["None", "Maharashtra", "Karnataka", "Tamil Nadu", "Rajasthan", "Uttar Pradesh",
-                             "Madhya Pradesh", "Odisha", "Delhi", "Gujarat", "Telangana", "West Bengal", "Assam"],
-                            index=0
-                        )
+                        state = facet_selectbox("State", counts['state'], 'filter_site_state')
 
                     with col2:
-                        heritage_type = st.selectbox(
-                            "Heritage Type",
-                            ["None", "Monument", "Temple", "Ruins", "Cave", "Fort", "Palace", "Bridge",
-                             "Road", "Observatory", "Forest", "Park"],
-                            index=0
-                        )
+                        heritage_type = facet_selectbox("Heritage Type", counts['heritage_type'], 'filter_heritage_type')
 
                     with col3:
                         conservation_status = st.selectbox(
@@ -217,11 +300,7 @@ def render_search_bar():
                         )
 
                     with col4:
-                        risk_level = st.selectbox(
-                            "Risk Level",
-                            ["None", "Low", "Medium", "High"],
-                            index=0
-                        )
+                        risk_level = facet_selectbox("Risk Level", counts['risk_level'], 'filter_site_risk_level')
 
                 col1, col2 = st.columns(2)
 
@@ -238,68 +317,51 @@ def render_search_bar():
 
                 # UNESCO checkboxes in a new line
                 st.markdown('<div class="unesco-checkboxes">', unsafe_allow_html=True)
-                unesco = st.checkbox("UNESCO", value=False)
-                non_unesco = st.checkbox("Non-UNESCO", value=False)
+                unesco = st.checkbox(f"UNESCO ({counts['unesco_status'].get(True, 0)})", value=False, key='filter_unesco')
+                non_unesco = st.checkbox(f"Non-UNESCO ({counts['unesco_status'].get(False, 0)})", value=False,
+                                         key='filter_non_unesco')
                 st.markdown('</div>', unsafe_allow_html=True)
 
             elif search_type == "Art Forms":
+                counts = facet_counts('art_forms', search_query, {
+                    'category': 'filter_art_category',
+                    'origin_state': 'filter_origin_state',
+                    'risk_level': 'filter_art_risk_level'
+                })
                 col1, col2, col3 = st.columns(3)
 
                 with st.container():
                     with col1:
-                        art_category = st.selectbox(
-                            "Category",
-                            ["None", "Dance", "Painting", "Textile", "Theatre", "Ritual"],
-                            index=0
-                        )
+                        art_category = facet_selectbox("Category", counts['category'], 'filter_art_category')
 
                     with col2:
-                        origin_state = st.selectbox(
-                            "Origin State",
-                            ["None", "Kerala", "Uttar Pradesh", "Tamil Nadu", "Andhra Pradesh", "Odisha",
-                             "Manipur", "Assam", "Bihar", "West Bengal", "Maharashtra", "Punjab",
-                             "Madhya Pradesh", "Gujarat", "Karnataka", "Rajasthan"],
-                            index=0
-                        )
+                        origin_state = facet_selectbox("Origin State", counts['origin_state'], 'filter_origin_state')
 
                     with col3:
-                        risk_level = st.selectbox(
-                            "Risk Level",
-                            ["None", "Low", "Medium", "High"],
-                            index=0
-                        )
+                        risk_level = facet_selectbox("Risk Level", counts['risk_level'], 'filter_art_risk_level')
 
             elif search_type == "Cultural Events":
+                counts = facet_counts('cultural_events', search_query, {
+                    'event_type': 'filter_event_type',
+                    'location': 'filter_event_location',
+                    'organizer': 'filter_event_organizer'
+                })
                 col1, col2, col3 = st.columns(3)
 
                 with st.container():
                     with col1:
-                        event_type = st.selectbox(
-                            "Event Type",
-                            ["None", "Dance Festival", "Music Festival", "Cultural Festival", "Eco Festival", "Wildlife Festival"],
-                            index=0
-                        )
+                        event_type = facet_selectbox("Event Type", counts['event_type'], 'filter_event_type')
 
                     with col2:
-                        location = st.selectbox(
-                            "Location",
-                            ["None", "Khajuraho", "Konark", "Aurangabad", "Mahabalipuram", "Pattadakal",
-                             "Delhi", "Mumbai", "Hampi", "Agra", "Sanchi", "Fatehpur Sikri", "Thanjavur",
-                             "Champaner", "Patan", "Mysore", "Madurai", "Guwahati", "Sundarbans", "Kaziranga"],
-                            index=0
-                        )
+                        location = facet_selectbox("Location", counts['location'], 'filter_event_location')
 
                     with col3:
-                        organizer = st.selectbox(
-                            "Organizer",
-                            ["None", "MP Tourism", "Odisha Tourism", "Maharashtra Tourism", "Tamil Nadu Tourism",
-                             "Karnataka Tourism", "Delhi Tourism", "UP Tourism", "Gujarat Tourism", "Assam Tourism",
-                             "West Bengal Tourism"],
-                            index=0
-                        )
+                        organizer = facet_selectbox("Organizer", counts['organizer'], 'filter_event_organizer')
 
     # Search button
     search_clicked = st.button("Search", key="search_button")
+    # Picking a suggestion searches right away
+    search_clicked = st.session_state.pop('suggestion_selected', False) or search_clicked
 
     if search_clicked:
         # Check if search query is empty
@@ -313,7 +375,6 @@ def render_search_bar():
         # Add search query if provided
         if search_query:
             filters['search_query'] = search_query
-            st.success(f"Searching for: {search_query}")
 
         # Add advanced filters if enabled and selected
         if search_type in ["Heritage Sites", "Art Forms", "Cultural Events"] and use_advanced_filters:
@@ -354,44 +415,22 @@ def render_search_bar():
                 if organizer != "None":
                     filters['organizer'] = organizer
 
-        # Get search results based on search type
-        if search_type == "All":
-            results = {
-                'heritage_sites': get_heritage_sites(filters),
-                'art_forms': get_art_forms(filters),
-                'cultural_events': get_cultural_events(filters)
-            }
-        elif search_type == "Heritage Sites":
-            results = {'heritage_sites': get_heritage_sites(filters)}
-        elif search_type == "Art Forms":
-            results = {'art_forms': get_art_forms(filters)}
-        elif search_type == "Cultural Events":
-            results = {'cultural_events': get_cultural_events(filters)}
-
-        # Display results
-        if any(results.values()):
-            # Calculate total results
-            total_results = sum(len(v) for v in results.values())
-            st.markdown(f"### Found {total_results} results")
-            st.markdown('<div class="search-results">', unsafe_allow_html=True)
-
-            if 'heritage_sites' in results and results['heritage_sites']:
-                sites = results['heritage_sites']
-                st.markdown(f"### Heritage Sites ({len(sites)})")
-                display_results_grid(sites, "Heritage Sites")
-
-            if 'art_forms' in results and results['art_forms']:
-                arts = results['art_forms']
-                st.markdown(f"### Art Forms ({len(arts)})")
-                display_results_grid(arts, "Art Forms")
-
-            if 'cultural_events' in results and results['cultural_events']:
-                events = results['cultural_events']
-                st.markdown(f"### Cultural Events ({len(events)})")
-                display_results_grid(events, "Cultural Events")
-
-            st.markdown('</div>', unsafe_allow_html=True)
-        else:
-            st.info("No results found matching your search criteria.")
+        # The search stays on screen across reruns, so its result pages can be browsed
+        st.session_state['discover_search'] = {'type': search_type, 'filters': filters}
+        st.session_state.pop('search_results_pagination', None)
+
+    search = st.session_state.get('discover_search')
+    if search is None or search['type'] != search_type:
+        return search_query
+
+    if search['filters'].get('search_query'):
+        st.success(f"Searching for: {search['filters']['search_query']}")
+
+    # Get search results based on search type
+    if search_type == "All":
+        # Sites, art forms and events are searched in parallel and ranked together
+        display_federated_results(federated_search(search['filters']['search_query']))
+    else:
+        display_search_page(search_type, search['filters'])
 
     return search_query
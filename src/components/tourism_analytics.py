@@ -8,6 +8,7 @@ from sklearn.preprocessing import StandardScaler
 from sklearn.cluster import KMeans
 from utils.config import ANALYTICS_CONFIG
 from utils.database import execute_query
+from utils.site_metrics import site_metrics_source
 
 def get_visitor_stats(start_date=None, end_date=None, site_id=None):
     """Fetch visitor statistics with optional filters."""
@@ -44,7 +45,7 @@ def get_visitor_stats(start_date=None, end_date=None, site_id=None):
 
 def get_site_clusters():
     """Perform clustering analysis on heritage sites."""
-    query = """
+    query = f"""
     SELECT
         h.site_id,
         h.name,
@@ -52,14 +53,12 @@ def get_site_clusters():
         h.heritage_type,
         h.risk_level,
         h.health_index,
-        COUNT(DISTINCT v.visit_date) as visit_days,
-        SUM(v.visitor_count) as total_visitors,
-        AVG(v.revenue) as avg_revenue,
-        AVG(u.rating) as avg_rating
+        m.visit_days,
+        m.total_visitors,
+        m.total_revenue / NULLIF(m.revenue_count, 0) as avg_revenue,
+        m.avg_rating
     FROM HERITAGE_SITES h
-    LEFT JOIN VISITOR_STATS v ON h.site_id = v.site_id
-    LEFT JOIN USER_INTERACTIONS u ON h.site_id = u.site_id
-    GROUP BY h.site_id, h.name, h.state, h.heritage_type, h.risk_level, h.health_index
+    LEFT JOIN {site_metrics_source()} m ON h.site_id = m.site_id
     """
     sites_df = execute_query(query)
 
@@ -1,27 +1,6 @@
 import streamlit as st
 from src.utils.database import get_trending_sites
-from src.utils.config import UNSPLASH_ACCESS_KEY
-import requests
-
-def get_site_image(site_name):
-    """Fetch a relevant image for the heritage site from Unsplash."""
-    try:
-        response = requests.get(
-            "https://api.unsplash.com/search/photos",
-            params={
-                "query": f"{site_name}",
-                "per_page": 1
-            },
-            headers={
-                "Authorization": f"Client-ID {UNSPLASH_ACCESS_KEY}"
-            }
-        )
-        data = response.json()
-        if data['results']:
-            return data['results'][0]['urls']['regular']
-    except Exception as e:
-        st.warning(f"Could not fetch image: {str(e)}")
-    return None
+from src.components.image_gallery import fill_image_slots, image_slot
 
 def render_trending():
     """Render the trending heritage sites section."""
@@ -69,6 +48,7 @@ def render_trending():
 
     # Display trending sites in two rows of 4 columns each
     num_cols = 4
+    image_slots = []
     for row in range(2):  # Two rows
         cols = st.columns(num_cols)
         for col in range(num_cols):
@@ -76,12 +56,8 @@ def render_trending():
             if idx < len(trending_sites):
                 with cols[col]:
                     site = trending_sites[idx]
-                    # Use Unsplash API to get a relevant image
-                    image_url = get_site_image(site['name'])
-                    if image_url:
-                        st.image(image_url, use_container_width=True)
-                    else:
-                        st.image("https://via.placeholder.com/400x200?text=No+Image", use_container_width=True)
+                    # Unsplash image, filled in once every card is laid out
+                    image_slots.append((site['name'], image_slot()))
                     st.markdown(f"#### {site['name']}")
                     st.markdown(f"*{site['location']}, {site['state']}*")
                     # Add Read More link
@@ -89,3 +65,5 @@ def render_trending():
                         st.session_state['selected_site'] = site['name']
                         st.session_state['current_view'] = 'site_details'
                         st.rerun()
+
+    fill_image_slots(image_slots, "https://via.placeholder.com/400x200?text=No+Image")
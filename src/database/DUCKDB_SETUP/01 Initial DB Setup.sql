@@ -0,0 +1,120 @@
+-- ---------------------------------------------------------------------------------
+-- Local DuckDB database (DATABASE_BACKEND=duckdb)
+-- Mirrors SNOWFLAKE_SETUP/01 Initial DB Setup.sql; AUTOINCREMENT columns use sequences.
+-- ---------------------------------------------------------------------------------
+
+CREATE SEQUENCE IF NOT EXISTS SEQ_SITE_ID START 1;
+CREATE SEQUENCE IF NOT EXISTS SEQ_ART_FORM_ID START 1;
+CREATE SEQUENCE IF NOT EXISTS SEQ_EVENT_ID START 1;
+CREATE SEQUENCE IF NOT EXISTS SEQ_STAT_ID START 1;
+CREATE SEQUENCE IF NOT EXISTS SEQ_INTERACTION_ID START 1;
+
+-- Heritage Sites Table: Stores information about heritage sites
+CREATE TABLE IF NOT EXISTS HERITAGE_SITES (
+    site_id BIGINT PRIMARY KEY DEFAULT nextval('SEQ_SITE_ID'),
+    name VARCHAR NOT NULL,
+    description TEXT,
+    story TEXT,
+    location VARCHAR,
+    latitude DECIMAL(10, 8),
+    longitude DECIMAL(11, 8),
+    state VARCHAR,
+    city VARCHAR,
+    established_year INTEGER,
+    heritage_type VARCHAR,
+    unesco_status BOOLEAN,
+    risk_level VARCHAR,
+    health_index DECIMAL(3, 2),
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Art Forms Table: Stores information about traditional art forms
+CREATE TABLE IF NOT EXISTS ART_FORMS (
+    art_form_id BIGINT PRIMARY KEY DEFAULT nextval('SEQ_ART_FORM_ID'),
+    name VARCHAR NOT NULL,
+    description TEXT,
+    origin_state VARCHAR,
+    category VARCHAR,
+    risk_level VARCHAR,
+    practitioners_count BIGINT,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Cultural Events Table: Stores information about cultural events
+CREATE TABLE IF NOT EXISTS CULTURAL_EVENTS (
+    event_id BIGINT PRIMARY KEY DEFAULT nextval('SEQ_EVENT_ID'),
+    name VARCHAR NOT NULL,
+    description TEXT,
+    start_date DATE,
+    end_date DATE,
+    location VARCHAR,
+    event_type VARCHAR,
+    organizer VARCHAR,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Visitor Statistics Table: Tracks visitor data for heritage sites
+CREATE TABLE IF NOT EXISTS VISITOR_STATS (
+    stat_id BIGINT PRIMARY KEY DEFAULT nextval('SEQ_STAT_ID'),
+    site_id BIGINT NOT NULL,
+    visit_date DATE,
+    visitor_count BIGINT,
+    revenue DOUBLE,
+    season VARCHAR,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- User Interactions Table: Stores user reviews and interactions
+CREATE TABLE IF NOT EXISTS USER_INTERACTIONS (
+    interaction_id BIGINT PRIMARY KEY DEFAULT nextval('SEQ_INTERACTION_ID'),
+    user_id VARCHAR,
+    site_id BIGINT NOT NULL,
+    interaction_type VARCHAR,
+    interaction_date TIMESTAMP,
+    rating BIGINT,
+    review TEXT,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Site Art Forms Mapping Table: Links heritage sites with art forms
+CREATE TABLE IF NOT EXISTS SITE_ART_FORMS (
+    site_id BIGINT NOT NULL,
+    art_form_id BIGINT NOT NULL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (site_id, art_form_id)
+);
+
+-- Heritage Health Index View: Provides health index and risk level information
+CREATE OR REPLACE VIEW HERITAGE_HEALTH_INDEX AS
+SELECT
+    site_id,
+    name,
+    health_index,
+    risk_level,
+    state,
+    city
+FROM HERITAGE_SITES
+ORDER BY health_index DESC;
+
+-- Seasonal Visitor Stats View: Analyzes visitor patterns by season
+CREATE OR REPLACE VIEW SEASONAL_VISITOR_STATS AS
+SELECT
+    hs.site_id,
+    hs.name,
+    vs.season,
+    SUM(vs.visitor_count) as total_visitors,
+    AVG(vs.visitor_count) as avg_visitors,
+    SUM(vs.revenue) as total_revenue
+FROM HERITAGE_SITES hs
+JOIN VISITOR_STATS vs ON hs.site_id = vs.site_id
+GROUP BY hs.site_id, hs.name, vs.season
+ORDER BY total_visitors DESC;
+
+-- Indexes matching the app's lookup paths
+CREATE INDEX IF NOT EXISTS idx_visitor_stats_site_date ON VISITOR_STATS(site_id, visit_date);
+CREATE INDEX IF NOT EXISTS idx_user_interactions_site ON USER_INTERACTIONS(site_id);
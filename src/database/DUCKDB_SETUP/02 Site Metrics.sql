@@ -0,0 +1,22 @@
+-- ---------------------------------------------------------------------------------
+-- Per-site metrics table (SITE_METRICS_SOURCE=table)
+-- Refreshed incrementally by src/utils/site_metrics.py (delete + insert per changed
+-- site in one transaction, so site_id is indexed rather than declared PRIMARY KEY)
+-- ---------------------------------------------------------------------------------
+
+CREATE TABLE IF NOT EXISTS SITE_METRICS (
+    site_id BIGINT NOT NULL,
+    visit_days BIGINT,
+    total_visitors BIGINT,
+    total_revenue DOUBLE,
+    revenue_count BIGINT,  -- VISITOR_STATS rows with a revenue, for the per-row average
+    last_visit_date DATE,
+    avg_rating DOUBLE,
+    rating_count BIGINT,
+    refreshed_at TIMESTAMP
+);
+
+CREATE INDEX IF NOT EXISTS idx_site_metrics_site ON SITE_METRICS(site_id);
+
+-- Tables created before revenue_count existed (then run refresh_site_metrics.py --full)
+ALTER TABLE SITE_METRICS ADD COLUMN IF NOT EXISTS revenue_count BIGINT;
@@ -0,0 +1,30 @@
+-- ---------------------------------------------------------------------------------
+-- Precomputed site scorecards, one row per site per assessment date
+-- Written by src/services/site_scorecards.py (python src/scripts/refresh_site_scorecards.py)
+-- List columns hold JSON text
+-- ---------------------------------------------------------------------------------
+
+CREATE TABLE IF NOT EXISTS SITE_SCORECARDS (
+    site_id BIGINT NOT NULL,
+    assessment_date DATE NOT NULL,
+    physical_condition_score DOUBLE,
+    cultural_significance_score DOUBLE,
+    tourism_impact_score DOUBLE,
+    community_engagement_score DOUBLE,
+    overall_health_score DOUBLE,
+    current_visitor_score DOUBLE,
+    site_significance_score DOUBLE,
+    infrastructure_readiness DOUBLE,
+    community_capacity DOUBLE,
+    preservation_needs DOUBLE,
+    overall_potential_score DOUBLE,
+    seasonal_patterns VARCHAR,
+    peak_seasons VARCHAR,
+    revenue_opportunities VARCHAR,
+    risk_assessment_score DOUBLE,
+    resource_allocation_priority INTEGER,
+    implementation_timeline VARCHAR,
+    computed_at TIMESTAMP
+);
+
+CREATE INDEX IF NOT EXISTS idx_site_scorecards_site_date ON SITE_SCORECARDS(site_id, assessment_date);
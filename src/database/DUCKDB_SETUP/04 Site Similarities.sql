@@ -0,0 +1,15 @@
+-- ---------------------------------------------------------------------------------
+-- Precomputed similar sites, the top neighbours of every site by rank
+-- Written by src/services/site_similarity.py (python src/scripts/refresh_site_similarities.py)
+-- ---------------------------------------------------------------------------------
+
+CREATE TABLE IF NOT EXISTS SITE_SIMILARITIES (
+    site_id BIGINT NOT NULL,
+    similar_site_id BIGINT NOT NULL,
+    similarity_rank INTEGER NOT NULL,
+    similarity_score DOUBLE,
+    content_hash VARCHAR,
+    computed_at TIMESTAMP
+);
+
+CREATE INDEX IF NOT EXISTS idx_site_similarities_site ON SITE_SIMILARITIES(site_id, similarity_rank);
@@ -0,0 +1,19 @@
+-- ---------------------------------------------------------------------------------
+-- Site photos, including each site's Unsplash photo manifest (source = 'unsplash')
+-- Manifest rows are written by src/services/site_media.py
+-- ---------------------------------------------------------------------------------
+
+CREATE TABLE IF NOT EXISTS SITE_PHOTOS (
+    photo_id VARCHAR NOT NULL,
+    site_id BIGINT NOT NULL,
+    image_url VARCHAR NOT NULL,
+    capture_date TIMESTAMP
+);
+
+ALTER TABLE SITE_PHOTOS ADD COLUMN IF NOT EXISTS photographer VARCHAR;
+ALTER TABLE SITE_PHOTOS ADD COLUMN IF NOT EXISTS source VARCHAR;
+ALTER TABLE SITE_PHOTOS ADD COLUMN IF NOT EXISTS source_query VARCHAR;
+ALTER TABLE SITE_PHOTOS ADD COLUMN IF NOT EXISTS photo_rank INTEGER;
+ALTER TABLE SITE_PHOTOS ADD COLUMN IF NOT EXISTS fetched_at TIMESTAMP;
+
+CREATE INDEX IF NOT EXISTS idx_site_photos_site ON SITE_PHOTOS(site_id, source, photo_rank);
@@ -0,0 +1,61 @@
+-- ---------------------------------------------------------------------------------
+-- Per-site metrics (SITE_METRICS)
+-- Visitor and rating aggregates are computed per source table and then joined,
+-- so VISITOR_STATS rows are not multiplied by USER_INTERACTIONS rows.
+-- Pick ONE of the two options and set SITE_METRICS_SOURCE in .env accordingly.
+-- ---------------------------------------------------------------------------------
+
+USE DATABASE ROOTS_ROUTES;
+USE SCHEMA PUBLIC;
+
+-- Option 1 (SITE_METRICS_SOURCE=dynamic): dynamic table refreshed incrementally by Snowflake
+CREATE OR REPLACE DYNAMIC TABLE SITE_METRICS
+    TARGET_LAG = '5 minutes'
+    WAREHOUSE = COMPUTE_WH
+    REFRESH_MODE = INCREMENTAL
+AS
+SELECT
+    h.site_id,
+    COALESCE(v.visit_days, 0) AS visit_days,
+    COALESCE(v.total_visitors, 0) AS total_visitors,
+    COALESCE(v.total_revenue, 0) AS total_revenue,
+    COALESCE(v.revenue_count, 0) AS revenue_count,
+    v.last_visit_date,
+    u.avg_rating,
+    COALESCE(u.rating_count, 0) AS rating_count
+FROM HERITAGE_SITES h
+LEFT JOIN (
+    SELECT
+        site_id,
+        COUNT(DISTINCT visit_date) AS visit_days,
+        SUM(visitor_count) AS total_visitors,
+        SUM(revenue) AS total_revenue,
+        COUNT(revenue) AS revenue_count,
+        MAX(visit_date) AS last_visit_date
+    FROM VISITOR_STATS
+    GROUP BY site_id
+) v ON h.site_id = v.site_id
+LEFT JOIN (
+    SELECT
+        site_id,
+        AVG(rating) AS avg_rating,
+        COUNT(rating) AS rating_count
+    FROM USER_INTERACTIONS
+    GROUP BY site_id
+) u ON h.site_id = u.site_id;
+
+-- Option 2 (SITE_METRICS_SOURCE=table): plain table refreshed incrementally by the app
+-- (src/utils/site_metrics.py, or python src/scripts/refresh_site_metrics.py from a scheduler)
+-- CREATE TABLE IF NOT EXISTS SITE_METRICS (
+--     site_id NUMBER PRIMARY KEY,
+--     visit_days NUMBER,
+--     total_visitors NUMBER,
+--     total_revenue FLOAT,
+--     revenue_count NUMBER,
+--     last_visit_date DATE,
+--     avg_rating FLOAT,
+--     rating_count NUMBER,
+--     refreshed_at TIMESTAMP_NTZ
+-- );
+-- Tables created before revenue_count existed (then run refresh_site_metrics.py --full):
+-- ALTER TABLE SITE_METRICS ADD COLUMN IF NOT EXISTS revenue_count NUMBER;
@@ -0,0 +1,34 @@
+-- ---------------------------------------------------------------------------------
+-- Precomputed site scorecards (SITE_SCORECARDS)
+-- One row per site per assessment date, written by the scheduled job
+-- python src/scripts/refresh_site_scorecards.py. The AI Insights page reads the
+-- latest row and keeps the older ones as score history.
+-- ---------------------------------------------------------------------------------
+
+USE DATABASE ROOTS_ROUTES;
+USE SCHEMA PUBLIC;
+
+CREATE TABLE IF NOT EXISTS SITE_SCORECARDS (
+    site_id NUMBER NOT NULL,
+    assessment_date DATE NOT NULL,
+    physical_condition_score FLOAT,
+    cultural_significance_score FLOAT,
+    tourism_impact_score FLOAT,
+    community_engagement_score FLOAT,
+    overall_health_score FLOAT,
+    current_visitor_score FLOAT,
+    site_significance_score FLOAT,
+    infrastructure_readiness FLOAT,
+    community_capacity FLOAT,
+    preservation_needs FLOAT,
+    overall_potential_score FLOAT,
+    seasonal_patterns VARCHAR,       -- JSON object: season -> relative demand
+    peak_seasons VARCHAR,            -- JSON array
+    revenue_opportunities VARCHAR,   -- JSON array
+    risk_assessment_score FLOAT,
+    resource_allocation_priority NUMBER,
+    implementation_timeline VARCHAR, -- JSON array
+    computed_at TIMESTAMP_NTZ,
+    PRIMARY KEY (site_id, assessment_date)
+)
+CLUSTER BY (assessment_date);
@@ -0,0 +1,21 @@
+-- ---------------------------------------------------------------------------------
+-- Precomputed similar sites (SITE_SIMILARITIES)
+-- The top neighbours of every site by description, type, state, distance and
+-- shared art forms, written by python src/scripts/refresh_site_similarities.py
+-- (incremental; --full recomputes every site). Related-site lookups read these
+-- rows instead of ranking sites on every request.
+-- ---------------------------------------------------------------------------------
+
+USE DATABASE ROOTS_ROUTES;
+USE SCHEMA PUBLIC;
+
+CREATE TABLE IF NOT EXISTS SITE_SIMILARITIES (
+    site_id NUMBER NOT NULL,
+    similar_site_id NUMBER NOT NULL,
+    similarity_rank NUMBER NOT NULL,  -- 1 is the most similar
+    similarity_score FLOAT,
+    content_hash VARCHAR,             -- hash of the site's inputs, to find edited sites
+    computed_at TIMESTAMP_NTZ,
+    PRIMARY KEY (site_id, similarity_rank)
+)
+CLUSTER BY (site_id);
@@ -0,0 +1,25 @@
+-- ---------------------------------------------------------------------------------
+-- Site photo manifests (SITE_PHOTOS rows with source = 'unsplash')
+-- One Unsplash search per site is stored here and serves every gallery of the
+-- site details page. Manifests older than SITE_MEDIA_CONFIG['max_age_days'],
+-- or made for a site's previous name, are refreshed in the background by
+-- src/services/site_media.py. Existing SITE_PHOTOS tables gain the manifest
+-- columns; their other photos are left as they are.
+-- ---------------------------------------------------------------------------------
+
+USE DATABASE ROOTS_ROUTES;
+USE SCHEMA PUBLIC;
+
+CREATE TABLE IF NOT EXISTS SITE_PHOTOS (
+    photo_id VARCHAR NOT NULL,
+    site_id NUMBER NOT NULL,
+    image_url VARCHAR NOT NULL,
+    capture_date TIMESTAMP_NTZ
+)
+CLUSTER BY (site_id);
+
+ALTER TABLE SITE_PHOTOS ADD COLUMN IF NOT EXISTS photographer VARCHAR;
+ALTER TABLE SITE_PHOTOS ADD COLUMN IF NOT EXISTS source VARCHAR;        -- 'unsplash' for manifest rows
+ALTER TABLE SITE_PHOTOS ADD COLUMN IF NOT EXISTS source_query VARCHAR;  -- search the manifest was made from
+ALTER TABLE SITE_PHOTOS ADD COLUMN IF NOT EXISTS photo_rank NUMBER;     -- 1 is shown first
+ALTER TABLE SITE_PHOTOS ADD COLUMN IF NOT EXISTS fetched_at TIMESTAMP_NTZ;
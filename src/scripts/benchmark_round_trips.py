@@ -0,0 +1,140 @@
+import sys
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+# Add the project root directory to the Python path
+project_root = str(Path(__file__).parent.parent.parent)
+sys.path.append(project_root)
+
+from src.utils import database
+from src.utils.config import DATABASE_CONFIG, QUERY_CACHE_CONFIG
+from src.utils.database import (
+    execute_query,
+    get_query_stats,
+    reset_query_stats,
+    get_trending_sites,
+    get_heritage_sites,
+    get_art_forms,
+    get_cultural_events,
+    get_site_health,
+    get_site_revenue,
+    get_site_visitors,
+    get_site_ratings,
+    get_site_comments,
+    get_site_photos,
+    get_site_videos,
+    get_site_articles,
+    get_site_resources,
+    get_site_events
+)
+from src.utils.site_bundle import get_site_bundle
+
+# Statements execute_query used to send before every query, before the session
+# context was pinned at connect time
+LEGACY_SESSION_STATEMENTS = [
+    "USE DATABASE ROOTS_ROUTES",
+    "USE SCHEMA PUBLIC",
+    "USE WAREHOUSE COMPUTE_WH"
+]
+
+
+def load_site_details_page(site):
+    """Issue the queries the site details page needs for one site."""
+    execute_query("SELECT * FROM HERITAGE_SITES WHERE name = %s", (site['name'],))
+    get_art_forms(site['site_id'])
+    execute_query("SELECT * FROM VISITOR_STATS WHERE site_id = %s ORDER BY VISIT_DATE DESC", (site['site_id'],))
+    execute_query("SELECT * FROM USER_INTERACTIONS WHERE site_id = %s ORDER BY interaction_date DESC", (site['site_id'],))
+    for loader in (get_site_health, get_site_revenue, get_site_visitors, get_site_ratings,
+                   get_site_comments, get_site_photos, get_site_videos, get_site_articles,
+                   get_site_resources, get_site_events):
+        loader(site['site_id'])
+
+
+def load_site_bundle(site):
+    """Load the site details page through the cached site bundle."""
+    get_site_bundle(site['site_id'])
+
+
+def load_discover_page():
+    """Issue the queries of an "All" search on the Discover page."""
+    filters = {'search_query': 'temple'}
+    get_heritage_sites(filters)
+    get_art_forms(filters)
+    get_cultural_events(filters)
+
+
+@contextmanager
+def legacy_session_statements():
+    """Send the old per-query USE statements before every statement, on the same cursor.
+
+    They go through the same counting function as the queries, so the old
+    path's round trips are measured rather than derived.
+    """
+    execute_statement = database._execute_statement
+
+    def execute_with_session_statements(cursor, query, params=None):
+        for statement in LEGACY_SESSION_STATEMENTS:
+            execute_statement(cursor, statement)
+        execute_statement(cursor, query, params)
+
+    database._execute_statement = execute_with_session_statements
+    try:
+        yield
+    finally:
+        database._execute_statement = execute_statement
+
+
+def count_round_trips(page_loader, legacy=False, warm=False):
+    """Round trips and elapsed seconds of one page load.
+
+    Cold loads run with the query cache off; warm loads run once unmeasured first.
+    """
+    cache_enabled = QUERY_CACHE_CONFIG['enabled']
+    QUERY_CACHE_CONFIG['enabled'] = cache_enabled and warm
+    try:
+        if warm:
+            page_loader()
+        reset_query_stats()
+        start = time.perf_counter()
+        if legacy:
+            with legacy_session_statements():
+                page_loader()
+        else:
+            page_loader()
+        return get_query_stats()['round_trips'], time.perf_counter() - start
+    finally:
+        QUERY_CACHE_CONFIG['enabled'] = cache_enabled
+
+
+def measure(name, page_loader, warm=False):
+    """Run one page workload on the old and the current path and report their round trips."""
+    before = None
+    if DATABASE_CONFIG['backend'] == 'snowflake':
+        before, _ = count_round_trips(page_loader, legacy=True, warm=warm)
+    after, elapsed = count_round_trips(page_loader, warm=warm)
+
+    before_text = 'n/a' if before is None else before
+    saved_text = 'n/a' if before is None else before - after
+    print(f"{name:<20} round trips before={before_text:<4} after={after:<4} "
+          f"saved={saved_text:<4} elapsed={elapsed * 1000:.0f} ms")
+
+
+def main():
+    sites = get_trending_sites(limit=1)
+    if not sites:
+        print("No heritage sites found; load sample data first.")
+        sys.exit(1)
+
+    print("Round trips per page (before = replayed with the per-query USE statements)")
+    if DATABASE_CONFIG['backend'] != 'snowflake':
+        print("USE statements only exist on Snowflake; 'before' is measured there only.")
+    measure("Home (trending)", lambda: get_trending_sites(limit=8))
+    measure("Discover (All)", load_discover_page)
+    measure("Site details", lambda: load_site_details_page(sites[0]))
+    measure("Site bundle (cold)", lambda: load_site_bundle(sites[0]))
+    measure("Site bundle (warm)", lambda: load_site_bundle(sites[0]), warm=True)
+
+
+if __name__ == "__main__":
+    main()
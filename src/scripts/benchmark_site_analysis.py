@@ -0,0 +1,87 @@
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# Add the project root directory to the Python path
+project_root = str(Path(__file__).parent.parent.parent)
+sys.path.append(project_root)
+
+from src.services.ai_analysis import HeritageAIAnalysis
+from src.utils.database import get_db_connection, get_trending_sites
+from src.utils.schema_catalog import schema_catalog
+
+
+class _CountingCursor:
+    """Cursor wrapper that counts the statements sent through it."""
+
+    def __init__(self, cursor, counter):
+        self._cursor = cursor
+        self._counter = counter
+
+    def execute(self, *args, **kwargs):
+        self._counter['queries'] += 1
+        return self._cursor.execute(*args, **kwargs)
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+
+class _CountingConnection:
+    """Connection wrapper handing out counting cursors."""
+
+    def __init__(self, conn):
+        self._conn = conn
+        self.counter = {'queries': 0}
+
+    def cursor(self):
+        return _CountingCursor(self._conn.cursor(), self.counter)
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+
+def load_separately(analysis, site_id):
+    """The four analyses as render_site_insights used to call them."""
+    analysis.calculate_health_score(site_id)
+    analysis.calculate_tourism_potential(site_id)
+    analysis.analyze_seasonality(site_id)
+    analysis.generate_preservation_priorities(site_id)
+
+
+def measure(name, conn, page_loader, repeat):
+    """Run one workload ``repeat`` times and report queries and latency per run."""
+    conn.counter['queries'] = 0
+    start = time.perf_counter()
+    for _ in range(repeat):
+        page_loader()
+    elapsed = (time.perf_counter() - start) / repeat
+    print(f"{name:<28} queries={conn.counter['queries'] / repeat:<6.1f} elapsed={elapsed * 1000:.0f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare the site insights analyses with and without a shared context.")
+    parser.add_argument('--repeat', type=int, default=5, help="runs per workload")
+    args = parser.parse_args()
+
+    sites = get_trending_sites(limit=1)
+    if not sites:
+        print("No heritage sites found; load sample data first.")
+        sys.exit(1)
+    site_id = int(sites[0]['site_id'])
+
+    conn = _CountingConnection(get_db_connection())
+    try:
+        analysis = HeritageAIAnalysis(conn)
+        # Warm the schema catalog so both workloads only pay for data queries
+        schema_catalog.tables()
+
+        print(f"Site insights for site {site_id} (average of {args.repeat} runs)")
+        measure("Separate analyses", conn, lambda: load_separately(analysis, site_id), args.repeat)
+        measure("analyze_site (shared context)", conn, lambda: analysis.analyze_site(site_id), args.repeat)
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,212 @@
+import argparse
+import os
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Add the project root directory to the Python path
+project_root = str(Path(__file__).parent.parent.parent)
+sys.path.append(project_root)
+
+from src.utils.config import DATABASE_CONFIG
+from src.utils.db_backends import DuckDBBackend
+from src.utils.site_metrics import refresh_site_metrics
+
+SCHEMA_DIR = os.path.join(project_root, 'src', 'database', 'DUCKDB_SETUP')
+
+STATES = {
+    'Uttar Pradesh': ['Agra', 'Varanasi', 'Lucknow'],
+    'Madhya Pradesh': ['Khajuraho', 'Bhopal', 'Gwalior'],
+    'Karnataka': ['Hampi', 'Badami', 'Mysuru'],
+    'Odisha': ['Konark', 'Puri', 'Bhubaneswar'],
+    'Maharashtra': ['Aurangabad', 'Mumbai', 'Pune'],
+    'Tamil Nadu': ['Thanjavur', 'Chennai', 'Madurai'],
+    'Rajasthan': ['Jaipur', 'Udaipur', 'Jaisalmer'],
+    'Gujarat': ['Patan', 'Vadodara', 'Ahmedabad'],
+    'Delhi': ['New Delhi'],
+    'Telangana': ['Hyderabad', 'Warangal'],
+    'West Bengal': ['Kolkata', 'Bishnupur'],
+    'Kerala': ['Kochi', 'Thiruvananthapuram']
+}
+HERITAGE_TYPES = ['Monument', 'Temple', 'Fort', 'Cave', 'Ruins', 'Palace', 'Stepwell', 'Mosque', 'Bridge']
+NAME_PREFIXES = ['Sun', 'Lotus', 'Royal', 'Ancient', 'Golden', 'Stone', 'Lake', 'Hill', 'River', 'Victory']
+RISK_LEVELS = ['Low', 'Medium', 'High']
+ART_CATEGORIES = ['Dance', 'Music', 'Painting', 'Craft', 'Theatre', 'Textile']
+EVENT_TYPES = ['Festival', 'Exhibition', 'Workshop', 'Performance', 'Tour']
+INTERACTION_TYPES = ['visit', 'review', 'rating']
+SEASONS = np.array(['Winter', 'Winter', 'Spring', 'Spring', 'Summer', 'Summer',
+                    'Monsoon', 'Monsoon', 'Monsoon', 'Autumn', 'Autumn', 'Winter'])
+
+
+def create_schema(conn):
+    """Create the local tables and views from the DUCKDB_SETUP files, in order."""
+    cursor = conn.cursor()
+    for file_name in sorted(os.listdir(SCHEMA_DIR)):
+        if not file_name.endswith('.sql'):
+            continue
+        # Drop comment lines first; they may contain semicolons
+        with open(os.path.join(SCHEMA_DIR, file_name), 'r') as f:
+            schema_sql = ''.join(line for line in f if not line.strip().startswith('--'))
+
+        for statement in schema_sql.split(';'):
+            if statement.strip():
+                cursor.execute(statement)
+    cursor.close()
+
+
+def generate_sites(rng, num_sites):
+    """Heritage sites spread over the states, with searchable names and descriptions."""
+    states = rng.choice(list(STATES), num_sites)
+    cities = [rng.choice(STATES[state]) for state in states]
+    types = rng.choice(HERITAGE_TYPES, num_sites)
+    prefixes = rng.choice(NAME_PREFIXES, num_sites)
+
+    return pd.DataFrame({
+        'NAME': [f"{prefix} {kind} of {city} {i + 1}" for i, (prefix, kind, city) in enumerate(zip(prefixes, types, cities))],
+        'DESCRIPTION': [f"Historic {kind.lower()} in {city}, {state}" for kind, city, state in zip(types, cities, states)],
+        'LOCATION': cities,
+        'LATITUDE': rng.uniform(8.0, 34.0, num_sites).round(6),
+        'LONGITUDE': rng.uniform(69.0, 92.0, num_sites).round(6),
+        'STATE': states,
+        'CITY': cities,
+        'ESTABLISHED_YEAR': rng.integers(200, 1950, num_sites),
+        'HERITAGE_TYPE': types,
+        'UNESCO_STATUS': rng.random(num_sites) < 0.2,
+        'RISK_LEVEL': rng.choice(RISK_LEVELS, num_sites, p=[0.5, 0.35, 0.15]),
+        'HEALTH_INDEX': rng.uniform(0.5, 0.99, num_sites).round(2)
+    })
+
+
+def generate_visitor_stats(rng, site_ids, days):
+    """One row per site per day, with a per-site popularity and seasonal swing."""
+    dates = pd.date_range(end=pd.Timestamp.today().normalize(), periods=days, freq='D')
+    popularity = rng.lognormal(mean=6.0, sigma=0.8, size=len(site_ids))
+    seasonal = 1 + 0.3 * np.sin(2 * np.pi * (dates.dayofyear.values / 365.0))
+
+    visitors = rng.poisson(np.outer(popularity, seasonal)).ravel()
+    return pd.DataFrame({
+        'SITE_ID': np.repeat(site_ids, days),
+        'VISIT_DATE': np.tile(dates.date, len(site_ids)),
+        'VISITOR_COUNT': visitors,
+        'REVENUE': visitors * rng.choice([40.0, 100.0, 600.0], len(visitors), p=[0.5, 0.4, 0.1]),
+        'SEASON': np.tile(SEASONS[dates.month.values - 1], len(site_ids))
+    })
+
+
+def generate_user_interactions(rng, site_ids, num_interactions, days):
+    """Visits, ratings and reviews by a pool of returning users."""
+    types = rng.choice(INTERACTION_TYPES, num_interactions, p=[0.5, 0.2, 0.3])
+    has_rating = types != 'visit'
+    ratings = np.where(has_rating, rng.choice([1, 2, 3, 4, 5], num_interactions, p=[0.05, 0.1, 0.2, 0.35, 0.3]), None)
+    offsets = pd.to_timedelta(rng.integers(0, days * 24 * 3600, num_interactions), unit='s')
+
+    return pd.DataFrame({
+        'USER_ID': [f"user_{i}" for i in rng.integers(1, max(num_interactions // 20, 100), num_interactions)],
+        'SITE_ID': rng.choice(site_ids, num_interactions),
+        'INTERACTION_TYPE': types,
+        'INTERACTION_DATE': pd.Timestamp.now().floor('s') - offsets,
+        'RATING': ratings,
+        'REVIEW': np.where(types == 'review', "Great experience at this heritage site!", None)
+    })
+
+
+def generate_art_forms(rng, num_art_forms):
+    """Traditional art forms from the same states as the sites."""
+    categories = rng.choice(ART_CATEGORIES, num_art_forms)
+    states = rng.choice(list(STATES), num_art_forms)
+    return pd.DataFrame({
+        'NAME': [f"{state} {category} {i + 1}" for i, (state, category) in enumerate(zip(states, categories))],
+        'DESCRIPTION': [f"Traditional {category.lower()} of {state}" for category, state in zip(categories, states)],
+        'ORIGIN_STATE': states,
+        'CATEGORY': categories,
+        'RISK_LEVEL': rng.choice(RISK_LEVELS, num_art_forms),
+        'PRACTITIONERS_COUNT': rng.integers(10, 50000, num_art_forms)
+    })
+
+
+def generate_site_art_forms(rng, site_ids, art_form_ids):
+    """Link every site with a few art forms."""
+    links = {(site_id, art_form_id)
+             for site_id in site_ids
+             for art_form_id in rng.choice(art_form_ids, min(3, len(art_form_ids)), replace=False)}
+    return pd.DataFrame(sorted(links), columns=['SITE_ID', 'ART_FORM_ID'])
+
+
+def generate_cultural_events(rng, num_events):
+    """Events spread over the coming year."""
+    start_dates = pd.Timestamp.today().normalize() + pd.to_timedelta(rng.integers(1, 365, num_events), unit='D')
+    types = rng.choice(EVENT_TYPES, num_events)
+    states = rng.choice(list(STATES), num_events)
+    return pd.DataFrame({
+        'NAME': [f"{state} {kind} {i + 1}" for i, (state, kind) in enumerate(zip(states, types))],
+        'DESCRIPTION': "Join us for this cultural event!",
+        'START_DATE': start_dates.date,
+        'END_DATE': (start_dates + pd.to_timedelta(rng.integers(1, 7, num_events), unit='D')).date,
+        'LOCATION': states,
+        'EVENT_TYPE': types,
+        'ORGANIZER': "Ministry of Culture"
+    })
+
+
+def load(backend, conn, df, table_name):
+    """Append a generated DataFrame and report the row count."""
+    success, nrows = backend.write_dataframe(conn, df, table_name)
+    print(f"Loaded {nrows:,} rows into {table_name}")
+
+
+def init_local_database(path, num_sites, days, num_interactions, num_art_forms, num_events, seed, reset):
+    """Create the local DuckDB database and fill it with generated data."""
+    if reset and os.path.exists(path):
+        os.remove(path)
+
+    backend = DuckDBBackend(path)
+    conn = backend.connect()
+    rng = np.random.default_rng(seed)
+    try:
+        create_schema(conn)
+        print(f"Database schema created in {path}")
+
+        load(backend, conn, generate_sites(rng, num_sites), 'HERITAGE_SITES')
+        cursor = conn.cursor()
+        cursor.execute("SELECT site_id FROM HERITAGE_SITES ORDER BY site_id")
+        site_ids = np.array([row[0] for row in cursor.fetchall()])
+
+        load(backend, conn, generate_visitor_stats(rng, site_ids, days), 'VISITOR_STATS')
+        load(backend, conn, generate_user_interactions(rng, site_ids, num_interactions, days), 'USER_INTERACTIONS')
+        load(backend, conn, generate_art_forms(rng, num_art_forms), 'ART_FORMS')
+
+        cursor.execute("SELECT art_form_id FROM ART_FORMS ORDER BY art_form_id")
+        art_form_ids = np.array([row[0] for row in cursor.fetchall()])
+        cursor.close()
+
+        load(backend, conn, generate_site_art_forms(rng, site_ids, art_form_ids), 'SITE_ART_FORMS')
+        load(backend, conn, generate_cultural_events(rng, num_events), 'CULTURAL_EVENTS')
+
+        rows = refresh_site_metrics(full=True, conn=conn)
+        print(f"Computed SITE_METRICS for {rows or 0:,} sites")
+        print("Local database initialization completed successfully!")
+    finally:
+        conn.close()
+        backend.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Create a local DuckDB database with production-like data volumes.")
+    parser.add_argument('--path', default=DATABASE_CONFIG['duckdb_path'], help="DuckDB file to create")
+    parser.add_argument('--sites', type=int, default=2000, help="number of heritage sites")
+    parser.add_argument('--days', type=int, default=730, help="days of daily visitor statistics per site")
+    parser.add_argument('--interactions', type=int, default=500000, help="number of user interactions")
+    parser.add_argument('--art-forms', type=int, default=300, help="number of art forms")
+    parser.add_argument('--events', type=int, default=1000, help="number of cultural events")
+    parser.add_argument('--seed', type=int, default=42, help="random seed")
+    parser.add_argument('--reset', action='store_true', help="delete an existing database file first")
+    args = parser.parse_args()
+
+    init_local_database(args.path, args.sites, args.days, args.interactions,
+                        args.art_forms, args.events, args.seed, args.reset)
+
+
+if __name__ == "__main__":
+    main()
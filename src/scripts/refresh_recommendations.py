@@ -0,0 +1,29 @@
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# Add the project root directory to the Python path
+project_root = str(Path(__file__).parent.parent.parent)
+sys.path.append(project_root)
+
+from src.services.collaborative_filtering import item_recommender
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rebuild the \"visitors also liked\" recommendations from USER_INTERACTIONS and save them for the app processes.")
+    parser.parse_args()
+
+    start = time.time()
+    try:
+        index = item_recommender.refresh()
+    except Exception as e:
+        print(f"Recommendation refresh failed: {e}")
+        sys.exit(1)
+    print(f"Rebuilt the recommendations of {len(index['site_positions']):,} sites from "
+          f"{index['interactions']:,} user-site interactions in {time.time() - start:.2f}s "
+          f"(saved to {item_recommender.path})")
+
+
+if __name__ == "__main__":
+    main()
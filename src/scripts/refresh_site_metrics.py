@@ -0,0 +1,27 @@
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# Add the project root directory to the Python path
+project_root = str(Path(__file__).parent.parent.parent)
+sys.path.append(project_root)
+
+from src.utils.site_metrics import refresh_site_metrics
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Refresh the SITE_METRICS table (SITE_METRICS_SOURCE=table).")
+    parser.add_argument('--full', action='store_true', help="recompute every site instead of only changed ones")
+    args = parser.parse_args()
+
+    start = time.time()
+    rows = refresh_site_metrics(full=args.full)
+    if rows is None:
+        print("Site metrics refresh failed")
+        sys.exit(1)
+    print(f"Refreshed SITE_METRICS for {rows:,} sites in {time.time() - start:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
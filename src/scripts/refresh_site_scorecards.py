@@ -0,0 +1,29 @@
+import argparse
+import sys
+import time
+from datetime import date
+from pathlib import Path
+
+# Add the project root directory to the Python path
+project_root = str(Path(__file__).parent.parent.parent)
+sys.path.append(project_root)
+
+from src.services.site_scorecards import refresh_site_scorecards
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compute every site's scorecard into SITE_SCORECARDS (run daily from a scheduler).")
+    parser.add_argument('--date', type=date.fromisoformat, default=None,
+                        help="assessment date to write, YYYY-MM-DD (default: today)")
+    args = parser.parse_args()
+
+    start = time.time()
+    rows = refresh_site_scorecards(args.date)
+    if rows is None:
+        print("Site scorecard refresh failed")
+        sys.exit(1)
+    print(f"Wrote {rows:,} site scorecards in {time.time() - start:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
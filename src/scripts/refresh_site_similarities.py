@@ -0,0 +1,28 @@
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# Add the project root directory to the Python path
+project_root = str(Path(__file__).parent.parent.parent)
+sys.path.append(project_root)
+
+from src.services.site_similarity import refresh_site_similarities
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Update the stored similar sites (SITE_SIMILARITIES) of added, edited and removed sites.")
+    parser.add_argument('--full', action='store_true',
+                        help="recompute the neighbours of every site")
+    args = parser.parse_args()
+
+    start = time.time()
+    sites = refresh_site_similarities(full=args.full)
+    if sites is None:
+        print("Site similarity refresh failed")
+        sys.exit(1)
+    print(f"Refreshed the similar sites of {sites:,} sites in {time.time() - start:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,17 +3,80 @@ import pandas as pd
 from datetime import datetime, timedelta
 from typing import Dict, List, Tuple, Optional
 import json
+from src.utils.database import fetch_dataframe
+from src.utils.schema_catalog import schema_catalog
+
+# Scoring weights and lookups shared by the per-site and the fleet-wide scoring
+HEALTH_WEIGHTS = {
+    'physical': 0.3,
+    'cultural': 0.3,
+    'tourism': 0.2,
+    'community': 0.2
+}
+POTENTIAL_WEIGHTS = {
+    'visitor': 0.25,
+    'significance': 0.25,
+    'infrastructure': 0.2,
+    'community': 0.15,
+    'preservation': 0.15
+}
+# Condition multiplier by risk level (unknown levels count as 1.0)
+RISK_MULTIPLIERS = {
+    'Low': 1.0,
+    'Medium': 0.8,
+    'High': 0.6
+}
+# Base risk by risk level (unknown levels count as 0.5)
+RISK_SCORES = {
+    'Low': 0.3,
+    'Medium': 0.6,
+    'High': 0.9
+}
+# Significance by heritage type (other types count as 0.6)
+HERITAGE_TYPE_SCORES = {
+    'Cultural': 0.9,
+    'Natural': 0.8,
+    'Mixed': 0.85,
+    'Historical': 0.75
+}
+
+class SiteAnalysisContext:
+    """Site data and visitor statistics of one site, loaded once and shared by every analysis"""
+
+    def __init__(self, site_id: int, site_data: Dict, visitor_stats: pd.DataFrame):
+        self.site_id = site_id
+        self.site_data = site_data
+        self.visitor_stats = visitor_stats
+
 
 class HeritageAIAnalysis:
     def __init__(self, db_connection):
         self.db = db_connection
 
-    def calculate_health_score(self, site_id: int) -> Dict:
+    def load_context(self, site_id: int) -> SiteAnalysisContext:
+        """
+        Load everything the analyses need for a site in one pass
+        """
+        return SiteAnalysisContext(site_id, self._get_site_data(site_id), self._get_visitor_stats(site_id))
+
+    def analyze_site(self, site_id: int) -> Dict:
+        """
+        Run all four analyses for a site from a single data load
+        """
+        context = self.load_context(site_id)
+        return {
+            'health': self.calculate_health_score(site_id, context),
+            'potential': self.calculate_tourism_potential(site_id, context),
+            'seasonality': self.analyze_seasonality(site_id, context),
+            'priorities': self.generate_preservation_priorities(site_id, context)
+        }
+
+    def calculate_health_score(self, site_id: int, context: Optional[SiteAnalysisContext] = None) -> Dict:
         """
         Calculate the Cultural Heritage Health Score for a site
         """
         # Get site data
-        site_data = self._get_site_data(site_id)
+        site_data = context.site_data if context else self._get_site_data(site_id)
 
         # Calculate individual scores
         physical_score = self._calculate_physical_condition(site_data)
@@ -22,12 +85,7 @@ class HeritageAIAnalysis:
         community_score = self._calculate_community_engagement(site_data)
 
         # Calculate overall score with weighted average
-        weights = {
-            'physical': 0.3,
-            'cultural': 0.3,
-            'tourism': 0.2,
-            'community': 0.2
-        }
+        weights = HEALTH_WEIGHTS
 
         overall_score = (
             physical_score * weights['physical'] +
@@ -45,12 +103,12 @@ class HeritageAIAnalysis:
             'assessment_date': datetime.now().date()
         }
 
-    def calculate_tourism_potential(self, site_id: int) -> Dict:
+    def calculate_tourism_potential(self, site_id: int, context: Optional[SiteAnalysisContext] = None) -> Dict:
         """
         Calculate the Tourism Potential Index for a site
         """
         # Get site data
-        site_data = self._get_site_data(site_id)
+        site_data = context.site_data if context else self._get_site_data(site_id)
 
         # Calculate individual scores
         visitor_score = self._calculate_visitor_potential(site_data)
@@ -60,13 +118,7 @@ class HeritageAIAnalysis:
         preservation_score = self._calculate_preservation_needs(site_data)
 
         # Calculate overall score with weighted average
-        weights = {
-            'visitor': 0.25,
-            'significance': 0.25,
-            'infrastructure': 0.2,
-            'community': 0.15,
-            'preservation': 0.15
-        }
+        weights = POTENTIAL_WEIGHTS
 
         overall_score = (
             visitor_score * weights['visitor'] +
@@ -86,12 +138,12 @@ class HeritageAIAnalysis:
             'assessment_date': datetime.now().date()
         }
 
-    def analyze_seasonality(self, site_id: int) -> Dict:
+    def analyze_seasonality(self, site_id: int, context: Optional[SiteAnalysisContext] = None) -> Dict:
         """
         Analyze tourism seasonality patterns for a site
         """
         # Get visitor statistics
-        visitor_stats = self._get_visitor_stats(site_id)
+        visitor_stats = context.visitor_stats.copy() if context else self._get_visitor_stats(site_id)
 
         # Calculate seasonal patterns
         seasonal_patterns = self._calculate_seasonal_patterns(visitor_stats)
@@ -108,12 +160,12 @@ class HeritageAIAnalysis:
             'revenue_opportunities': revenue_opportunities
         }
 
-    def generate_preservation_priorities(self, site_id: int) -> Dict:
+    def generate_preservation_priorities(self, site_id: int, context: Optional[SiteAnalysisContext] = None) -> Dict:
         """
         Generate preservation priorities for a site
         """
         # Get site data
-        site_data = self._get_site_data(site_id)
+        site_data = context.site_data if context else self._get_site_data(site_id)
 
         # Calculate risk assessment
         risk_score = self._calculate_risk_assessment(site_data)
@@ -130,43 +182,191 @@ class HeritageAIAnalysis:
             'implementation_timeline': timeline
         }
 
+    def score_all_sites(self) -> pd.DataFrame:
+        """
+        Score every site at once with column operations (same results as the per-site functions)
+        """
+        sites = self._get_all_sites_data()
+        if sites.empty:
+            return sites
+
+        health_index = sites['health_index'].astype(float).fillna(0)
+        risk_level = sites['risk_level'].astype(object)
+        heritage_type = sites['heritage_type'].astype(object)
+        unesco = sites['unesco_status'].astype(object).fillna(False).astype(bool)
+        review_count = sites['review_count'].astype(float).fillna(0)
+        avg_rating = sites['avg_rating'].astype(float).fillna(0)
+        visitor_count = sites['visitor_count'].astype(float).fillna(0)
+        avg_visitors = sites['avg_visitors'].astype(float).fillna(0)
+
+        risk_multiplier = risk_level.map(RISK_MULTIPLIERS).fillna(1.0).astype(float)
+        base_risk = risk_level.map(RISK_SCORES).fillna(0.5).astype(float)
+        unesco_score = np.where(unesco, 0.8, 0.5)
+        rating_score = avg_rating / 5
+
+        # Health score components
+        physical = np.minimum(1.0, health_index * risk_multiplier)
+        cultural = unesco_score * 0.5 + np.minimum(1.0, review_count / 100) * 0.25 + rating_score * 0.25
+        tourism = np.minimum(1.0, avg_visitors / 1000) * 0.7 + 0.5 * 0.3
+        community = np.minimum(1.0, review_count / 50) * 0.6 + rating_score * 0.4
+
+        # Tourism potential components
+        established_year = sites['established_year'].astype(float)
+        has_year = established_year.notna() & (established_year != 0)
+        age = datetime.now().year - np.trunc(established_year.fillna(0))
+        year_score = np.where(has_year, np.minimum(1.0, age / 1000), 0.5)
+        type_score = heritage_type.map(HERITAGE_TYPE_SCORES).fillna(0.6).astype(float)
+
+        visitor = np.minimum(1.0, visitor_count / 1000) * 0.5 + rating_score * 0.3 + np.minimum(1.0, review_count / 100) * 0.2
+        significance = unesco_score * 0.4 + type_score * 0.3 + year_score * 0.3
+        infrastructure = health_index * risk_multiplier
+        capacity = (np.minimum(1.0, review_count / 50) * 0.4 + rating_score * 0.4 +
+                    np.minimum(1.0, visitor_count / 500) * 0.2)
+        preservation = np.minimum(1.0, base_risk * 0.6 + (1 - health_index) * 0.4) * np.where(unesco, 1.2, 1.0)
+
+        # Preservation priorities
+        risk = np.minimum(1.0, base_risk * 0.7 + (1 - health_index) * 0.3)
+        base_priority = np.select([risk >= 0.8, risk >= 0.5], [1, 2], 3)
+
+        scores = sites[['site_id', 'name', 'location', 'state', 'heritage_type', 'risk_level',
+                        'unesco_status', 'health_index', 'visitor_count', 'avg_visitors',
+                        'review_count', 'avg_rating']].copy()
+        scores['physical_condition_score'] = physical
+        scores['cultural_significance_score'] = cultural
+        scores['tourism_impact_score'] = tourism
+        scores['community_engagement_score'] = community
+        scores['overall_health_score'] = (
+            physical * HEALTH_WEIGHTS['physical'] +
+            cultural * HEALTH_WEIGHTS['cultural'] +
+            tourism * HEALTH_WEIGHTS['tourism'] +
+            community * HEALTH_WEIGHTS['community']
+        )
+        scores['current_visitor_score'] = visitor
+        scores['site_significance_score'] = significance
+        scores['infrastructure_readiness'] = infrastructure
+        scores['community_capacity'] = capacity
+        scores['preservation_needs'] = preservation
+        scores['overall_potential_score'] = (
+            visitor * POTENTIAL_WEIGHTS['visitor'] +
+            significance * POTENTIAL_WEIGHTS['significance'] +
+            infrastructure * POTENTIAL_WEIGHTS['infrastructure'] +
+            capacity * POTENTIAL_WEIGHTS['community'] +
+            preservation * POTENTIAL_WEIGHTS['preservation']
+        )
+        scores['risk_assessment_score'] = risk
+        scores['resource_allocation_priority'] = np.maximum(1, base_priority - unesco.astype(int))
+        return scores
+
+    def analyze_seasonality_all_sites(self) -> Dict[int, Dict]:
+        """
+        Seasonality reports for every site from one load of the visitor statistics
+        """
+        if not schema_catalog.has_table('VISITOR_STATS'):
+            print("VISITOR_STATS table not found")
+            return {}
+
+        date_col = schema_catalog.find_column('VISITOR_STATS', ['VISIT_DATE', 'DATE', 'VISIT_TIME'])
+        count_col = schema_catalog.find_column('VISITOR_STATS', ['VISITOR_COUNT', 'COUNT', 'TOTAL_VISITORS'])
+        season_col = schema_catalog.find_column('VISITOR_STATS', ['SEASON', 'VISIT_SEASON'])
+        site_id_col = schema_catalog.find_column('VISITOR_STATS', ['SITE_ID', 'HERITAGE_ID'])
+        if not all([date_col, count_col, site_id_col]):
+            print("Missing required columns in VISITOR_STATS")
+            return {}
+
+        season_select = f'"{season_col}"' if season_col else 'NULL'
+        stats = fetch_dataframe(f"""
+            SELECT "{site_id_col}" as site_id, "{count_col}" as visitor_count, {season_select} as season
+            FROM "VISITOR_STATS"
+            ORDER BY "{site_id_col}", "{date_col}"
+        """)
+        if stats is None:
+            return {}
+        stats['visitor_count'] = pd.to_numeric(stats['visitor_count'], errors='coerce').fillna(0)
+
+        reports = {}
+        for site_id, visitor_stats in stats.groupby('site_id', sort=False):
+            seasonal_patterns = self._calculate_seasonal_patterns(visitor_stats[['visitor_count', 'season']].copy())
+            reports[int(site_id)] = {
+                'seasonal_patterns': seasonal_patterns,
+                'peak_seasons': self._identify_peak_seasons(seasonal_patterns),
+                'revenue_opportunities': self._calculate_revenue_opportunities(seasonal_patterns)
+            }
+        return reports
+
+    def _get_all_sites_data(self) -> pd.DataFrame:
+        """Helper method to load every site with its review and visitor aggregates in one query"""
+        id_column = schema_catalog.find_column('HERITAGE_SITES', ['ID', 'SITE_ID', 'HERITAGE_ID'])
+        if not id_column:
+            print("Could not find ID column in HERITAGE_SITES table")
+            return pd.DataFrame()
+
+        select_cols = [f'h."{id_column}" as site_id']
+        select_cols += [f'h."{col}"' for col in schema_catalog.columns('HERITAGE_SITES')
+                        if col.upper() != 'SITE_ID' and col != id_column]
+        joins = []
+
+        # Same aggregates as _get_site_data, computed for every site at once
+        ui_id_column = schema_catalog.find_column('USER_INTERACTIONS', ['ID', 'INTERACTION_ID'])
+        ui_site_id_column = schema_catalog.find_column('USER_INTERACTIONS', ['SITE_ID', 'HERITAGE_ID'])
+        ui_rating_column = schema_catalog.find_column('USER_INTERACTIONS', ['RATING', 'SCORE'])
+        if all([ui_id_column, ui_site_id_column, ui_rating_column]):
+            joins.append(f"""
+                LEFT JOIN (
+                    SELECT
+                        "{ui_site_id_column}" as site_id,
+                        COUNT(DISTINCT "{ui_id_column}") as review_count,
+                        AVG("{ui_rating_column}") as avg_rating
+                    FROM "USER_INTERACTIONS"
+                    GROUP BY "{ui_site_id_column}"
+                ) u ON u.site_id = h."{id_column}"
+            """)
+            select_cols += ['COALESCE(u.review_count, 0) as review_count', 'COALESCE(u.avg_rating, 0) as avg_rating']
+        else:
+            select_cols += ['0 as review_count', '0 as avg_rating']
+
+        vs_id_column = schema_catalog.find_column('VISITOR_STATS', ['ID', 'STAT_ID'])
+        vs_site_id_column = schema_catalog.find_column('VISITOR_STATS', ['SITE_ID', 'HERITAGE_ID'])
+        vs_count_column = schema_catalog.find_column('VISITOR_STATS', ['VISITOR_COUNT', 'COUNT', 'TOTAL_VISITORS'])
+        if all([vs_id_column, vs_site_id_column, vs_count_column]):
+            joins.append(f"""
+                LEFT JOIN (
+                    SELECT
+                        "{vs_site_id_column}" as site_id,
+                        COUNT(DISTINCT "{vs_id_column}") as visitor_count,
+                        AVG("{vs_count_column}") as avg_visitors
+                    FROM "VISITOR_STATS"
+                    GROUP BY "{vs_site_id_column}"
+                ) v ON v.site_id = h."{id_column}"
+            """)
+            select_cols += ['COALESCE(v.visitor_count, 0) as visitor_count', 'COALESCE(v.avg_visitors, 0) as avg_visitors']
+        else:
+            select_cols += ['0 as visitor_count', '0 as avg_visitors']
+
+        query = f"""
+            SELECT {', '.join(select_cols)}
+            FROM "HERITAGE_SITES" h
+            {''.join(joins)}
+        """
+        df = fetch_dataframe(query)
+        return df if df is not None else pd.DataFrame()
+
     def _get_site_data(self, site_id: int) -> Dict:
         """Helper method to get site data from database"""
         cursor = self.db.cursor()
         try:
-            # First, let's check what tables exist
-            cursor.execute("""
-                SELECT table_name
-                FROM information_schema.tables
-                WHERE table_schema = current_schema()
-            """)
-            tables = cursor.fetchall()
-            available_tables = [table[0].upper() for table in tables]
-            print("Available tables:", available_tables)
-
-            # Check if required tables exist
-            has_user_interactions = 'USER_INTERACTIONS' in available_tables
-            has_visitor_stats = 'VISITOR_STATS' in available_tables
+            # Check if required tables exist (from the cached schema catalog)
+            has_user_interactions = schema_catalog.has_table('USER_INTERACTIONS')
+            has_visitor_stats = schema_catalog.has_table('VISITOR_STATS')
 
             # Get the actual column names from HERITAGE_SITES
-            cursor.execute("""
-                SELECT column_name, data_type
-                FROM information_schema.columns
-                WHERE table_schema = current_schema()
-                AND table_name = 'HERITAGE_SITES'
-                ORDER BY ordinal_position
-            """)
-            columns = cursor.fetchall()
-            print("HERITAGE_SITES columns:", columns)
+            heritage_columns = schema_catalog.columns('HERITAGE_SITES')
 
-            if not columns:
+            if not heritage_columns:
                 print("No columns found in HERITAGE_SITES table")
                 return {}
 
-            heritage_columns = [col[0] for col in columns]
-
             # Find the ID column (it might be named differently)
-            id_column = next((col for col in heritage_columns if col.upper() in ['ID', 'SITE_ID', 'HERITAGE_ID']), None)
+            id_column = schema_catalog.find_column('HERITAGE_SITES', ['ID', 'SITE_ID', 'HERITAGE_ID'])
             if not id_column:
                 print("Could not find ID column in HERITAGE_SITES table")
                 return {}
@@ -198,21 +398,10 @@ class HeritageAIAnalysis:
 
             # Now get the additional metrics if tables exist
             if has_user_interactions:
-                # Get column names from USER_INTERACTIONS
-                cursor.execute("""
-                    SELECT column_name
-                    FROM information_schema.columns
-                    WHERE table_schema = current_schema()
-                    AND table_name = 'USER_INTERACTIONS'
-                    ORDER BY ordinal_position
-                """)
-                ui_columns = [col[0] for col in cursor.fetchall()]
-                print("USER_INTERACTIONS columns:", ui_columns)
-
                 # Find the ID and SITE_ID columns
-                ui_id_column = next((col for col in ui_columns if col.upper() in ['ID', 'INTERACTION_ID']), None)
-                ui_site_id_column = next((col for col in ui_columns if col.upper() in ['SITE_ID', 'HERITAGE_ID']), None)
-                ui_rating_column = next((col for col in ui_columns if col.upper() in ['RATING', 'SCORE']), None)
+                ui_id_column = schema_catalog.find_column('USER_INTERACTIONS', ['ID', 'INTERACTION_ID'])
+                ui_site_id_column = schema_catalog.find_column('USER_INTERACTIONS', ['SITE_ID', 'HERITAGE_ID'])
+                ui_rating_column = schema_catalog.find_column('USER_INTERACTIONS', ['RATING', 'SCORE'])
 
                 if all([ui_id_column, ui_site_id_column, ui_rating_column]):
                     ui_query = f"""
@@ -236,21 +425,10 @@ class HeritageAIAnalysis:
                 result['avg_rating'] = 0.0
 
             if has_visitor_stats:
-                # Get column names from VISITOR_STATS
-                cursor.execute("""
-                    SELECT column_name
-                    FROM information_schema.columns
-                    WHERE table_schema = current_schema()
-                    AND table_name = 'VISITOR_STATS'
-                    ORDER BY ordinal_position
-                """)
-                vs_columns = [col[0] for col in cursor.fetchall()]
-                print("VISITOR_STATS columns:", vs_columns)
-
                 # Find the ID and SITE_ID columns
-                vs_id_column = next((col for col in vs_columns if col.upper() in ['ID', 'STAT_ID']), None)
-                vs_site_id_column = next((col for col in vs_columns if col.upper() in ['SITE_ID', 'HERITAGE_ID']), None)
-                vs_count_column = next((col for col in vs_columns if col.upper() in ['VISITOR_COUNT', 'COUNT', 'TOTAL_VISITORS']), None)
+                vs_id_column = schema_catalog.find_column('VISITOR_STATS', ['ID', 'STAT_ID'])
+                vs_site_id_column = schema_catalog.find_column('VISITOR_STATS', ['SITE_ID', 'HERITAGE_ID'])
+                vs_count_column = schema_catalog.find_column('VISITOR_STATS', ['VISITOR_COUNT', 'COUNT', 'TOTAL_VISITORS'])
 
                 if all([vs_id_column, vs_site_id_column, vs_count_column]):
                     vs_query = f"""
@@ -283,33 +461,16 @@ class HeritageAIAnalysis:
         cursor = self.db.cursor()
         try:
             # First check if VISITOR_STATS table exists
-            cursor.execute("""
-                SELECT table_name
-                FROM information_schema.tables
-                WHERE table_schema = current_schema()
-                AND table_name = 'VISITOR_STATS'
-            """)
-            if not cursor.fetchone():
+            if not schema_catalog.has_table('VISITOR_STATS'):
                 print("VISITOR_STATS table not found")
                 return pd.DataFrame(columns=['visit_date', 'visitor_count', 'revenue', 'season'])
 
-            # Get column names from VISITOR_STATS
-            cursor.execute("""
-                SELECT column_name
-                FROM information_schema.columns
-                WHERE table_schema = current_schema()
-                AND table_name = 'VISITOR_STATS'
-                ORDER BY ordinal_position
-            """)
-            columns = [col[0] for col in cursor.fetchall()]
-            print("VISITOR_STATS columns:", columns)
-
             # Find required columns
-            date_col = next((col for col in columns if col.upper() in ['VISIT_DATE', 'DATE', 'VISIT_TIME']), None)
-            count_col = next((col for col in columns if col.upper() in ['VISITOR_COUNT', 'COUNT', 'TOTAL_VISITORS']), None)
-            revenue_col = next((col for col in columns if col.upper() in ['REVENUE', 'INCOME', 'TOTAL_REVENUE']), None)
-            season_col = next((col for col in columns if col.upper() in ['SEASON', 'VISIT_SEASON']), None)
-            site_id_col = next((col for col in columns if col.upper() in ['SITE_ID', 'HERITAGE_ID']), None)
+            date_col = schema_catalog.find_column('VISITOR_STATS', ['VISIT_DATE', 'DATE', 'VISIT_TIME'])
+            count_col = schema_catalog.find_column('VISITOR_STATS', ['VISITOR_COUNT', 'COUNT', 'TOTAL_VISITORS'])
+            revenue_col = schema_catalog.find_column('VISITOR_STATS', ['REVENUE', 'INCOME', 'TOTAL_REVENUE'])
+            season_col = schema_catalog.find_column('VISITOR_STATS', ['SEASON', 'VISIT_SEASON'])
+            site_id_col = schema_catalog.find_column('VISITOR_STATS', ['SITE_ID', 'HERITAGE_ID'])
 
             if not all([date_col, count_col, site_id_col]):
                 print("Missing required columns in VISITOR_STATS")
@@ -359,11 +520,7 @@ class HeritageAIAnalysis:
         base_score = float(site_data['health_index'] or 0)
 
         # Adjust based on risk_level
-        risk_multiplier = {
-            'Low': 1.0,
-            'Medium': 0.8,
-            'High': 0.6
-        }.get(site_data['risk_level'], 1.0)
+        risk_multiplier = RISK_MULTIPLIERS.get(site_data['risk_level'], 1.0)
 
         return min(1.0, float(base_score * risk_multiplier))
 
@@ -471,12 +628,7 @@ class HeritageAIAnalysis:
             return 0.0
 
         # Base risk from risk_level
-        risk_scores = {
-            'Low': 0.3,
-            'Medium': 0.6,
-            'High': 0.9
-        }
-        base_risk = risk_scores.get(site_data['risk_level'], 0.5)
+        base_risk = RISK_SCORES.get(site_data['risk_level'], 0.5)
 
         # Adjust based on health_index
         health_factor = 1 - float(site_data['health_index'] or 0)
@@ -555,12 +707,7 @@ class HeritageAIAnalysis:
         base_score = 0.8 if site_data['unesco_status'] else 0.5
 
         # Adjust based on heritage type
-        heritage_type_score = {
-            'Cultural': 0.9,
-            'Natural': 0.8,
-            'Mixed': 0.85,
-            'Historical': 0.75
-        }.get(site_data['heritage_type'], 0.6)
+        heritage_type_score = HERITAGE_TYPE_SCORES.get(site_data['heritage_type'], 0.6)
 
         # Adjust based on established year (older is more significant)
         year_score = 0.5  # Default if no year data
@@ -580,11 +727,7 @@ class HeritageAIAnalysis:
         base_score = float(site_data['health_index'] or 0)
 
         # Adjust based on risk level
-        risk_multiplier = {
-            'Low': 1.0,
-            'Medium': 0.8,
-            'High': 0.6
-        }.get(site_data['risk_level'], 1.0)
+        risk_multiplier = RISK_MULTIPLIERS.get(site_data['risk_level'], 1.0)
 
         return float(base_score * risk_multiplier)
 
@@ -610,12 +753,7 @@ class HeritageAIAnalysis:
             return 0.0
 
         # Base score from risk level
-        risk_scores = {
-            'Low': 0.3,
-            'Medium': 0.6,
-            'High': 0.9
-        }
-        base_score = risk_scores.get(site_data['risk_level'], 0.5)
+        base_score = RISK_SCORES.get(site_data['risk_level'], 0.5)
 
         # Adjust based on health index
         health_factor = 1 - float(site_data['health_index'] or 0)
@@ -2,12 +2,18 @@ import openai
 from typing import List, Dict, Optional
 import os
 from dotenv import load_dotenv
+from src.utils.config import HTTP_CLIENT_CONFIG
+from src.utils.http_client import http_client
 
 # Load environment variables
 load_dotenv()
 
 # Initialize OpenAI client
-client = openai.OpenAI(api_key=os.getenv('OPENAI_API_KEY'))
+client = openai.OpenAI(
+    api_key=os.getenv('OPENAI_API_KEY'),
+    timeout=HTTP_CLIENT_CONFIG['providers']['openai']['timeout'],
+    max_retries=HTTP_CLIENT_CONFIG['providers']['openai']['retries']
+)
 
 class AIService:
     def __init__(self):
@@ -31,47 +37,34 @@ class AIService:
         5. Be between 150-200 words
         """
 
-        response = client.chat.completions.create(
-            model=self.model,
-            messages=[{"role": "user", "content": prompt}],
-            temperature=0.7,
-            max_tokens=300
-        )
+        with http_client.track('openai'):
+            response = client.chat.completions.create(
+                model=self.model,
+                messages=[{"role": "user", "content": prompt}],
+                temperature=0.7,
+                max_tokens=300
+            )
 
         return response.choices[0].message.content
 
     def get_similar_sites(self, site_data: Dict, all_sites: List[Dict], top_n: int = 3) -> List[Dict]:
-        """Find similar heritage sites using GPT-4 for semantic understanding."""
-        prompt = f"""
-        Given the following heritage site:
-        Name: {site_data['name']}
-        Location: {site_data['location']}, {site_data['state']}
-        Type: {site_data['heritage_type']}
-        Description: {site_data['description']}
+        """Find the sites in all_sites most similar to a site, without an API call.
 
-        And these potential similar sites:
-        {[f"Name: {site['name']}, Type: {site['heritage_type']}, Location: {site['location']}" for site in all_sites]}
-
-        Return the indices of the top {top_n} most similar sites based on:
-        1. Cultural significance
-        2. Architectural style
-        3. Historical period
-        4. Geographic proximity
-        5. Visitor experience
-
-        Return only the indices as a comma-separated list.
+        Uses the neighbours precomputed in SITE_SIMILARITIES when they cover
+        enough of all_sites, otherwise ranks all_sites locally the same way.
         """
+        from src.services.site_similarity import get_similar_site_ids, rank_similar_sites
 
-        response = client.chat.completions.create(
-            model=self.model,
-            messages=[{"role": "user", "content": prompt}],
-            temperature=0.3,
-            max_tokens=50
-        )
+        candidates = [site for site in all_sites if site.get('site_id') is None
+                      or site.get('site_id') != site_data.get('site_id')]
+        if site_data.get('site_id') is not None:
+            by_id = {site.get('site_id'): site for site in candidates}
+            stored = get_similar_site_ids(site_data['site_id']) or []
+            similar = [by_id[site_id] for site_id in stored if site_id in by_id][:top_n]
+            if len(similar) >= min(top_n, len(candidates)):
+                return similar
 
-        # Parse the response to get indices
-        indices = [int(idx.strip()) for idx in response.choices[0].message.content.split(',')]
-        return [all_sites[idx] for idx in indices if idx < len(all_sites)]
+        return [candidates[position] for position in rank_similar_sites(site_data, candidates, top_n)]
 
     def analyze_review_sentiment(self, review: str) -> Dict:
         """Analyze the sentiment and extract key points from a review."""
@@ -86,12 +79,13 @@ class AIService:
         4. Suggested improvements (if any)
         """
 
-        response = client.chat.completions.create(
-            model=self.model,
-            messages=[{"role": "user", "content": prompt}],
-            temperature=0.3,
-            max_tokens=200
-        )
+        with http_client.track('openai'):
+            response = client.chat.completions.create(
+                model=self.model,
+                messages=[{"role": "user", "content": prompt}],
+                temperature=0.3,
+                max_tokens=200
+            )
 
         return response.choices[0].message.content
 
@@ -112,12 +106,13 @@ class AIService:
         5. Local tips
         """
 
-        response = client.chat.completions.create(
-            model=self.model,
-            messages=[{"role": "user", "content": prompt}],
-            temperature=0.7,
-            max_tokens=400
-        )
+        with http_client.track('openai'):
+            response = client.chat.completions.create(
+                model=self.model,
+                messages=[{"role": "user", "content": prompt}],
+                temperature=0.7,
+                max_tokens=400
+            )
 
         return response.choices[0].message.content
 
@@ -130,12 +125,13 @@ class AIService:
         Maintain the original tone and cultural context while ensuring natural language in the target language.
         """
 
-        response = client.chat.completions.create(
-            model=self.model,
-            messages=[{"role": "user", "content": prompt}],
-            temperature=0.3,
-            max_tokens=300
-        )
+        with http_client.track('openai'):
+            response = client.chat.completions.create(
+                model=self.model,
+                messages=[{"role": "user", "content": prompt}],
+                temperature=0.3,
+                max_tokens=300
+            )
 
         return response.choices[0].message.content
 
@@ -158,12 +154,13 @@ class AIService:
         Return the indices of recommended sites as a comma-separated list.
         """
 
-        response = client.chat.completions.create(
-            model=self.model,
-            messages=[{"role": "user", "content": prompt}],
-            temperature=0.5,
-            max_tokens=100
-        )
+        with http_client.track('openai'):
+            response = client.chat.completions.create(
+                model=self.model,
+                messages=[{"role": "user", "content": prompt}],
+                temperature=0.5,
+                max_tokens=100
+            )
 
         # Parse the response to get indices
         indices = [int(idx.strip()) for idx in response.choices[0].message.content.split(',')]
@@ -0,0 +1,277 @@
+import os
+import pickle
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+from src.utils.config import RECOMMENDER_CONFIG
+from src.utils.query_cache import query_cache
+
+
+def load_interaction_weights() -> pd.DataFrame:
+    """Summed interaction weight per (user_id, site_id) from USER_INTERACTIONS.
+
+    Interactions are grouped in SQL, so millions of rows arrive as one row
+    per user, site and interaction type. Each interaction counts its type's
+    weight, scaled by rating / 3 when it has a rating.
+    """
+    from src.utils.database import fetch_dataframe
+
+    df = fetch_dataframe("""
+        SELECT
+            user_id,
+            site_id,
+            interaction_type,
+            COUNT(*) AS interactions,
+            COUNT(rating) AS rated,
+            COALESCE(SUM(rating), 0) AS rating_sum
+        FROM USER_INTERACTIONS
+        WHERE user_id IS NOT NULL
+        GROUP BY user_id, site_id, interaction_type
+    """, ttl=0)
+    if df is None:
+        raise RuntimeError("could not read USER_INTERACTIONS")
+
+    type_weights = RECOMMENDER_CONFIG['interaction_weights']
+    weight = df['interaction_type'].astype(object).map(type_weights).fillna(RECOMMENDER_CONFIG['default_weight'])
+    df['weight'] = weight.astype(float) * (
+        (df['interactions'] - df['rated']).astype(float) + df['rating_sum'].astype(float) / 3.0)
+    return df.groupby(['user_id', 'site_id'], as_index=False)['weight'].sum()
+
+
+def build_user_site_matrix(weights: pd.DataFrame) -> Tuple[sparse.csr_matrix, np.ndarray, np.ndarray]:
+    """Users x sites CSR matrix of damped interaction weights, with the user and site ids of its rows and columns."""
+    weights = weights[weights['weight'] > 0]
+    user_codes, user_ids = pd.factorize(weights['user_id'].astype(str))
+    site_codes, site_ids = pd.factorize(weights['site_id'].astype('int64'))
+    # log1p keeps repeat visitors from dominating a site's vector
+    matrix = sparse.csr_matrix((np.log1p(weights['weight'].to_numpy(dtype=float)), (user_codes, site_codes)),
+                               shape=(len(user_ids), len(site_ids)))
+    return matrix, np.asarray(user_ids), np.asarray(site_ids, dtype='int64')
+
+
+def item_similarities(matrix: sparse.csr_matrix, top_k: int, block_size: int,
+                      shrinkage: float = 0.0) -> sparse.csr_matrix:
+    """Sites x sites cosine similarities of the matrix columns, keeping each site's top_k.
+
+    Columns are multiplied block_size sites at a time, so only a
+    sites x block_size slice is ever dense. With ``shrinkage`` a similarity
+    is scaled by co / (co + shrinkage), co being the number of users shared
+    by both sites, which damps pairs linked by a handful of users.
+    """
+    sites = matrix.shape[1]
+    norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=0)).ravel())
+    normalized = (matrix @ sparse.diags(np.divide(1.0, norms, out=np.zeros_like(norms), where=norms > 0))).tocsc()
+    binary = matrix.copy().tocsc()
+    binary.data[:] = 1.0
+    k = min(top_k, sites - 1)
+
+    rows, columns, values = [], [], []
+    for start in range(0, sites, block_size):
+        block = slice(start, min(start + block_size, sites))
+        similarities = (normalized[:, block].T @ normalized).toarray()
+        if shrinkage:
+            shared = (binary[:, block].T @ binary).toarray()
+            similarities *= shared / (shared + shrinkage)
+        similarities[np.arange(similarities.shape[0]), np.arange(block.start, block.stop)] = 0.0
+        if k <= 0:
+            continue
+        top = np.argpartition(-similarities, k - 1, axis=1)[:, :k]
+        top_values = np.take_along_axis(similarities, top, axis=1)
+        keep = top_values > 0
+        rows.append(np.repeat(np.arange(block.start, block.stop), k)[keep.ravel()])
+        columns.append(top[keep])
+        values.append(top_values[keep])
+
+    if not rows:
+        return sparse.csr_matrix((sites, sites))
+    return sparse.csr_matrix((np.concatenate(values), (np.concatenate(rows), np.concatenate(columns))),
+                             shape=(sites, sites))
+
+
+class ItemRecommender:
+    """In-memory item-item collaborative filtering over USER_INTERACTIONS.
+
+    Serves "visitors who liked this also liked" lists and per-user top-N
+    recommendations. The index is never built on a request: a process
+    starts from the index saved at ``path`` by refresh_recommendations.py
+    (or another process) and otherwise builds it in the background,
+    serving no recommendations until then. It is rebuilt in the background
+    when older than RECOMMENDER_CONFIG['refresh_interval'] or after
+    interactions are written through the app, while the previous index
+    keeps answering.
+    """
+
+    def __init__(self, path: str, refresh_interval: float, min_rebuild_interval: float):
+        self.path = path
+        self.refresh_interval = refresh_interval
+        self.min_rebuild_interval = min_rebuild_interval
+        self._index = None
+        self._built_at = 0.0
+        self._written_at = 0.0
+        self._stale = True
+        self._rebuilding = False
+        self._lock = threading.Lock()
+        self._stats = {'rebuilds': 0, 'loads': 0, 'last_rebuild_duration': None, 'lookups': 0}
+
+    # -- building ----------------------------------------------------------
+
+    def build(self) -> Dict:
+        """Read the interactions and compute the site neighbour matrix."""
+        built_at = time.time()
+        weights = load_interaction_weights()
+        matrix, user_ids, site_ids = build_user_site_matrix(weights)
+        similarities = item_similarities(matrix, RECOMMENDER_CONFIG['top_k'], RECOMMENDER_CONFIG['block_size'],
+                                         RECOMMENDER_CONFIG['shrinkage'])
+        return {
+            'matrix': matrix,
+            'similarities': similarities,
+            'site_ids': site_ids,
+            'site_positions': {int(site_id): position for position, site_id in enumerate(site_ids)},
+            'user_positions': {str(user_id): position for position, user_id in enumerate(user_ids)},
+            'interactions': int(len(weights)),
+            'built_at': built_at
+        }
+
+    def _load(self) -> Optional[Dict]:
+        """The saved index if it is newer than this process's and than its last interaction write."""
+        try:
+            with open(self.path, 'rb') as f:
+                index = pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            print(f"Error loading recommendations from {self.path}: {e}")
+            return None
+        with self._lock:
+            newest = max(self._built_at, self._written_at)
+        if index.get('built_at', 0.0) <= newest or time.time() - index['built_at'] >= self.refresh_interval:
+            return None
+        return index
+
+    def _save(self, index: Dict):
+        """Write the index to disk atomically for other processes and restarts."""
+        try:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            temp_path = f"{self.path}.{os.getpid()}.tmp"
+            with open(temp_path, 'wb') as f:
+                pickle.dump(index, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temp_path, self.path)
+        except Exception as e:
+            print(f"Error saving recommendations to {self.path}: {e}")
+
+    def _install(self, index: Dict):
+        with self._lock:
+            self._index = index
+            self._built_at = index['built_at']
+
+    def refresh(self) -> Dict:
+        """Build the index now, install it and save it; raises when the interactions could not be read."""
+        start = time.time()
+        index = self.build()
+        self._install(index)
+        self._save(index)
+        with self._lock:
+            self._stats['rebuilds'] += 1
+            self._stats['last_rebuild_duration'] = time.time() - start
+        return index
+
+    def _rebuild(self):
+        try:
+            index = self._load()
+            if index is not None:
+                self._install(index)
+                with self._lock:
+                    self._stats['loads'] += 1
+            else:
+                self.refresh()
+        except Exception as e:
+            print(f"Error building recommendations: {e}")
+            with self._lock:
+                self._stale = True
+        finally:
+            with self._lock:
+                self._rebuilding = False
+
+    def _current(self) -> Optional[Dict]:
+        """The index, None until the first background load or build finishes."""
+        with self._lock:
+            age = time.time() - self._built_at
+            if age >= self.refresh_interval:
+                self._stale = True
+            start = (self._stale and not self._rebuilding
+                     and (self._index is None or age >= self.min_rebuild_interval))
+            if start:
+                self._stale = False
+                self._rebuilding = True
+
+        if start:
+            threading.Thread(target=self._rebuild, name='recommender-rebuild', daemon=True).start()
+        with self._lock:
+            self._stats['lookups'] += 1
+            return self._index
+
+    def on_tables_written(self, tables: List[str]):
+        """Query cache write listener: rebuild after new interactions."""
+        written = {table.upper() for table in tables}
+        if '*' in written or 'USER_INTERACTIONS' in written:
+            with self._lock:
+                self._stale = True
+                self._written_at = time.time()
+
+    # -- serving -----------------------------------------------------------
+
+    def _top(self, index: Dict, scores: np.ndarray, limit: int, exclude) -> List[Tuple[int, float]]:
+        """Best ``limit`` (site_id, score) pairs of a score per site, skipping excluded positions."""
+        scores = scores.copy()
+        scores[list(exclude)] = 0.0
+        candidates = np.nonzero(scores > 0)[0]
+        if len(candidates) > limit:
+            candidates = candidates[np.argpartition(-scores[candidates], limit - 1)[:limit]]
+        ranked = sorted(candidates, key=lambda position: (-scores[position], index['site_ids'][position]))
+        return [(int(index['site_ids'][position]), float(scores[position])) for position in ranked]
+
+    def also_liked(self, site_id: int, limit: int = 5) -> List[Tuple[int, float]]:
+        """Sites most often liked by the visitors of a site, as (site_id, similarity)."""
+        index = self._current()
+        if index is None or int(site_id) not in index['site_positions']:
+            return []
+        position = index['site_positions'][int(site_id)]
+        scores = index['similarities'].getrow(position).toarray().ravel()
+        return self._top(index, scores, limit, [position])
+
+    def recommend_for_user(self, user_id: str, limit: int = 10) -> List[Tuple[int, float]]:
+        """Top sites for a user from the neighbours of the sites they interacted with, as (site_id, score).
+
+        Sites the user already interacted with are left out; unknown users
+        get no recommendations.
+        """
+        index = self._current()
+        if index is None or str(user_id) not in index['user_positions']:
+            return []
+        history = index['matrix'].getrow(index['user_positions'][str(user_id)])
+        scores = np.asarray((history @ index['similarities']).todense()).ravel()
+        return self._top(index, scores, limit, history.indices)
+
+    def stats(self) -> Dict:
+        """Matrix sizes and rebuild timings, for monitoring."""
+        with self._lock:
+            stats = dict(self._stats)
+            if self._index is not None:
+                stats['users'] = len(self._index['user_positions'])
+                stats['sites'] = len(self._index['site_positions'])
+                stats['interactions'] = self._index['interactions']
+                stats['neighbour_pairs'] = int(self._index['similarities'].nnz)
+        return stats
+
+
+# Shared recommender for the process
+item_recommender = ItemRecommender(RECOMMENDER_CONFIG['path'], RECOMMENDER_CONFIG['refresh_interval'],
+                                   RECOMMENDER_CONFIG['min_rebuild_interval'])
+query_cache.add_write_listener(item_recommender.on_tables_written)
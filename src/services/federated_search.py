@@ -0,0 +1,77 @@
+from typing import Dict, List, Optional
+
+from src.utils.config import FEDERATED_SEARCH_CONFIG, SEARCH_INDEX_CONFIG
+from src.utils.database import get_art_forms, get_cultural_events, get_heritage_sites
+from src.utils.query_executor import run_concurrently
+from src.utils.search_index import INDEXED_TABLES, search_index
+
+# Sources of an "All" search: result label and access function per search index document type
+SEARCH_SOURCES = {
+    'heritage_sites': {'label': 'Heritage Sites', 'fetch': get_heritage_sites},
+    'art_forms': {'label': 'Art Forms', 'fetch': get_art_forms},
+    'cultural_events': {'label': 'Cultural Events', 'fetch': get_cultural_events}
+}
+
+
+def _search_source(source: str, query: str) -> Dict:
+    """Matching rows of one source in relevance order, with their search index scores if available."""
+    ranked = search_index.search(source, query, SEARCH_INDEX_CONFIG['max_candidates'])
+    filters = {'search_query': query}
+    if ranked is not None:
+        # The fetch reuses these matches instead of searching the index again
+        filters['ranked_ids'] = [doc_id for doc_id, _ in ranked]
+    rows = SEARCH_SOURCES[source]['fetch'](filters)
+    return {
+        'rows': rows,
+        'scores': None if ranked is None else dict(ranked),
+        'matches': len(rows) if ranked is None else len(ranked)
+    }
+
+
+def _merge(found: Dict[str, Dict]) -> List[Dict]:
+    """One list of every source's rows, best first.
+
+    Search index (BM25) scores are compared directly when every source has
+    them; otherwise rows are interleaved by reciprocal rank.
+    """
+    use_scores = all(result['scores'] is not None for result in found.values())
+    merged = []
+    for source, result in found.items():
+        id_column = INDEXED_TABLES[source]['id']
+        for position, row in enumerate(result['rows']):
+            if use_scores:
+                relevance = result['scores'].get(row[id_column], 0.0)
+            else:
+                relevance = 1.0 / (FEDERATED_SEARCH_CONFIG['rank_constant'] + position + 1)
+            merged.append(dict(row, result_type=SEARCH_SOURCES[source]['label'], relevance=relevance))
+    merged.sort(key=lambda row: -row['relevance'])
+    return merged
+
+
+def federated_search(query: str, deadlines: Optional[Dict[str, float]] = None) -> Dict:
+    """Search heritage sites, art forms and cultural events at once for the "All" search.
+
+    The sources are queried in parallel, each within its deadline in seconds
+    (FEDERATED_SEARCH_CONFIG['deadlines'] by default). Returns:
+    - results: rows of every source in one relevance ranking, each with
+      'result_type' (the source label) and 'relevance'
+    - facets: {source: {'label', 'count'}} with each source's number of matches
+    - missing: labels of sources that failed or missed their deadline
+    - partial: whether any source is missing from the results
+    """
+    deadlines = {**FEDERATED_SEARCH_CONFIG['deadlines'], **(deadlines or {})}
+    outcomes = run_concurrently(
+        {source: (lambda source=source: _search_source(source, query)) for source in SEARCH_SOURCES},
+        timeouts=deadlines,
+        queue_timeout=FEDERATED_SEARCH_CONFIG['max_queue_wait']
+    )
+
+    found = {source: outcome for source, outcome in outcomes.items() if outcome is not None}
+    missing = [SEARCH_SOURCES[source]['label'] for source, outcome in outcomes.items() if outcome is None]
+    return {
+        'results': _merge(found),
+        'facets': {source: {'label': SEARCH_SOURCES[source]['label'], 'count': result['matches']}
+                   for source, result in found.items()},
+        'missing': missing,
+        'partial': bool(missing)
+    }
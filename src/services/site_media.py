@@ -0,0 +1,145 @@
+import hashlib
+import threading
+from typing import Dict, List, Optional
+
+import pandas as pd
+
+from src.utils.config import SITE_MEDIA_CONFIG
+from src.utils.database import fetch_dataframe, get_db_connection, invalidate_tables
+from src.utils.schema_catalog import schema_catalog
+from src.utils.unsplash import image_service, normalize_query
+
+# SITE_PHOTOS source of manifest rows; other photos of a site are never touched
+PHOTO_SOURCE = 'unsplash'
+MANIFEST_COLUMNS = ['photo_id', 'site_id', 'image_url', 'photographer', 'source', 'source_query',
+                    'photo_rank', 'capture_date']
+
+
+def photo_query(site_name: str) -> str:
+    """Unsplash search a site's manifest is made from."""
+    return normalize_query(f"{site_name} india")
+
+
+def _capture_date(created_at: Optional[str]):
+    """Unsplash 'created_at' as a naive UTC datetime, or None."""
+    if not created_at:
+        return None
+    try:
+        return pd.Timestamp(created_at).tz_convert('UTC').tz_localize(None).to_pydatetime()
+    except (ValueError, TypeError):
+        return None
+
+
+def load_site_photo_manifest(site_id: int) -> Optional[pd.DataFrame]:
+    """Manifest rows of a site in display order; None when SITE_PHOTOS is unavailable."""
+    if not schema_catalog.has_table('SITE_PHOTOS'):
+        return None
+    return fetch_dataframe("""
+        SELECT image_url, photographer, source_query, fetched_at
+        FROM SITE_PHOTOS
+        WHERE site_id = %s AND source = %s
+        ORDER BY photo_rank
+    """, [int(site_id), PHOTO_SOURCE], ttl=SITE_MEDIA_CONFIG['ttl'])
+
+
+def store_site_photo_manifest(site_id: int, query: str, photos: List[Dict]) -> bool:
+    """Replace a site's manifest rows with the given photos, in order."""
+    params = [(
+        photo.get('id') or hashlib.md5(photo['url'].encode('utf-8')).hexdigest(),
+        int(site_id),
+        photo['url'],
+        photo.get('author'),
+        PHOTO_SOURCE,
+        query,
+        rank,
+        _capture_date(photo.get('created_at'))
+    ) for rank, photo in enumerate(photos, start=1)]
+
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    try:
+        cursor.execute("BEGIN")
+        cursor.execute("DELETE FROM SITE_PHOTOS WHERE site_id = %s AND source = %s", [int(site_id), PHOTO_SOURCE])
+        if params:
+            cursor.executemany(
+                f"INSERT INTO SITE_PHOTOS ({', '.join(MANIFEST_COLUMNS)}, fetched_at) "
+                "VALUES (%s, %s, %s, %s, %s, %s, %s, %s, CURRENT_TIMESTAMP())",
+                params
+            )
+        cursor.execute("COMMIT")
+        return True
+    except Exception as e:
+        print(f"Error storing photos of site {site_id}: {e}")
+        try:
+            cursor.execute("ROLLBACK")
+        except Exception:
+            pass
+        return False
+    finally:
+        cursor.close()
+        conn.close()
+        invalidate_tables('SITE_PHOTOS')
+
+
+class _SiteMedia:
+    """Site photo manifests: one Unsplash search per site, shared by every gallery of the page.
+
+    A site without a manifest is searched once and stored. Manifests older
+    than SITE_MEDIA_CONFIG['max_age_days'], or made for a site's previous
+    name, keep being served while a background refresh replaces them.
+    """
+
+    def __init__(self):
+        self._refreshing = set()
+        self._lock = threading.Lock()
+
+    def refresh(self, site_id: int, site_name: str) -> List[Dict]:
+        """Search a site's photos and store them as its manifest."""
+        query = photo_query(site_name)
+        photos = image_service.photos(query, SITE_MEDIA_CONFIG['photos_per_site'])
+        if photos:
+            store_site_photo_manifest(site_id, query, photos)
+        return photos
+
+    def _refresh_in_background(self, site_id: int, site_name: str):
+        with self._lock:
+            if site_id in self._refreshing:
+                return
+            self._refreshing.add(site_id)
+
+        def run():
+            try:
+                self.refresh(site_id, site_name)
+            except Exception as e:
+                print(f"Error refreshing photos of site {site_id}: {e}")
+            finally:
+                with self._lock:
+                    self._refreshing.discard(site_id)
+
+        threading.Thread(target=run, name='site-photos-refresh', daemon=True).start()
+
+    def _stale(self, manifest: pd.DataFrame, site_name: str) -> bool:
+        if manifest['source_query'].iloc[0] != photo_query(site_name):
+            return True
+        fetched_at = pd.Timestamp(manifest['fetched_at'].min())
+        if pd.isna(fetched_at):
+            return True
+        if fetched_at.tzinfo is not None:
+            fetched_at = fetched_at.tz_convert('UTC').tz_localize(None)
+        return pd.Timestamp.utcnow().tz_localize(None) - fetched_at > pd.Timedelta(days=SITE_MEDIA_CONFIG['max_age_days'])
+
+    def photo_urls(self, site_id: int, site_name: str) -> List[str]:
+        """Image URLs of a site's photos in display order, from its manifest."""
+        manifest = load_site_photo_manifest(site_id)
+        if manifest is None:
+            # No SITE_PHOTOS table: search directly (still through the image cache)
+            return image_service.image_urls(photo_query(site_name), SITE_MEDIA_CONFIG['photos_per_site'])
+        if manifest.empty:
+            return [photo['url'] for photo in self.refresh(site_id, site_name)]
+        if self._stale(manifest, site_name):
+            self._refresh_in_background(int(site_id), site_name)
+        return [str(url) for url in manifest['image_url']]
+
+
+# Shared site photo manifests for the process
+site_media = _SiteMedia()
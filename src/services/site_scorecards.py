@@ -0,0 +1,180 @@
+import json
+from datetime import date, timedelta
+from typing import Dict, Optional
+
+import pandas as pd
+
+from src.services.ai_analysis import HeritageAIAnalysis
+from src.utils.config import SCORECARD_CONFIG
+from src.utils.database import fetch_dataframe, get_db_connection, invalidate_tables
+from src.utils.schema_catalog import schema_catalog
+
+SCORE_COLUMNS = [
+    'physical_condition_score', 'cultural_significance_score', 'tourism_impact_score',
+    'community_engagement_score', 'overall_health_score', 'current_visitor_score',
+    'site_significance_score', 'infrastructure_readiness', 'community_capacity',
+    'preservation_needs', 'overall_potential_score', 'risk_assessment_score'
+]
+JSON_COLUMNS = ['seasonal_patterns', 'peak_seasons', 'revenue_opportunities', 'implementation_timeline']
+SCORECARD_COLUMNS = ['site_id', 'assessment_date'] + SCORE_COLUMNS + JSON_COLUMNS + ['resource_allocation_priority']
+
+# Report keys per section, as returned by HeritageAIAnalysis.analyze_site
+_HEALTH_KEYS = ['physical_condition_score', 'cultural_significance_score', 'tourism_impact_score',
+                'community_engagement_score', 'overall_health_score']
+_POTENTIAL_KEYS = ['current_visitor_score', 'site_significance_score', 'infrastructure_readiness',
+                   'community_capacity', 'preservation_needs', 'overall_potential_score']
+
+
+def compute_site_scorecards(assessment_date: Optional[date] = None) -> pd.DataFrame:
+    """Score every site with the HeritageAIAnalysis logic, one row per site in SCORECARD_COLUMNS order."""
+    assessment_date = assessment_date or date.today()
+    conn = get_db_connection()
+    try:
+        analysis = HeritageAIAnalysis(conn)
+        scores = analysis.score_all_sites()
+        if scores.empty:
+            return pd.DataFrame(columns=SCORECARD_COLUMNS)
+        seasonality = analysis.analyze_seasonality_all_sites()
+    finally:
+        conn.close()
+
+    rows = []
+    for site in scores.to_dict('records'):
+        site_id = int(site['site_id'])
+        report = seasonality.get(site_id) or {
+            'seasonal_patterns': {},
+            'peak_seasons': analysis._identify_peak_seasons({}),
+            'revenue_opportunities': analysis._calculate_revenue_opportunities({})
+        }
+        row = {'site_id': site_id, 'assessment_date': assessment_date}
+        row.update({column: float(site[column]) for column in SCORE_COLUMNS})
+        row.update(report)
+        row['implementation_timeline'] = analysis._generate_implementation_timeline(
+            row['risk_assessment_score'], site)
+        row['resource_allocation_priority'] = int(site['resource_allocation_priority'])
+        rows.append(row)
+    return pd.DataFrame(rows, columns=SCORECARD_COLUMNS)
+
+
+def refresh_site_scorecards(assessment_date: Optional[date] = None) -> Optional[int]:
+    """Compute every site's scorecard and store it in SITE_SCORECARDS.
+
+    Rows of the same assessment date are replaced in one transaction, so the
+    job can be re-run safely. Returns the number of rows written, or None on
+    failure.
+    """
+    assessment_date = assessment_date or date.today()
+    scorecards = compute_site_scorecards(assessment_date)
+    if scorecards.empty:
+        print("No heritage sites to score")
+        return 0
+
+    for column in JSON_COLUMNS:
+        scorecards[column] = scorecards[column].map(json.dumps)
+    columns = ', '.join(SCORECARD_COLUMNS)
+    placeholders = ', '.join(['%s'] * len(SCORECARD_COLUMNS))
+    params = [tuple(row) for row in scorecards.astype(object).itertuples(index=False)]
+
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    try:
+        cursor.execute("BEGIN")
+        cursor.execute("DELETE FROM SITE_SCORECARDS WHERE assessment_date = %s", [assessment_date])
+        cursor.executemany(
+            f"INSERT INTO SITE_SCORECARDS ({columns}, computed_at) "
+            f"VALUES ({placeholders}, CURRENT_TIMESTAMP())",
+            params
+        )
+        cursor.execute("COMMIT")
+        return len(params)
+    except Exception as e:
+        print(f"Error refreshing site scorecards: {e}")
+        try:
+            cursor.execute("ROLLBACK")
+        except Exception:
+            pass
+        return None
+    finally:
+        cursor.close()
+        conn.close()
+        invalidate_tables('SITE_SCORECARDS')
+
+
+def _to_report(row: Dict) -> Dict:
+    """Scorecard row as the analyze_site report of health, potential, seasonality and priorities."""
+    row = dict(row)
+    for column in JSON_COLUMNS:
+        row[column] = json.loads(row[column]) if row[column] else None
+    row['resource_allocation_priority'] = int(row['resource_allocation_priority'])
+
+    health = {key: float(row[key]) for key in _HEALTH_KEYS}
+    potential = {key: float(row[key]) for key in _POTENTIAL_KEYS}
+    health['assessment_date'] = potential['assessment_date'] = row['assessment_date']
+    return {
+        'health': health,
+        'potential': potential,
+        'seasonality': {
+            'seasonal_patterns': row['seasonal_patterns'] or {},
+            'peak_seasons': row['peak_seasons'] or [],
+            'revenue_opportunities': row['revenue_opportunities'] or []
+        },
+        'priorities': {
+            'risk_assessment_score': float(row['risk_assessment_score']),
+            'resource_allocation_priority': row['resource_allocation_priority'],
+            'implementation_timeline': row['implementation_timeline'] or []
+        }
+    }
+
+
+def get_latest_scorecard(site_id: int) -> Optional[Dict]:
+    """Latest stored scorecard of a site as an analyze_site report, or None if missing or stale.
+
+    A scorecard is stale when its assessment date is more than
+    SCORECARD_CONFIG['max_age_days'] days old.
+    """
+    if not schema_catalog.has_table('SITE_SCORECARDS'):
+        return None
+    df = fetch_dataframe(f"""
+        SELECT {', '.join(SCORECARD_COLUMNS)}
+        FROM SITE_SCORECARDS
+        WHERE site_id = %s
+        ORDER BY assessment_date DESC
+        LIMIT 1
+    """, [int(site_id)], ttl=SCORECARD_CONFIG['ttl'])
+    if df is None or df.empty:
+        return None
+
+    row = df.iloc[0].to_dict()
+    assessment_date = pd.Timestamp(row['assessment_date']).date()
+    if assessment_date < date.today() - timedelta(days=SCORECARD_CONFIG['max_age_days']):
+        return None
+    row['assessment_date'] = assessment_date
+    return _to_report(row)
+
+
+def get_site_report(site_id: int, analysis: HeritageAIAnalysis) -> Dict:
+    """Site insights report from the latest scorecard, computed live when it is missing or stale."""
+    report = get_latest_scorecard(site_id)
+    if report is not None:
+        report['source'] = 'scorecard'
+        return report
+    report = analysis.analyze_site(site_id)
+    report['source'] = 'live'
+    return report
+
+
+def get_scorecard_history(site_id: int, days: Optional[int] = None) -> pd.DataFrame:
+    """Overall health, potential and risk scores of a site per assessment date, oldest first."""
+    days = SCORECARD_CONFIG['history_days'] if days is None else days
+    df = None
+    if schema_catalog.has_table('SITE_SCORECARDS'):
+        df = fetch_dataframe("""
+            SELECT assessment_date, overall_health_score, overall_potential_score, risk_assessment_score
+            FROM SITE_SCORECARDS
+            WHERE site_id = %s AND assessment_date >= %s
+            ORDER BY assessment_date
+        """, [int(site_id), date.today() - timedelta(days=days)], ttl=SCORECARD_CONFIG['ttl'])
+    if df is None:
+        return pd.DataFrame(columns=['assessment_date', 'overall_health_score',
+                                     'overall_potential_score', 'risk_assessment_score'])
+    return df
@@ -0,0 +1,394 @@
+import hashlib
+import threading
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+from src.utils.config import SIMILARITY_CONFIG
+from src.utils.database import fetch_dataframe, get_db_connection, invalidate_tables
+from src.utils.query_cache import query_cache
+from src.utils.schema_catalog import schema_catalog
+
+SITE_COLUMNS = ['site_id', 'name', 'description', 'heritage_type', 'state', 'latitude', 'longitude']
+SIMILARITY_COLUMNS = ['site_id', 'similar_site_id', 'similarity_rank', 'similarity_score', 'content_hash']
+
+# Tables whose changes can move a site's neighbours
+SOURCE_TABLES = {'HERITAGE_SITES', 'SITE_ART_FORMS'}
+
+EARTH_RADIUS_KM = 6371.0
+
+
+def load_sites() -> pd.DataFrame:
+    """Every heritage site with the columns its similarity is computed from, by site id."""
+    df = fetch_dataframe(f"SELECT {', '.join(SITE_COLUMNS)} FROM HERITAGE_SITES ORDER BY site_id", ttl=0)
+    if df is None:
+        raise RuntimeError("could not read HERITAGE_SITES")
+    return df
+
+
+def load_site_art_forms() -> pd.DataFrame:
+    """Every (site_id, art_form_id) link."""
+    df = fetch_dataframe("SELECT site_id, art_form_id FROM SITE_ART_FORMS", ttl=0)
+    if df is None:
+        raise RuntimeError("could not read SITE_ART_FORMS")
+    return df
+
+
+def site_hashes(sites: pd.DataFrame, links: Optional[pd.DataFrame] = None) -> Dict[int, str]:
+    """Hash of everything a site's similarity depends on, by site id."""
+    art_forms = {}
+    if links is not None:
+        for site_id, art_form_id in zip(links['site_id'], links['art_form_id']):
+            art_forms.setdefault(int(site_id), []).append(int(art_form_id))
+
+    hashes = {}
+    for row in sites.astype(object).itertuples(index=False):
+        site = row._asdict()
+        site_id = int(site['site_id'])
+        content = repr([site[column] for column in SITE_COLUMNS[1:]] + sorted(art_forms.get(site_id, [])))
+        hashes[site_id] = hashlib.md5(content.encode('utf-8')).hexdigest()
+    return hashes
+
+
+def _codes(values: pd.Series) -> np.ndarray:
+    """Integer code per value, -1 for missing ones, so equal values compare equal."""
+    codes, _ = pd.factorize(values.astype(object).where(values.notna(), None))
+    return codes
+
+
+def _tfidf(vectorizer: TfidfVectorizer, texts: pd.Series) -> sparse.csr_matrix:
+    """TF-IDF vectors of the texts; no columns when they hold no usable terms."""
+    try:
+        return vectorizer.fit_transform(texts)
+    except ValueError:
+        return sparse.csr_matrix((len(texts), 0))
+
+
+def build_features(sites: pd.DataFrame, links: Optional[pd.DataFrame] = None) -> Dict:
+    """Text vectors, category codes, coordinates and art forms of the sites, in row order.
+
+    Texts are TF-IDF weighted words and character n-grams of the name, type
+    and description, L2-normalized so a dot product is their cosine
+    similarity; the character n-grams tolerate spelling variants.
+    """
+    texts = (sites[['name', 'heritage_type', 'description']].astype(object).fillna('').astype(str)
+             .agg(' '.join, axis=1).str.lower())
+    words = TfidfVectorizer(analyzer='word', ngram_range=(1, 2), stop_words='english', sublinear_tf=True)
+    chars = TfidfVectorizer(analyzer='char_wb', ngram_range=(3, 5), sublinear_tf=True, max_features=50000)
+    # Equal halves of two unit vectors keep the combined vector at unit length
+    text = sparse.hstack([_tfidf(words, texts), _tfidf(chars, texts)]).tocsr() * np.sqrt(0.5)
+
+    ids = sites['site_id'].astype('int64').to_numpy()
+    # Site x art form incidence matrix
+    art_forms = sparse.csr_matrix((len(ids), 0))
+    if links is not None and len(links):
+        position = {site_id: row for row, site_id in enumerate(ids)}
+        pairs = [(position[int(site_id)], int(art_form_id))
+                 for site_id, art_form_id in zip(links['site_id'], links['art_form_id'])
+                 if int(site_id) in position]
+        if pairs:
+            rows, art_form_ids = zip(*pairs)
+            columns, _ = pd.factorize(pd.Series(art_form_ids))
+            art_forms = sparse.csr_matrix((np.ones(len(rows)), (rows, columns)), shape=(len(ids), columns.max() + 1))
+            art_forms.data[:] = 1.0  # duplicate links count once
+
+    return {
+        'ids': ids,
+        'text': text,
+        'heritage_type': _codes(sites['heritage_type']),
+        'state': _codes(sites['state']),
+        'latitude': np.radians(pd.to_numeric(sites['latitude'], errors='coerce').to_numpy(dtype=float)),
+        'longitude': np.radians(pd.to_numeric(sites['longitude'], errors='coerce').to_numpy(dtype=float)),
+        'art_forms': art_forms,
+        'art_form_counts': np.asarray(art_forms.sum(axis=1)).ravel()
+    }
+
+
+def _same(codes: np.ndarray, rows: np.ndarray) -> np.ndarray:
+    """1.0 where a row's value equals a column's value and both are present."""
+    return ((codes[rows, None] == codes[None, :]) & (codes[rows, None] >= 0)).astype(float)
+
+
+def score_rows(features: Dict, rows: np.ndarray) -> np.ndarray:
+    """Similarity of the given sites (rows) to every site (columns), from 0 to 1.
+
+    A weighted blend of text cosine similarity, same heritage type, same
+    state, geographic proximity and the Jaccard overlap of the art forms
+    practised at both sites; a site's score against itself is -inf.
+    """
+    weights = SIMILARITY_CONFIG['weights']
+    scores = weights['text'] * (features['text'][rows] @ features['text'].T).toarray()
+    scores += weights['heritage_type'] * _same(features['heritage_type'], rows)
+    scores += weights['state'] * _same(features['state'], rows)
+
+    # Haversine distance; sites without coordinates get no proximity score
+    lat, lon = features['latitude'], features['longitude']
+    a = (np.sin((lat[None, :] - lat[rows, None]) / 2) ** 2
+         + np.cos(lat[rows, None]) * np.cos(lat[None, :]) * np.sin((lon[None, :] - lon[rows, None]) / 2) ** 2)
+    distance = 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0, 1)))
+    scores += weights['distance'] * np.nan_to_num(np.exp(-distance / SIMILARITY_CONFIG['distance_scale_km']))
+
+    shared = (features['art_forms'][rows] @ features['art_forms'].T).toarray()
+    counts = features['art_form_counts']
+    union = counts[rows, None] + counts[None, :] - shared
+    scores += weights['art_forms'] * np.divide(shared, union, out=np.zeros_like(shared), where=union > 0)
+
+    scores[np.arange(len(rows)), rows] = -np.inf
+    return scores
+
+
+def top_neighbours(scores: np.ndarray, k: int):
+    """Column positions and scores of the k best columns of every row, best first."""
+    k = min(k, scores.shape[1] - 1)
+    if k <= 0:
+        empty = np.empty((scores.shape[0], 0))
+        return empty.astype(int), empty
+    top = np.sort(np.argpartition(-scores, k - 1, axis=1)[:, :k], axis=1)
+    top_scores = np.take_along_axis(scores, top, axis=1)
+    # Stable sort keeps ties in site id order
+    order = np.argsort(-top_scores, axis=1, kind='stable')
+    return np.take_along_axis(top, order, axis=1), np.take_along_axis(top_scores, order, axis=1)
+
+
+def _neighbour_rows(features: Dict, positions: np.ndarray, top_k: int) -> pd.DataFrame:
+    """SITE_SIMILARITIES rows (without content_hash) of the sites at the given positions.
+
+    Sites are scored against the whole catalog SIMILARITY_CONFIG['block_size']
+    at a time, so memory stays bounded for large catalogs.
+    """
+    ids = features['ids']
+    frames = [pd.DataFrame(columns=SIMILARITY_COLUMNS[:-1])]
+    block_size = SIMILARITY_CONFIG['block_size']
+    for start in range(0, len(positions), block_size):
+        rows = positions[start:start + block_size]
+        neighbours, scores = top_neighbours(score_rows(features, rows), top_k)
+        frames.append(pd.DataFrame({
+            'site_id': np.repeat(ids[rows], neighbours.shape[1]),
+            'similar_site_id': ids[neighbours.ravel()],
+            'similarity_rank': np.tile(np.arange(1, neighbours.shape[1] + 1), len(rows)),
+            'similarity_score': scores.ravel().round(6)
+        }))
+    return pd.concat(frames, ignore_index=True)
+
+
+def compute_site_similarities(sites: Optional[pd.DataFrame] = None, links: Optional[pd.DataFrame] = None,
+                              top_k: Optional[int] = None) -> pd.DataFrame:
+    """The top_k most similar sites of every site, one row per pair in SIMILARITY_COLUMNS order."""
+    if sites is None:
+        sites, links = load_sites(), load_site_art_forms()
+    top_k = top_k or SIMILARITY_CONFIG['top_k']
+    if len(sites) < 2:
+        return pd.DataFrame(columns=SIMILARITY_COLUMNS)
+
+    features = build_features(sites, links)
+    similarities = _neighbour_rows(features, np.arange(len(sites)), top_k)
+    similarities['content_hash'] = similarities['site_id'].map(site_hashes(sites, links))
+    return similarities
+
+
+def _stored_neighbours() -> Optional[pd.DataFrame]:
+    """Every stored neighbour row, or None if the table cannot be read."""
+    return fetch_dataframe("""
+        SELECT site_id, similar_site_id, similarity_score, content_hash
+        FROM SITE_SIMILARITIES
+    """, ttl=0)
+
+
+def _sites_to_refresh(features: Dict, hashes: Dict[int, str], stored: pd.DataFrame, top_k: int):
+    """Ids of the sites whose neighbour lists are out of date, and of removed sites.
+
+    That is every added or edited site, every site listing one of those or a
+    removed site among its neighbours, and every site an edited site now
+    scores above its weakest stored neighbour.
+    """
+    stored_hashes = stored.groupby('site_id')['content_hash'].first().to_dict()
+    changed = {site_id for site_id, content_hash in hashes.items() if stored_hashes.get(site_id) != content_hash}
+    removed = set(stored_hashes) - set(hashes)
+    if not changed and not removed:
+        return set(), removed
+
+    refresh = set(changed)
+    refresh |= set(stored.loc[stored['similar_site_id'].isin(changed | removed), 'site_id'].astype(int))
+
+    # Weakest stored score per site; sites with a short list take any newcomer
+    weakest = stored.groupby('site_id')['similarity_score'].agg(['min', 'count'])
+    threshold = np.full(len(features['ids']), -np.inf)
+    for row, site_id in enumerate(features['ids']):
+        if site_id in weakest.index and weakest.at[site_id, 'count'] >= top_k:
+            threshold[row] = weakest.at[site_id, 'min']
+
+    position = {site_id: row for row, site_id in enumerate(features['ids'])}
+    changed_rows = np.array(sorted(position[site_id] for site_id in changed), dtype=int)
+    block_size = SIMILARITY_CONFIG['block_size']
+    for start in range(0, len(changed_rows), block_size):
+        # Scores are symmetric, so a changed site's row is its score in every other site's list
+        scores = score_rows(features, changed_rows[start:start + block_size])
+        refresh |= {int(features['ids'][column]) for column in np.nonzero((scores > threshold).any(axis=0))[0]}
+    return refresh - removed, removed
+
+
+def refresh_site_similarities(full: bool = False) -> Optional[int]:
+    """Bring SITE_SIMILARITIES up to date and return the number of sites whose lists were rewritten.
+
+    By default only added, edited and removed sites and the neighbour lists
+    they affect are recomputed, found by comparing each site's content hash
+    with the stored one. ``full`` recomputes every site, which also picks up
+    the small drift in text weights as the catalog grows. Returns None on
+    failure.
+    """
+    top_k = SIMILARITY_CONFIG['top_k']
+    sites, links = load_sites(), load_site_art_forms()
+    hashes = site_hashes(sites, links)
+
+    stored = None if full else _stored_neighbours()
+    if stored is None or stored.empty or len(sites) < 2:
+        refresh, removed = set(hashes), set()
+        similarities = compute_site_similarities(sites, links, top_k)
+        full = True
+    else:
+        features = build_features(sites, links)
+        refresh, removed = _sites_to_refresh(features, hashes, stored, top_k)
+        if not refresh and not removed:
+            return 0
+        positions = np.array([row for row, site_id in enumerate(features['ids']) if site_id in refresh], dtype=int)
+        similarities = _neighbour_rows(features, positions, top_k)
+        similarities['content_hash'] = similarities['site_id'].map(hashes)
+    params = [tuple(row) for row in similarities.astype(object).itertuples(index=False)]
+
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    try:
+        cursor.execute("BEGIN")
+        if full:
+            cursor.execute("DELETE FROM SITE_SIMILARITIES")
+        else:
+            stale = sorted(refresh | removed)
+            for start in range(0, len(stale), 1000):
+                chunk = stale[start:start + 1000]
+                cursor.execute(
+                    f"DELETE FROM SITE_SIMILARITIES WHERE site_id IN ({', '.join(['%s'] * len(chunk))})",
+                    chunk
+                )
+        if params:
+            cursor.executemany(
+                f"INSERT INTO SITE_SIMILARITIES ({', '.join(SIMILARITY_COLUMNS)}, computed_at) "
+                "VALUES (%s, %s, %s, %s, %s, CURRENT_TIMESTAMP())",
+                params
+            )
+        cursor.execute("COMMIT")
+        return len(refresh)
+    except Exception as e:
+        print(f"Error refreshing site similarities: {e}")
+        try:
+            cursor.execute("ROLLBACK")
+        except Exception:
+            pass
+        return None
+    finally:
+        cursor.close()
+        conn.close()
+        invalidate_tables('SITE_SIMILARITIES')
+
+
+def get_similar_site_ids(site_id: int, top_n: Optional[int] = None) -> Optional[List[int]]:
+    """Stored neighbours of a site, most similar first, or None if none are stored."""
+    if not schema_catalog.has_table('SITE_SIMILARITIES'):
+        return None
+    df = fetch_dataframe("""
+        SELECT similar_site_id
+        FROM SITE_SIMILARITIES
+        WHERE site_id = %s
+        ORDER BY similarity_rank
+    """, [int(site_id)], ttl=SIMILARITY_CONFIG['ttl'])
+    if df is None or df.empty:
+        return None
+    ids = [int(similar_id) for similar_id in df['similar_site_id']]
+    return ids[:top_n] if top_n else ids
+
+
+def rank_similar_sites(site: Dict, candidates: List[Dict], top_n: int) -> List[int]:
+    """Positions in ``candidates`` of the top_n sites most similar to ``site``, computed locally."""
+    if not candidates:
+        return []
+    frame = pd.DataFrame([site] + list(candidates)).reindex(columns=SITE_COLUMNS)
+    frame['site_id'] = np.arange(len(frame))
+    positions, _ = top_neighbours(score_rows(build_features(frame), np.array([0])), top_n)
+    return [int(position) - 1 for position in positions[0]]
+
+
+class _RelatedSites:
+    """Related-site lookups with live scoring for sites without stored neighbours.
+
+    Writes to HERITAGE_SITES or SITE_ART_FORMS made through the app drop the
+    live features and, with SIMILARITY_CONFIG['refresh_on_write'], start an
+    incremental refresh of SITE_SIMILARITIES in the background.
+    """
+
+    def __init__(self):
+        self._features = None
+        self._refreshing = False
+        self._refresh_again = False
+        self._lock = threading.Lock()
+
+    def _live_features(self) -> Optional[Dict]:
+        with self._lock:
+            features = self._features
+        if features is None:
+            try:
+                features = build_features(load_sites(), load_site_art_forms())
+            except Exception as e:
+                print(f"Error building site similarity features: {e}")
+                return None
+            with self._lock:
+                self._features = features
+        return features
+
+    def related_site_ids(self, site_id: int, top_n: int) -> List[int]:
+        """Ids of the top_n sites most related to a site, stored or scored live."""
+        stored = get_similar_site_ids(site_id, top_n)
+        if stored:
+            return stored
+        features = self._live_features()
+        if features is None:
+            return []
+        rows = np.nonzero(features['ids'] == int(site_id))[0]
+        if not len(rows):
+            return []
+        positions, _ = top_neighbours(score_rows(features, rows), top_n)
+        return [int(features['ids'][position]) for position in positions[0]]
+
+    def _refresh(self):
+        while True:
+            try:
+                refresh_site_similarities()
+            except Exception as e:
+                print(f"Error refreshing site similarities: {e}")
+            with self._lock:
+                if not self._refresh_again:
+                    self._refreshing = False
+                    return
+                self._refresh_again = False
+
+    def on_tables_written(self, tables: List[str]):
+        """Query cache write listener: drop live features and refresh changed neighbour lists."""
+        written = {table.upper() for table in tables}
+        if '*' not in written and not written & SOURCE_TABLES:
+            return
+        with self._lock:
+            self._features = None
+        if not SIMILARITY_CONFIG['refresh_on_write'] or not schema_catalog.has_table('SITE_SIMILARITIES'):
+            return
+        with self._lock:
+            if self._refreshing:
+                self._refresh_again = True
+                return
+            self._refreshing = True
+        threading.Thread(target=self._refresh, name='site-similarity-refresh', daemon=True).start()
+
+
+# Shared related-sites lookups for the process
+related_sites = _RelatedSites()
+query_cache.add_write_listener(related_sites.on_tables_written)
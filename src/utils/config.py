@@ -9,9 +9,184 @@ SNOWFLAKE_CONFIG = {
     'user': os.getenv('SNOWFLAKE_USER', ''),
     'password': os.getenv('SNOWFLAKE_PASSWORD', ''),
     'account': os.getenv('SNOWFLAKE_ACCOUNT', ''),
-    'warehouse': os.getenv('SNOWFLAKE_WAREHOUSE', ''),
-    'database': os.getenv('SNOWFLAKE_DATABASE', ''),
-    'schema': os.getenv('SNOWFLAKE_SCHEMA', '')
+    'warehouse': os.getenv('SNOWFLAKE_WAREHOUSE', 'COMPUTE_WH'),
+    'database': os.getenv('SNOWFLAKE_DATABASE', 'ROOTS_ROUTES'),
+    'schema': os.getenv('SNOWFLAKE_SCHEMA', 'PUBLIC'),
+    'role': os.getenv('SNOWFLAKE_ROLE', '')
+}
+
+# Database backend: 'snowflake' (default) or 'duckdb' for a local embedded file
+DATABASE_CONFIG = {
+    'backend': os.getenv('DATABASE_BACKEND', 'snowflake').lower(),
+    'duckdb_path': os.getenv('DUCKDB_PATH', os.path.join('data', 'roots_routes.duckdb'))
+}
+
+# Per-site metrics (visitors, visit days, revenue, ratings) source:
+# 'inline' (aggregate on read), 'table' (SITE_METRICS refreshed incrementally by the app)
+# or 'dynamic' (SITE_METRICS dynamic table maintained by Snowflake)
+SITE_METRICS_CONFIG = {
+    'source': os.getenv('SITE_METRICS_SOURCE', 'inline').lower(),
+    'refresh_interval': 300,  # seconds between incremental refreshes in 'table' mode
+    'watermark_lag': 600  # seconds re-scanned before the last refresh, for rows committed late
+}
+
+# Database connection pool settings
+POOL_CONFIG = {
+    'min_size': int(os.getenv('DB_POOL_MIN_SIZE', 1)),
+    'max_size': int(os.getenv('DB_POOL_MAX_SIZE', 8)),
+    'idle_timeout': 300,  # close idle connections above min_size after 5 minutes
+    'health_check_after': 60,  # only probe connections idle for more than 1 minute
+    'checkout_timeout': 30,  # seconds to wait for a free connection
+    'max_lifetime': 3600  # recycle connections after 1 hour
+}
+
+# Query result cache settings
+QUERY_CACHE_CONFIG = {
+    'enabled': os.getenv('QUERY_CACHE_ENABLED', 'True').lower() in ('true', '1', 'yes'),
+    'default_ttl': 60,  # seconds
+    'max_bytes': int(os.getenv('QUERY_CACHE_MAX_MB', 128)) * 1024 * 1024
+}
+
+# Schema metadata (information_schema) cache settings
+SCHEMA_CATALOG_CONFIG = {
+    'ttl': 600  # seconds; DDL run through the app refreshes it immediately
+}
+
+# Concurrent page query settings
+QUERY_EXECUTOR_CONFIG = {
+    'max_workers': int(os.getenv('QUERY_EXECUTOR_WORKERS', 8)),  # at most DB_POOL_MAX_SIZE queries run at once anyway
+    'default_timeout': 30,  # seconds per query, counted from when it starts running
+    'max_queue_wait': 10  # seconds a query may wait for a free worker before it is given up
+}
+
+# Site details page bundle settings
+SITE_BUNDLE_CONFIG = {
+    'ttl': 30,  # seconds a fetched bundle is reused for the same site
+    'include_media': False  # photos, videos, articles, resources, events and comments tables
+}
+
+# In-process full-text search index over sites, art forms and events
+SEARCH_INDEX_CONFIG = {
+    'enabled': os.getenv('SEARCH_INDEX_ENABLED', 'True').lower() in ('true', '1', 'yes'),
+    'path': os.getenv('SEARCH_INDEX_PATH', os.path.join('data', 'search_index.pkl')),
+    'refresh_interval': 300,  # seconds between checks for rows changed outside the app
+    'max_candidates': 1000,  # ranked matches handed to SQL for the remaining filters
+    'min_trigram_similarity': 0.4
+}
+
+# "All" search over sites, art forms and events
+FEDERATED_SEARCH_CONFIG = {
+    # seconds a source may take before the results are shown without it
+    'deadlines': {'heritage_sites': 5, 'art_forms': 3, 'cultural_events': 3},
+    'max_queue_wait': 2,  # seconds a source may wait for a free query worker, on top of its deadline
+    'rank_constant': 60  # reciprocal rank fusion constant when search index scores are unavailable
+}
+
+# Advanced filter options and counts, from in-memory bitmaps
+FACET_CONFIG = {
+    'refresh_interval': 300  # seconds before a table is reloaded even without writes
+}
+
+# Discover search box suggestions
+TYPEAHEAD_CONFIG = {
+    'limit': 8,  # suggestions shown under the search box
+    'refresh_interval': 600,  # seconds before popularity is re-read even without writes
+    'min_rebuild_interval': 30  # seconds between background rebuilds after writes
+}
+
+# Precomputed site scorecards (SITE_SCORECARDS), written by src/scripts/refresh_site_scorecards.py
+SCORECARD_CONFIG = {
+    'max_age_days': int(os.getenv('SCORECARD_MAX_AGE_DAYS', 1)),  # older scorecards are recomputed live
+    'history_days': 365,  # assessments shown in the score history chart
+    'ttl': 300  # seconds a scorecard read is cached
+}
+
+# Precomputed similar sites (SITE_SIMILARITIES), written by src/scripts/refresh_site_similarities.py
+SIMILARITY_CONFIG = {
+    'top_k': 20,  # neighbours stored per site
+    'weights': {'text': 0.5, 'heritage_type': 0.12, 'state': 0.08, 'distance': 0.15, 'art_forms': 0.15},
+    'distance_scale_km': 250,  # proximity falls to about a third at this distance
+    'block_size': 500,  # sites scored against the whole catalog at a time
+    'ttl': 600,  # seconds a neighbour list read is cached
+    'refresh_on_write': True  # refresh changed neighbour lists in the background after site writes
+}
+
+# Item-item collaborative filtering over USER_INTERACTIONS
+RECOMMENDER_CONFIG = {
+    'interaction_weights': {'visit': 1.0, 'rating': 1.5, 'review': 2.0},
+    'default_weight': 1.0,  # other interaction types
+    'top_k': 50,  # neighbours kept per site
+    'block_size': 1000,  # sites whose similarities are computed at a time
+    'shrinkage': 10,  # damps similarities backed by few shared visitors
+    'refresh_interval': 3600,  # seconds before the index is rebuilt from the table
+    'min_rebuild_interval': 60,  # seconds between rebuilds after new interactions
+    # Index saved by refresh_recommendations.py and by in-app rebuilds, loaded by the app processes
+    'path': os.getenv('RECOMMENDER_INDEX_PATH', os.path.join('data', 'recommendations.pkl'))
+}
+
+# Per-site Unsplash photo manifests in SITE_PHOTOS, serving the site details galleries
+SITE_MEDIA_CONFIG = {
+    'photos_per_site': 20,  # one search per site covers every gallery on the page
+    'max_age_days': 30,  # older manifests are refreshed in the background
+    'ttl': 300  # seconds a manifest read is cached
+}
+
+# Unsplash image lookups, cached in memory and in a local file keyed by normalized query
+IMAGE_CACHE_CONFIG = {
+    'path': os.getenv('IMAGE_CACHE_PATH', os.path.join('data', 'image_cache.sqlite')),
+    'memory_entries': 2048,  # most recently used queries kept in memory
+    'ttl': 7 * 86400,  # seconds a found image is reused
+    'negative_ttl': 86400,  # seconds a query without results is not searched again
+    'error_ttl': 120,  # seconds before a failed request is retried
+    'rate_limit_backoff': 900,  # seconds without requests after Unsplash reports its rate limit
+    'max_workers': 8,  # concurrent Unsplash requests when filling a card grid
+    'batch_timeout': 15  # seconds a card grid waits for its images before showing the fallback
+}
+
+# Resized local copies of card and gallery images, stored by content hash
+THUMBNAIL_CONFIG = {
+    'enabled': os.getenv('THUMBNAILS_ENABLED', 'True').lower() in ('true', '1', 'yes'),
+    'path': os.getenv('THUMBNAIL_PATH', os.path.join('data', 'thumbnails')),
+    'renditions': {
+        'card': {'size': (400, 200), 'crop': True},  # grid cards, cut to the 200px card height
+        'gallery': {'size': (800, 600), 'crop': False}  # site details photos, scaled to fit
+    },
+    'format': 'WEBP',  # JPEG where Pillow is built without WebP
+    'quality': 80,
+    'download_workers': 8,  # concurrent source image downloads
+    'render_workers': 2,  # Pillow worker processes
+    'max_source_bytes': 15 * 1024 * 1024,
+    'failure_ttl': 600,  # seconds before a URL that failed is downloaded again
+    'wait_timeout': 10  # seconds a page waits for renditions before showing the remote URLs
+}
+
+# Outbound HTTP per provider: token bucket (requests per second, burst), seconds per attempt,
+# seconds per call including retries and throttling, and retries on 429/5xx or connection errors
+HTTP_CLIENT_CONFIG = {
+    'providers': {
+        'unsplash': {
+            'rate': int(os.getenv('UNSPLASH_REQUESTS_PER_HOUR', 50)) / 3600,  # 50/hour demo, 5000/hour production
+            'burst': 10, 'timeout': 5, 'deadline': 10, 'retries': 1
+        },
+        'google_maps': {'rate': 50, 'burst': 50, 'timeout': 10, 'deadline': 20, 'retries': 2},
+        'openai': {
+            'rate': int(os.getenv('OPENAI_REQUESTS_PER_MINUTE', 500)) / 60,
+            'burst': 20, 'timeout': 60, 'deadline': 120, 'retries': 2
+        },
+        'images': {'rate': 50, 'burst': 50, 'timeout': 10, 'deadline': 20, 'retries': 1}  # image file downloads
+    },
+    'pool_maxsize': 16,  # keep-alive connections per host
+    'backoff_base': 0.5,  # seconds; doubled per retry with full jitter
+    'backoff_max': 8,
+    'latency_samples': 1000  # recent requests per provider kept for latency percentiles
+}
+
+# Metrics snapshots each app process writes for the admin portal, which runs in its own process
+METRICS_EXPORT_CONFIG = {
+    'enabled': os.getenv('METRICS_EXPORT_ENABLED', 'True').lower() in ('true', '1', 'yes'),
+    'path': os.getenv('METRICS_EXPORT_PATH', os.path.join('data', 'metrics')),
+    'interval': 15,  # seconds between snapshots
+    'max_age': 300  # seconds after which a process's snapshot is treated as gone
 }
 
 # OpenAI API configuration
@@ -56,6 +231,7 @@ DASHBOARD_CONFIG = {
 # Cultural Discovery Settings
 DISCOVERY_CONFIG = {
     'search_limit': 10,
+    'page_size': 20,  # listing page size; a multiple of the 4-column card grid
     'filter_options': {
         'heritage_types': ['Cultural', 'Natural', 'Mixed'],
         'risk_levels': ['Low', 'Medium', 'High'],
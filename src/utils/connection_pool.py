@@ -0,0 +1,290 @@
+import threading
+import time
+from collections import deque
+from typing import Callable, Dict, Optional
+
+
+class PoolTimeoutError(Exception):
+    """Raised when no connection could be checked out before the timeout."""
+
+
+class PooledConnection:
+    """Proxy around a raw DB-API connection that returns itself to the pool on close()."""
+
+    def __init__(self, pool, raw_connection):
+        self._pool = pool
+        self._raw = raw_connection
+        self._released = False
+
+    @property
+    def raw(self):
+        return self._raw
+
+    def __getattr__(self, name):
+        # Delegate everything else (cursor, commit, rollback, ...) to the real connection
+        return getattr(self._raw, name)
+
+    def close(self):
+        """Return the connection to the pool instead of closing it."""
+        if not self._released:
+            self._released = True
+            self._pool.release(self._raw)
+
+    def invalidate(self):
+        """Discard the underlying connection, e.g. after a network error."""
+        if not self._released:
+            self._released = True
+            self._pool.release(self._raw, discard=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is not None and _is_connection_error(exc):
+            self.invalidate()
+        else:
+            self.close()
+        return False
+
+    def __del__(self):
+        # Safety net for callers that forget to close
+        try:
+            self.close()
+        except Exception:
+            pass
+
+
+def _is_connection_error(exc) -> bool:
+    """Best-effort check whether an exception means the connection itself is broken."""
+    name = type(exc).__name__
+    return name in ('OperationalError', 'InterfaceError', 'DatabaseError', 'ConnectionError')
+
+
+class ConnectionPool:
+    """Bounded, thread-safe pool of database connections.
+
+    Connections are created lazily up to ``max_size``. Idle connections beyond
+    ``min_size`` are closed after ``idle_timeout`` seconds, and a connection that
+    has been idle longer than ``health_check_after`` seconds is probed with
+    ``SELECT 1`` before being handed out.
+    """
+
+    def __init__(
+        self,
+        connect: Callable,
+        min_size: int = 1,
+        max_size: int = 10,
+        idle_timeout: float = 300,
+        health_check_after: float = 60,
+        checkout_timeout: float = 30,
+        max_lifetime: float = 3600
+    ):
+        if min_size < 0 or max_size < 1 or min_size > max_size:
+            raise ValueError("Invalid pool size: need 0 <= min_size <= max_size and max_size >= 1")
+
+        self._connect = connect
+        self.min_size = min_size
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self.health_check_after = health_check_after
+        self.checkout_timeout = checkout_timeout
+        self.max_lifetime = max_lifetime
+
+        self._lock = threading.Condition()
+        # Idle connections as (connection, created_at, last_used), most recently used on the right
+        self._idle = deque()
+        self._created_at = {}
+        self._in_use = 0
+        self._pending = 0
+        self._closed = False
+
+        self._stats = {
+            'connections_created': 0,
+            'connections_closed': 0,
+            'checkouts': 0,
+            'waits': 0,
+            'timeouts': 0,
+            'health_checks': 0,
+            'health_check_failures': 0,
+            'last_connection': None
+        }
+
+    def acquire(self, timeout: Optional[float] = None) -> PooledConnection:
+        """Check out a connection, waiting up to ``timeout`` seconds if the pool is exhausted."""
+        timeout = self.checkout_timeout if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+
+        while True:
+            raw = None
+            create = False
+
+            with self._lock:
+                if self._closed:
+                    raise PoolTimeoutError("Connection pool is closed")
+
+                evicted = self._evict_idle_locked()
+
+                if self._idle:
+                    raw, created_at, last_used = self._idle.pop()
+                    self._in_use += 1
+                elif self._total_locked() < self.max_size:
+                    self._pending += 1
+                    create = True
+                else:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self._stats['timeouts'] += 1
+                        raise PoolTimeoutError(
+                            f"Timed out after {timeout}s waiting for a database connection "
+                            f"({self._in_use}/{self.max_size} in use)"
+                        )
+                    self._stats['waits'] += 1
+                    self._lock.wait(remaining)
+                    continue
+
+            for stale in evicted:
+                self._close_raw(stale)
+
+            if create:
+                return self._checkout(self._create())
+
+            # Only probe connections that sat idle long enough to have been dropped server-side
+            if time.monotonic() - last_used >= self.health_check_after and not self._is_healthy(raw):
+                self.release(raw, discard=True)
+                continue
+
+            return self._checkout(raw)
+
+    def release(self, raw, discard: bool = False):
+        """Return a raw connection to the pool, or close it when ``discard`` is set."""
+        now = time.monotonic()
+        with self._lock:
+            self._in_use = max(0, self._in_use - 1)
+            created_at = self._created_at.get(id(raw), now)
+            expired = self.max_lifetime and now - created_at >= self.max_lifetime
+            if discard or expired or self._closed or _is_closed(raw):
+                self._created_at.pop(id(raw), None)
+                to_close = raw
+            else:
+                self._idle.append((raw, created_at, now))
+                to_close = None
+            self._lock.notify()
+
+        if to_close is not None:
+            self._close_raw(to_close)
+
+    def close_all(self):
+        """Close every idle connection and refuse further checkouts."""
+        with self._lock:
+            self._closed = True
+            idle = [entry[0] for entry in self._idle]
+            self._idle.clear()
+            for raw in idle:
+                self._created_at.pop(id(raw), None)
+            self._lock.notify_all()
+
+        for raw in idle:
+            self._close_raw(raw)
+
+    def reset(self):
+        """Close all idle connections but keep the pool usable."""
+        with self._lock:
+            idle = [entry[0] for entry in self._idle]
+            self._idle.clear()
+            for raw in idle:
+                self._created_at.pop(id(raw), None)
+
+        for raw in idle:
+            self._close_raw(raw)
+
+    def stats(self) -> Dict:
+        """Return a snapshot of pool usage counters."""
+        with self._lock:
+            stats = dict(self._stats)
+            stats.update({
+                'in_use': self._in_use,
+                'idle': len(self._idle),
+                'total': self._total_locked(),
+                'min_size': self.min_size,
+                'max_size': self.max_size
+            })
+        return stats
+
+    def _checkout(self, raw) -> PooledConnection:
+        with self._lock:
+            self._stats['checkouts'] += 1
+        return PooledConnection(self, raw)
+
+    def _create(self):
+        try:
+            raw = self._connect()
+        except Exception:
+            with self._lock:
+                self._pending -= 1
+                self._lock.notify()
+            raise
+
+        with self._lock:
+            self._pending -= 1
+            self._in_use += 1
+            self._created_at[id(raw)] = time.monotonic()
+            self._stats['connections_created'] += 1
+            self._stats['last_connection'] = time.strftime('%Y-%m-%d %H:%M:%S')
+        return raw
+
+    def _total_locked(self) -> int:
+        return len(self._idle) + self._in_use + self._pending
+
+    def _evict_idle_locked(self) -> list:
+        """Pop connections idle longer than idle_timeout, keeping at least min_size open."""
+        now = time.monotonic()
+        evicted = []
+        # Oldest idle connections are on the left
+        while self._idle and self._total_locked() > self.min_size:
+            raw, created_at, last_used = self._idle[0]
+            if now - last_used < self.idle_timeout:
+                break
+            self._idle.popleft()
+            self._created_at.pop(id(raw), None)
+            evicted.append(raw)
+        return evicted
+
+    def _is_healthy(self, raw) -> bool:
+        with self._lock:
+            self._stats['health_checks'] += 1
+        if _is_closed(raw):
+            healthy = False
+        else:
+            try:
+                cursor = raw.cursor()
+                try:
+                    cursor.execute('SELECT 1')
+                finally:
+                    cursor.close()
+                healthy = True
+            except Exception as e:
+                print(f"Connection health check failed: {e}")
+                healthy = False
+
+        if not healthy:
+            with self._lock:
+                self._stats['health_check_failures'] += 1
+        return healthy
+
+    def _close_raw(self, raw):
+        try:
+            raw.close()
+        except Exception as e:
+            print(f"Error closing connection: {e}")
+        with self._lock:
+            self._stats['connections_closed'] += 1
+
+
+def _is_closed(raw) -> bool:
+    is_closed = getattr(raw, 'is_closed', None)
+    if callable(is_closed):
+        try:
+            return bool(is_closed())
+        except Exception:
+            return True
+    return False
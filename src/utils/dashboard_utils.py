@@ -3,6 +3,8 @@ import plotly.express as px
 import plotly.graph_objects as go
 import streamlit as st
 from src.utils.database_config import snowflake_config
+from src.utils.config import DASHBOARD_CONFIG
+from src.utils.site_metrics import site_metrics_source
 
 class DashboardUtils:
     def __init__(self):
@@ -10,16 +12,16 @@ class DashboardUtils:
 
     def get_overview_metrics(self):
         """Get overview metrics for the dashboard."""
-        query = """
+        query = f"""
         SELECT
-            COUNT(DISTINCT h.site_id) as total_sites,
-            SUM(v.visitor_count) as total_visitors,
-            SUM(v.revenue) as total_revenue,
+            COUNT(h.site_id) as total_sites,
+            SUM(m.total_visitors) as total_visitors,
+            SUM(m.total_revenue) as total_revenue,
             AVG(h.health_index) as avg_health
         FROM HERITAGE_SITES h
-        LEFT JOIN VISITOR_STATS v ON h.site_id = v.site_id
+        LEFT JOIN {site_metrics_source()} m ON h.site_id = m.site_id
         """
-        result = self.sf.execute_query(query)
+        result = self.sf.execute_query(query, ttl=DASHBOARD_CONFIG['refresh_interval'])
 
         # Return default values if query fails or returns no results
         if result is None or len(result) == 0:
@@ -41,26 +43,20 @@ class DashboardUtils:
 
     def get_trending_sites(self, limit=5):
         """Get trending heritage sites based on visitor count and ratings."""
-        query = """
-        WITH site_metrics AS (
-            SELECT
-                h.name,
-                h.location,
-                h.state,
-                COUNT(DISTINCT v.visit_date) as visit_days,
-                COALESCE(SUM(v.visitor_count), 0) as total_visitors,
-                COALESCE(AVG(u.rating), 0) as avg_rating
-            FROM HERITAGE_SITES h
-            LEFT JOIN VISITOR_STATS v ON h.site_id = v.site_id
-            LEFT JOIN USER_INTERACTIONS u ON h.site_id = u.site_id
-            GROUP BY h.name, h.location, h.state
-        )
-        SELECT *
-        FROM site_metrics
+        query = f"""
+        SELECT
+            h.name,
+            h.location,
+            h.state,
+            COALESCE(m.visit_days, 0) as visit_days,
+            COALESCE(m.total_visitors, 0) as total_visitors,
+            COALESCE(m.avg_rating, 0) as avg_rating
+        FROM HERITAGE_SITES h
+        LEFT JOIN {site_metrics_source()} m ON h.site_id = m.site_id
         ORDER BY total_visitors DESC NULLS LAST, avg_rating DESC NULLS LAST
         LIMIT %s
         """
-        result = self.sf.execute_query(query, [limit])
+        result = self.sf.execute_query(query, [limit], ttl=DASHBOARD_CONFIG['refresh_interval'])
 
         # Return empty list if query fails or returns no results
         if result is None:
@@ -97,7 +93,7 @@ class DashboardUtils:
         GROUP BY DATE_TRUNC('month', visit_date)
         ORDER BY month ASC
         """
-        result = self.sf.execute_query(query, [months])
+        result = self.sf.execute_query(query, [months], ttl=DASHBOARD_CONFIG['refresh_interval'])
 
         # Return default values if query fails or returns no results
         if result is None or len(result) == 0:
@@ -124,37 +120,36 @@ class DashboardUtils:
         FROM HERITAGE_SITES
         GROUP BY heritage_type
         """
-        return self.sf.execute_query(query)
+        return self.sf.execute_query(query, ttl=DASHBOARD_CONFIG['refresh_interval'])
 
     def get_state_wise_distribution(self):
         """Get distribution of heritage sites by state."""
-        query = """
+        query = f"""
         SELECT
             h.state,
             COUNT(*) as count,
-            SUM(v.visitor_count) as total_visitors
+            SUM(m.total_visitors) as total_visitors
         FROM HERITAGE_SITES h
-        LEFT JOIN VISITOR_STATS v ON h.site_id = v.site_id
+        LEFT JOIN {site_metrics_source()} m ON h.site_id = m.site_id
         GROUP BY h.state
         """
-        return self.sf.execute_query(query)
+        return self.sf.execute_query(query, ttl=DASHBOARD_CONFIG['refresh_interval'])
 
     def get_health_index_summary(self):
         """Get summary of heritage health index."""
-        query = """
+        query = f"""
         SELECT
             AVG(h.health_index) as avg_health,
-            COUNT(DISTINCT CASE WHEN h.risk_level = 'Low' THEN h.site_id END) as low_risk_count,
-            COUNT(DISTINCT CASE WHEN h.risk_level = 'Medium' THEN h.site_id END) as medium_risk_count,
-            COUNT(DISTINCT CASE WHEN h.risk_level = 'High' THEN h.site_id END) as high_risk_count,
-            COUNT(DISTINCT v.visit_date) as total_visit_days,
-            SUM(v.visitor_count) as total_visitors,
-            AVG(u.rating) as avg_rating
+            COUNT(CASE WHEN h.risk_level = 'Low' THEN h.site_id END) as low_risk_count,
+            COUNT(CASE WHEN h.risk_level = 'Medium' THEN h.site_id END) as medium_risk_count,
+            COUNT(CASE WHEN h.risk_level = 'High' THEN h.site_id END) as high_risk_count,
+            (SELECT COUNT(DISTINCT visit_date) FROM VISITOR_STATS) as total_visit_days,
+            SUM(m.total_visitors) as total_visitors,
+            SUM(m.avg_rating * m.rating_count) / NULLIF(SUM(m.rating_count), 0) as avg_rating
         FROM HERITAGE_SITES h
-        LEFT JOIN VISITOR_STATS v ON h.site_id = v.site_id
-        LEFT JOIN USER_INTERACTIONS u ON h.site_id = u.site_id
+        LEFT JOIN {site_metrics_source()} m ON h.site_id = m.site_id
         """
-        result = self.sf.execute_query(query)
+        result = self.sf.execute_query(query, ttl=DASHBOARD_CONFIG['refresh_interval'])
 
         # Return default values if query fails or returns no results
         if result is None or len(result) == 0:
@@ -296,5 +291,5 @@ class DashboardUtils:
     def test_connection(self):
         """Test the database connection."""
         query = "SELECT COUNT(*) FROM HERITAGE_SITES"
-        result = self.sf.execute_query(query)
+        result = self.sf.execute_query(query, ttl=0)
         return result is not None and len(result) > 0
@@ -2,7 +2,6 @@ import pandas as pd
 import json
 from datetime import datetime, timedelta
 import random
-import snowflake.connector
 from src.utils.database_config import snowflake_config
 
 class DataLoader:
@@ -1,251 +1,515 @@
-import snowflake.connector
-from snowflake.connector.pandas_tools import write_pandas
 import pandas as pd
-from src.utils.config import SNOWFLAKE_CONFIG, DISCOVERY_CONFIG
-from typing import Dict, List, Optional
+import pyarrow as pa
+from src.utils.config import DISCOVERY_CONFIG, DASHBOARD_CONFIG, POOL_CONFIG
+from src.utils.connection_pool import ConnectionPool, PoolTimeoutError
+from src.utils.db_backends import get_backend
+from src.utils.metrics_export import register_metrics
+from src.utils.query_cache import cached_fetch, query_cache
+from src.utils.schema_catalog import schema_catalog
+from src.utils.search_index import search_index
+from src.utils.site_metrics import site_metrics_source
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+import threading
 import time
 
 class SnowflakeConnection:
     _instance = None
-    _connection = None
-    _last_used = 0
-    _timeout = 300  # 5 minutes timeout
+    _instance_lock = threading.Lock()
     _max_retries = 3
     _retry_delay = 1  # seconds
 
     @classmethod
     def get_instance(cls):
         if cls._instance is None:
-            cls._instance = cls()
+            with cls._instance_lock:
+                if cls._instance is None:
+                    cls._instance = cls()
         return cls._instance
 
-    def get_connection(self):
-        current_time = time.time()
+    def __init__(self):
+        self.pool = ConnectionPool(
+            connect=self._connect,
+            min_size=POOL_CONFIG['min_size'],
+            max_size=POOL_CONFIG['max_size'],
+            idle_timeout=POOL_CONFIG['idle_timeout'],
+            health_check_after=POOL_CONFIG['health_check_after'],
+            checkout_timeout=POOL_CONFIG['checkout_timeout'],
+            max_lifetime=POOL_CONFIG['max_lifetime']
+        )
 
-        # Check if connection exists and is not timed out
-        if (self._connection is not None and
-            current_time - self._last_used < self._timeout):
-            try:
-                # Test if connection is still alive
-                self._connection.cursor().execute('SELECT 1')
-                self._last_used = current_time
-                return self._connection
-            except Exception as e:
-                print(f"Connection test failed: {e}")
-                self.close_connection()
+    def _connect(self):
+        """Open a new physical connection on the configured backend, retrying transient failures.
 
-        # Create new connection with retries
+        The Snowflake backend pins warehouse, database, schema and role at login,
+        so queries on a pooled connection never need their own USE statements.
+        """
         for attempt in range(self._max_retries):
             try:
-                self._connection = snowflake.connector.connect(
-                    user=SNOWFLAKE_CONFIG['user'],
-                    password=SNOWFLAKE_CONFIG['password'],
-                    account=SNOWFLAKE_CONFIG['account'],
-                    warehouse=SNOWFLAKE_CONFIG['warehouse'],
-                    database=SNOWFLAKE_CONFIG['database'],
-                    schema=SNOWFLAKE_CONFIG['schema'],
-                    # Add connection pooling settings
-                    connection_timeout=60,
-                    session_parameters={
-                        'QUERY_TIMEOUT': 300,
-                        'STATEMENT_TIMEOUT_IN_SECONDS': 300
-                    }
-                )
-                self._last_used = current_time
-                return self._connection
+                return get_backend().connect()
             except Exception as e:
                 print(f"Connection attempt {attempt + 1} failed: {e}")
                 if attempt < self._max_retries - 1:
                     time.sleep(self._retry_delay)
                 else:
                     print("Max retries reached. Could not establish connection.")
-                    return None
+                    raise
 
-    def close_connection(self):
-        if self._connection is not None:
-            try:
-                self._connection.close()
-            except Exception as e:
-                print(f"Error closing connection: {e}")
-            finally:
-                self._connection = None
+    def get_connection(self, timeout: Optional[float] = None):
+        """Check out a pooled connection. Call close() on it to return it to the pool."""
+        try:
+            return self.pool.acquire(timeout)
+        except PoolTimeoutError as e:
+            print(f"Connection pool exhausted: {e}")
+            return None
+        except Exception as e:
+            print(f"Could not establish connection: {e}")
+            return None
 
-    def __del__(self):
-        """Destructor to ensure connection is closed when object is destroyed."""
-        self.close_connection()
+    def close_connection(self):
+        """Close all idle pooled connections; checked-out ones are closed when returned."""
+        self.pool.reset()
 
-# Initialize the connection when the module is loaded
+# Initialize the connection manager when the module is loaded
 _connection_manager = SnowflakeConnection.get_instance()
 
 def get_db_connection():
-    """Get a connection to the Snowflake database."""
+    """Check out a pooled connection to the configured database backend.
+
+    The returned connection must be closed by the caller, which hands it back to the pool.
+    """
     conn = SnowflakeConnection.get_instance().get_connection()
     if conn is None:
         raise Exception("Failed to establish database connection after multiple retries")
     return conn
 
-def execute_query(query, params=None):
-    """Execute a query on the Snowflake database."""
-    try:
-        conn = get_db_connection()
-        cursor = conn.cursor()
+def get_pool_stats() -> Dict:
+    """Return connection pool statistics for monitoring."""
+    return SnowflakeConnection.get_instance().pool.stats()
 
-        # Execute each permission statement separately
-        permission_statements = [
-            "USE DATABASE ROOTS_ROUTES",
-            "USE SCHEMA PUBLIC",
-            "USE WAREHOUSE COMPUTE_WH"
-        ]
+register_metrics('db_pool', get_pool_stats)
 
-        for statement in permission_statements:
-            cursor.execute(statement)
+# Statements sent to the warehouse, used to measure round trips per page
+_query_stats = {'round_trips': 0}
+_query_stats_lock = threading.Lock()
 
-        if params:
-            cursor.execute(query, params)
-        else:
-            cursor.execute(query)
-        result = cursor.fetchall()
-        return result
-    except Exception as e:
-        print(f"Error executing query: {e}")
-        # Try to reconnect once
-        SnowflakeConnection.get_instance().close_connection()
+def _execute_statement(cursor, query, params=None):
+    """Run one statement on a cursor, counting it as a backend round trip."""
+    with _query_stats_lock:
+        _query_stats['round_trips'] += 1
+    if params:
+        cursor.execute(query, params)
+    else:
+        cursor.execute(query)
+
+def get_query_stats() -> Dict:
+    """Return counters of statements sent to the database."""
+    with _query_stats_lock:
+        return dict(_query_stats)
+
+def reset_query_stats():
+    """Reset the statement counters."""
+    with _query_stats_lock:
+        _query_stats['round_trips'] = 0
+
+def get_cache_stats() -> Dict:
+    """Return query result cache hit/miss counters for monitoring."""
+    return query_cache.stats()
+
+def get_schema_catalog_stats() -> Dict:
+    """Return schema catalog load/lookup counters for monitoring."""
+    return schema_catalog.stats()
+
+def get_search_index_stats() -> Dict:
+    """Return search index sizes and refresh counters for monitoring."""
+    return search_index.stats()
+
+def invalidate_tables(*table_names):
+    """Drop cached results that read any of the given tables."""
+    query_cache.invalidate_tables(table_names)
+
+def execute_query(query, params=None, ttl: Optional[float] = None):
+    """Execute a query on the Snowflake database.
+
+    Read-only results are served from the shared query cache for ``ttl`` seconds
+    (QUERY_CACHE_CONFIG default when None, 0 to bypass the cache).
+    """
+    return cached_fetch(query, params, lambda: _execute_uncached(query, params), ttl)
+
+def _execute_uncached(query, params=None):
+    """Run a query on a pooled connection, retrying once on a fresh connection."""
+    for attempt in range(2):
+        conn = None
+        cursor = None
         try:
             conn = get_db_connection()
             cursor = conn.cursor()
-
-            # Execute each permission statement separately after reconnection
-            for statement in permission_statements:
-                cursor.execute(statement)
-
-            if params:
-                cursor.execute(query, params)
-            else:
-                cursor.execute(query)
+            _execute_statement(cursor, query, params)
             result = cursor.fetchall()
             return result
         except Exception as e:
-            print(f"Error executing query after reconnect: {e}")
-            return None
+            if attempt == 0:
+                print(f"Error executing query: {e}")
+                # Drop the connection and retry once on a fresh one
+                if conn is not None:
+                    if cursor is not None:
+                        cursor.close()
+                        cursor = None
+                    conn.invalidate()
+                    conn = None
+            else:
+                print(f"Error executing query after reconnect: {e}")
+                return None
+        finally:
+            if cursor is not None:
+                cursor.close()
+            if conn is not None:
+                conn.close()
+
+# Low-cardinality text columns returned as pandas categoricals
+CATEGORICAL_COLUMNS = ('state', 'heritage_type', 'risk_level')
+
+def _arrow_to_dataframe(table) -> pd.DataFrame:
+    """Convert an Arrow table to pandas with lower-case columns and compact dtypes."""
+    table = table.rename_columns([name.lower() for name in table.column_names])
+
+    # NUMBER/DECIMAL columns would otherwise become object columns of Decimals
+    for i, field in enumerate(table.schema):
+        if pa.types.is_decimal(field.type):
+            column = table.column(i)
+            if field.type.scale == 0:
+                try:
+                    column = column.cast(pa.int64())
+                except pa.ArrowInvalid:
+                    column = column.cast(pa.string()).cast(pa.float64())
+            else:
+                # Arrow's direct decimal -> double cast is not correctly rounded
+                # (0.70 becomes 0.7000000000000001); parsing the text is, like float(Decimal)
+                column = column.cast(pa.string()).cast(pa.float64())
+            table = table.set_column(i, field.name, column)
+
+    categories = [name for name in CATEGORICAL_COLUMNS if name in table.column_names]
+    # self_destruct frees Arrow buffers as columns are converted, halving peak memory
+    return table.to_pandas(categories=categories, split_blocks=True, self_destruct=True)
+
+def _empty_dataframe(cursor) -> pd.DataFrame:
+    columns = [col[0].lower() for col in cursor.description or []]
+    return pd.DataFrame(columns=columns)
+
+def _fetch_cursor_dataframe(cursor) -> pd.DataFrame:
+    """Fetch a cursor's whole result set column-wise through Arrow."""
+    if hasattr(cursor, 'fetch_arrow_all'):
+        # Snowflake returns None instead of an empty table when there are no rows
+        table = cursor.fetch_arrow_all()
+        return _empty_dataframe(cursor) if table is None else _arrow_to_dataframe(table)
+    if hasattr(cursor, 'fetch_arrow_table'):
+        return _arrow_to_dataframe(cursor.fetch_arrow_table())
+
+    rows = cursor.fetchall()
+    df = pd.DataFrame.from_records(rows, columns=[col[0].lower() for col in cursor.description])
+    for name in CATEGORICAL_COLUMNS:
+        if name in df.columns:
+            df[name] = df[name].astype('category')
+    return df
+
+def fetch_dataframe(query, params=None, ttl: Optional[float] = None) -> Optional[pd.DataFrame]:
+    """Execute a query and return the result as a DataFrame, or None on failure.
+
+    Rows are fetched as Arrow record batches rather than Python tuples, columns
+    are lower-cased and state/heritage_type/risk_level come back as categoricals.
+    Results are cached like execute_query.
+    """
+    return cached_fetch(query, params, lambda: _fetch_dataframe_uncached(query, params), ttl, kind='frame')
+
+def _fetch_dataframe_uncached(query, params=None):
+    """Run a query on a pooled connection and fetch it as a DataFrame, retrying once."""
+    for attempt in range(2):
+        conn = None
+        cursor = None
+        try:
+            conn = get_db_connection()
+            cursor = conn.cursor()
+            _execute_statement(cursor, query, params)
+            return _fetch_cursor_dataframe(cursor)
+        except Exception as e:
+            if attempt == 0:
+                print(f"Error fetching dataframe: {e}")
+                if conn is not None:
+                    if cursor is not None:
+                        cursor.close()
+                        cursor = None
+                    conn.invalidate()
+                    conn = None
+            else:
+                print(f"Error fetching dataframe after reconnect: {e}")
+                return None
+        finally:
+            if cursor is not None:
+                cursor.close()
+            if conn is not None:
+                conn.close()
+
+def iter_dataframe_batches(query, params=None, batch_rows: int = 100000) -> Iterator[pd.DataFrame]:
+    """Stream a large result set as DataFrame batches without materialising it whole.
+
+    Use for scans such as VISITOR_STATS that can run to millions of rows; batches
+    are not cached. Categorical columns are per batch.
+    """
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    try:
+        _execute_statement(cursor, query, params)
+        if hasattr(cursor, 'fetch_arrow_batches'):
+            for table in cursor.fetch_arrow_batches():
+                yield _arrow_to_dataframe(table)
+        elif hasattr(cursor, 'fetch_record_batch'):
+            for batch in cursor.fetch_record_batch(batch_rows):
+                yield _arrow_to_dataframe(pa.Table.from_batches([batch]))
+        else:
+            while True:
+                rows = cursor.fetchmany(batch_rows)
+                if not rows:
+                    break
+                yield pd.DataFrame.from_records(rows, columns=[col[0].lower() for col in cursor.description])
     finally:
-        if 'cursor' in locals():
-            cursor.close()
+        cursor.close()
+        conn.close()
+
+def _records(df: Optional[pd.DataFrame], columns: Optional[List[str]] = None) -> List[Dict]:
+    """Turn a fetched DataFrame into the list of row dicts the older callers expect."""
+    if df is None or df.empty:
+        return []
+    if columns is not None:
+        df = df[columns]
+    # Plain Python values with None for missing ones, as fetchall() returned
+    return df.astype(object).where(df.notna(), None).to_dict('records')
+
+def _or_empty(df: Optional[pd.DataFrame]) -> pd.DataFrame:
+    """An empty DataFrame in place of a failed fetch."""
+    return df if df is not None else pd.DataFrame()
+
+def _first_record(df: Optional[pd.DataFrame], defaults: Dict) -> Dict:
+    """First row of a DataFrame as a dict keyed like ``defaults``, or the defaults."""
+    records = _records(df, list(defaults))
+    return records[0] if records else dict(defaults)
+
+def _keyset_condition(order: Sequence[Tuple[str, str]], cursor: Sequence) -> Tuple[str, List]:
+    """SQL condition selecting the rows after ``cursor`` in an (expression, 'ASC'/'DESC') order.
+
+    Expanded to (a > x) OR (a = x AND b > y) rather than a row comparison, so
+    mixed directions work and Snowflake can prune on the leading key.
+    """
+    clauses = []
+    params = []
+    for i, (expression, direction) in enumerate(order):
+        operator = '>' if direction == 'ASC' else '<'
+        terms = [f"{previous} = %s" for previous, _ in order[:i]] + [f"{expression} {operator} %s"]
+        clauses.append(f"({' AND '.join(terms)})")
+        params.extend(list(cursor[:i + 1]))
+    return f"({' OR '.join(clauses)})", params
+
+def _cursor_value(value):
+    """Plain Python value of a cursor key, bindable as a query parameter."""
+    if hasattr(value, 'to_pydatetime'):
+        return value.to_pydatetime()
+    if hasattr(value, 'item'):
+        return value.item()
+    return value
+
+def _fetch_keyset_page(columns: str, from_where: str, params: List, order: Sequence[Tuple[str, str]],
+                       cursor: Optional[Sequence] = None, page_size: Optional[int] = None) -> Dict:
+    """Fetch one page of ``SELECT columns FROM ... WHERE ...`` in a stable keyset order.
+
+    ``order`` ends with a unique key so every row has exactly one position;
+    ``cursor`` is the ``next_cursor`` of the previous page (None for the
+    first). Only the requested page is read, however deep it is. Returns
+    {'items': row dicts, 'next_cursor': cursor of the next page or None}.
+    """
+    page_size = page_size or DISCOVERY_CONFIG['page_size']
+    params = list(params)
+    if cursor is not None:
+        condition, cursor_params = _keyset_condition(order, cursor)
+        from_where += f" AND {condition}"
+        params.extend(cursor_params)
+
+    keys = ', '.join(f"{expression} AS _page_key_{i}" for i, (expression, _) in enumerate(order))
+    order_by = ', '.join(f"{expression} {direction}" for expression, direction in order)
+    query = f"""
+    SELECT {columns}, {keys}
+    {from_where}
+    ORDER BY {order_by}
+    LIMIT %s
+    """
+    # One extra row tells whether another page follows
+    params.append(page_size + 1)
+
+    df = _or_empty(fetch_dataframe(query, params))
+    key_columns = [f"_page_key_{i}" for i in range(len(order))]
+    next_cursor = None
+    if len(df) > page_size:
+        df = df.iloc[:page_size]
+        next_cursor = tuple(_cursor_value(value) for value in df[key_columns].iloc[-1])
+    return {
+        'items': _records(df.drop(columns=key_columns, errors='ignore')),
+        'next_cursor': next_cursor
+    }
+
+def _count_rows(from_where: str, params: List) -> int:
+    """Number of rows matched by a ``FROM ... WHERE ...`` clause."""
+    df = fetch_dataframe(f"SELECT COUNT(*) AS row_count {from_where}", params)
+    if df is None or df.empty:
+        return 0
+    return int(df['row_count'].iloc[0])
+
+def get_distinct_values(table_name: str, column: str) -> List:
+    """Sorted distinct non-null values of a column, for filter dropdowns."""
+    df = fetch_dataframe(f"""
+    SELECT DISTINCT {column} AS value
+    FROM {table_name}
+    WHERE {column} IS NOT NULL
+    ORDER BY value
+    """)
+    if df is None:
+        return []
+    return [_cursor_value(value) for value in df['value']]
+
+def _id_condition(id_column: str, ids: List) -> Tuple[str, List]:
+    """SQL condition restricting rows to the given ids (none matches nothing)."""
+    if not ids:
+        return " AND 1=0", []
+    return f" AND {id_column} IN ({','.join(['%s'] * len(ids))})", list(ids)
+
+def _rank_results(df: Optional[pd.DataFrame], id_column: str, ranked_ids: List, limit: int) -> Optional[pd.DataFrame]:
+    """Order fetched rows by search relevance and keep the best ``limit``."""
+    if df is None or df.empty:
+        return df
+    rank = {doc_id: position for position, doc_id in enumerate(ranked_ids)}
+    order = df[id_column].map(lambda doc_id: rank.get(_cursor_value(doc_id), len(rank)))
+    return df.iloc[order.argsort(kind='stable')].head(limit).reset_index(drop=True)
+
+def _relevance_order(ranked_ids: Optional[List], id_column: str,
+                     fallback: Sequence[Tuple[str, str]]) -> Tuple[str, List, Sequence[Tuple[str, str]]]:
+    """JOIN clause, its parameters and the keyset order listing search matches by relevance.
+
+    Each indexed match gets its position in ``ranked_ids`` as ``r.search_rank``.
+    Without ranked matches (no search, or SQL matching because the index is
+    unavailable) there is no join and the ``fallback`` order is used.
+    """
+    if not ranked_ids:
+        return "", [], fallback
+    rows = ', '.join(['(%s, %s)'] * len(ranked_ids))
+    params = [value for rank, doc_id in enumerate(ranked_ids) for value in (doc_id, rank)]
+    join = f" JOIN (VALUES {rows}) AS r(doc_id, search_rank) ON r.doc_id = {id_column}"
+    return join, params, [('r.search_rank', 'ASC'), (id_column, 'ASC')]
+
+def _search_matches(doc_type: str, filters: Dict) -> Optional[List]:
+    """Ids matching the filters' search query by relevance, None when the search index is unavailable.
+
+    A caller that already searched the index passes the ids as 'ranked_ids'.
+    """
+    if 'ranked_ids' in filters:
+        return filters['ranked_ids']
+    return search_index.search_ids(doc_type, filters['search_query'])
+
+def _heritage_site_filters(filters: Optional[Dict]) -> Tuple[str, List, Optional[List]]:
+    """SQL conditions and parameters for heritage site filters on alias ``h``.
+
+    A search query is answered by the in-process search index; the third
+    value is then the matching site ids by relevance (None without a search
+    or when the index is unavailable and SQL matching is used instead).
+    """
+    query = ""
+    params = []
+    ranked_ids = None
+
+    if filters:
+        if 'search_query' in filters:
+            ranked_ids = _search_matches('heritage_sites', filters)
+        if ranked_ids is not None:
+            condition, id_params = _id_condition('h.site_id', ranked_ids)
+            query += condition
+            params.extend(id_params)
+        elif 'search_query' in filters:
+            query += """ AND (
+                CONTAINS(LOWER(h.name), LOWER(%s)) OR
+                CONTAINS(LOWER(h.description), LOWER(%s)) OR
+                CONTAINS(LOWER(h.location), LOWER(%s)) OR
+                CONTAINS(LOWER(h.city), LOWER(%s)) OR
+                SOUNDEX(h.name) = SOUNDEX(%s) OR
+                SOUNDEX(h.location) = SOUNDEX(%s)
+            )"""
+            search_term = filters['search_query']
+            params.extend([search_term, search_term, search_term, search_term, search_term, search_term])
+        if 'type' in filters:
+            placeholders = ','.join(['%s'] * len(filters['type']))
+            query += f" AND h.heritage_type IN ({placeholders})"
+            params.extend(filters['type'])
+        if 'state' in filters:
+            query += " AND h.state = %s"
+            params.append(filters['state'])
+        if 'risk_level' in filters:
+            placeholders = ','.join(['%s'] * len(filters['risk_level']))
+            query += f" AND h.risk_level IN ({placeholders})"
+            params.extend(filters['risk_level'])
+        if 'year_range' in filters:
+            query += " AND h.established_year BETWEEN %s AND %s"
+            params.extend(filters['year_range'])
+        if 'unesco_status' in filters:
+            query += " AND h.unesco_status = %s"
+            params.append(filters['unesco_status'])
+
+    return query, params, ranked_ids
+
+def get_heritage_sites_df(filters: Optional[Dict] = None) -> pd.DataFrame:
+    """Fetch heritage sites with optional filters as a DataFrame."""
+    query = f"""
+    SELECT
+        h.site_id,
+        h.name,
+        h.description,
+        h.location,
+        h.latitude,
+        h.longitude,
+        h.state,
+        h.city,
+        h.established_year,
+        h.heritage_type,
+        h.unesco_status,
+        h.risk_level,
+        h.health_index,
+        h.created_at,
+        COALESCE(m.visit_days, 0) as visit_days,
+        COALESCE(m.total_visitors, 0) as total_visitors,
+        COALESCE(m.avg_rating, 0) as avg_rating
+    FROM HERITAGE_SITES h
+    LEFT JOIN {site_metrics_source()} m ON h.site_id = m.site_id
+    WHERE 1=1
+    """
+    conditions, params, ranked_ids = _heritage_site_filters(filters)
+    query += conditions
+
+    query += """
+    ORDER BY total_visitors DESC, avg_rating DESC
+    LIMIT %s
+    """
+    if ranked_ids is not None:
+        # Every indexed match is fetched, then the most relevant are kept
+        params.append(len(ranked_ids))
+        return _or_empty(_rank_results(fetch_dataframe(query, params), 'site_id', ranked_ids,
+                                       DISCOVERY_CONFIG['search_limit']))
+    params.append(DISCOVERY_CONFIG['search_limit'])
+
+    return _or_empty(fetch_dataframe(query, params))
 
 def get_heritage_sites(filters: Optional[Dict] = None) -> List[Dict]:
     """Fetch heritage sites with optional filters."""
     try:
-        query = """
-        SELECT
-            h.site_id,
-            h.name,
-            h.description,
-            h.location,
-            h.latitude,
-            h.longitude,
-            h.state,
-            h.city,
-            h.established_year,
-            h.heritage_type,
-            h.unesco_status,
-            h.risk_level,
-            h.health_index,
-            h.created_at,
-            COUNT(DISTINCT v.visit_date) as visit_days,
-            COALESCE(SUM(v.visitor_count), 0) as total_visitors,
-            COALESCE(AVG(u.rating), 0) as avg_rating
-        FROM HERITAGE_SITES h
-        LEFT JOIN VISITOR_STATS v ON h.site_id = v.site_id
-        LEFT JOIN USER_INTERACTIONS u ON h.site_id = u.site_id
-        WHERE 1=1
-        """
-        params = []
-
-        if filters:
-            if 'search_query' in filters:
-                query += """ AND (
-                    CONTAINS(LOWER(h.name), LOWER(%s)) OR
-                    CONTAINS(LOWER(h.description), LOWER(%s)) OR
-                    CONTAINS(LOWER(h.location), LOWER(%s)) OR
-                    CONTAINS(LOWER(h.city), LOWER(%s)) OR
-                    SOUNDEX(h.name) = SOUNDEX(%s) OR
-                    SOUNDEX(h.location) = SOUNDEX(%s)
-                )"""
-                search_term = filters['search_query']
-                params.extend([search_term, search_term, search_term, search_term, search_term, search_term])
-            if 'type' in filters:
-                placeholders = ','.join(['%s'] * len(filters['type']))
-                query += f" AND h.heritage_type IN ({placeholders})"
-                params.extend(filters['type'])
-            if 'state' in filters:
-                query += " AND h.state = %s"
-                params.append(filters['state'])
-            if 'risk_level' in filters:
-                placeholders = ','.join(['%s'] * len(filters['risk_level']))
-                query += f" AND h.risk_level IN ({placeholders})"
-                params.extend(filters['risk_level'])
-            if 'year_range' in filters:
-                query += " AND h.established_year BETWEEN %s AND %s"
-                params.extend(filters['year_range'])
-            if 'unesco_status' in filters:
-                query += " AND h.unesco_status = %s"
-                params.append(filters['unesco_status'])
-
-        query += """
-        GROUP BY
-            h.site_id,
-            h.name,
-            h.description,
-            h.location,
-            h.latitude,
-            h.longitude,
-            h.state,
-            h.city,
-            h.established_year,
-            h.heritage_type,
-            h.unesco_status,
-            h.risk_level,
-            h.health_index,
-            h.created_at
-        ORDER BY total_visitors DESC, avg_rating DESC
-        LIMIT %s
-        """
-        params.append(DISCOVERY_CONFIG['search_limit'])
-
-        result = execute_query(query, params)
-        if result is None:
-            return []
-
-        # Convert the result to a list of dictionaries
-        sites = []
-        for row in result:
-            site = {
-                'site_id': row[0],
-                'name': row[1],
-                'description': row[2],
-                'location': row[3],
-                'latitude': row[4],
-                'longitude': row[5],
-                'state': row[6],
-                'city': row[7],
-                'established_year': row[8],
-                'heritage_type': row[9],
-                'unesco_status': row[10],
-                'risk_level': row[11],
-                'health_index': row[12],
-                'created_at': row[13],
-                'visit_days': row[14],
-                'total_visitors': row[15],
-                'avg_rating': row[16]
-            }
-            sites.append(site)
-
-        return sites
+        return _records(get_heritage_sites_df(filters))
     except Exception as e:
         print(f"Error in get_heritage_sites: {e}")
         return []
 
-def get_all_heritage_sites() -> List[Dict]:
-    """Fetch all heritage sites."""
+def get_all_heritage_sites_df() -> pd.DataFrame:
+    """Fetch all heritage sites as a DataFrame."""
     query = """
     SELECT
         site_id,
@@ -265,98 +529,262 @@ def get_all_heritage_sites() -> List[Dict]:
     ORDER BY name ASC
     """
 
-    result = execute_query(query)
-    if result is None:
-        return []
+    return _or_empty(fetch_dataframe(query))
 
-    # Convert the result to a list of dictionaries
-    sites = []
-    for row in result:
-        site = {
-            'site_id': row[0],
-            'name': row[1],
-            'description': row[2],
-            'location': row[3],
-            'latitude': row[4],
-            'longitude': row[5],
-            'state': row[6],
-            'city': row[7],
-            'established_year': row[8],
-            'heritage_type': row[9],
-            'unesco_status': row[10],
-            'risk_level': row[11],
-            'health_index': row[12]
-        }
-        sites.append(site)
-
-    return sites
+def get_all_heritage_sites() -> List[Dict]:
+    """Fetch all heritage sites."""
+    return _records(get_all_heritage_sites_df())
+
+# Listing orders: name -> (expression, direction) keys ending with the unique id.
+# 'relevance' lists search matches in search index order, else as 'popularity'.
+SITE_PAGE_ORDERS = {
+    'name': [('h.name', 'ASC'), ('h.site_id', 'ASC')],
+    'popularity': [('COALESCE(m.total_visitors, 0)', 'DESC'), ('h.site_id', 'ASC')]
+}
+
+def _heritage_sites_from(filters: Optional[Dict], with_metrics: bool,
+                         order_by: Optional[str] = None) -> Tuple[str, List, Sequence[Tuple[str, str]]]:
+    """FROM/WHERE clause of the heritage site listing, its parameters and its keyset order."""
+    conditions, params, ranked_ids = _heritage_site_filters(filters)
+    join, join_params, order = "", [], SITE_PAGE_ORDERS.get(order_by)
+    if order_by == 'relevance':
+        join, join_params, order = _relevance_order(ranked_ids, 'h.site_id', SITE_PAGE_ORDERS['popularity'])
+    from_where = f"FROM HERITAGE_SITES h{join}"
+    if with_metrics:
+        from_where += f" LEFT JOIN {site_metrics_source()} m ON h.site_id = m.site_id"
+    return f"{from_where} WHERE 1=1{conditions}", join_params + params, order
+
+def get_heritage_sites_page(filters: Optional[Dict] = None, order_by: str = 'name',
+                            cursor: Optional[Sequence] = None, page_size: Optional[int] = None) -> Dict:
+    """Fetch one page of heritage sites ordered by name, by total visitors or by search relevance.
+
+    Pass the returned ``next_cursor`` back as ``cursor`` for the following page.
+    """
+    with_metrics = order_by != 'name'
+    columns = """
+        h.site_id, h.name, h.description, h.location, h.latitude, h.longitude, h.state,
+        h.city, h.established_year, h.heritage_type, h.unesco_status, h.risk_level, h.health_index"""
+    if with_metrics:
+        columns += ", COALESCE(m.total_visitors, 0) as total_visitors"
+    from_where, params, order = _heritage_sites_from(filters, with_metrics, order_by)
+    return _fetch_keyset_page(columns, from_where, params, order, cursor, page_size)
+
+def count_heritage_sites(filters: Optional[Dict] = None) -> int:
+    """Number of heritage sites matching the filters."""
+    from_where, params, _ = _heritage_sites_from(filters, with_metrics=False)
+    return _count_rows(from_where, params)
+
+# Per-site reads of the site details page, each taking the site id. The get_site_*
+# helpers turn a failed read into empty data; the site bundle uses them directly so
+# that it can tell a failed read from an empty one. '{site_metrics}' stands for
+# the per-site metrics relation.
+SITE_QUERIES = {
+    'art_forms': """
+        SELECT DISTINCT
+            a.art_form_id,
+            a.name,
+            a.description,
+            a.origin_state,
+            a.category,
+            a.risk_level,
+            a.practitioners_count
+        FROM ART_FORMS a
+        JOIN SITE_ART_FORMS saf ON a.art_form_id = saf.art_form_id
+        WHERE saf.site_id = %s
+        ORDER BY a.name
+        """,
+    'visitor_stats': """
+        SELECT
+            visit_date,
+            visitor_count,
+            revenue
+        FROM VISITOR_STATS
+        WHERE site_id = %s
+        ORDER BY visit_date DESC
+        """,
+    'interactions': """
+        SELECT *
+        FROM USER_INTERACTIONS
+        WHERE site_id = %s
+        ORDER BY interaction_date DESC
+        """,
+    'health': """
+        SELECT
+            h.health_index,
+            h.risk_level,
+            m.visit_days,
+            m.total_visitors,
+            m.avg_rating
+        FROM HERITAGE_SITES h
+        LEFT JOIN {site_metrics} m ON h.site_id = m.site_id
+        WHERE h.site_id = %s
+        """,
+    'revenue': """
+        SELECT
+            SUM(v.revenue) as total_revenue,
+            AVG(v.revenue) as avg_revenue,
+            COUNT(DISTINCT v.visit_date) as visit_days
+        FROM VISITOR_STATS v
+        WHERE v.site_id = %s
+        """,
+    'visitors': """
+        SELECT
+            SUM(v.visitor_count) as total_visitors,
+            AVG(v.visitor_count) as avg_visitors,
+            COUNT(DISTINCT v.visit_date) as visit_days
+        FROM VISITOR_STATS v
+        WHERE v.site_id = %s
+        """,
+    'ratings': """
+        SELECT
+            AVG(u.rating) as avg_rating,
+            COUNT(u.rating) as total_ratings,
+            MIN(u.rating) as min_rating,
+            MAX(u.rating) as max_rating
+        FROM USER_INTERACTIONS u
+        WHERE u.site_id = %s
+        """,
+    'comments': """
+        SELECT
+            u.user_id,
+            u.comment,
+            u.review_date
+        FROM USER_INTERACTIONS u
+        WHERE u.site_id = %s AND u.comment IS NOT NULL
+        ORDER BY u.review_date DESC
+        """,
+    'photos': """
+        SELECT
+            p.photo_id,
+            p.image_url,
+            p.capture_date
+        FROM SITE_PHOTOS p
+        WHERE p.site_id = %s
+        ORDER BY p.capture_date DESC
+        """,
+    'videos': """
+        SELECT
+            v.video_id,
+            v.video_url,
+            v.title,
+            v.description,
+            v.upload_date
+        FROM SITE_VIDEOS v
+        WHERE v.site_id = %s
+        ORDER BY v.upload_date DESC
+        """,
+    'articles': """
+        SELECT
+            a.article_id,
+            a.title,
+            a.content,
+            a.author,
+            a.publication_date,
+            a.source_url
+        FROM SITE_ARTICLES a
+        WHERE a.site_id = %s
+        ORDER BY a.publication_date DESC
+        """,
+    'resources': """
+        SELECT
+            r.resource_id,
+            r.title,
+            r.description,
+            r.resource_type,
+            r.file_url,
+            r.upload_date
+        FROM SITE_RESOURCES r
+        WHERE r.site_id = %s
+        ORDER BY r.upload_date DESC
+        """,
+    'events': """
+        SELECT
+            e.event_id,
+            e.name,
+            e.description,
+            e.start_date,
+            e.end_date,
+            e.organizer,
+            e.event_type,
+            e.venue
+        FROM SITE_EVENTS e
+        WHERE e.site_id = %s
+        ORDER BY e.start_date DESC
+        """
+}
+
+# Values of the single-row reads when the site has no row
+SITE_QUERY_DEFAULTS = {
+    'health': {
+        'health_index': 0,
+        'risk_level': 'Unknown',
+        'visit_days': 0,
+        'total_visitors': 0,
+        'avg_rating': 0
+    },
+    'revenue': {
+        'total_revenue': 0,
+        'avg_revenue': 0,
+        'visit_days': 0
+    },
+    'visitors': {
+        'total_visitors': 0,
+        'avg_visitors': 0,
+        'visit_days': 0
+    },
+    'ratings': {
+        'avg_rating': 0,
+        'total_ratings': 0,
+        'min_rating': 0,
+        'max_rating': 0
+    }
+}
 
-def get_site_details(site_id: str) -> Dict:
-    """Fetch details of a specific heritage site."""
-    query = """
+def site_query(name: str) -> str:
+    """SQL of one SITE_QUERIES read."""
+    return SITE_QUERIES[name].replace('{site_metrics}', site_metrics_source())
+
+SITE_DETAIL_COLUMNS = [
+    'site_id', 'name', 'description', 'location', 'latitude', 'longitude',
+    'state', 'city', 'established_year', 'heritage_type', 'unesco_status',
+    'risk_level', 'health_index', 'story', 'visit_days', 'total_visitors', 'avg_rating'
+]
+
+def get_site_details_df(site_id: str) -> Optional[pd.DataFrame]:
+    """Fetch details of a specific heritage site as a DataFrame (empty if there is no such site, None on failure)."""
+    query = f"""
     SELECT
         h.*,
-        COUNT(DISTINCT v.visit_date) as visit_days,
-        SUM(v.visitor_count) as total_visitors,
-        AVG(u.rating) as avg_rating
+        m.visit_days,
+        m.total_visitors,
+        m.avg_rating
     FROM HERITAGE_SITES h
-    LEFT JOIN VISITOR_STATS v ON h.site_id = v.site_id
-    LEFT JOIN USER_INTERACTIONS u ON h.site_id = u.site_id
+    LEFT JOIN {site_metrics_source()} m ON h.site_id = m.site_id
     WHERE h.site_id = %s
-    GROUP BY h.site_id, h.name, h.description, h.location, h.latitude, h.longitude,
-             h.state, h.city, h.established_year, h.heritage_type, h.unesco_status,
-             h.risk_level, h.health_index, h.created_at
     """
-    result = execute_query(query, [site_id])
-    if result is None or len(result) == 0:
-        return None
-
-    row = result[0]
-    site = {
-        'site_id': row[0],
-        'name': row[1],
-        'description': row[2],
-        'location': row[3],
-        'latitude': row[4],
-        'longitude': row[5],
-        'state': row[6],
-        'city': row[7],
-        'established_year': row[8],
-        'heritage_type': row[9],
-        'unesco_status': row[10],
-        'risk_level': row[11],
-        'health_index': row[12],
-        'visit_days': row[13],
-        'total_visitors': row[14],
-        'avg_rating': row[15]
-    }
-    return site
+    return fetch_dataframe(query, [site_id])
+
+def get_site_details(site_id: str) -> Dict:
+    """Fetch details of a specific heritage site."""
+    records = _records(get_site_details_df(site_id), SITE_DETAIL_COLUMNS)
+    return records[0] if records else None
+
+def get_site_id_by_name(name: str) -> Optional[int]:
+    """Look up the id of a heritage site by its name."""
+    records = _records(fetch_dataframe("SELECT site_id FROM HERITAGE_SITES WHERE name = %s", [name]))
+    return int(records[0]['site_id']) if records else None
+
+def get_visitor_stats_df(site_id: str) -> pd.DataFrame:
+    """Fetch visitor statistics for a specific heritage site as a DataFrame."""
+    return _or_empty(fetch_dataframe(site_query('visitor_stats'), [site_id]))
 
 def get_visitor_stats(site_id: str) -> List[Dict]:
     """Fetch visitor statistics for a specific heritage site."""
-    query = """
-    SELECT
-        visit_date,
-        visitor_count,
-        revenue
-    FROM VISITOR_STATS
-    WHERE site_id = %s
-    ORDER BY visit_date DESC
-    """
-    result = execute_query(query, [site_id])
-    if result is None:
-        return []
+    return _records(get_visitor_stats_df(site_id))
 
-    stats = []
-    for row in result:
-        stat = {
-            'visit_date': row[0],
-            'visitor_count': row[1],
-            'revenue': row[2]
-        }
-        stats.append(stat)
-
-    return stats
+def get_site_interactions_df(site_id: str) -> pd.DataFrame:
+    """Fetch visitor interactions for a specific heritage site, newest first, as a DataFrame."""
+    return _or_empty(fetch_dataframe(site_query('interactions'), [site_id]))
 
 def get_user_reviews(site_id: str) -> List[Dict]:
     """Fetch user reviews for a specific heritage site."""
@@ -370,51 +798,30 @@ def get_user_reviews(site_id: str) -> List[Dict]:
     WHERE u.site_id = %s
     ORDER BY u.review_date DESC
     """
-    result = execute_query(query, [site_id])
-    if result is None:
-        return []
-
-    reviews = []
-    for row in result:
-        review = {
-            'user_id': row[0],
-            'rating': row[1],
-            'comment': row[2],
-            'review_date': row[3]
-        }
-        reviews.append(review)
-
-    return reviews
+    return _records(fetch_dataframe(query, [site_id]))
 
 def execute_update(query, params=None):
     """Execute an update query (INSERT, UPDATE, DELETE)."""
     conn = get_db_connection()
     try:
         cursor = conn.cursor()
-        if params:
-            cursor.execute(query, params)
-        else:
-            cursor.execute(query)
+        _execute_statement(cursor, query, params)
         conn.commit()
         return cursor.rowcount
     finally:
         cursor.close()
         conn.close()
+        # Cached reads of the written table are stale now
+        query_cache.invalidate_for_statement(query)
 
 def load_dataframe_to_table(df, table_name):
-    """Load a pandas DataFrame into a Snowflake table."""
+    """Load a pandas DataFrame into a database table."""
     conn = get_db_connection()
     try:
-        success, nchunks, nrows, _ = write_pandas(
-            conn=conn,
-            df=df,
-            table_name=table_name,
-            database=SNOWFLAKE_CONFIG['database'],
-            schema=SNOWFLAKE_CONFIG['schema']
-        )
-        return success, nrows
+        return get_backend().write_dataframe(conn, df, table_name)
     finally:
         conn.close()
+        query_cache.invalidate_tables([table_name])
 
 def get_table_schema(table_name):
     """Get the schema of a Snowflake table."""
@@ -437,17 +844,7 @@ def get_table_schema(table_name):
 
 def check_table_exists(table_name):
     """Check if a table exists in the database."""
-    conn = get_db_connection()
-    try:
-        query = f"""
-        SELECT COUNT(*)
-        FROM information_schema.tables
-        WHERE table_name = '{table_name}'
-        """
-        result = pd.read_sql(query, conn)
-        return result.iloc[0][0] > 0
-    finally:
-        conn.close()
+    return schema_catalog.has_table(table_name)
 
 def create_table_if_not_exists(table_name, columns):
     """Create a table if it doesn't exist."""
@@ -465,6 +862,8 @@ def create_table_if_not_exists(table_name, columns):
         finally:
             cursor.close()
             conn.close()
+            query_cache.invalidate_tables([table_name])
+            schema_catalog.invalidate()
 
 def drop_table_if_exists(table_name):
     """Drop a table if it exists."""
@@ -476,39 +875,30 @@ def drop_table_if_exists(table_name):
     finally:
         cursor.close()
         conn.close()
+        query_cache.invalidate_tables([table_name])
+        schema_catalog.invalidate()
 
 def get_overview_metrics() -> Dict:
     """Fetch overview metrics for the dashboard."""
-    query = """
+    query = f"""
     SELECT
-        COUNT(DISTINCT h.site_id) as total_sites,
-        SUM(v.visitor_count) as total_visitors,
-        SUM(v.revenue) as total_revenue,
+        COUNT(h.site_id) as total_sites,
+        SUM(m.total_visitors) as total_visitors,
+        SUM(m.total_revenue) as total_revenue,
         AVG(h.health_index) as avg_health
     FROM HERITAGE_SITES h
-    LEFT JOIN VISITOR_STATS v ON h.site_id = v.site_id
+    LEFT JOIN {site_metrics_source()} m ON h.site_id = m.site_id
     """
-    result = execute_query(query)
-    if result is None or len(result) == 0:
-        return {
-            'total_sites': 0,
-            'total_visitors': 0,
-            'total_revenue': 0,
-            'avg_health': 0
-        }
-
-    row = result[0]
-    metrics = {
-        'total_sites': row[0],
-        'total_visitors': row[1],
-        'total_revenue': row[2],
-        'avg_health': row[3]
-    }
-    return metrics
-
-def get_trending_sites(limit: int = 5) -> List[Dict]:
-    """Fetch trending heritage sites."""
-    query = """
+    return _first_record(fetch_dataframe(query, ttl=DASHBOARD_CONFIG['refresh_interval']), {
+        'total_sites': 0,
+        'total_visitors': 0,
+        'total_revenue': 0,
+        'avg_health': 0
+    })
+
+def get_trending_sites_df(limit: int = 5) -> pd.DataFrame:
+    """Fetch trending heritage sites as a DataFrame."""
+    query = f"""
     SELECT
         h.site_id,
         h.name,
@@ -523,60 +913,22 @@ def get_trending_sites(limit: int = 5) -> List[Dict]:
         h.unesco_status,
         h.risk_level,
         h.health_index,
-        COUNT(DISTINCT v.visit_date) as visit_days,
-        COALESCE(SUM(v.visitor_count), 0) as total_visitors,
-        COALESCE(AVG(u.rating), 0) as avg_rating
+        COALESCE(m.visit_days, 0) as visit_days,
+        COALESCE(m.total_visitors, 0) as total_visitors,
+        COALESCE(m.avg_rating, 0) as avg_rating
     FROM HERITAGE_SITES h
-    LEFT JOIN VISITOR_STATS v ON h.site_id = v.site_id
-    LEFT JOIN USER_INTERACTIONS u ON h.site_id = u.site_id
-    GROUP BY
-        h.site_id,
-        h.name,
-        h.description,
-        h.location,
-        h.latitude,
-        h.longitude,
-        h.state,
-        h.city,
-        h.established_year,
-        h.heritage_type,
-        h.unesco_status,
-        h.risk_level,
-        h.health_index,
-        h.created_at
+    LEFT JOIN {site_metrics_source()} m ON h.site_id = m.site_id
     ORDER BY total_visitors DESC, avg_rating DESC
     LIMIT %s
     """
-    result = execute_query(query, [limit])
-    if result is None:
-        return []
+    return _or_empty(fetch_dataframe(query, [limit], ttl=DASHBOARD_CONFIG['refresh_interval']))
 
-    sites = []
-    for row in result:
-        site = {
-            'site_id': row[0],
-            'name': row[1],
-            'description': row[2],
-            'location': row[3],
-            'latitude': row[4],
-            'longitude': row[5],
-            'state': row[6],
-            'city': row[7],
-            'established_year': row[8],
-            'heritage_type': row[9],
-            'unesco_status': row[10],
-            'risk_level': row[11],
-            'health_index': row[12],
-            'visit_days': row[13],
-            'total_visitors': row[14],
-            'avg_rating': row[15]
-        }
-        sites.append(site)
-
-    return sites
+def get_trending_sites(limit: int = 5) -> List[Dict]:
+    """Fetch trending heritage sites."""
+    return _records(get_trending_sites_df(limit))
 
-def get_visitor_trends() -> List[Dict]:
-    """Fetch visitor trends for heritage sites."""
+def get_visitor_trends_df() -> pd.DataFrame:
+    """Fetch monthly visitor trends for heritage sites as a DataFrame."""
     query = """
     SELECT
         DATE_TRUNC('month', v.visit_date) as month,
@@ -587,23 +939,17 @@ def get_visitor_trends() -> List[Dict]:
     GROUP BY month
     ORDER BY month ASC
     """
-    result = execute_query(query)
-    if result is None:
-        return []
-
-    trends = []
-    for row in result:
-        trend = {
-            'month': row[0],
-            'total_visitors': row[1] or 0,
-            'total_revenue': row[2] or 0
-        }
-        trends.append(trend)
+    df = fetch_dataframe(query, ttl=DASHBOARD_CONFIG['refresh_interval'])
+    if df is None:
+        return pd.DataFrame(columns=['month', 'total_visitors', 'total_revenue'])
+    return df.fillna({'total_visitors': 0, 'total_revenue': 0})
 
-    return trends
+def get_visitor_trends() -> List[Dict]:
+    """Fetch visitor trends for heritage sites."""
+    return _records(get_visitor_trends_df())
 
-def get_all_art_forms() -> List[Dict]:
-    """Fetch all art forms."""
+def get_all_art_forms_df() -> pd.DataFrame:
+    """Fetch all art forms as a DataFrame."""
     query = """
     SELECT
         art_form_id,
@@ -617,24 +963,67 @@ def get_all_art_forms() -> List[Dict]:
     ORDER BY name ASC
     """
 
-    result = execute_query(query)
-    if result is None:
-        return []
+    return _or_empty(fetch_dataframe(query))
+
+def get_all_art_forms() -> List[Dict]:
+    """Fetch all art forms."""
+    return _records(get_all_art_forms_df())
+
+def _art_form_filters(filters: Optional[Dict]) -> Tuple[str, List, Optional[List]]:
+    """SQL conditions, parameters and ranked search matches for art form filters on alias ``a``."""
+    query = ""
+    params = []
+    ranked_ids = None
+
+    if filters:
+        if 'search_query' in filters:
+            ranked_ids = _search_matches('art_forms', filters)
+        if ranked_ids is not None:
+            condition, id_params = _id_condition('a.art_form_id', ranked_ids)
+            query += condition
+            params.extend(id_params)
+        elif 'search_query' in filters:
+            query += """ AND (
+                CONTAINS(LOWER(a.name), LOWER(%s)) OR
+                CONTAINS(LOWER(a.description), LOWER(%s)) OR
+                SOUNDEX(a.name) = SOUNDEX(%s) OR
+                SOUNDEX(a.origin_state) = SOUNDEX(%s)
+            )"""
+            search_term = filters['search_query']
+            params.extend([search_term, search_term, search_term, search_term])
+        if 'category' in filters:
+            query += " AND a.category = %s"
+            params.append(filters['category'])
+        if 'origin_state' in filters:
+            query += " AND a.origin_state = %s"
+            params.append(filters['origin_state'])
+        if 'risk_level' in filters:
+            query += " AND a.risk_level = %s"
+            params.append(filters['risk_level'])
 
-    art_forms = []
-    for row in result:
-        art_form = {
-            'art_form_id': row[0],
-            'name': row[1],
-            'description': row[2],
-            'origin_state': row[3],
-            'category': row[4],
-            'risk_level': row[5],
-            'practitioners_count': row[6]
-        }
-        art_forms.append(art_form)
-
-    return art_forms
+    return query, params, ranked_ids
+
+ART_FORM_PAGE_ORDERS = {
+    'name': [('a.name', 'ASC'), ('a.art_form_id', 'ASC')],
+    'practitioners': [('COALESCE(a.practitioners_count, 0)', 'DESC'), ('a.art_form_id', 'ASC')]
+}
+
+def get_art_forms_page(filters: Optional[Dict] = None, order_by: str = 'name',
+                       cursor: Optional[Sequence] = None, page_size: Optional[int] = None) -> Dict:
+    """Fetch one page of art forms ordered by name, by number of practitioners or by search relevance."""
+    conditions, params, ranked_ids = _art_form_filters(filters)
+    join, join_params, order = "", [], ART_FORM_PAGE_ORDERS.get(order_by)
+    if order_by == 'relevance':
+        join, join_params, order = _relevance_order(ranked_ids, 'a.art_form_id', ART_FORM_PAGE_ORDERS['name'])
+    columns = """
+        a.art_form_id, a.name, a.description, a.origin_state, a.category, a.risk_level, a.practitioners_count"""
+    from_where = f"FROM ART_FORMS a{join} WHERE 1=1{conditions}"
+    return _fetch_keyset_page(columns, from_where, join_params + params, order, cursor, page_size)
+
+def count_art_forms(filters: Optional[Dict] = None) -> int:
+    """Number of art forms matching the filters."""
+    conditions, params, _ = _art_form_filters(filters)
+    return _count_rows(f"FROM ART_FORMS a WHERE 1=1{conditions}", params)
 
 def get_art_forms(filters: Optional[Dict] = None) -> List[Dict]:
     """Fetch art forms with optional filters or by site ID."""
@@ -652,6 +1041,7 @@ def get_art_forms(filters: Optional[Dict] = None) -> List[Dict]:
     WHERE 1=1
     """
     params = []
+    ranked_ids = None
 
     # Handle case when filters is a site ID (integer)
     if isinstance(filters, int):
@@ -659,69 +1049,35 @@ def get_art_forms(filters: Optional[Dict] = None) -> List[Dict]:
         params.append(filters)
     # Handle case when filters is a dictionary
     elif isinstance(filters, dict):
-        if 'search_query' in filters:
-            query += """ AND (
-                CONTAINS(LOWER(a.name), LOWER(%s)) OR
-                CONTAINS(LOWER(a.description), LOWER(%s)) OR
-                SOUNDEX(a.name) = SOUNDEX(%s) OR
-                SOUNDEX(a.origin_state) = SOUNDEX(%s)
-            )"""
-            search_term = filters['search_query']
-            params.extend([search_term, search_term, search_term, search_term])
-        if 'category' in filters:
-            query += " AND a.category = %s"
-            params.append(filters['category'])
-        if 'origin_state' in filters:
-            query += " AND a.origin_state = %s"
-            params.append(filters['origin_state'])
-        if 'risk_level' in filters:
-            query += " AND a.risk_level = %s"
-            params.append(filters['risk_level'])
+        conditions, params, ranked_ids = _art_form_filters(filters)
+        query += conditions
 
     query += """
     ORDER BY a.name
     LIMIT %s
     """
+    if ranked_ids is not None:
+        params.append(len(ranked_ids))
+        return _records(_rank_results(fetch_dataframe(query, params), 'art_form_id', ranked_ids,
+                                      DISCOVERY_CONFIG['search_limit']))
     params.append(DISCOVERY_CONFIG['search_limit'])
 
-    result = execute_query(query, params)
-    if result is None:
-        return []
+    return _records(fetch_dataframe(query, params))
 
-    art_forms = []
-    for row in result:
-        art_form = {
-            'art_form_id': row[0],
-            'name': row[1],
-            'description': row[2],
-            'origin_state': row[3],
-            'category': row[4],
-            'risk_level': row[5],
-            'practitioners_count': row[6]
-        }
-        art_forms.append(art_form)
-
-    return art_forms
-
-def get_cultural_events(filters: Optional[Dict] = None) -> List[Dict]:
-    """Fetch cultural events with optional filters."""
-    query = """
-    SELECT
-        e.event_id,
-        e.name,
-        e.description,
-        e.start_date,
-        e.end_date,
-        e.location,
-        e.event_type,
-        e.organizer
-    FROM CULTURAL_EVENTS e
-    WHERE 1=1
-    """
+def _cultural_event_filters(filters: Optional[Dict]) -> Tuple[str, List, Optional[List]]:
+    """SQL conditions, parameters and ranked search matches for cultural event filters on alias ``e``."""
+    query = ""
     params = []
+    ranked_ids = None
 
     if filters:
         if 'search_query' in filters:
+            ranked_ids = _search_matches('cultural_events', filters)
+        if ranked_ids is not None:
+            condition, id_params = _id_condition('e.event_id', ranked_ids)
+            query += condition
+            params.extend(id_params)
+        elif 'search_query' in filters:
             query += """ AND (
                 CONTAINS(LOWER(e.name), LOWER(%s)) OR
                 CONTAINS(LOWER(e.description), LOWER(%s)) OR
@@ -742,31 +1098,60 @@ def get_cultural_events(filters: Optional[Dict] = None) -> List[Dict]:
             query += " AND e.organizer = %s"
             params.append(filters['organizer'])
 
+    return query, params, ranked_ids
+
+# Events without a start date sort after all dated ones
+CULTURAL_EVENT_PAGE_ORDERS = {
+    'start_date': [("COALESCE(e.start_date, DATE '9999-12-31')", 'ASC'), ('e.event_id', 'ASC')],
+    'name': [('e.name', 'ASC'), ('e.event_id', 'ASC')]
+}
+
+def get_cultural_events_page(filters: Optional[Dict] = None, order_by: str = 'start_date',
+                             cursor: Optional[Sequence] = None, page_size: Optional[int] = None) -> Dict:
+    """Fetch one page of cultural events ordered by start date, by name or by search relevance."""
+    conditions, params, ranked_ids = _cultural_event_filters(filters)
+    join, join_params, order = "", [], CULTURAL_EVENT_PAGE_ORDERS.get(order_by)
+    if order_by == 'relevance':
+        join, join_params, order = _relevance_order(ranked_ids, 'e.event_id', CULTURAL_EVENT_PAGE_ORDERS['start_date'])
+    columns = """
+        e.event_id, e.name, e.description, e.start_date, e.end_date, e.location, e.event_type, e.organizer"""
+    from_where = f"FROM CULTURAL_EVENTS e{join} WHERE 1=1{conditions}"
+    return _fetch_keyset_page(columns, from_where, join_params + params, order, cursor, page_size)
+
+def count_cultural_events(filters: Optional[Dict] = None) -> int:
+    """Number of cultural events matching the filters."""
+    conditions, params, _ = _cultural_event_filters(filters)
+    return _count_rows(f"FROM CULTURAL_EVENTS e WHERE 1=1{conditions}", params)
+
+def get_cultural_events(filters: Optional[Dict] = None) -> List[Dict]:
+    """Fetch cultural events with optional filters."""
+    query = """
+    SELECT
+        e.event_id,
+        e.name,
+        e.description,
+        e.start_date,
+        e.end_date,
+        e.location,
+        e.event_type,
+        e.organizer
+    FROM CULTURAL_EVENTS e
+    WHERE 1=1
+    """
+    conditions, params, ranked_ids = _cultural_event_filters(filters)
+    query += conditions
+
     query += """
     ORDER BY e.start_date DESC
     LIMIT %s
     """
+    if ranked_ids is not None:
+        params.append(len(ranked_ids))
+        return _records(_rank_results(fetch_dataframe(query, params), 'event_id', ranked_ids,
+                                      DISCOVERY_CONFIG['search_limit']))
     params.append(DISCOVERY_CONFIG['search_limit'])
 
-    result = execute_query(query, params)
-    if result is None:
-        return []
-
-    events = []
-    for row in result:
-        event = {
-            'event_id': row[0],
-            'name': row[1],
-            'description': row[2],
-            'start_date': row[3],
-            'end_date': row[4],
-            'location': row[5],
-            'event_type': row[6],
-            'organizer': row[7]
-        }
-        events.append(event)
-
-    return events
+    return _records(fetch_dataframe(query, params))
 
 def get_street_view(latitude: float, longitude: float) -> Dict:
     """Fetch street view for a heritage site."""
@@ -780,17 +1165,8 @@ def get_street_view(latitude: float, longitude: float) -> Dict:
     ORDER BY s.capture_date DESC
     LIMIT 1
     """
-    result = execute_query(query, [latitude, longitude])
-    if result is None or len(result) == 0:
-        return None
-
-    row = result[0]
-    street_view = {
-        'street_view_id': row[0],
-        'image_url': row[1],
-        'capture_date': row[2]
-    }
-    return street_view
+    records = _records(fetch_dataframe(query, [latitude, longitude]))
+    return records[0] if records else None
 
 def get_site_image(site_id: str) -> Dict:
     """Fetch image for a heritage site."""
@@ -804,364 +1180,90 @@ def get_site_image(site_id: str) -> Dict:
     ORDER BY i.capture_date DESC
     LIMIT 1
     """
-    result = execute_query(query, [site_id])
-    if result is None or len(result) == 0:
-        return None
-
-    row = result[0]
-    image = {
-        'image_id': row[0],
-        'image_url': row[1],
-        'capture_date': row[2]
-    }
-    return image
+    records = _records(fetch_dataframe(query, [site_id]))
+    return records[0] if records else None
 
-def get_related_sites(site_id: str) -> List[Dict]:
-    """Fetch related heritage sites."""
-    query = """
+def get_heritage_sites_by_ids_df(site_ids: List[int]) -> Optional[pd.DataFrame]:
+    """Fetch heritage sites with their metrics by id, in the order of the ids given."""
+    condition, params = _id_condition('h.site_id', site_ids)
+    query = f"""
     SELECT
         h.*,
-        COUNT(DISTINCT v.visit_date) as visit_days,
-        SUM(v.visitor_count) as total_visitors,
-        AVG(u.rating) as avg_rating
+        m.visit_days,
+        m.total_visitors,
+        m.avg_rating
     FROM HERITAGE_SITES h
-    LEFT JOIN VISITOR_STATS v ON h.site_id = v.site_id
-    LEFT JOIN USER_INTERACTIONS u ON h.site_id = u.site_id
-    WHERE h.site_id != %s
-    GROUP BY h.site_id, h.name, h.description, h.location, h.latitude, h.longitude,
-             h.state, h.city, h.established_year, h.heritage_type, h.unesco_status,
-             h.risk_level, h.health_index, h.created_at, h.updated_at
-    ORDER BY total_visitors DESC, avg_rating DESC
-    LIMIT 5
+    LEFT JOIN {site_metrics_source()} m ON h.site_id = m.site_id
+    WHERE 1=1{condition}
     """
-    result = execute_query(query, [site_id])
-    if result is None:
-        return []
+    return _rank_results(fetch_dataframe(query, params), 'site_id', site_ids, len(site_ids))
+
+def get_heritage_sites_by_ids(site_ids: List[int]) -> List[Dict]:
+    """Fetch heritage sites with their metrics by id, in the order of the ids given."""
+    return _records(get_heritage_sites_by_ids_df(site_ids))
+
+def get_related_sites(site_id: str, limit: int = 5) -> List[Dict]:
+    """Fetch the heritage sites most related to a site, most related first.
 
-    sites = []
-    for row in result:
-        site = {
-            'id': row[0],
-            'name': row[1],
-            'description': row[2],
-            'location': row[3],
-            'latitude': row[4],
-            'longitude': row[5],
-            'state': row[6],
-            'city': row[7],
-            'established_year': row[8],
-            'heritage_type': row[9],
-            'unesco_status': row[10],
-            'risk_level': row[11],
-            'health_index': row[12],
-            'visit_days': row[13],
-            'total_visitors': row[14],
-            'avg_rating': row[15]
-        }
-        sites.append(site)
-
-    return sites
+    Relatedness blends description similarity, same state and type, distance
+    and shared art forms; see src/services/site_similarity.py.
+    """
+    from src.services.site_similarity import related_sites
+
+    related_ids = related_sites.related_site_ids(site_id, limit)
+    if not related_ids:
+        return []
+    df = get_heritage_sites_by_ids_df(related_ids)
+    if df is None:
+        return []
+    return _records(df.rename(columns={'site_id': 'id'}), [
+        'id', 'name', 'description', 'location', 'latitude', 'longitude',
+        'state', 'city', 'established_year', 'heritage_type', 'unesco_status',
+        'risk_level', 'health_index', 'visit_days', 'total_visitors', 'avg_rating'
+    ])
 
 def get_site_health(site_id: str) -> Dict:
     """Fetch health metrics for a heritage site."""
-    query = """
-    SELECT
-        h.health_index,
-        h.risk_level,
-        COUNT(DISTINCT v.visit_date) as visit_days,
-        SUM(v.visitor_count) as total_visitors,
-        AVG(u.rating) as avg_rating
-    FROM HERITAGE_SITES h
-    LEFT JOIN VISITOR_STATS v ON h.site_id = v.site_id
-    LEFT JOIN USER_INTERACTIONS u ON h.site_id = u.site_id
-    WHERE h.site_id = %s
-    GROUP BY h.health_index, h.risk_level
-    """
-    result = execute_query(query, [site_id])
-    if result is None or len(result) == 0:
-        return {
-            'health_index': 0,
-            'risk_level': 'Unknown',
-            'visit_days': 0,
-            'total_visitors': 0,
-            'avg_rating': 0
-        }
-
-    row = result[0]
-    health = {
-        'health_index': row[0],
-        'risk_level': row[1],
-        'visit_days': row[2],
-        'total_visitors': row[3],
-        'avg_rating': row[4]
-    }
-    return health
+    return _first_record(fetch_dataframe(site_query('health'), [site_id]), SITE_QUERY_DEFAULTS['health'])
 
 def get_site_revenue(site_id: str) -> Dict:
     """Fetch revenue metrics for a heritage site."""
-    query = """
-    SELECT
-        SUM(v.revenue) as total_revenue,
-        AVG(v.revenue) as avg_revenue,
-        COUNT(DISTINCT v.visit_date) as visit_days
-    FROM VISITOR_STATS v
-    WHERE v.site_id = %s
-    """
-    result = execute_query(query, [site_id])
-    if result is None or len(result) == 0:
-        return {
-            'total_revenue': 0,
-            'avg_revenue': 0,
-            'visit_days': 0
-        }
-
-    row = result[0]
-    revenue = {
-        'total_revenue': row[0],
-        'avg_revenue': row[1],
-        'visit_days': row[2]
-    }
-    return revenue
+    return _first_record(fetch_dataframe(site_query('revenue'), [site_id]), SITE_QUERY_DEFAULTS['revenue'])
 
 def get_site_visitors(site_id: str) -> Dict:
     """Fetch visitor metrics for a heritage site."""
-    query = """
-    SELECT
-        SUM(v.visitor_count) as total_visitors,
-        AVG(v.visitor_count) as avg_visitors,
-        COUNT(DISTINCT v.visit_date) as visit_days
-    FROM VISITOR_STATS v
-    WHERE v.site_id = %s
-    """
-    result = execute_query(query, [site_id])
-    if result is None or len(result) == 0:
-        return {
-            'total_visitors': 0,
-            'avg_visitors': 0,
-            'visit_days': 0
-        }
-
-    row = result[0]
-    visitors = {
-        'total_visitors': row[0],
-        'avg_visitors': row[1],
-        'visit_days': row[2]
-    }
-    return visitors
+    return _first_record(fetch_dataframe(site_query('visitors'), [site_id]), SITE_QUERY_DEFAULTS['visitors'])
 
 def get_site_ratings(site_id: str) -> Dict:
     """Fetch rating metrics for a heritage site."""
-    query = """
-    SELECT
-        AVG(u.rating) as avg_rating,
-        COUNT(u.rating) as total_ratings,
-        MIN(u.rating) as min_rating,
-        MAX(u.rating) as max_rating
-    FROM USER_INTERACTIONS u
-    WHERE u.site_id = %s
-    """
-    result = execute_query(query, [site_id])
-    if result is None or len(result) == 0:
-        return {
-            'avg_rating': 0,
-            'total_ratings': 0,
-            'min_rating': 0,
-            'max_rating': 0
-        }
-
-    row = result[0]
-    ratings = {
-        'avg_rating': row[0],
-        'total_ratings': row[1],
-        'min_rating': row[2],
-        'max_rating': row[3]
-    }
-    return ratings
+    return _first_record(fetch_dataframe(site_query('ratings'), [site_id]), SITE_QUERY_DEFAULTS['ratings'])
 
 def get_site_comments(site_id: str) -> List[Dict]:
     """Fetch comments for a heritage site."""
-    query = """
-    SELECT
-        u.user_id,
-        u.comment,
-        u.review_date
-    FROM USER_INTERACTIONS u
-    WHERE u.site_id = %s AND u.comment IS NOT NULL
-    ORDER BY u.review_date DESC
-    """
-    result = execute_query(query, [site_id])
-    if result is None:
-        return []
-
-    comments = []
-    for row in result:
-        comment = {
-            'user_id': row[0],
-            'comment': row[1],
-            'review_date': row[2]
-        }
-        comments.append(comment)
-
-    return comments
+    return _records(fetch_dataframe(site_query('comments'), [site_id]))
 
 def get_site_photos(site_id: str) -> List[Dict]:
     """Fetch photos for a heritage site."""
-    query = """
-    SELECT
-        p.photo_id,
-        p.image_url,
-        p.capture_date
-    FROM SITE_PHOTOS p
-    WHERE p.site_id = %s
-    ORDER BY p.capture_date DESC
-    """
-    result = execute_query(query, [site_id])
-    if result is None:
-        return []
-
-    photos = []
-    for row in result:
-        photo = {
-            'photo_id': row[0],
-            'image_url': row[1],
-            'capture_date': row[2]
-        }
-        photos.append(photo)
-
-    return photos
+    return _records(fetch_dataframe(site_query('photos'), [site_id]))
 
 def get_site_videos(site_id: str) -> List[Dict]:
     """Fetch videos for a heritage site."""
-    query = """
-    SELECT
-        v.video_id,
-        v.video_url,
-        v.title,
-        v.description,
-        v.upload_date
-    FROM SITE_VIDEOS v
-    WHERE v.site_id = %s
-    ORDER BY v.upload_date DESC
-    """
-    result = execute_query(query, [site_id])
-    if result is None:
-        return []
-
-    videos = []
-    for row in result:
-        video = {
-            'video_id': row[0],
-            'video_url': row[1],
-            'title': row[2],
-            'description': row[3],
-            'upload_date': row[4]
-        }
-        videos.append(video)
-
-    return videos
+    return _records(fetch_dataframe(site_query('videos'), [site_id]))
 
 def get_site_articles(site_id: str) -> List[Dict]:
     """Fetch articles for a heritage site."""
-    query = """
-    SELECT
-        a.article_id,
-        a.title,
-        a.content,
-        a.author,
-        a.publication_date,
-        a.source_url
-    FROM SITE_ARTICLES a
-    WHERE a.site_id = %s
-    ORDER BY a.publication_date DESC
-    """
-    result = execute_query(query, [site_id])
-    if result is None:
-        return []
-
-    articles = []
-    for row in result:
-        article = {
-            'article_id': row[0],
-            'title': row[1],
-            'content': row[2],
-            'author': row[3],
-            'publication_date': row[4],
-            'source_url': row[5]
-        }
-        articles.append(article)
-
-    return articles
+    return _records(fetch_dataframe(site_query('articles'), [site_id]))
 
 def get_site_resources(site_id: str) -> List[Dict]:
     """Fetch resources for a heritage site."""
-    query = """
-    SELECT
-        r.resource_id,
-        r.title,
-        r.description,
-        r.resource_type,
-        r.file_url,
-        r.upload_date
-    FROM SITE_RESOURCES r
-    WHERE r.site_id = %s
-    ORDER BY r.upload_date DESC
-    """
-    result = execute_query(query, [site_id])
-    if result is None:
-        return []
-
-    resources = []
-    for row in result:
-        resource = {
-            'resource_id': row[0],
-            'title': row[1],
-            'description': row[2],
-            'resource_type': row[3],
-            'file_url': row[4],
-            'upload_date': row[5]
-        }
-        resources.append(resource)
-
-    return resources
+    return _records(fetch_dataframe(site_query('resources'), [site_id]))
 
 def get_site_events(site_id: str) -> List[Dict]:
     """Fetch events for a heritage site."""
-    query = """
-    SELECT
-        e.event_id,
-        e.name,
-        e.description,
-        e.start_date,
-        e.end_date,
-        e.organizer,
-        e.event_type,
-        e.venue
-    FROM SITE_EVENTS e
-    WHERE e.site_id = %s
-    ORDER BY e.start_date DESC
-    """
-    result = execute_query(query, [site_id])
-    if result is None:
-        return []
-
-    events = []
-    for row in result:
-        event = {
-            'event_id': row[0],
-            'name': row[1],
-            'description': row[2],
-            'start_date': row[3],
-            'end_date': row[4],
-            'organizer': row[5],
-            'event_type': row[6],
-            'venue': row[7]
-        }
-        events.append(event)
-
-    return events
+    return _records(fetch_dataframe(site_query('events'), [site_id]))
 
-def get_all_cultural_events() -> List[Dict]:
-    """Fetch all cultural events."""
+def get_all_cultural_events_df() -> pd.DataFrame:
+    """Fetch all cultural events as a DataFrame."""
     query = """
     SELECT
         event_id,
@@ -1176,23 +1278,9 @@ def get_all_cultural_events() -> List[Dict]:
     ORDER BY start_date ASC
     """
 
-    result = execute_query(query)
-    if result is None:
-        return []
+    return _or_empty(fetch_dataframe(query))
+
+def get_all_cultural_events() -> List[Dict]:
+    """Fetch all cultural events."""
+    return _records(get_all_cultural_events_df())
 
-    # Convert the result to a list of dictionaries
-    events = []
-    for row in result:
-        event = {
-            'event_id': row[0],
-            'name': row[1],
-            'description': row[2],
-            'start_date': row[3],
-            'end_date': row[4],
-            'location': row[5],
-            'event_type': row[6],
-            'organizer': row[7]
-        }
-        events.append(event)
-
-    return events
@@ -1,8 +1,9 @@
 import os
 from dotenv import load_dotenv
-import snowflake.connector
-from snowflake.connector.pandas_tools import write_pandas
 import pandas as pd
+from src.utils.database import _execute_uncached as _execute_pooled
+from src.utils.db_backends import get_backend
+from src.utils.query_cache import cached_fetch, query_cache
 
 # Load environment variables
 load_dotenv()
@@ -18,40 +19,20 @@ class SnowflakeConfig:
         self.role = os.getenv('SNOWFLAKE_ROLE')
 
     def get_connection(self):
-        """Create and return a Snowflake connection."""
+        """Create and return a connection on the configured database backend."""
         try:
-            conn = snowflake.connector.connect(
-                account=self.account,
-                user=self.user,
-                password=self.password,
-                database=self.database,
-                warehouse=self.warehouse,
-                schema=self.schema,
-                role=self.role
-            )
-            return conn
+            return get_backend().connect()
         except Exception as e:
-            print(f"Error connecting to Snowflake: {str(e)}")
+            print(f"Error connecting to {get_backend().name}: {str(e)}")
             return None
 
-    def execute_query(self, query, params=None):
-        """Execute a query and return results."""
-        conn = self.get_connection()
-        if conn:
-            try:
-                cursor = conn.cursor()
-                if params:
-                    cursor.execute(query, params)
-                else:
-                    cursor.execute(query)
-                results = cursor.fetchall()
-                cursor.close()
-                conn.close()
-                return results
-            except Exception as e:
-                print(f"Error executing query: {str(e)}")
-                return None
-        return None
+    def execute_query(self, query, params=None, ttl=None):
+        """Execute a query and return results, using the shared query cache for reads."""
+        return cached_fetch(query, params, lambda: self._execute_uncached(query, params), ttl)
+
+    def _execute_uncached(self, query, params=None):
+        """Execute a query on a pooled connection, so concurrent page queries share the pool."""
+        return _execute_pooled(query, params)
 
     def execute_many(self, query, params_list):
         """Execute a query multiple times with different parameters."""
@@ -67,25 +48,23 @@ class SnowflakeConfig:
             except Exception as e:
                 print(f"Error executing multiple queries: {str(e)}")
                 return False
+            finally:
+                query_cache.invalidate_for_statement(query)
         return False
 
     def write_dataframe(self, df, table_name):
-        """Write a pandas DataFrame to a Snowflake table."""
+        """Write a pandas DataFrame to a database table."""
         conn = self.get_connection()
         if conn:
             try:
-                success, nchunks, nrows, _ = write_pandas(
-                    conn=conn,
-                    df=df,
-                    table_name=table_name,
-                    database=self.database,
-                    schema=self.schema
-                )
+                success, nrows = get_backend().write_dataframe(conn, df, table_name)
                 conn.close()
                 return success
             except Exception as e:
-                print(f"Error writing DataFrame to Snowflake: {str(e)}")
+                print(f"Error writing DataFrame to {get_backend().name}: {str(e)}")
                 return False
+            finally:
+                query_cache.invalidate_tables([table_name])
         return False
 
 # Create a singleton instance
@@ -0,0 +1,349 @@
+import os
+import re
+import threading
+import uuid
+from typing import List, Optional, Tuple
+
+from src.utils.config import SNOWFLAKE_CONFIG, DATABASE_CONFIG
+
+
+class DatabaseBackend:
+    """Interface every database backend implements.
+
+    ``connect()`` returns a DB-API style connection (cursor/commit/close) that
+    accepts the Snowflake SQL dialect and ``%s`` placeholders used by the app.
+    """
+
+    name = 'base'
+
+    def connect(self):
+        """Open a new physical connection."""
+        raise NotImplementedError
+
+    def write_dataframe(self, conn, df, table_name: str) -> Tuple[bool, int]:
+        """Append a DataFrame to an existing table, returning (success, rows written)."""
+        raise NotImplementedError
+
+    def close(self):
+        """Release any backend-wide resources."""
+
+
+class SnowflakeBackend(DatabaseBackend):
+    """Snowflake warehouse, the production backend."""
+
+    name = 'snowflake'
+
+    def connect(self):
+        """Connect with warehouse, database, schema and role pinned at login."""
+        import snowflake.connector
+
+        session_context = {
+            'warehouse': SNOWFLAKE_CONFIG['warehouse'],
+            'database': SNOWFLAKE_CONFIG['database'],
+            'schema': SNOWFLAKE_CONFIG['schema']
+        }
+        if SNOWFLAKE_CONFIG.get('role'):
+            session_context['role'] = SNOWFLAKE_CONFIG['role']
+
+        return snowflake.connector.connect(
+            user=SNOWFLAKE_CONFIG['user'],
+            password=SNOWFLAKE_CONFIG['password'],
+            account=SNOWFLAKE_CONFIG['account'],
+            connection_timeout=60,
+            session_parameters={
+                'QUERY_TIMEOUT': 300,
+                'STATEMENT_TIMEOUT_IN_SECONDS': 300
+            },
+            **session_context
+        )
+
+    def write_dataframe(self, conn, df, table_name: str) -> Tuple[bool, int]:
+        from snowflake.connector.pandas_tools import write_pandas
+
+        success, nchunks, nrows, _ = write_pandas(
+            conn=conn,
+            df=df,
+            table_name=table_name,
+            database=SNOWFLAKE_CONFIG['database'],
+            schema=SNOWFLAKE_CONFIG['schema']
+        )
+        return success, nrows
+
+
+# ---------------------------------------------------------------------------
+# Snowflake -> DuckDB SQL translation
+# ---------------------------------------------------------------------------
+
+_PLACEHOLDER = re.compile(r'%(s|%)')
+_NILADIC_CALL = re.compile(r'\b(CURRENT_DATE|CURRENT_TIMESTAMP|CURRENT_TIME)\s*\(\s*\)', re.IGNORECASE)
+_DATEADD_CALL = re.compile(r'\bDATEADD\s*\(', re.IGNORECASE)
+_DML = re.compile(r'^\s*(?:INSERT|UPDATE|DELETE|MERGE)\b', re.IGNORECASE)
+
+# DATEADD date parts and the DuckDB interval constructor for each
+_DATEADD_UNITS = {
+    'year': 'to_years', 'years': 'to_years', 'y': 'to_years', 'yy': 'to_years', 'yyyy': 'to_years',
+    'quarter': 'to_months', 'quarters': 'to_months', 'q': 'to_months',
+    'month': 'to_months', 'months': 'to_months', 'mm': 'to_months', 'mon': 'to_months',
+    'week': 'to_weeks', 'weeks': 'to_weeks', 'w': 'to_weeks', 'wk': 'to_weeks',
+    'day': 'to_days', 'days': 'to_days', 'd': 'to_days', 'dd': 'to_days',
+    'hour': 'to_hours', 'hours': 'to_hours', 'h': 'to_hours', 'hh': 'to_hours',
+    'minute': 'to_minutes', 'minutes': 'to_minutes', 'mi': 'to_minutes', 'min': 'to_minutes',
+    'second': 'to_seconds', 'seconds': 'to_seconds', 's': 'to_seconds', 'sec': 'to_seconds'
+}
+
+
+def _split_call_args(query: str, start: int) -> Tuple[Optional[List[str]], int]:
+    """Split the arguments of a call whose opening parenthesis ends at ``start``."""
+    args = []
+    depth = 0
+    quote = None
+    current = start
+    for i in range(start, len(query)):
+        ch = query[i]
+        if quote:
+            if ch == quote:
+                quote = None
+        elif ch in ("'", '"'):
+            quote = ch
+        elif ch == '(':
+            depth += 1
+        elif ch == ')':
+            if depth == 0:
+                args.append(query[current:i].strip())
+                return args, i + 1
+            depth -= 1
+        elif ch == ',' and depth == 0:
+            args.append(query[current:i].strip())
+            current = i + 1
+    return None, start
+
+
+def _rewrite_dateadd(query: str) -> str:
+    """DATEADD(unit, n, expr) -> (expr + to_<unit>s(n))."""
+    out = []
+    pos = 0
+    while True:
+        match = _DATEADD_CALL.search(query, pos)
+        if not match:
+            out.append(query[pos:])
+            return ''.join(out)
+
+        args, end = _split_call_args(query, match.end())
+        unit = args[0].strip('\'"').lower() if args and len(args) == 3 else None
+        if unit not in _DATEADD_UNITS:
+            # Leave anything we do not understand to DuckDB
+            out.append(query[pos:match.end()])
+            pos = match.end()
+            continue
+
+        amount = _rewrite_dateadd(args[1])
+        if unit in ('quarter', 'quarters', 'q'):
+            amount = f"({amount}) * 3"
+        out.append(query[pos:match.start()])
+        out.append(f"({_rewrite_dateadd(args[2])} + {_DATEADD_UNITS[unit]}(CAST({amount} AS BIGINT)))")
+        pos = end
+
+
+def translate_snowflake_sql(query: str, has_params: bool = False) -> str:
+    """Rewrite the Snowflake-specific SQL the app uses into DuckDB SQL.
+
+    DATE_TRUNC and CONTAINS exist in DuckDB with the same semantics, and
+    SOUNDEX is registered as a function on every DuckDB connection.
+    """
+    if has_params:
+        # pyformat placeholders -> qmark, '%%' -> '%' as the Snowflake connector does
+        query = _PLACEHOLDER.sub(lambda m: '?' if m.group(1) == 's' else '%', query)
+    query = _NILADIC_CALL.sub(lambda m: m.group(1).upper(), query)
+    query = _rewrite_dateadd(query)
+    # Fully qualified ROOTS_ROUTES.PUBLIC.<table> names live in the default schema locally
+    qualified = re.compile(
+        r'\b' + re.escape(SNOWFLAKE_CONFIG['database']) + r'\.' + re.escape(SNOWFLAKE_CONFIG['schema']) + r'\.',
+        re.IGNORECASE
+    )
+    return qualified.sub('', query)
+
+
+_SOUNDEX_CODES = {}
+for _letters, _code in (('BFPV', '1'), ('CGJKQSXZ', '2'), ('DT', '3'), ('L', '4'), ('MN', '5'), ('R', '6')):
+    for _letter in _letters:
+        _SOUNDEX_CODES[_letter] = _code
+
+
+def soundex(value: Optional[str]) -> Optional[str]:
+    """American Soundex code, matching Snowflake's SOUNDEX()."""
+    if value is None:
+        return None
+    letters = [c for c in value.upper() if 'A' <= c <= 'Z']
+    if not letters:
+        return ''
+
+    result = letters[0]
+    last = _SOUNDEX_CODES.get(letters[0], '')
+    for letter in letters[1:]:
+        code = _SOUNDEX_CODES.get(letter, '')
+        if code and code != last:
+            result += code
+            if len(result) == 4:
+                break
+        # H and W do not separate letters with the same code
+        if letter not in 'HW':
+            last = code
+    return result.ljust(4, '0')
+
+
+class _DuckDBCursor:
+    """DB-API cursor that translates Snowflake SQL before running it on DuckDB.
+
+    Cursors share their connection's DuckDB handle (and its registered
+    functions); a pooled connection is only used by one thread at a time.
+    """
+
+    def __init__(self, cursor):
+        self._cursor = cursor
+        self.rowcount = -1
+
+    def execute(self, query, params=None):
+        query = translate_snowflake_sql(query, has_params=bool(params))
+        if params:
+            self._cursor.execute(query, list(params))
+        else:
+            self._cursor.execute(query)
+        self.rowcount = -1
+        if _DML.match(query):
+            # DuckDB reports affected rows as a single-row result
+            row = self._cursor.fetchone()
+            self.rowcount = row[0] if row else 0
+        return self
+
+    def executemany(self, query, params_list):
+        query = translate_snowflake_sql(query, has_params=True)
+        self._cursor.executemany(query, [list(params) for params in params_list])
+        return self
+
+    def close(self):
+        # The DuckDB handle belongs to the connection
+        self.rowcount = -1
+
+    def __getattr__(self, name):
+        # fetchall, fetchone, description, fetchdf, register, ...
+        return getattr(self._cursor, name)
+
+
+class _DuckDBConnection:
+    """DB-API connection over one DuckDB cursor of the shared database."""
+
+    def __init__(self, conn):
+        self._conn = conn
+        self._closed = False
+
+    def cursor(self):
+        return _DuckDBCursor(self._conn)
+
+    def commit(self):
+        # Statements autocommit unless a transaction was opened explicitly
+        try:
+            self._conn.commit()
+        except Exception:
+            pass
+
+    def rollback(self):
+        try:
+            self._conn.rollback()
+        except Exception:
+            pass
+
+    def close(self):
+        if not self._closed:
+            self._closed = True
+            self._conn.close()
+
+    def is_closed(self) -> bool:
+        return self._closed
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+
+class DuckDBBackend(DatabaseBackend):
+    """Local embedded DuckDB file speaking the app's Snowflake SQL dialect.
+
+    One database handle is opened per process; every connection handed out
+    is a cursor on it, so pooled connections can run queries concurrently.
+    """
+
+    name = 'duckdb'
+
+    def __init__(self, path: str):
+        self.path = path
+        self._database = None
+        self._lock = threading.Lock()
+
+    def _get_database(self):
+        with self._lock:
+            if self._database is None:
+                import duckdb
+
+                directory = os.path.dirname(self.path)
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+                self._database = duckdb.connect(self.path)
+            return self._database
+
+    @staticmethod
+    def _register_functions(conn):
+        try:
+            from duckdb.sqltypes import VARCHAR
+        except ImportError:
+            # duckdb < 1.4
+            from duckdb.typing import VARCHAR
+
+        try:
+            conn.create_function('soundex', soundex, [VARCHAR], VARCHAR)
+        except Exception:
+            # Already registered on this connection
+            pass
+
+    def connect(self):
+        conn = self._get_database().cursor()
+        self._register_functions(conn)
+        return _DuckDBConnection(conn)
+
+    def write_dataframe(self, conn, df, table_name: str) -> Tuple[bool, int]:
+        cursor = conn.cursor()
+        view_name = f"_df_{uuid.uuid4().hex}"
+        try:
+            cursor.register(view_name, df)
+            cursor.execute(f"INSERT INTO {table_name} BY NAME SELECT * FROM {view_name}")
+            return True, len(df)
+        finally:
+            try:
+                cursor.unregister(view_name)
+            except Exception:
+                pass
+            cursor.close()
+
+    def close(self):
+        with self._lock:
+            if self._database is not None:
+                self._database.close()
+                self._database = None
+
+
+_backend = None
+_backend_lock = threading.Lock()
+
+
+def get_backend() -> DatabaseBackend:
+    """Return the process-wide backend selected by DATABASE_CONFIG['backend']."""
+    global _backend
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                backend = DATABASE_CONFIG['backend']
+                if backend == 'duckdb':
+                    _backend = DuckDBBackend(DATABASE_CONFIG['duckdb_path'])
+                elif backend == 'snowflake':
+                    _backend = SnowflakeBackend()
+                else:
+                    raise ValueError(f"Unknown database backend: {backend}")
+    return _backend
@@ -0,0 +1,176 @@
+import threading
+import time
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from src.utils.config import FACET_CONFIG
+from src.utils.query_cache import query_cache
+from src.utils.search_index import search_index
+
+# Faceted document types: source table, id column and the columns counted per value.
+# Document types match the search index so a text query narrows the counts.
+FACET_FIELDS = {
+    'heritage_sites': {
+        'table': 'HERITAGE_SITES',
+        'id': 'site_id',
+        'fields': ['state', 'heritage_type', 'risk_level', 'unesco_status']
+    },
+    'art_forms': {
+        'table': 'ART_FORMS',
+        'id': 'art_form_id',
+        'fields': ['category', 'origin_state', 'risk_level']
+    },
+    'cultural_events': {
+        'table': 'CULTURAL_EVENTS',
+        'id': 'event_id',
+        'fields': ['event_type', 'location', 'organizer']
+    }
+}
+
+
+def _bitmap(positions, size: int) -> int:
+    """Python int with the bits at the given row positions set."""
+    bits = np.zeros(size, dtype=bool)
+    bits[list(positions)] = True
+    return int.from_bytes(np.packbits(bits, bitorder='little').tobytes(), 'little')
+
+
+def _plain(value):
+    """Facet value as a plain Python scalar."""
+    return value.item() if hasattr(value, 'item') else value
+
+
+class _FacetTable:
+    """Row position per id and one bitmap of matching rows per field value."""
+
+    def __init__(self, ids: List, columns: Dict[str, List]):
+        self.size = len(ids)
+        self.positions = {doc_id: position for position, doc_id in enumerate(ids)}
+        self.all_rows = (1 << self.size) - 1
+        self.bitmaps = {}
+        for field, values in columns.items():
+            rows_by_value = {}
+            for position, value in enumerate(values):
+                if value is not None:
+                    rows_by_value.setdefault(value, []).append(position)
+            self.bitmaps[field] = {value: _bitmap(rows, self.size) for value, rows in rows_by_value.items()}
+
+    def rows_of(self, ids: List) -> int:
+        """Bitmap of the rows with the given ids."""
+        return _bitmap([self.positions[doc_id] for doc_id in ids if doc_id in self.positions], self.size)
+
+    def selection(self, field: str, selected) -> int:
+        """Bitmap of the rows having the selected value, or any of a list of values."""
+        values = selected if isinstance(selected, (list, tuple, set)) else [selected]
+        bitmap = 0
+        for value in values:
+            bitmap |= self.bitmaps[field].get(value, 0)
+        return bitmap
+
+
+class FacetIndex:
+    """In-memory bitmaps of the filterable columns of sites, art forms and events.
+
+    Counting a facet is a few bitmap intersections and popcounts instead of a
+    GROUP BY query per facet. Writes reported by the query cache mark a
+    table for reloading on its next use.
+    """
+
+    def __init__(self, refresh_interval: float):
+        self.refresh_interval = refresh_interval
+        self._tables = {}
+        self._loaded_at = {}
+        self._dirty = set(FACET_FIELDS)
+        self._lock = threading.Lock()
+        self._stats = {'counts': 0, 'loads': 0, 'last_load_duration': None}
+
+    def _load(self, doc_type: str) -> Optional[_FacetTable]:
+        from src.utils.database import fetch_dataframe
+
+        spec = FACET_FIELDS[doc_type]
+        start = time.time()
+        df = fetch_dataframe(f"SELECT {spec['id']}, {', '.join(spec['fields'])} FROM {spec['table']}", ttl=0)
+        if df is None:
+            print(f"Error loading facets for {doc_type}")
+            return None
+        df = df.astype(object).where(df.notna(), None)
+        table = _FacetTable([_plain(doc_id) for doc_id in df[spec['id']]],
+                            {field: [_plain(value) for value in df[field]] for field in spec['fields']})
+        with self._lock:
+            self._stats['loads'] += 1
+            self._stats['last_load_duration'] = time.time() - start
+        return table
+
+    def _table(self, doc_type: str) -> Optional[_FacetTable]:
+        """Bitmaps of one document type, reloaded when written to or older than the refresh interval."""
+        with self._lock:
+            table = self._tables.get(doc_type)
+            stale = (doc_type in self._dirty
+                     or time.monotonic() - self._loaded_at.get(doc_type, 0.0) >= self.refresh_interval)
+            if table is not None and not stale:
+                return table
+            self._dirty.discard(doc_type)
+
+        loaded = self._load(doc_type)
+        with self._lock:
+            if loaded is None:
+                self._dirty.add(doc_type)
+                return table
+            self._tables[doc_type] = loaded
+            self._loaded_at[doc_type] = time.monotonic()
+        return loaded
+
+    def on_tables_written(self, tables: List[str]):
+        """Query cache write listener: reload written tables on their next use."""
+        written = {table.upper() for table in tables}
+        with self._lock:
+            for doc_type, spec in FACET_FIELDS.items():
+                if '*' in written or spec['table'] in written:
+                    self._dirty.add(doc_type)
+
+    def counts(self, doc_type: str, query: Optional[str] = None,
+               selected: Optional[Dict] = None) -> Dict[str, Dict]:
+        """Number of matching rows per value of every facet field of a document type.
+
+        Rows match the text query (through the search index; the query is
+        ignored while the index is unavailable) and the ``selected`` values of
+        the other fields, so each count is what picking that value would
+        return. ``selected`` maps a field to a value or a list of values.
+        """
+        table = self._table(doc_type)
+        if table is None:
+            return {field: {} for field in FACET_FIELDS[doc_type]['fields']}
+
+        matching = table.all_rows
+        if query:
+            ids = search_index.search_ids(doc_type, query)
+            if ids is not None:
+                matching &= table.rows_of(ids)
+
+        selections = {field: table.selection(field, value)
+                      for field, value in (selected or {}).items() if value is not None}
+        counts = {}
+        for field, bitmaps in table.bitmaps.items():
+            rows = matching
+            for other, selection in selections.items():
+                if other != field:
+                    rows &= selection
+            counts[field] = {value: (rows & bitmap).bit_count() for value, bitmap in bitmaps.items()}
+        with self._lock:
+            self._stats['counts'] += 1
+        return counts
+
+    def stats(self) -> Dict:
+        """Rows and distinct values per document type plus load counters, for monitoring."""
+        with self._lock:
+            stats = dict(self._stats)
+            stats['rows'] = {doc_type: table.size for doc_type, table in self._tables.items()}
+            stats['values'] = {doc_type: sum(len(bitmaps) for bitmaps in table.bitmaps.values())
+                               for doc_type, table in self._tables.items()}
+        return stats
+
+
+# Shared facet bitmaps for every search box in the process
+facet_index = FacetIndex(FACET_CONFIG['refresh_interval'])
+query_cache.add_write_listener(facet_index.on_tables_written)
@@ -0,0 +1,226 @@
+import random
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Dict, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from src.utils.config import HTTP_CLIENT_CONFIG
+from src.utils.metrics_export import register_metrics
+
+# Responses worth another attempt
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class RateLimitExceeded(requests.exceptions.RequestException):
+    """No request token of a provider became available before the call's deadline."""
+
+
+class TokenBucket:
+    """Request tokens refilled at ``rate`` per second, holding at most ``burst``."""
+
+    def __init__(self, rate: float, burst: float):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = burst
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, timeout: float) -> Optional[float]:
+        """Take a token, waiting up to ``timeout`` seconds; returns the seconds waited, None if none came in time.
+
+        A wait that could not end before the timeout is not started.
+        """
+        start = time.monotonic()
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return waited
+                wait = (1 - self._tokens) / self.rate
+            if now - start + wait > timeout:
+                return None
+            time.sleep(wait)
+            waited = time.monotonic() - start
+
+
+class ProviderMetrics:
+    """Request counters and recent latencies of one provider."""
+
+    def __init__(self, samples: int):
+        self.latencies = deque(maxlen=samples)
+        self.counters = {'requests': 0, 'errors': 0, 'retries': 0, 'rate_limited': 0,
+                         'throttled': 0, 'rejected': 0, 'throttle_seconds': 0.0}
+        self.last_error = None
+
+    def summary(self) -> Dict:
+        latencies = sorted(self.latencies)
+        summary = dict(self.counters, last_error=self.last_error)
+        if latencies:
+            summary['avg_latency'] = sum(latencies) / len(latencies)
+            summary['p50_latency'] = latencies[len(latencies) // 2]
+            summary['p95_latency'] = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+            summary['max_latency'] = latencies[-1]
+        return summary
+
+
+class HttpClient:
+    """Shared outbound HTTP for Unsplash, Google Maps, OpenAI and image downloads.
+
+    Every call names its provider (a key of HTTP_CLIENT_CONFIG['providers']),
+    which sets its token bucket (requests per second and burst, tuned to
+    the provider's quota), per-attempt timeout, overall deadline and
+    retries. Requests share one pooled keep-alive session. 429 and 5xx
+    responses and connection errors are retried with jittered exponential
+    backoff (honouring Retry-After) while the deadline allows. Latencies
+    and errors are kept per provider and published for the admin portal.
+    """
+
+    def __init__(self, providers: Dict[str, Dict], pool_maxsize: int, backoff_base: float,
+                 backoff_max: float, latency_samples: int):
+        self.providers = providers
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=len(providers) + 4, pool_maxsize=pool_maxsize)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        self._buckets = {name: TokenBucket(spec['rate'], spec['burst']) for name, spec in providers.items()}
+        self._metrics = {name: ProviderMetrics(latency_samples) for name in providers}
+        self._lock = threading.Lock()
+
+    def _count(self, provider: str, counter: str, amount=1):
+        with self._lock:
+            self._metrics[provider].counters[counter] += amount
+
+    def _record(self, provider: str, latency: float, error: Optional[str] = None):
+        with self._lock:
+            metrics = self._metrics[provider]
+            metrics.counters['requests'] += 1
+            metrics.latencies.append(latency)
+            if error:
+                metrics.counters['errors'] += 1
+                metrics.last_error = error
+
+    def _acquire(self, provider: str, deadline: float):
+        """Wait for a request token of a provider, or raise RateLimitExceeded past the deadline."""
+        waited = self._buckets[provider].acquire(max(0.0, deadline - time.monotonic()))
+        if waited is None:
+            self._count(provider, 'rejected')
+            raise RateLimitExceeded(f"{provider} request budget exhausted")
+        if waited > 0:
+            self._count(provider, 'throttled')
+            self._count(provider, 'throttle_seconds', waited)
+
+    def _backoff(self, attempt: int, retry_after: Optional[str]) -> float:
+        """Seconds before the next attempt: Retry-After if given, else full-jitter exponential backoff."""
+        if retry_after:
+            try:
+                return float(retry_after)
+            except ValueError:
+                pass
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+
+    def request(self, provider: str, method: str, url: str, **kwargs) -> requests.Response:
+        """Send a request within the provider's rate, timeout, retry and deadline limits.
+
+        Returns the last response, which may still be an error status; raises
+        the last connection error, or RateLimitExceeded when no token came in time.
+        """
+        spec = self.providers[provider]
+        deadline = time.monotonic() + spec['deadline']
+        attempt_timeout = kwargs.pop('timeout', None) or spec['timeout']
+        attempt = 0
+        while True:
+            self._acquire(provider, deadline)
+            timeout = min(attempt_timeout, max(deadline - time.monotonic(), 0.1))
+            start = time.monotonic()
+            try:
+                response = self.session.request(method, url, timeout=timeout, **kwargs)
+            except requests.exceptions.RequestException as e:
+                self._record(provider, time.monotonic() - start, type(e).__name__)
+                wait = self._backoff(attempt, None)
+                if attempt >= spec['retries'] or time.monotonic() + wait >= deadline:
+                    raise
+            else:
+                failed = response.status_code in RETRY_STATUSES
+                self._record(provider, time.monotonic() - start,
+                             f"HTTP {response.status_code}" if response.status_code >= 400 else None)
+                if response.status_code == 429:
+                    self._count(provider, 'rate_limited')
+                if not failed:
+                    return response
+                wait = self._backoff(attempt, response.headers.get('Retry-After'))
+                if attempt >= spec['retries'] or time.monotonic() + wait >= deadline:
+                    return response
+                response.close()
+            attempt += 1
+            self._count(provider, 'retries')
+            time.sleep(wait)
+
+    def get(self, provider: str, url: str, **kwargs) -> requests.Response:
+        return self.request(provider, 'GET', url, **kwargs)
+
+    def session_for(self, provider: str) -> requests.Session:
+        """requests.Session whose requests go through a provider's limits, for client libraries."""
+        return _ProviderSession(self, provider)
+
+    @contextmanager
+    def track(self, provider: str):
+        """Rate limit and time a call made by a provider's own SDK (e.g. OpenAI).
+
+        The SDK does its own retries; this takes one token and records the
+        call's latency (time to the response, for streams) and any error.
+        """
+        self._acquire(provider, time.monotonic() + self.providers[provider]['deadline'])
+        start = time.monotonic()
+        try:
+            yield
+        except Exception as e:
+            self._record(provider, time.monotonic() - start, type(e).__name__)
+            raise
+        self._record(provider, time.monotonic() - start)
+
+    def stats(self) -> Dict[str, Dict]:
+        """Counters and latency percentiles (seconds) per provider, for monitoring."""
+        with self._lock:
+            return {provider: metrics.summary() for provider, metrics in self._metrics.items()}
+
+
+class _ProviderSession(requests.Session):
+    """Session handed to client libraries; its requests are sent by HttpClient.request."""
+
+    def __init__(self, client: HttpClient, provider: str):
+        super().__init__()
+        self._client = client
+        self._provider = provider
+
+    def request(self, method, url, **kwargs):
+        return self._client.request(self._provider, method, url, **kwargs)
+
+
+# Shared outbound HTTP client for the process
+http_client = HttpClient(
+    HTTP_CLIENT_CONFIG['providers'],
+    HTTP_CLIENT_CONFIG['pool_maxsize'],
+    HTTP_CLIENT_CONFIG['backoff_base'],
+    HTTP_CLIENT_CONFIG['backoff_max'],
+    HTTP_CLIENT_CONFIG['latency_samples']
+)
+register_metrics('http_client', http_client.stats)
+
+
+def google_maps_client(api_key: str):
+    """googlemaps.Client whose requests go through the shared client's 'google_maps' limits."""
+    import googlemaps
+
+    spec = HTTP_CLIENT_CONFIG['providers']['google_maps']
+    return googlemaps.Client(key=api_key, requests_session=http_client.session_for('google_maps'),
+                             timeout=spec['timeout'], retry_timeout=spec['deadline'])
@@ -1,8 +1,13 @@
 import os
 from openai import OpenAI
-from src.utils.config import OPENAI_API_KEY, OPENAI_MODEL
+from src.utils.config import HTTP_CLIENT_CONFIG, OPENAI_API_KEY, OPENAI_MODEL
+from src.utils.http_client import http_client
 
-OpenAIClient = OpenAI(api_key=OPENAI_API_KEY)
+OpenAIClient = OpenAI(
+    api_key=OPENAI_API_KEY,
+    timeout=HTTP_CLIENT_CONFIG['providers']['openai']['timeout'],
+    max_retries=HTTP_CLIENT_CONFIG['providers']['openai']['retries']
+)
 
 def generate_site_story(site):
     """
@@ -32,21 +37,22 @@ def generate_site_story(site):
         """
 
         # Call OpenAI API
-        response = OpenAIClient.chat.completions.create(
-            model=OPENAI_MODEL,
-            messages=[
-                {
-                    "role": "system",
-                    "content": "You are a knowledgeable heritage site storyteller who creates engaging narratives about historical places. It must not be more than 550 words."
-                },
-                {
-                    "role": "user",
-                    "content": prompt
-                }
-            ],
-            temperature=0.7,
-            stream=True
-        )
+        with http_client.track('openai'):
+            response = OpenAIClient.chat.completions.create(
+                model=OPENAI_MODEL,
+                messages=[
+                    {
+                        "role": "system",
+                        "content": "You are a knowledgeable heritage site storyteller who creates engaging narratives about historical places. It must not be more than 550 words."
+                    },
+                    {
+                        "role": "user",
+                        "content": prompt
+                    }
+                ],
+                temperature=0.7,
+                stream=True
+            )
 
         # Extract and return the generated story
         # return response.choices[0].message.content
@@ -92,21 +98,22 @@ def generate_user_custom_site_story(site, user_input):
         """
 
         # Call OpenAI API
-        response = OpenAIClient.chat.completions.create(
-            model=OPENAI_MODEL,
-            messages=[
-                {
-                    "role": "system",
-                    "content": "You are a knowledgeable heritage site storyteller who creates engaging narratives about historical places. It must not be more than 550 words."
-                },
-                {
-                    "role": "user",
-                    "content": prompt
-                }
-            ],
-            temperature=0.7,
-            stream=True
-        )
+        with http_client.track('openai'):
+            response = OpenAIClient.chat.completions.create(
+                model=OPENAI_MODEL,
+                messages=[
+                    {
+                        "role": "system",
+                        "content": "You are a knowledgeable heritage site storyteller who creates engaging narratives about historical places. It must not be more than 550 words."
+                    },
+                    {
+                        "role": "user",
+                        "content": prompt
+                    }
+                ],
+                temperature=0.7,
+                stream=True
+            )
 
         # Extract and return the generated story
         # return response.choices[0].message.content
@@ -0,0 +1,80 @@
+import json
+import os
+import socket
+import tempfile
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+from src.utils.config import METRICS_EXPORT_CONFIG
+
+_collectors = {}
+_lock = threading.Lock()
+_publisher = None
+
+
+def _process_name() -> str:
+    return f"{socket.gethostname()}-{os.getpid()}"
+
+
+def write_snapshot():
+    """Write the current metrics of every registered collector to this process's snapshot file."""
+    with _lock:
+        collectors = dict(_collectors)
+    metrics = {}
+    for name, collect in collectors.items():
+        try:
+            metrics[name] = collect()
+        except Exception as e:
+            print(f"Error collecting {name} metrics: {e}")
+    snapshot = {'process': _process_name(), 'updated_at': time.time(), 'metrics': metrics}
+
+    directory = METRICS_EXPORT_CONFIG['path']
+    try:
+        os.makedirs(directory, exist_ok=True)
+        handle, temporary = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        with os.fdopen(handle, 'w') as file:
+            json.dump(snapshot, file, default=str)
+        os.replace(temporary, os.path.join(directory, f"{snapshot['process']}.json"))
+    except Exception as e:
+        print(f"Error writing metrics snapshot: {e}")
+
+
+def _publish():
+    while True:
+        time.sleep(METRICS_EXPORT_CONFIG['interval'])
+        write_snapshot()
+
+
+def register_metrics(name: str, collect: Callable[[], Dict]):
+    """Publish ``collect()`` under ``name`` in this process's periodic metrics snapshot."""
+    global _publisher
+    with _lock:
+        _collectors[name] = collect
+        if _publisher is not None or not METRICS_EXPORT_CONFIG['enabled']:
+            return
+        _publisher = threading.Thread(target=_publish, name='metrics-export', daemon=True)
+    _publisher.start()
+
+
+def read_snapshots(max_age: Optional[float] = None) -> List[Dict]:
+    """Latest snapshot of every process that wrote one within ``max_age`` seconds, oldest process first.
+
+    Each is {'process', 'updated_at', 'metrics': {name: collected metrics}}.
+    """
+    max_age = METRICS_EXPORT_CONFIG['max_age'] if max_age is None else max_age
+    directory = METRICS_EXPORT_CONFIG['path']
+    try:
+        names = [name for name in os.listdir(directory) if name.endswith('.json')]
+    except OSError:
+        return []
+    snapshots = []
+    for name in names:
+        try:
+            with open(os.path.join(directory, name)) as file:
+                snapshot = json.load(file)
+        except (OSError, ValueError):
+            continue
+        if time.time() - snapshot.get('updated_at', 0) <= max_age:
+            snapshots.append(snapshot)
+    return sorted(snapshots, key=lambda snapshot: snapshot['process'])
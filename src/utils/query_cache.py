@@ -0,0 +1,330 @@
+import re
+import sys
+import threading
+import time
+from collections import OrderedDict, defaultdict
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+import pandas as pd
+
+from src.utils.config import QUERY_CACHE_CONFIG
+from src.utils.metrics_export import register_metrics
+
+_IDENTIFIER = r'(?:"[^"]+"|[A-Za-z_][\w$]*)(?:\s*\.\s*(?:"[^"]+"|[A-Za-z_][\w$]*))*'
+
+# Tables referenced by FROM / JOIN clauses
+_TABLE_REF = re.compile(r'\b(?:FROM|JOIN)\s+(' + _IDENTIFIER + ')', re.IGNORECASE)
+# Comma separated FROM lists ("FROM a, b") up to the next clause
+_FROM_LIST = re.compile(
+    r'\bFROM\s+(.*?)(?=\bWHERE\b|\bGROUP\b|\bORDER\b|\bLIMIT\b|\bHAVING\b|\bQUALIFY\b|\bUNION\b|\bJOIN\b|[()]|$)',
+    re.IGNORECASE | re.DOTALL
+)
+# Target table of a write statement
+_WRITE_TARGET = re.compile(
+    r'^\s*(?:INSERT\s+(?:OVERWRITE\s+)?INTO|UPDATE|DELETE\s+FROM|MERGE\s+INTO|COPY\s+INTO|'
+    r'TRUNCATE\s+(?:TABLE\s+)?(?:IF\s+EXISTS\s+)?|DROP\s+(?:DYNAMIC\s+)?TABLE\s+(?:IF\s+EXISTS\s+)?|'
+    r'ALTER\s+(?:DYNAMIC\s+)?TABLE\s+(?:IF\s+EXISTS\s+)?|'
+    r'CREATE\s+(?:OR\s+REPLACE\s+)?(?:TRANSIENT\s+|TEMPORARY\s+|DYNAMIC\s+)?TABLE\s+(?:IF\s+NOT\s+EXISTS\s+)?)'
+    r'\s*(' + _IDENTIFIER + ')',
+    re.IGNORECASE
+)
+# Statements that change table definitions rather than data
+_DDL = re.compile(
+    r'^\s*(?:CREATE|ALTER|DROP|UNDROP|COMMENT\s+ON)\b', re.IGNORECASE
+)
+_READ_ONLY = re.compile(r'^\s*(?:SELECT|WITH|SHOW|DESC|DESCRIBE|EXPLAIN)\b', re.IGNORECASE)
+_COMMENTS = re.compile(r'--[^\n]*|/\*.*?\*/', re.DOTALL)
+_WHITESPACE = re.compile(r'\s+')
+
+
+def normalize_sql(query: str) -> str:
+    """Strip comments, collapse whitespace and drop a trailing semicolon."""
+    query = _COMMENTS.sub(' ', query)
+    return _WHITESPACE.sub(' ', query).strip().rstrip(';').strip()
+
+
+def is_read_only(query: str) -> bool:
+    """Whether a statement only reads data and may be served from the cache."""
+    return bool(_READ_ONLY.match(_COMMENTS.sub(' ', query)))
+
+
+def is_ddl(query: str) -> bool:
+    """Whether a statement may change the schema (tables, views or columns)."""
+    return bool(_DDL.match(_COMMENTS.sub(' ', query)))
+
+
+def _table_name(identifier: str) -> str:
+    """Reduce DB.SCHEMA.TABLE or a quoted identifier to an upper-case table name."""
+    return identifier.split('.')[-1].strip().strip('"').upper()
+
+
+def extract_tables(query: str) -> Set[str]:
+    """Best-effort set of tables a SELECT statement reads.
+
+    Over-matching (CTE names, aliases) only costs an extra invalidation.
+    """
+    query = normalize_sql(query)
+    tables = {_table_name(match) for match in _TABLE_REF.findall(query)}
+    for from_list in _FROM_LIST.findall(query):
+        for part in from_list.split(',')[1:]:
+            name = part.strip().split(' ')[0]
+            if name and re.match(_IDENTIFIER + '$', name):
+                tables.add(_table_name(name))
+    return tables
+
+
+def write_target(query: str) -> Optional[str]:
+    """Table written by an INSERT/UPDATE/DELETE/MERGE/DDL statement, if recognisable."""
+    match = _WRITE_TARGET.match(normalize_sql(query))
+    return _table_name(match.group(1)) if match else None
+
+
+def _estimate_size(value) -> int:
+    """Approximate memory footprint of a cached result in bytes."""
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(index=True, deep=True).sum())
+    if hasattr(value, 'estimate_size'):
+        return value.estimate_size()
+    if isinstance(value, (list, tuple)):
+        size = sys.getsizeof(value)
+        for row in value:
+            size += sys.getsizeof(row)
+            if isinstance(row, (list, tuple)):
+                size += sum(sys.getsizeof(item) for item in row)
+            elif isinstance(row, dict):
+                size += sum(sys.getsizeof(item) for item in row.values())
+        return size
+    return sys.getsizeof(value)
+
+
+def _copy(value):
+    """Hand callers their own copy so they cannot mutate the cached value."""
+    if isinstance(value, pd.DataFrame):
+        return value.copy()
+    if isinstance(value, list):
+        return list(value)
+    if hasattr(value, 'copy'):
+        return value.copy()
+    return value
+
+
+class _CacheEntry:
+    __slots__ = ('value', 'expires_at', 'tables', 'versions', 'size')
+
+    def __init__(self, value, expires_at, tables, versions, size):
+        self.value = value
+        self.expires_at = expires_at
+        self.tables = tables
+        self.versions = versions
+        self.size = size
+
+
+class QueryCache:
+    """Process-wide LRU cache of query results bounded by memory size.
+
+    Each entry remembers the version of every table it read. Writes bump the
+    versions of the tables they touch, so dependent entries are dropped and a
+    query that was already running when the write happened is not cached.
+    """
+
+    def __init__(self, max_bytes: int, default_ttl: float):
+        self.max_bytes = max_bytes
+        self.default_ttl = default_ttl
+        self._entries = OrderedDict()
+        self._keys_by_table = defaultdict(set)
+        self._table_versions = defaultdict(int)
+        self._ddl_listeners = []
+        self._write_listeners = []
+        self._bytes = 0
+        self._lock = threading.RLock()
+        self._stats = {
+            'hits': 0,
+            'misses': 0,
+            'evictions': 0,
+            'expirations': 0,
+            'invalidations': 0
+        }
+
+    @staticmethod
+    def make_key(query: str, params=None, kind: str = 'rows') -> Tuple:
+        """Cache key from the result shape, normalized SQL text and bind parameters."""
+        if params is None:
+            params_key = ()
+        elif isinstance(params, dict):
+            params_key = tuple(sorted((k, repr(v)) for k, v in params.items()))
+        else:
+            params_key = tuple(repr(p) for p in params)
+        return kind, normalize_sql(query), params_key
+
+    def snapshot_versions(self, tables: Iterable[str]) -> Dict[str, int]:
+        """Current versions of the given tables, taken before running a query."""
+        with self._lock:
+            versions = {table: self._table_versions[table] for table in tables}
+            # '*' is bumped by clear() so unrecognised writes invalidate everything
+            versions['*'] = self._table_versions['*']
+            return versions
+
+    def get(self, key) -> Tuple[bool, object]:
+        """Return (hit, value); expired or invalidated entries count as misses."""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry.expires_at <= now:
+                    self._remove(key)
+                    self._stats['expirations'] += 1
+                elif any(self._table_versions[t] != v for t, v in entry.versions.items()):
+                    self._remove(key)
+                else:
+                    self._entries.move_to_end(key)
+                    self._stats['hits'] += 1
+                    return True, _copy(entry.value)
+            self._stats['misses'] += 1
+            return False, None
+
+    def put(self, key, value, tables: Set[str], ttl: Optional[float] = None,
+            versions: Optional[Dict[str, int]] = None):
+        """Store a result unless a dependent table changed while it was being computed."""
+        ttl = self.default_ttl if ttl is None else ttl
+        if ttl <= 0:
+            return
+
+        size = _estimate_size(value)
+        if size > self.max_bytes:
+            return
+
+        with self._lock:
+            if versions is None:
+                versions = self.snapshot_versions(tables)
+            elif any(self._table_versions[t] != v for t, v in versions.items()):
+                return
+
+            if key in self._entries:
+                self._remove(key)
+
+            self._entries[key] = _CacheEntry(value, time.monotonic() + ttl, set(tables), versions, size)
+            self._bytes += size
+            for table in tables:
+                self._keys_by_table[table].add(key)
+
+            # Evict least recently used entries until we fit in the memory budget
+            while self._bytes > self.max_bytes and self._entries:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self._stats['evictions'] += 1
+
+    def invalidate_tables(self, tables: Iterable[str]):
+        """Bump table versions and drop every entry that read any of them."""
+        with self._lock:
+            tables = [_table_name(table) for table in tables]
+            for table in tables:
+                self._table_versions[table] += 1
+                for key in list(self._keys_by_table.pop(table, ())):
+                    if key in self._entries:
+                        self._remove(key)
+                        self._stats['invalidations'] += 1
+            listeners = list(self._write_listeners)
+        for callback in listeners:
+            callback(tables)
+
+    def add_write_listener(self, callback: Callable[[List[str]], None]):
+        """Call ``callback`` with the table names whenever tables are written.
+
+        A write the cache cannot attribute to a table passes ['*'].
+        """
+        with self._lock:
+            self._write_listeners.append(callback)
+
+    def add_ddl_listener(self, callback: Callable[[], None]):
+        """Call ``callback`` whenever a DDL statement runs through the cache."""
+        with self._lock:
+            self._ddl_listeners.append(callback)
+
+    def invalidate_for_statement(self, query: str) -> Optional[str]:
+        """Invalidate whatever a write statement touched; clear everything if unsure."""
+        if is_ddl(query):
+            with self._lock:
+                listeners = list(self._ddl_listeners)
+            for callback in listeners:
+                callback()
+
+        table = write_target(query)
+        if table:
+            self.invalidate_tables([table])
+        else:
+            self.clear()
+        return table
+
+    def clear(self):
+        """Drop every entry."""
+        with self._lock:
+            self._table_versions['*'] += 1
+            self._stats['invalidations'] += len(self._entries)
+            self._entries.clear()
+            self._keys_by_table.clear()
+            self._bytes = 0
+            listeners = list(self._write_listeners)
+        for callback in listeners:
+            callback(['*'])
+
+    def stats(self) -> Dict:
+        """Hit/miss counters and current size, for monitoring."""
+        with self._lock:
+            stats = dict(self._stats)
+            lookups = stats['hits'] + stats['misses']
+            stats.update({
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'max_bytes': self.max_bytes,
+                'hit_rate': stats['hits'] / lookups if lookups else 0.0
+            })
+        return stats
+
+    def _remove(self, key):
+        entry = self._entries.pop(key)
+        self._bytes -= entry.size
+        for table in entry.tables:
+            keys = self._keys_by_table.get(table)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._keys_by_table[table]
+
+
+# Shared cache for every query path in the process
+query_cache = QueryCache(
+    max_bytes=QUERY_CACHE_CONFIG['max_bytes'],
+    default_ttl=QUERY_CACHE_CONFIG['default_ttl']
+)
+register_metrics('query_cache', query_cache.stats)
+
+
+def cached_fetch(query: str, params, fetch: Callable, ttl: Optional[float] = None, kind: str = 'rows'):
+    """Serve a read-only query from the cache, calling fetch() on a miss.
+
+    Write statements are executed through fetch() and then invalidate the
+    tables they touched. ``ttl=0`` bypasses the cache for a single call.
+    ``kind`` separates results of the same query fetched in different shapes
+    (row tuples vs DataFrames).
+    """
+    if not is_read_only(query):
+        try:
+            return fetch()
+        finally:
+            query_cache.invalidate_for_statement(query)
+
+    if not QUERY_CACHE_CONFIG['enabled'] or ttl == 0:
+        return fetch()
+
+    key = query_cache.make_key(query, params, kind)
+    hit, value = query_cache.get(key)
+    if hit:
+        return value
+
+    tables = extract_tables(query)
+    versions = query_cache.snapshot_versions(tables)
+    value = fetch()
+    # Failed queries return None and are never cached
+    if value is not None:
+        query_cache.put(key, value, tables, ttl, versions)
+    return _copy(value)
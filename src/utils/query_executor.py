@@ -0,0 +1,89 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from src.utils.config import QUERY_EXECUTOR_CONFIG
+from src.utils.database import execute_query, fetch_dataframe
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    """Shared worker pool for concurrent page queries, created on first use."""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=QUERY_EXECUTOR_CONFIG['max_workers'],
+                                           thread_name_prefix='query-executor')
+        return _executor
+
+
+def run_concurrently(tasks: Dict[str, Callable[[], Any]], timeout: Optional[float] = None,
+                     timeouts: Optional[Dict[str, float]] = None,
+                     defaults: Optional[Dict[str, Any]] = None,
+                     queue_timeout: Optional[float] = None) -> Dict[str, Any]:
+    """Run independent named loaders in parallel and gather their results by name.
+
+    Each task gets ``timeouts[name]`` (or ``timeout``, or the configured
+    default) seconds counted from when a worker starts running it, so time
+    spent queued behind other pages' tasks on the shared pool does not use
+    up its deadline. A task still queued after ``queue_timeout`` seconds
+    (QUERY_EXECUTOR_CONFIG['max_queue_wait'] by default) is cancelled. A task
+    that fails or runs out of time yields ``defaults[name]`` (None if not
+    given); a started one keeps running in the background and still returns
+    its connection to the pool and fills the query cache when it finishes.
+    """
+    timeout = QUERY_EXECUTOR_CONFIG['default_timeout'] if timeout is None else timeout
+    queue_timeout = QUERY_EXECUTOR_CONFIG['max_queue_wait'] if queue_timeout is None else queue_timeout
+    timeouts = timeouts or {}
+    defaults = defaults or {}
+
+    started_at = {}
+    started = {name: threading.Event() for name in tasks}
+
+    def timed(name, task):
+        def run():
+            started_at[name] = time.monotonic()
+            started[name].set()
+            return task()
+        return run
+
+    executor = _get_executor()
+    submitted = time.monotonic()
+    futures = {name: executor.submit(timed(name, task)) for name, task in tasks.items()}
+
+    results = {}
+    for name, future in futures.items():
+        limit = timeouts.get(name, timeout)
+        try:
+            if not started[name].wait(max(submitted + queue_timeout - time.monotonic(), 0)):
+                if future.cancel():
+                    print(f"Query '{name}' waited {queue_timeout}s for a worker")
+                    results[name] = defaults.get(name)
+                    continue
+                started[name].wait()
+            remaining = started_at[name] + limit - time.monotonic()
+            results[name] = future.result(timeout=max(remaining, 0))
+        except FutureTimeoutError:
+            print(f"Query '{name}' timed out after {limit}s")
+            results[name] = defaults.get(name)
+        except Exception as e:
+            print(f"Error running query '{name}': {e}")
+            results[name] = defaults.get(name)
+    return results
+
+
+def execute_queries(queries: Dict[str, Tuple[str, Any]], as_dataframe: bool = False,
+                    ttl: Optional[float] = None, timeout: Optional[float] = None,
+                    timeouts: Optional[Dict[str, float]] = None) -> Dict[str, Any]:
+    """Run a batch of named ``(query, params)`` pairs concurrently on pooled connections.
+
+    Results are row tuples as from execute_query, or DataFrames with
+    ``as_dataframe``; failed or timed out queries yield None.
+    """
+    fetch = fetch_dataframe if as_dataframe else execute_query
+    tasks = {name: (lambda query=query, params=params: fetch(query, params, ttl=ttl))
+             for name, (query, params) in queries.items()}
+    return run_concurrently(tasks, timeout=timeout, timeouts=timeouts)
@@ -0,0 +1,111 @@
+import threading
+import time
+from typing import Dict, List, Optional, Sequence
+
+from src.utils.config import SCHEMA_CATALOG_CONFIG
+from src.utils.metrics_export import register_metrics
+from src.utils.query_cache import query_cache
+
+
+class SchemaCatalog:
+    """Process-wide cache of the tables and columns in the current schema.
+
+    The whole catalog is loaded with one information_schema query and reused
+    until the TTL expires or a DDL statement (CREATE/ALTER/DROP TABLE) runs
+    through the app.
+    """
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self._columns = None  # upper-case table name -> column names in ordinal order
+        self._resolved = {}
+        self._loaded_at = 0.0
+        self._lock = threading.Lock()
+        self._stats = {'loads': 0, 'lookups': 0}
+
+    def _load(self) -> Dict[str, List[str]]:
+        """Read every table's columns of the current schema in one round trip."""
+        from src.utils.database import get_db_connection
+
+        conn = get_db_connection()
+        cursor = conn.cursor()
+        try:
+            cursor.execute("""
+                SELECT table_name, column_name
+                FROM information_schema.columns
+                WHERE table_schema = current_schema()
+                ORDER BY table_name, ordinal_position
+            """)
+            columns = {}
+            for table_name, column_name in cursor.fetchall():
+                columns.setdefault(table_name.upper(), []).append(column_name)
+            return columns
+        finally:
+            cursor.close()
+            conn.close()
+
+    def _catalog(self) -> Dict[str, List[str]]:
+        """The cached catalog, reloaded when stale."""
+        with self._lock:
+            self._stats['lookups'] += 1
+            if self._columns is not None and time.monotonic() - self._loaded_at < self.ttl:
+                return self._columns
+
+            try:
+                self._columns = self._load()
+                self._stats['loads'] += 1
+            except Exception as e:
+                print(f"Error loading schema catalog: {e}")
+                # Keep serving the previous catalog rather than failing every caller
+                if self._columns is None:
+                    return {}
+            self._resolved = {}
+            self._loaded_at = time.monotonic()
+            return self._columns
+
+    def tables(self) -> List[str]:
+        """Upper-case names of the tables and views in the current schema."""
+        return sorted(self._catalog())
+
+    def has_table(self, table_name: str) -> bool:
+        """Whether a table or view exists in the current schema."""
+        return table_name.upper() in self._catalog()
+
+    def columns(self, table_name: str) -> List[str]:
+        """Column names of a table in ordinal order, or [] if it does not exist."""
+        return list(self._catalog().get(table_name.upper(), []))
+
+    def find_column(self, table_name: str, candidates: Sequence[str]) -> Optional[str]:
+        """Actual name of the first column of a table matching one of the candidate names.
+
+        Resolves aliases such as SITE_ID/HERITAGE_ID once per catalog load.
+        """
+        columns = self._catalog().get(table_name.upper(), [])
+        key = (table_name.upper(), tuple(candidate.upper() for candidate in candidates))
+        with self._lock:
+            if key in self._resolved:
+                return self._resolved[key]
+        column = next((col for col in columns if col.upper() in key[1]), None)
+        with self._lock:
+            self._resolved[key] = column
+        return column
+
+    def invalidate(self):
+        """Drop the cached catalog so the next lookup reloads it."""
+        with self._lock:
+            self._columns = None
+            self._resolved = {}
+
+    def stats(self) -> Dict:
+        """Load and lookup counters, for monitoring."""
+        with self._lock:
+            stats = dict(self._stats)
+            stats['tables'] = len(self._columns) if self._columns is not None else 0
+            stats['age'] = time.monotonic() - self._loaded_at if self._columns is not None else None
+        return stats
+
+
+# Shared catalog for every metadata lookup in the process
+schema_catalog = SchemaCatalog(ttl=SCHEMA_CATALOG_CONFIG['ttl'])
+query_cache.add_ddl_listener(schema_catalog.invalidate)
+register_metrics('schema_catalog', schema_catalog.stats)
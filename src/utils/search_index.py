@@ -0,0 +1,435 @@
+import math
+import os
+import pickle
+import re
+import threading
+import time
+from bisect import bisect_left
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+
+from src.utils.config import SEARCH_INDEX_CONFIG
+from src.utils.metrics_export import register_metrics
+from src.utils.query_cache import query_cache
+
+# Searchable document types: source table, id column and text fields with their weight
+INDEXED_TABLES = {
+    'heritage_sites': {
+        'table': 'HERITAGE_SITES',
+        'id': 'site_id',
+        'fields': {'name': 3.0, 'location': 1.5, 'city': 1.5, 'description': 1.0}
+    },
+    'art_forms': {
+        'table': 'ART_FORMS',
+        'id': 'art_form_id',
+        'fields': {'name': 3.0, 'category': 1.5, 'origin_state': 1.5, 'description': 1.0}
+    },
+    'cultural_events': {
+        'table': 'CULTURAL_EVENTS',
+        'id': 'event_id',
+        'fields': {'name': 3.0, 'location': 1.5, 'organizer': 1.5, 'description': 1.0}
+    }
+}
+
+# Weight of a query term's expansions relative to an exact match
+PREFIX_WEIGHT = 0.8
+PHONETIC_WEIGHT = 0.6
+TRIGRAM_WEIGHT = 0.7
+MAX_EXPANSIONS = 50
+
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+_FORMAT_VERSION = 1
+_TOKEN = re.compile(r'\w+')
+_STOP_WORDS = {'a', 'an', 'and', 'at', 'by', 'for', 'in', 'of', 'on', 'or', 'the', 'to', 'with'}
+_SOUNDEX_CODES = {
+    **dict.fromkeys('bfpv', '1'), **dict.fromkeys('cgjkqsxz', '2'), **dict.fromkeys('dt', '3'),
+    'l': '4', **dict.fromkeys('mn', '5'), 'r': '6'
+}
+
+
+def _plain(value):
+    """Python scalar of a value fetched through pandas, so ids and hashes pickle and compare plainly."""
+    return value.item() if hasattr(value, 'item') else value
+
+
+def tokenize(text) -> List[str]:
+    """Lower-case word tokens of a text, without stop words."""
+    if not text:
+        return []
+    return [token for token in _TOKEN.findall(str(text).lower()) if token not in _STOP_WORDS]
+
+
+def soundex(term: str) -> Optional[str]:
+    """American Soundex code of a term (as the warehouse SOUNDEX), or None for non-letters."""
+    letters = [char for char in term.lower() if 'a' <= char <= 'z']
+    if not letters:
+        return None
+    code = letters[0].upper()
+    previous = _SOUNDEX_CODES.get(letters[0], '')
+    for char in letters[1:]:
+        digit = _SOUNDEX_CODES.get(char, '')
+        if digit and digit != previous:
+            code += digit
+            if len(code) == 4:
+                break
+        # h and w do not separate letters with the same code; vowels do
+        if char not in 'hw':
+            previous = digit
+    return code.ljust(4, '0')
+
+
+def trigrams(term: str) -> set:
+    """Character trigrams of a term padded with word boundaries."""
+    padded = f"  {term} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class SearchIndex:
+    """In-process inverted index over the text columns of sites, art forms and events.
+
+    Documents are ranked with BM25 over field-weighted term frequencies. Query
+    terms also match indexed terms they prefix, terms with the same Soundex
+    code and terms with similar trigrams, so partial words and misspellings
+    still find results.
+
+    The index is built from one snapshot of the tables and saved to disk.
+    After a restart or a write to an indexed table, only the rows whose
+    content hash changed are re-read. Loading, building and re-syncing run in
+    a background thread, never inside a search.
+    """
+
+    def __init__(self, path: str, refresh_interval: float):
+        self.path = path
+        self.refresh_interval = refresh_interval
+        self._lock = threading.RLock()
+        self._refresh_lock = threading.Lock()
+        self._loaded = False
+        self._ready = False
+        self._refreshing = False
+        self._dirty = set(INDEXED_TABLES)
+        self._checked_at = 0.0
+        self._stats = {'builds': 0, 'refreshes': 0, 'documents_updated': 0, 'searches': 0}
+        self._reset()
+
+    def _reset(self):
+        # doc type -> doc id -> (content hash, {term: weighted frequency}, weighted length)
+        self._docs = {doc_type: {} for doc_type in INDEXED_TABLES}
+        # doc type -> term -> {doc id: weighted frequency}
+        self._postings = {doc_type: defaultdict(dict) for doc_type in INDEXED_TABLES}
+        self._total_length = {doc_type: 0.0 for doc_type in INDEXED_TABLES}
+        # Vocabulary across all types, for fuzzy expansion
+        self._term_refs = defaultdict(int)
+        self._soundex = defaultdict(set)
+        self._trigrams = defaultdict(set)
+        self._sorted_terms = None
+
+    # -- maintenance -------------------------------------------------------
+
+    def _add_term(self, term: str):
+        self._term_refs[term] += 1
+        if self._term_refs[term] == 1:
+            code = soundex(term)
+            if code:
+                self._soundex[code].add(term)
+            for gram in trigrams(term):
+                self._trigrams[gram].add(term)
+            self._sorted_terms = None
+
+    def _drop_term(self, term: str):
+        self._term_refs[term] -= 1
+        if self._term_refs[term] == 0:
+            del self._term_refs[term]
+            code = soundex(term)
+            if code:
+                self._soundex[code].discard(term)
+            for gram in trigrams(term):
+                self._trigrams[gram].discard(term)
+            self._sorted_terms = None
+
+    def _remove_document(self, doc_type: str, doc_id):
+        document = self._docs[doc_type].pop(doc_id, None)
+        if document is None:
+            return
+        _, terms, length = document
+        postings = self._postings[doc_type]
+        for term in terms:
+            postings[term].pop(doc_id, None)
+            if not postings[term]:
+                del postings[term]
+            self._drop_term(term)
+        self._total_length[doc_type] -= length
+
+    def _add_document(self, doc_type: str, doc_id, content_hash, row: Dict):
+        terms = defaultdict(float)
+        for field, weight in INDEXED_TABLES[doc_type]['fields'].items():
+            for token in tokenize(row.get(field)):
+                terms[token] += weight
+        length = sum(terms.values())
+
+        self._remove_document(doc_type, doc_id)
+        self._docs[doc_type][doc_id] = (content_hash, dict(terms), length)
+        postings = self._postings[doc_type]
+        for term, frequency in terms.items():
+            postings[term][doc_id] = frequency
+            self._add_term(term)
+        self._total_length[doc_type] += length
+
+    def _sync_table(self, doc_type: str) -> int:
+        """Re-read the rows of one table whose content hash changed; returns the number updated."""
+        from src.utils.database import fetch_dataframe
+
+        spec = INDEXED_TABLES[doc_type]
+        fields = list(spec['fields'])
+        content_hash = f"HASH({', '.join(fields)})"
+        hashes = fetch_dataframe(
+            f"SELECT {spec['id']} AS doc_id, {content_hash} AS doc_hash FROM {spec['table']}", ttl=0)
+        if hashes is None:
+            raise RuntimeError(f"could not read {spec['table']}")
+        current = dict(zip(hashes['doc_id'].tolist(), hashes['doc_hash'].tolist()))
+
+        with self._lock:
+            indexed = self._docs[doc_type]
+            deleted = [doc_id for doc_id in indexed if doc_id not in current]
+            changed = [doc_id for doc_id, value in current.items()
+                       if doc_id not in indexed or indexed[doc_id][0] != value]
+            for doc_id in deleted:
+                self._remove_document(doc_type, doc_id)
+        if not changed:
+            return len(deleted)
+
+        columns = f"{spec['id']} AS doc_id, {content_hash} AS doc_hash, {', '.join(fields)}"
+        if len(changed) > len(current) // 2:
+            # Mostly new: one scan beats many IN lists
+            batches = [fetch_dataframe(f"SELECT {columns} FROM {spec['table']}", ttl=0)]
+        else:
+            batches = []
+            for start in range(0, len(changed), 1000):
+                chunk = changed[start:start + 1000]
+                placeholders = ','.join(['%s'] * len(chunk))
+                batches.append(fetch_dataframe(
+                    f"SELECT {columns} FROM {spec['table']} WHERE {spec['id']} IN ({placeholders})",
+                    chunk, ttl=0))
+
+        with self._lock:
+            for rows in batches:
+                if rows is None:
+                    raise RuntimeError(f"could not read {spec['table']}")
+                for row in rows.to_dict('records'):
+                    self._add_document(doc_type, _plain(row['doc_id']), _plain(row['doc_hash']), row)
+        return len(changed) + len(deleted)
+
+    def _load(self) -> bool:
+        """Restore the index saved by a previous process, if any."""
+        try:
+            with open(self.path, 'rb') as f:
+                state = pickle.load(f)
+        except FileNotFoundError:
+            return False
+        except Exception as e:
+            print(f"Error loading search index from {self.path}: {e}")
+            return False
+        if state.get('format') != _FORMAT_VERSION or set(state['docs']) != set(INDEXED_TABLES):
+            return False
+
+        with self._lock:
+            self._reset()
+            for doc_type, documents in state['docs'].items():
+                for doc_id, (content_hash, terms, length) in documents.items():
+                    self._docs[doc_type][doc_id] = (content_hash, terms, length)
+                    postings = self._postings[doc_type]
+                    for term, frequency in terms.items():
+                        postings[term][doc_id] = frequency
+                        self._add_term(term)
+                    self._total_length[doc_type] += length
+            self._ready = True
+        return True
+
+    def _save(self):
+        """Write the documents to disk atomically so a restart only re-reads changed rows."""
+        with self._lock:
+            state = {'format': _FORMAT_VERSION, 'docs': {doc_type: dict(documents)
+                                                          for doc_type, documents in self._docs.items()}}
+        try:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            temp_path = f"{self.path}.tmp"
+            with open(temp_path, 'wb') as f:
+                pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temp_path, self.path)
+        except Exception as e:
+            print(f"Error saving search index to {self.path}: {e}")
+
+    def _ensure_fresh(self) -> bool:
+        """Load or build the index and bring changed tables up to date; False if unavailable."""
+        with self._refresh_lock:
+            if not self._loaded and not self._load():
+                self._stats['builds'] += 1
+            with self._lock:
+                if not self._loaded or time.monotonic() - self._checked_at >= self.refresh_interval:
+                    self._dirty = set(INDEXED_TABLES)
+                dirty = self._dirty
+                self._dirty = set()
+            if not dirty:
+                return True
+
+            updated = 0
+            try:
+                for doc_type in sorted(dirty):
+                    updated += self._sync_table(doc_type)
+            except Exception as e:
+                print(f"Error refreshing search index: {e}")
+                with self._lock:
+                    self._dirty |= dirty
+                return self._loaded
+            self._loaded = True
+            self._ready = True
+            self._checked_at = time.monotonic()
+            self._stats['refreshes'] += 1
+            self._stats['documents_updated'] += updated
+            if updated:
+                self._save()
+            return True
+
+    def _refresh_in_background(self):
+        try:
+            self._ensure_fresh()
+        finally:
+            with self._lock:
+                self._refreshing = False
+
+    def warm(self):
+        """Start loading, building or refreshing the index in the background if it needs it.
+
+        Called at app startup and by every search, so neither waits for a
+        build; a refresh already running is not started twice.
+        """
+        if not SEARCH_INDEX_CONFIG['enabled']:
+            return
+        with self._lock:
+            if self._refreshing:
+                return
+            if self._loaded and not self._dirty and time.monotonic() - self._checked_at < self.refresh_interval:
+                return
+            self._refreshing = True
+        threading.Thread(target=self._refresh_in_background, name='search-index-refresh', daemon=True).start()
+
+    def on_tables_written(self, tables: List[str]):
+        """Query cache write listener: mark written tables for re-sync by the next search."""
+        written = {table.upper() for table in tables}
+        with self._lock:
+            for doc_type, spec in INDEXED_TABLES.items():
+                if '*' in written or spec['table'] in written:
+                    self._dirty.add(doc_type)
+
+    def invalidate(self):
+        """Re-check every table on the next search."""
+        with self._lock:
+            self._dirty = set(INDEXED_TABLES)
+
+    # -- search ------------------------------------------------------------
+
+    def _expansions(self, doc_type: str, token: str) -> Dict[str, float]:
+        """Indexed terms a query token matches, with their weight."""
+        postings = self._postings[doc_type]
+        expansions = {}
+        if token in postings:
+            expansions[token] = 1.0
+
+        if len(token) >= 2:
+            if self._sorted_terms is None:
+                self._sorted_terms = sorted(self._term_refs)
+            start = bisect_left(self._sorted_terms, token)
+            for term in self._sorted_terms[start:start + MAX_EXPANSIONS]:
+                if not term.startswith(token):
+                    break
+                if term in postings:
+                    expansions.setdefault(term, PREFIX_WEIGHT)
+
+        if len(token) >= 3:
+            for term in self._soundex.get(soundex(token), ()):
+                if term in postings:
+                    expansions[term] = max(expansions.get(term, 0.0), PHONETIC_WEIGHT)
+
+            grams = trigrams(token)
+            shared = defaultdict(int)
+            for gram in grams:
+                for term in self._trigrams.get(gram, ()):
+                    shared[term] += 1
+            min_similarity = SEARCH_INDEX_CONFIG['min_trigram_similarity']
+            for term, count in shared.items():
+                similarity = count / (len(grams) + len(trigrams(term)) - count)
+                if similarity >= min_similarity and term in postings:
+                    expansions[term] = max(expansions.get(term, 0.0), TRIGRAM_WEIGHT * similarity)
+
+        return dict(sorted(expansions.items(), key=lambda item: -item[1])[:MAX_EXPANSIONS])
+
+    def search(self, doc_type: str, query: str, limit: Optional[int] = None) -> Optional[List[Tuple[object, float]]]:
+        """Rank documents of one type for a free-text query as (doc id, score), best first.
+
+        Returns None when the index is disabled or not built yet, so callers
+        fall back to searching in SQL. Changed tables are re-synced in the
+        background; until then the previous documents are searched.
+        """
+        if not SEARCH_INDEX_CONFIG['enabled']:
+            return None
+        self.warm()
+        if not self._ready:
+            return None
+        tokens = list(dict.fromkeys(tokenize(query)))
+        if not tokens:
+            return []
+
+        with self._lock:
+            self._stats['searches'] += 1
+            documents = self._docs[doc_type]
+            postings = self._postings[doc_type]
+            doc_count = len(documents)
+            if not doc_count:
+                return []
+            avg_length = self._total_length[doc_type] / doc_count or 1.0
+
+            scores = defaultdict(float)
+            for token in tokens:
+                # Each query token counts once per document, through its best matching term
+                best = {}
+                for term, weight in self._expansions(doc_type, token).items():
+                    matches = postings[term]
+                    idf = math.log(1 + (doc_count - len(matches) + 0.5) / (len(matches) + 0.5))
+                    for doc_id, frequency in matches.items():
+                        length = documents[doc_id][2]
+                        norm = frequency * (BM25_K1 + 1) / (
+                            frequency + BM25_K1 * (1 - BM25_B + BM25_B * length / avg_length))
+                        score = weight * idf * norm
+                        if score > best.get(doc_id, 0.0):
+                            best[doc_id] = score
+                for doc_id, score in best.items():
+                    scores[doc_id] += score
+
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+        return ranked[:limit] if limit else ranked
+
+    def search_ids(self, doc_type: str, query: str) -> Optional[List]:
+        """Ids of the best SEARCH_INDEX_CONFIG['max_candidates'] matches, or None if unavailable."""
+        ranked = self.search(doc_type, query, SEARCH_INDEX_CONFIG['max_candidates'])
+        if ranked is None:
+            return None
+        return [doc_id for doc_id, _ in ranked]
+
+    def stats(self) -> Dict:
+        """Document and vocabulary sizes plus refresh counters, for monitoring."""
+        with self._lock:
+            stats = dict(self._stats)
+            stats['documents'] = {doc_type: len(documents) for doc_type, documents in self._docs.items()}
+            stats['terms'] = len(self._term_refs)
+            stats['dirty'] = sorted(self._dirty)
+        return stats
+
+
+# Shared index for every search in the process
+search_index = SearchIndex(SEARCH_INDEX_CONFIG['path'], SEARCH_INDEX_CONFIG['refresh_interval'])
+query_cache.add_write_listener(search_index.on_tables_written)
+query_cache.add_ddl_listener(search_index.invalidate)
+register_metrics('search_index', search_index.stats)
@@ -0,0 +1,176 @@
+import threading
+from concurrent.futures import Future
+from typing import Dict, List, Optional
+
+import pandas as pd
+
+from src.utils.config import QUERY_CACHE_CONFIG, SITE_BUNDLE_CONFIG
+from src.utils.database import (
+    SITE_DETAIL_COLUMNS,
+    SITE_QUERY_DEFAULTS,
+    _first_record,
+    _records,
+    fetch_dataframe,
+    get_site_details_df,
+    site_query
+)
+from src.utils.query_cache import _estimate_size, query_cache
+from src.utils.query_executor import run_concurrently
+
+# Tables a bundle reads; a write to any of them drops the cached bundles
+BUNDLE_TABLES = {'HERITAGE_SITES', 'ART_FORMS', 'SITE_ART_FORMS', 'VISITOR_STATS', 'USER_INTERACTIONS', 'SITE_METRICS'}
+MEDIA_TABLES = {'SITE_PHOTOS', 'SITE_VIDEOS', 'SITE_ARTICLES', 'SITE_RESOURCES', 'SITE_EVENTS'}
+
+# Stands in for the result of a loader that failed or timed out
+_FAILED = object()
+
+
+def _load_site(site_id: int) -> Optional[Dict]:
+    """The site's details, None if there is no such site; raises when they could not be read."""
+    df = get_site_details_df(site_id)
+    if df is None:
+        raise RuntimeError(f"could not read heritage site {site_id}")
+    records = _records(df, SITE_DETAIL_COLUMNS)
+    return records[0] if records else None
+
+
+def _site_read(name: str, shape: str):
+    """Loader of one SITE_QUERIES read that raises when the read fails.
+
+    Unlike the get_site_* helpers it never turns a failed read into empty
+    data, so a bundle holding one is marked failed and not cached. ``shape``
+    is 'frame', 'records' or 'first' (the first row, or its defaults).
+    """
+    def load(site_id: int):
+        df = fetch_dataframe(site_query(name), [site_id])
+        if df is None:
+            raise RuntimeError(f"could not read {name} of heritage site {site_id}")
+        if shape == 'frame':
+            return df
+        if shape == 'first':
+            return _first_record(df, SITE_QUERY_DEFAULTS[name])
+        return _records(df)
+    return load
+
+
+# Bundle field -> loader taking the site id
+_LOADERS = {
+    'site': _load_site,
+    'art_forms': _site_read('art_forms', 'records'),
+    'visitor_stats': _site_read('visitor_stats', 'frame'),
+    'interactions': _site_read('interactions', 'frame'),
+    'health': _site_read('health', 'first'),
+    'revenue': _site_read('revenue', 'first'),
+    'visitors': _site_read('visitors', 'first'),
+    'ratings': _site_read('ratings', 'first')
+}
+_MEDIA_LOADERS = {name: _site_read(name, 'records')
+                  for name in ('comments', 'photos', 'videos', 'articles', 'resources', 'events')}
+
+
+class SiteBundle:
+    """Everything the site details page shows for one heritage site.
+
+    ``failed`` names the fields whose loaders failed or timed out; those
+    fields hold their empty defaults, and ``site`` is None if it failed.
+    """
+
+    def __init__(self, site_id: int, site: Optional[Dict] = None, art_forms: Optional[List[Dict]] = None,
+                 visitor_stats: Optional[pd.DataFrame] = None, interactions: Optional[pd.DataFrame] = None,
+                 health: Optional[Dict] = None, revenue: Optional[Dict] = None,
+                 visitors: Optional[Dict] = None, ratings: Optional[Dict] = None,
+                 comments: Optional[List[Dict]] = None, photos: Optional[List[Dict]] = None,
+                 videos: Optional[List[Dict]] = None, articles: Optional[List[Dict]] = None,
+                 resources: Optional[List[Dict]] = None, events: Optional[List[Dict]] = None,
+                 failed: Optional[List[str]] = None):
+        self.site_id = site_id
+        self.site = site
+        self.art_forms = art_forms or []
+        self.visitor_stats = visitor_stats if visitor_stats is not None else pd.DataFrame()
+        self.interactions = interactions if interactions is not None else pd.DataFrame()
+        self.health = health or {}
+        self.revenue = revenue or {}
+        self.visitors = visitors or {}
+        self.ratings = ratings or {}
+        self.comments = comments or []
+        self.photos = photos or []
+        self.videos = videos or []
+        self.articles = articles or []
+        self.resources = resources or []
+        self.events = events or []
+        self.failed = failed or []
+
+    def copy(self) -> 'SiteBundle':
+        """Copy that callers may modify without touching the cached bundle."""
+        fields = {name: value.copy() if hasattr(value, 'copy') else value
+                  for name, value in vars(self).items()}
+        return SiteBundle(**fields)
+
+    def estimate_size(self) -> int:
+        """Approximate memory footprint in bytes, for the query cache budget."""
+        return sum(_estimate_size(value) for value in vars(self).values())
+
+
+_inflight = {}
+_inflight_lock = threading.Lock()
+
+
+def _fetch_bundle(site_id: int, include_media: bool) -> Optional[SiteBundle]:
+    """Run every bundle query concurrently on pooled connections; None if the site does not exist."""
+    loaders = dict(_LOADERS)
+    if include_media:
+        loaders.update(_MEDIA_LOADERS)
+
+    fields = run_concurrently({name: (lambda loader=loader: loader(site_id)) for name, loader in loaders.items()},
+                              defaults={name: _FAILED for name in loaders})
+    failed = sorted(name for name, value in fields.items() if value is _FAILED)
+    fields = {name: None if value is _FAILED else value for name, value in fields.items()}
+    if fields['site'] is None and 'site' not in failed:
+        return None
+    return SiteBundle(site_id, failed=failed, **fields)
+
+
+def get_site_bundle(site_id: int, include_media: Optional[bool] = None,
+                    ttl: Optional[float] = None) -> Optional[SiteBundle]:
+    """Fetch the site details page data for one site, or None if the site does not exist.
+
+    Bundles are cached per site for SITE_BUNDLE_CONFIG['ttl'] seconds and
+    dropped when any table they read is written. A bundle with failed
+    fields is returned but not cached. Concurrent requests for the same
+    site share one fetch.
+    """
+    site_id = int(site_id)
+    include_media = SITE_BUNDLE_CONFIG['include_media'] if include_media is None else include_media
+    ttl = SITE_BUNDLE_CONFIG['ttl'] if ttl is None else ttl
+    key = ('bundle', site_id, include_media)
+    tables = BUNDLE_TABLES | MEDIA_TABLES if include_media else BUNDLE_TABLES
+    use_cache = QUERY_CACHE_CONFIG['enabled'] and ttl != 0
+
+    if use_cache:
+        hit, bundle = query_cache.get(key)
+        if hit:
+            return bundle
+
+    with _inflight_lock:
+        future = _inflight.get(key)
+        owner = future is None
+        if owner:
+            future = _inflight[key] = Future()
+
+    if not owner:
+        bundle = future.result()
+        return bundle.copy() if bundle is not None else None
+
+    try:
+        versions = query_cache.snapshot_versions(tables)
+        bundle = _fetch_bundle(site_id, include_media)
+        if use_cache and bundle is not None and not bundle.failed:
+            query_cache.put(key, bundle, tables, ttl, versions)
+        future.set_result(bundle)
+    except Exception as e:
+        future.set_exception(e)
+        raise
+    finally:
+        with _inflight_lock:
+            _inflight.pop(key, None)
+    return bundle.copy() if bundle is not None else None
@@ -0,0 +1,192 @@
+import threading
+import time
+from datetime import timedelta
+from typing import Dict, Optional
+
+from src.utils.config import SITE_METRICS_CONFIG
+
+# Per-site metrics, aggregated per source table before joining so that
+# visitor rows and rating rows never multiply each other.
+SITE_METRICS_SELECT = """
+    SELECT
+        h.site_id,
+        COALESCE(v.visit_days, 0) AS visit_days,
+        COALESCE(v.total_visitors, 0) AS total_visitors,
+        COALESCE(v.total_revenue, 0) AS total_revenue,
+        COALESCE(v.revenue_count, 0) AS revenue_count,
+        v.last_visit_date,
+        u.avg_rating,
+        COALESCE(u.rating_count, 0) AS rating_count
+    FROM HERITAGE_SITES h
+    LEFT JOIN (
+        SELECT
+            site_id,
+            COUNT(DISTINCT visit_date) AS visit_days,
+            SUM(visitor_count) AS total_visitors,
+            SUM(revenue) AS total_revenue,
+            COUNT(revenue) AS revenue_count,
+            MAX(visit_date) AS last_visit_date
+        FROM VISITOR_STATS
+        {visitor_filter}
+        GROUP BY site_id
+    ) v ON h.site_id = v.site_id
+    LEFT JOIN (
+        SELECT
+            site_id,
+            AVG(rating) AS avg_rating,
+            COUNT(rating) AS rating_count
+        FROM USER_INTERACTIONS
+        {interaction_filter}
+        GROUP BY site_id
+    ) u ON h.site_id = u.site_id
+    {site_filter}
+"""
+
+SITE_METRICS_COLUMNS = [
+    'site_id', 'visit_days', 'total_visitors', 'total_revenue', 'revenue_count',
+    'last_visit_date', 'avg_rating', 'rating_count'
+]
+
+# Sites with visitor or interaction rows written after the watermark
+_CHANGED_SITES = """
+    SELECT site_id FROM VISITOR_STATS WHERE updated_at > %s
+    UNION
+    SELECT site_id FROM USER_INTERACTIONS WHERE updated_at > %s
+"""
+
+_refresh_lock = threading.Lock()
+_refresh_state = {
+    'last_refresh': 0.0,
+    'last_duration': None,
+    'last_sites_refreshed': None,
+    'last_error': None,
+    'running': False
+}
+
+
+def _metrics_select(changed_only: bool = False) -> str:
+    """SITE_METRICS_SELECT, optionally restricted to sites changed since a watermark."""
+    if not changed_only:
+        return SITE_METRICS_SELECT.format(visitor_filter='', interaction_filter='', site_filter='')
+    return SITE_METRICS_SELECT.format(
+        visitor_filter=f"WHERE site_id IN ({_CHANGED_SITES})",
+        interaction_filter=f"WHERE site_id IN ({_CHANGED_SITES})",
+        site_filter=f"WHERE h.site_id IN ({_CHANGED_SITES})"
+    )
+
+
+def site_metrics_source() -> str:
+    """SQL relation of per-site metrics to LEFT JOIN onto HERITAGE_SITES by site_id.
+
+    SITE_METRICS_CONFIG['source'] selects where metrics come from:
+    'table' - the SITE_METRICS table, refreshed incrementally by this module
+    'dynamic' - the SITE_METRICS dynamic table maintained by Snowflake
+    'inline' - the pre-aggregated query itself, when no materialization exists
+    """
+    source = SITE_METRICS_CONFIG['source']
+    if source == 'table':
+        _maybe_refresh_in_background()
+        return 'SITE_METRICS'
+    if source == 'dynamic':
+        return 'SITE_METRICS'
+    return f"({_metrics_select()})"
+
+
+def refresh_site_metrics(full: bool = False, conn=None) -> Optional[int]:
+    """Bring the SITE_METRICS table up to date.
+
+    Only sites with VISITOR_STATS or USER_INTERACTIONS rows updated since the
+    previous refresh, less SITE_METRICS_CONFIG['watermark_lag'] seconds, are
+    recomputed (delete + insert in one transaction). The lag catches rows
+    stamped before the previous refresh started but committed after it read
+    them; rows committed later than that are only picked up by a full
+    rebuild, so schedule refresh_site_metrics.py --full periodically. A
+    full rebuild runs when the table is empty or ``full`` is set; use it after
+    bulk deletes, which the updated_at watermark cannot see. Returns the
+    number of site rows written, or None on failure.
+    """
+    from src.utils.database import get_db_connection, invalidate_tables
+
+    own_connection = conn is None
+    if own_connection:
+        conn = get_db_connection()
+    cursor = conn.cursor()
+    columns = ', '.join(SITE_METRICS_COLUMNS)
+    try:
+        # Rows stamped while this refresh runs are picked up by the next one,
+        # as long as they commit within the watermark lag
+        cursor.execute("SELECT CAST(CURRENT_TIMESTAMP() AS TIMESTAMP)")
+        started_at = cursor.fetchone()[0]
+
+        watermark = None
+        if not full:
+            cursor.execute("SELECT MAX(refreshed_at) FROM SITE_METRICS")
+            watermark = cursor.fetchone()[0]
+            if watermark is not None:
+                watermark -= timedelta(seconds=SITE_METRICS_CONFIG['watermark_lag'])
+
+        cursor.execute("BEGIN")
+        if watermark is None:
+            cursor.execute("DELETE FROM SITE_METRICS")
+            cursor.execute(
+                f"INSERT INTO SITE_METRICS ({columns}, refreshed_at) "
+                f"SELECT m.*, %s FROM ({_metrics_select()}) m",
+                [started_at]
+            )
+        else:
+            cursor.execute(
+                f"DELETE FROM SITE_METRICS WHERE site_id IN ({_CHANGED_SITES})",
+                [watermark, watermark]
+            )
+            cursor.execute(
+                f"INSERT INTO SITE_METRICS ({columns}, refreshed_at) "
+                f"SELECT m.*, %s FROM ({_metrics_select(changed_only=True)}) m",
+                [started_at] + [watermark, watermark] * 3
+            )
+        rows = cursor.rowcount
+        cursor.execute("COMMIT")
+        return rows
+    except Exception as e:
+        print(f"Error refreshing site metrics: {e}")
+        try:
+            cursor.execute("ROLLBACK")
+        except Exception:
+            pass
+        return None
+    finally:
+        cursor.close()
+        if own_connection:
+            conn.close()
+        invalidate_tables('SITE_METRICS')
+
+
+def _run_refresh():
+    start = time.time()
+    rows = refresh_site_metrics()
+    with _refresh_lock:
+        _refresh_state.update({
+            'last_refresh': time.time(),
+            'last_duration': time.time() - start,
+            'last_sites_refreshed': rows,
+            'last_error': None if rows is not None else 'refresh failed',
+            'running': False
+        })
+
+
+def _maybe_refresh_in_background():
+    """Start an incremental refresh when the last one is older than the refresh interval."""
+    with _refresh_lock:
+        if _refresh_state['running']:
+            return
+        if time.time() - _refresh_state['last_refresh'] < SITE_METRICS_CONFIG['refresh_interval']:
+            return
+        _refresh_state['running'] = True
+    threading.Thread(target=_run_refresh, name='site-metrics-refresh', daemon=True).start()
+
+
+def get_site_metrics_status() -> Dict:
+    """Source mode and last background refresh, for monitoring."""
+    with _refresh_lock:
+        status = dict(_refresh_state)
+    status['source'] = SITE_METRICS_CONFIG['source']
+    return status
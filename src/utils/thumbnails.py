@@ -0,0 +1,284 @@
+import hashlib
+import os
+import tempfile
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor, TimeoutError, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from io import BytesIO
+from typing import Dict, Hashable, Iterable, Iterator, List, Optional, Tuple, Union
+
+from src.utils.config import THUMBNAIL_CONFIG
+from src.utils.http_client import http_client
+
+# File extension per output format
+EXTENSIONS = {'WEBP': 'webp', 'JPEG': 'jpg'}
+
+
+def render_renditions(source: bytes, renditions: Dict[str, Dict], image_format: str, quality: int) -> Dict[str, bytes]:
+    """Encoded bytes of every rendition of a source image.
+
+    Renditions with 'crop' are cut to exactly their size (centered);
+    the others are scaled down to fit within it. Runs in a worker process.
+    """
+    from PIL import Image, ImageOps
+
+    with Image.open(BytesIO(source)) as opened:
+        image = ImageOps.exif_transpose(opened)
+        image.load()
+    if image_format == 'JPEG' or image.mode not in ('RGB', 'RGBA'):
+        image = image.convert('RGB')
+
+    rendered = {}
+    for name, spec in renditions.items():
+        size = tuple(spec['size'])
+        if spec.get('crop'):
+            resized = ImageOps.fit(image, size, Image.LANCZOS)
+        else:
+            resized = image.copy()
+            resized.thumbnail(size, Image.LANCZOS)
+        output = BytesIO()
+        resized.save(output, image_format, quality=quality, optimize=image_format == 'JPEG')
+        rendered[name] = output.getvalue()
+    return rendered
+
+
+def _webp_supported() -> bool:
+    from PIL import features
+
+    return bool(features.check('webp'))
+
+
+def _write_atomic(path: str, data: bytes):
+    """Write a file through a temporary file in the same directory, so readers never see it half written."""
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    handle, temporary = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    try:
+        with os.fdopen(handle, 'wb') as file:
+            file.write(data)
+        os.replace(temporary, path)
+    except Exception:
+        if os.path.exists(temporary):
+            os.remove(temporary)
+        raise
+
+
+def _read(path: str) -> Optional[bytes]:
+    try:
+        with open(path, 'rb') as file:
+            return file.read()
+    except OSError:
+        return None
+
+
+class ThumbnailStore:
+    """Resized local copies of remote images in a content-addressed directory.
+
+    Each source URL is downloaded once. Its bytes are stored under their
+    SHA-256 digest, and every configured rendition is made from them in one
+    pass on a process pool (WebP, or JPEG where Pillow lacks WebP). A small
+    file per URL maps it to its digest, so identical images from different
+    URLs share their renditions and a new rendition size reuses the stored
+    source instead of downloading it again. A URL that could not be
+    downloaded or rendered is not tried again for ``failure_ttl`` seconds.
+
+    Layout under ``path``::
+
+        urls/<sha1 of url>               digest of the URL's image
+        <digest[:2]>/<digest>.src        downloaded source bytes
+        <digest[:2]>/<digest>-<name>.<ext>   renditions
+    """
+
+    def __init__(self, path: str, renditions: Dict[str, Dict], image_format: str, quality: int,
+                 download_workers: int, render_workers: int, max_source_bytes: int, failure_ttl: float = 600):
+        self.path = path
+        self.renditions = renditions
+        self.image_format = 'JPEG' if image_format == 'WEBP' and not _webp_supported() else image_format
+        self.quality = quality
+        self.render_workers = render_workers
+        self.max_source_bytes = max_source_bytes
+        self.failure_ttl = failure_ttl
+        self._downloads = ThreadPoolExecutor(max_workers=download_workers, thread_name_prefix='thumbnail')
+        self._renderer = None
+        self._inflight = {}
+        self._failed = {}
+        self._lock = threading.Lock()
+        self._stats = {'hits': 0, 'downloads': 0, 'download_bytes': 0, 'renders': 0,
+                       'served_bytes': 0, 'failures': 0, 'skipped_failures': 0}
+
+    @property
+    def extension(self) -> str:
+        return EXTENSIONS[self.image_format]
+
+    # -- store layout ------------------------------------------------------
+
+    def _url_path(self, url: str) -> str:
+        return os.path.join(self.path, 'urls', hashlib.sha1(url.encode('utf-8')).hexdigest())
+
+    def _source_path(self, digest: str) -> str:
+        return os.path.join(self.path, digest[:2], f"{digest}.src")
+
+    def _rendition_path(self, digest: str, rendition: str) -> str:
+        return os.path.join(self.path, digest[:2], f"{digest}-{rendition}.{self.extension}")
+
+    def _digest_of(self, url: str) -> Optional[str]:
+        digest = _read(self._url_path(url))
+        return digest.decode('ascii') if digest else None
+
+    # -- producing renditions ----------------------------------------------
+
+    def _render(self, source: bytes) -> Dict[str, bytes]:
+        """Every rendition of a source, on the process pool when it can be started."""
+        try:
+            with self._lock:
+                if self._renderer is None:
+                    self._renderer = ProcessPoolExecutor(max_workers=self.render_workers)
+                renderer = self._renderer
+            return renderer.submit(render_renditions, source, self.renditions,
+                                   self.image_format, self.quality).result()
+        except (BrokenProcessPool, OSError, RuntimeError) as e:
+            print(f"Thumbnail process pool unavailable, rendering in-process: {e}")
+            with self._lock:
+                self._renderer = None
+            return render_renditions(source, self.renditions, self.image_format, self.quality)
+
+    def _download(self, url: str) -> bytes:
+        response = http_client.get('images', url, stream=True)
+        response.raise_for_status()
+        chunks, size = [], 0
+        for chunk in response.iter_content(64 * 1024):
+            size += len(chunk)
+            if size > self.max_source_bytes:
+                raise ValueError(f"image larger than {self.max_source_bytes} bytes")
+            chunks.append(chunk)
+        with self._lock:
+            self._stats['downloads'] += 1
+            self._stats['download_bytes'] += size
+        return b''.join(chunks)
+
+    def _produce(self, url: str, rendition: str) -> Optional[bytes]:
+        """Rendition bytes of a URL's image, downloading and rendering whatever the store lacks."""
+        try:
+            digest = self._digest_of(url)
+            source = _read(self._source_path(digest)) if digest else None
+            if source is None:
+                source = self._download(url)
+                digest = hashlib.sha256(source).hexdigest()
+                _write_atomic(self._source_path(digest), source)
+                _write_atomic(self._url_path(url), digest.encode('ascii'))
+            # Another URL may already have rendered the same image
+            data = _read(self._rendition_path(digest, rendition))
+            if data is not None:
+                return data
+
+            rendered = self._render(source)
+            for name, data in rendered.items():
+                _write_atomic(self._rendition_path(digest, name), data)
+            with self._lock:
+                self._stats['renders'] += 1
+            return rendered[rendition]
+        except Exception as e:
+            print(f"Error making {rendition} thumbnail of {url}: {e}")
+            with self._lock:
+                self._stats['failures'] += 1
+                self._failed[url] = time.monotonic() + self.failure_ttl
+            return None
+
+    # -- public API --------------------------------------------------------
+
+    def cached(self, url: str, rendition: str) -> Optional[bytes]:
+        """Stored rendition of a URL's image, without any download; None when it is not in the store yet."""
+        digest = self._digest_of(url)
+        data = _read(self._rendition_path(digest, rendition)) if digest else None
+        if data is not None:
+            with self._lock:
+                self._stats['hits'] += 1
+                self._stats['served_bytes'] += len(data)
+        return data
+
+    def submit(self, url: str, rendition: str) -> Future:
+        """Future of a URL's rendition bytes (None on failure), sharing any download already running."""
+        key = (url, rendition)
+        with self._lock:
+            if self._failed.get(url, 0) > time.monotonic():
+                self._stats['skipped_failures'] += 1
+                future = Future()
+                future.set_result(None)
+                return future
+            self._failed.pop(url, None)
+            future = self._inflight.get(key)
+            if future is None:
+                future = self._downloads.submit(self._produce, url, rendition)
+                self._inflight[key] = future
+                future.add_done_callback(lambda done, key=key: self._forget(key, done))
+        return future
+
+    def _forget(self, key, future):
+        with self._lock:
+            if self._inflight.get(key) is future:
+                del self._inflight[key]
+            if future.result():
+                self._stats['served_bytes'] += len(future.result())
+
+    def get(self, url: str, rendition: str) -> Optional[bytes]:
+        """A URL's rendition bytes, produced now if needed; None when the image cannot be fetched."""
+        return self.cached(url, rendition) or self.submit(url, rendition).result()
+
+    def stats(self) -> Dict:
+        """Download, render and serve counters, for monitoring."""
+        with self._lock:
+            stats = dict(self._stats)
+            stats['failed_urls'] = sum(1 for until in self._failed.values() if until > time.monotonic())
+        return stats
+
+
+# Shared thumbnail store for every page in the process
+thumbnail_store = ThumbnailStore(
+    THUMBNAIL_CONFIG['path'],
+    THUMBNAIL_CONFIG['renditions'],
+    THUMBNAIL_CONFIG['format'],
+    THUMBNAIL_CONFIG['quality'],
+    THUMBNAIL_CONFIG['download_workers'],
+    THUMBNAIL_CONFIG['render_workers'],
+    THUMBNAIL_CONFIG['max_source_bytes'],
+    THUMBNAIL_CONFIG['failure_ttl']
+)
+
+
+def iter_local_images(images: Iterable[Tuple[Hashable, str]], rendition: str) -> Iterator[Tuple[Hashable, Union[bytes, str]]]:
+    """(key, rendition bytes) for (key, image URL) pairs, yielded as the renditions are ready.
+
+    Stored renditions are yielded as the pairs come in, the rest once
+    produced. A URL that fails, or is still being produced after
+    THUMBNAIL_CONFIG['wait_timeout'] seconds, yields the URL itself; the
+    latter finishes in the background for the next page view. With
+    thumbnails disabled every URL is yielded unchanged.
+    """
+    pending = {}
+    for key, url in images:
+        if not THUMBNAIL_CONFIG['enabled']:
+            yield key, url
+            continue
+        data = thumbnail_store.cached(url, rendition)
+        if data is not None:
+            yield key, data
+        else:
+            pending.setdefault(thumbnail_store.submit(url, rendition), []).append((key, url))
+
+    done = set()
+    try:
+        for future in as_completed(pending, timeout=THUMBNAIL_CONFIG['wait_timeout']):
+            done.add(future)
+            for key, url in pending[future]:
+                yield key, future.result() or url
+    except TimeoutError:
+        for future, waiting in pending.items():
+            if future not in done:
+                yield from waiting
+
+
+def local_images(urls: List[str], rendition: str) -> List[Union[bytes, str]]:
+    """Rendition bytes of each image URL, fetched concurrently; the URL itself where that fails."""
+    results = dict(iter_local_images(((url, url) for url in dict.fromkeys(urls)), rendition))
+    return [results[url] for url in urls]
@@ -0,0 +1,267 @@
+import re
+import threading
+import time
+import unicodedata
+from bisect import bisect_left
+from collections import OrderedDict, defaultdict
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from src.utils.config import TYPEAHEAD_CONFIG
+from src.utils.query_cache import query_cache
+
+# Suggestion groups and the tables whose writes make them stale. Event
+# popularity comes from the site group's city and state totals.
+GROUP_TABLES = {
+    'sites': {'HERITAGE_SITES', 'VISITOR_STATS', 'SITE_METRICS'},
+    'art_forms': {'ART_FORMS', 'SITE_ART_FORMS', 'HERITAGE_SITES', 'VISITOR_STATS', 'SITE_METRICS'},
+    'events': {'CULTURAL_EVENTS', 'HERITAGE_SITES', 'VISITOR_STATS', 'SITE_METRICS'}
+}
+
+# Search box type -> suggestion kinds offered
+KINDS_BY_SEARCH_TYPE = {
+    'All': None,
+    'Heritage Sites': {'site', 'city', 'state'},
+    'Art Forms': {'art_form'},
+    'Cultural Events': {'event'}
+}
+
+_NON_WORD = re.compile(r'[^\w]+')
+_SKIP_WORDS = {'a', 'an', 'and', 'of', 'the'}
+
+
+def normalize(text) -> str:
+    """Lower-case, accent-free text with single spaces between words."""
+    text = unicodedata.normalize('NFKD', str(text or ''))
+    text = ''.join(char for char in text if not unicodedata.combining(char))
+    return _NON_WORD.sub(' ', text.lower()).strip()
+
+
+class _PrefixGroup:
+    """Sorted array of suggestion keys for one group of suggestions.
+
+    Every entry is keyed by its full normalized text and by the text from each
+    later word on, so "mahal" finds "Taj Mahal". A prefix lookup is a binary
+    search for the range of keys starting with it; the most popular entries
+    of that range are the lowest distinct positions, since entries are stored
+    in popularity order.
+    """
+
+    def __init__(self, entries: List[Dict]):
+        # Entries in popularity order, so an entry's position is its rank
+        self.entries = sorted(entries, key=lambda entry: (-entry['popularity'], len(entry['text']), entry['text']))
+        self.kinds = {entry['kind'] for entry in self.entries}
+        keyed = []
+        for position, entry in enumerate(self.entries):
+            entry['normalized'] = normalize(entry['text'])
+            words = entry['normalized'].split()
+            for start, word in enumerate(words):
+                if start and (word in _SKIP_WORDS or word.isdigit()):
+                    continue
+                keyed.append((' '.join(words[start:]), position))
+        keyed.sort()
+        self.keys = [key for key, _ in keyed]
+        self.positions = np.array([position for _, position in keyed], dtype=np.int64)
+
+    def top(self, prefix: str, count: int) -> List[Dict]:
+        """The ``count`` most popular entries with a key starting with the prefix."""
+        start = bisect_left(self.keys, prefix)
+        end = bisect_left(self.keys, prefix + '\uffff', start)
+        # An entry can match through several of its keys, so de-duplicate before taking the top
+        matched = np.unique(self.positions[start:end])
+        return [self.entries[position] for position in matched[:count]]
+
+
+class TypeaheadIndex:
+    """In-memory prefix index of site names, cities, states, art forms and event names.
+
+    Suggestions are ranked by popularity: visitors for sites, cities and
+    states, visitors of the sites practising an art form, and visitors of the
+    event's city or state for events. A write to an underlying table rebuilds
+    only the affected groups, in the background, while the previous arrays
+    keep answering.
+    """
+
+    def __init__(self, refresh_interval: float, min_rebuild_interval: float, cache_size: int = 2048):
+        self.refresh_interval = refresh_interval
+        self.min_rebuild_interval = min_rebuild_interval
+        self.cache_size = cache_size
+        self._groups = {}
+        self._place_visitors = {}
+        self._dirty = set(GROUP_TABLES)
+        self._built_at = 0.0
+        self._rebuilding = False
+        self._lock = threading.Lock()
+        self._cache = OrderedDict()
+        self._stats = {'lookups': 0, 'cache_hits': 0, 'rebuilds': 0, 'last_rebuild_duration': None}
+
+    # -- building ----------------------------------------------------------
+
+    def _load_sites(self) -> List[Dict]:
+        from src.utils.database import fetch_dataframe
+        from src.utils.site_metrics import site_metrics_source
+
+        sites = fetch_dataframe(f"""
+            SELECT h.site_id, h.name, h.city, h.state, COALESCE(m.total_visitors, 0) AS total_visitors
+            FROM HERITAGE_SITES h
+            LEFT JOIN {site_metrics_source()} m ON h.site_id = m.site_id
+        """, ttl=0)
+        if sites is None:
+            raise RuntimeError("could not read HERITAGE_SITES")
+
+        entries = []
+        places = defaultdict(int)
+        for site in sites.to_dict('records'):
+            visitors = int(site['total_visitors'] or 0)
+            entries.append({'text': site['name'], 'kind': 'site', 'id': int(site['site_id']), 'popularity': visitors})
+            for kind in ('city', 'state'):
+                if site[kind]:
+                    places[(kind, str(site[kind]))] += visitors
+        entries.extend({'text': name, 'kind': kind, 'id': None, 'popularity': visitors}
+                       for (kind, name), visitors in places.items())
+        with self._lock:
+            self._place_visitors = {normalize(name): visitors for (_, name), visitors in places.items()}
+        return entries
+
+    def _load_art_forms(self) -> List[Dict]:
+        from src.utils.database import fetch_dataframe
+        from src.utils.site_metrics import site_metrics_source
+
+        art_forms = fetch_dataframe(f"""
+            SELECT a.art_form_id, a.name, COALESCE(SUM(m.total_visitors), 0) AS total_visitors
+            FROM ART_FORMS a
+            LEFT JOIN SITE_ART_FORMS saf ON a.art_form_id = saf.art_form_id
+            LEFT JOIN {site_metrics_source()} m ON saf.site_id = m.site_id
+            GROUP BY a.art_form_id, a.name
+        """, ttl=0)
+        if art_forms is None:
+            raise RuntimeError("could not read ART_FORMS")
+        return [{'text': row['name'], 'kind': 'art_form', 'id': int(row['art_form_id']),
+                 'popularity': int(row['total_visitors'] or 0)}
+                for row in art_forms.to_dict('records')]
+
+    def _load_events(self) -> List[Dict]:
+        from src.utils.database import fetch_dataframe
+
+        events = fetch_dataframe("SELECT event_id, name, location FROM CULTURAL_EVENTS", ttl=0)
+        if events is None:
+            raise RuntimeError("could not read CULTURAL_EVENTS")
+        with self._lock:
+            place_visitors = self._place_visitors
+        return [{'text': row['name'], 'kind': 'event', 'id': int(row['event_id']),
+                 'popularity': place_visitors.get(normalize(row['location']), 0)}
+                for row in events.to_dict('records')]
+
+    def _rebuild(self, groups):
+        """Rebuild the given groups and swap them in; the sites group goes first for event popularity."""
+        loaders = {'sites': self._load_sites, 'art_forms': self._load_art_forms, 'events': self._load_events}
+        start = time.time()
+        try:
+            for group in ('sites', 'art_forms', 'events'):
+                if group in groups:
+                    built = _PrefixGroup(loaders[group]())
+                    with self._lock:
+                        self._groups[group] = built
+                        self._cache.clear()
+            with self._lock:
+                self._built_at = time.monotonic()
+                self._stats['rebuilds'] += 1
+                self._stats['last_rebuild_duration'] = time.time() - start
+        except Exception as e:
+            print(f"Error rebuilding typeahead index: {e}")
+            with self._lock:
+                self._dirty |= set(groups)
+        finally:
+            with self._lock:
+                self._rebuilding = False
+
+    def _maybe_rebuild(self):
+        """Build synchronously on first use; afterwards refresh stale groups in the background."""
+        with self._lock:
+            if time.monotonic() - self._built_at >= self.refresh_interval:
+                self._dirty = set(GROUP_TABLES)
+            if not self._dirty or self._rebuilding:
+                return
+            if self._groups and time.monotonic() - self._built_at < self.min_rebuild_interval:
+                return
+            groups = self._dirty
+            self._dirty = set()
+            self._rebuilding = True
+            first_build = not self._groups
+
+        if first_build:
+            self._rebuild(groups)
+        else:
+            threading.Thread(target=self._rebuild, args=(groups,), name='typeahead-rebuild', daemon=True).start()
+
+    def on_tables_written(self, tables: List[str]):
+        """Query cache write listener: mark the groups built from written tables as stale."""
+        written = {table.upper() for table in tables}
+        with self._lock:
+            for group, group_tables in GROUP_TABLES.items():
+                if '*' in written or written & group_tables:
+                    self._dirty.add(group)
+            # Events rank by city and state visitors from the sites group
+            if 'sites' in self._dirty:
+                self._dirty.add('events')
+
+    # -- lookup ------------------------------------------------------------
+
+    def suggest(self, prefix: str, limit: Optional[int] = None, kinds: Optional[set] = None) -> List[Dict]:
+        """Most popular suggestions whose text, or a word in it, starts with the prefix.
+
+        Each suggestion is {'text', 'kind', 'id', 'popularity'}; ``kinds``
+        restricts them to site, city, state, art_form or event.
+        """
+        limit = limit or TYPEAHEAD_CONFIG['limit']
+        prefix = normalize(prefix)
+        if not prefix:
+            return []
+        self._maybe_rebuild()
+
+        cache_key = (prefix, limit, frozenset(kinds) if kinds else None)
+        with self._lock:
+            self._stats['lookups'] += 1
+            cached = self._cache.get(cache_key)
+            if cached is not None:
+                self._cache.move_to_end(cache_key)
+                self._stats['cache_hits'] += 1
+                return list(cached)
+            groups = list(self._groups.values())
+
+        candidates = []
+        for group in groups:
+            if kinds and not group.kinds & kinds:
+                continue
+            candidates.extend(entry for entry in group.top(prefix, limit)
+                              if not kinds or entry['kind'] in kinds)
+        # Popular first; among equals, entries that start with the prefix and shorter names
+        candidates.sort(key=lambda entry: (
+            -entry['popularity'], not entry['normalized'].startswith(prefix), len(entry['text']), entry['text']))
+        suggestions = candidates[:limit]
+
+        with self._lock:
+            self._cache[cache_key] = suggestions
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return list(suggestions)
+
+    def stats(self) -> Dict:
+        """Entry counts, lookup cache hits and rebuild timings, for monitoring."""
+        with self._lock:
+            stats = dict(self._stats)
+            stats['entries'] = {group: len(built.entries) for group, built in self._groups.items()}
+            stats['keys'] = sum(len(built.keys) for built in self._groups.values())
+            stats['dirty'] = sorted(self._dirty)
+        return stats
+
+
+# Shared index for every search box in the process
+typeahead_index = TypeaheadIndex(TYPEAHEAD_CONFIG['refresh_interval'], TYPEAHEAD_CONFIG['min_rebuild_interval'])
+query_cache.add_write_listener(typeahead_index.on_tables_written)
+
+
+def get_suggestions(prefix: str, search_type: str = 'All', limit: Optional[int] = None) -> List[Dict]:
+    """Typeahead suggestions for the Discover search box, filtered to the selected search type."""
+    return typeahead_index.suggest(prefix, limit, KINDS_BY_SEARCH_TYPE.get(search_type))
@@ -1,23 +1,328 @@
-import streamlit as st
-import requests
-from src.utils.config import UNSPLASH_ACCESS_KEY
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, TimeoutError, as_completed
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from src.utils.config import IMAGE_CACHE_CONFIG, UNSPLASH_ACCESS_KEY
+from src.utils.http_client import http_client
+from src.utils.metrics_export import register_metrics
+
+UNSPLASH_SEARCH_URL = "https://api.unsplash.com/search/photos"
+
+
+def normalize_query(query: str) -> str:
+    """Cache key of an image query: lower case with single spaces."""
+    return re.sub(r'\s+', ' ', str(query)).strip().lower()
+
+
+class ImageService:
+    """Unsplash photo search behind an in-memory LRU and a persistent SQLite cache.
+
+    Entries are keyed by normalized query and remember how many photos were
+    asked for, so a larger request refetches while a smaller one is served
+    from the stored list. Found photos live for ``ttl`` seconds, queries
+    without results for ``negative_ttl``; failed requests are only retried
+    after ``error_ttl`` and keep serving an expired entry meanwhile. After
+    Unsplash reports its rate limit no request is made for
+    ``rate_limit_backoff`` seconds.
+
+    Batches of queries (card grids) are resolved by ``iter_images``: cache
+    hits first, then the misses as they finish on a pool of ``max_workers``
+    threads. A query already being fetched for another batch is waited on
+    instead of fetched twice. Requests go through the shared HTTP client's
+    'unsplash' rate limit, timeouts and retries.
+    """
+
+    def __init__(self, path: str, memory_entries: int, ttl: float, negative_ttl: float,
+                 error_ttl: float, rate_limit_backoff: float, max_workers: int = 8,
+                 batch_timeout: float = 15):
+        self.path = path
+        self.memory_entries = memory_entries
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.error_ttl = error_ttl
+        self.rate_limit_backoff = rate_limit_backoff
+        self.batch_timeout = batch_timeout
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='image-fetch')
+        self._inflight = {}
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._disk = None
+        self._disk_lock = threading.Lock()
+        self._blocked_until = 0.0
+        self._stats = {'memory_hits': 0, 'disk_hits': 0, 'api_requests': 0, 'api_errors': 0,
+                       'negative_hits': 0, 'rate_limited': 0}
+
+    # -- disk cache --------------------------------------------------------
+
+    def _connection(self) -> Optional[sqlite3.Connection]:
+        """The cache file, created on first use; None when it cannot be opened."""
+        if self._disk is None and self.path:
+            try:
+                directory = os.path.dirname(self.path)
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+                connection = sqlite3.connect(self.path, timeout=5, check_same_thread=False)
+                connection.execute("""
+                    CREATE TABLE IF NOT EXISTS images (
+                        query TEXT PRIMARY KEY,
+                        per_page INTEGER NOT NULL,
+                        photos TEXT NOT NULL,
+                        expires_at REAL NOT NULL
+                    )
+                """)
+                connection.commit()
+                self._disk = connection
+            except Exception as e:
+                print(f"Error opening image cache {self.path}: {e}")
+                self.path = None
+        return self._disk
+
+    def _read_disk(self, key: str) -> Optional[Dict]:
+        with self._disk_lock:
+            connection = self._connection()
+            if connection is None:
+                return None
+            try:
+                row = connection.execute(
+                    "SELECT per_page, photos, expires_at FROM images WHERE query = ?", (key,)).fetchone()
+            except Exception as e:
+                print(f"Error reading image cache: {e}")
+                return None
+        if row is None:
+            return None
+        return {'per_page': row[0], 'photos': json.loads(row[1]), 'expires_at': row[2]}
+
+    def _write_disk(self, key: str, entry: Dict):
+        with self._disk_lock:
+            connection = self._connection()
+            if connection is None:
+                return
+            try:
+                connection.execute(
+                    "INSERT OR REPLACE INTO images (query, per_page, photos, expires_at) VALUES (?, ?, ?, ?)",
+                    (key, entry['per_page'], json.dumps(entry['photos']), entry['expires_at']))
+                connection.commit()
+            except Exception as e:
+                print(f"Error writing image cache: {e}")
+
+    # -- memory cache ------------------------------------------------------
+
+    def _remember(self, key: str, entry: Dict):
+        with self._lock:
+            self._memory[key] = entry
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.memory_entries:
+                self._memory.popitem(last=False)
+
+    def _cached(self, key: str) -> Optional[Dict]:
+        """Cached entry of a query from memory, else from disk (promoted to memory)."""
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                self._memory.move_to_end(key)
+                self._stats['memory_hits'] += 1
+                return entry
+        entry = self._read_disk(key)
+        if entry is not None:
+            self._remember(key, entry)
+            with self._lock:
+                self._stats['disk_hits'] += 1
+        return entry
+
+    # -- Unsplash ----------------------------------------------------------
+
+    def _fetch(self, query: str, count: int) -> Optional[List[Dict]]:
+        """Photos found by Unsplash for a query, or None when the request failed."""
+        with self._lock:
+            if time.time() < self._blocked_until:
+                return None
+            self._stats['api_requests'] += 1
+        try:
+            response = http_client.get(
+                'unsplash',
+                UNSPLASH_SEARCH_URL,
+                params={"query": query, "per_page": count},
+                headers={"Authorization": f"Client-ID {UNSPLASH_ACCESS_KEY}"}
+            )
+            if response.status_code in (403, 429) or response.headers.get('X-Ratelimit-Remaining') == '0':
+                with self._lock:
+                    self._blocked_until = time.time() + self.rate_limit_backoff
+                    self._stats['rate_limited'] += 1
+                if response.status_code != 200:
+                    print(f"Unsplash rate limit reached, pausing image requests for {self.rate_limit_backoff}s")
+                    return None
+            if response.status_code != 200:
+                raise ValueError(f"HTTP {response.status_code}")
+            return [{'id': result.get('id'), 'url': result['urls']['regular'],
+                     'author': result.get('user', {}).get('name'), 'created_at': result.get('created_at')}
+                    for result in response.json().get('results', [])]
+        except Exception as e:
+            print(f"Error fetching images for '{query}': {e}")
+            with self._lock:
+                self._stats['api_errors'] += 1
+            return None
+
+    # -- public API --------------------------------------------------------
+
+    def _fresh(self, key: str, count: int) -> Tuple[Optional[Dict], Optional[List[Dict]]]:
+        """Cached entry of a query and its photos, the photos being None unless the entry is usable."""
+        entry = self._cached(key)
+        # A shorter stored list than asked for means Unsplash had no more results
+        covers = entry is not None and (entry['per_page'] >= count or len(entry['photos']) < entry['per_page'])
+        if not covers or entry['expires_at'] <= time.time():
+            return entry, None
+        if not entry['photos']:
+            with self._lock:
+                self._stats['negative_hits'] += 1
+        return entry, entry['photos'][:count]
+
+    def _refresh(self, key: str, count: int, entry: Optional[Dict]) -> List[Dict]:
+        """Search Unsplash for a query and cache the outcome; ``entry`` is the expired entry, if any."""
+        now = time.time()
+        found = self._fetch(key, count)
+        if found is None:
+            # Keep serving what we had and hold off retrying for error_ttl
+            stale = entry['photos'] if entry is not None else []
+            per_page = entry['per_page'] if entry is not None else count
+            self._remember(key, {'per_page': per_page, 'photos': stale, 'expires_at': now + self.error_ttl})
+            return stale[:count]
+
+        entry = {'per_page': count, 'photos': found,
+                 'expires_at': now + (self.ttl if found else self.negative_ttl)}
+        self._remember(key, entry)
+        self._write_disk(key, entry)
+        return found[:count]
+
+    def photos(self, query: str, count: int = 1) -> List[Dict]:
+        """Up to ``count`` photos for a query as {'id', 'url', 'author', 'created_at'} dicts; empty when none are found."""
+        key = normalize_query(query)
+        if not key:
+            return []
+        entry, found = self._fresh(key, count)
+        if found is not None:
+            return found
+        return self._refresh(key, count, entry)
+
+    def image_urls(self, query: str, count: int = 1) -> List[str]:
+        """Up to ``count`` image URLs for a query."""
+        return [photo['url'] for photo in self.photos(query, count)]
+
+    def image_url(self, query: str, default: Optional[str] = None) -> Optional[str]:
+        """First image URL for a query, or ``default`` when there is none."""
+        urls = self.image_urls(query, 1)
+        return urls[0] if urls else default
+
+    def _submit(self, key: str, entry: Optional[Dict]):
+        """Future of the single-image lookup of a query, shared with any batch already fetching it."""
+        with self._lock:
+            future = self._inflight.get(key)
+            if future is None:
+                future = self._executor.submit(self._refresh, key, 1, entry)
+                self._inflight[key] = future
+                future.add_done_callback(lambda done, key=key: self._forget(key, done))
+        return future
+
+    def _forget(self, key: str, future):
+        with self._lock:
+            if self._inflight.get(key) is future:
+                del self._inflight[key]
+
+    def iter_images(self, queries: List[str], default: Optional[str] = None) -> Iterator[Tuple[str, Optional[str]]]:
+        """(query, first image URL or ``default``) for each distinct query, yielded as they resolve.
+
+        Cached queries come first without any request. Queries with the same
+        normalized form are fetched once. Lookups still running after
+        ``batch_timeout`` seconds yield ``default`` and finish in the
+        background, filling the cache for the next page view.
+        """
+        by_key = {}
+        for query in dict.fromkeys(queries):
+            key = normalize_query(query)
+            if key:
+                by_key.setdefault(key, []).append(query)
+            else:
+                yield query, default
+
+        pending = {}
+        for key, originals in by_key.items():
+            entry, found = self._fresh(key, 1)
+            if found is None:
+                pending[self._submit(key, entry)] = key
+                continue
+            for query in originals:
+                yield query, found[0]['url'] if found else default
+
+        resolved = set()
+        try:
+            for future in as_completed(pending, timeout=self.batch_timeout):
+                key = pending[future]
+                resolved.add(key)
+                try:
+                    found = future.result()
+                except Exception as e:
+                    print(f"Error resolving image for '{key}': {e}")
+                    found = []
+                for query in by_key[key]:
+                    yield query, found[0]['url'] if found else default
+        except TimeoutError:
+            for key in pending.values():
+                if key not in resolved:
+                    for query in by_key[key]:
+                        yield query, default
+
+    def resolve_images(self, queries: List[str], default: Optional[str] = None) -> Dict[str, Optional[str]]:
+        """First image URL (or ``default``) of each query, resolving cache misses concurrently."""
+        return dict(self.iter_images(queries, default))
+
+    def clear(self):
+        """Drop every cached entry, in memory and on disk."""
+        with self._lock:
+            self._memory.clear()
+        with self._disk_lock:
+            connection = self._connection()
+            if connection is not None:
+                connection.execute("DELETE FROM images")
+                connection.commit()
+
+    def stats(self) -> Dict:
+        """Cache hit and API request counters, for monitoring."""
+        with self._lock:
+            stats = dict(self._stats)
+            stats['memory_entries'] = len(self._memory)
+            stats['rate_limited_for'] = max(0.0, self._blocked_until - time.time())
+        return stats
+
+
+# Shared image cache for every page in the process
+image_service = ImageService(
+    IMAGE_CACHE_CONFIG['path'],
+    IMAGE_CACHE_CONFIG['memory_entries'],
+    IMAGE_CACHE_CONFIG['ttl'],
+    IMAGE_CACHE_CONFIG['negative_ttl'],
+    IMAGE_CACHE_CONFIG['error_ttl'],
+    IMAGE_CACHE_CONFIG['rate_limit_backoff'],
+    IMAGE_CACHE_CONFIG['max_workers'],
+    IMAGE_CACHE_CONFIG['batch_timeout']
+)
+register_metrics('image_cache', image_service.stats)
+
+
+def get_image(query: str, default: Optional[str] = None) -> Optional[str]:
+    """First Unsplash image URL for a query, through the shared image cache."""
+    return image_service.image_url(query, default)
+
+
+def resolve_images(queries: List[str], default: Optional[str] = None) -> Dict[str, Optional[str]]:
+    """First Unsplash image URL of each query, with cache misses fetched concurrently."""
+    return image_service.resolve_images(queries, default)
+
 
 def get_site_images(site_name, count=5):
     """Fetch multiple relevant images for the heritage site from Unsplash."""
-    try:
-        response = requests.get(
-            "https://api.unsplash.com/search/photos",
-            params={
-                "query": f"{site_name} india",
-                "per_page": count
-            },
-            headers={
-                "Authorization": f"Client-ID {UNSPLASH_ACCESS_KEY}"
-            }
-        )
-        data = response.json()
-        if data['results']:
-            return [result['urls']['regular'] for result in data['results']]
-    except Exception as e:
-        st.warning(f"Could not fetch images: {str(e)}")
-    return None
+    return image_service.image_urls(f"{site_name} india", count) or None
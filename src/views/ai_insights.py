@@ -5,47 +5,24 @@ from src.components.ai_insights import (
     render_health_score,
     render_tourism_potential,
     render_seasonality_analysis,
-    render_preservation_priorities
+    render_preservation_priorities,
+    render_scorecard_history
 )
+from src.services.site_scorecards import get_scorecard_history, get_site_report
 from src.utils.database import get_db_connection
+from src.utils.schema_catalog import schema_catalog
 
 def get_heritage_sites():
     """Get list of heritage sites with visitor counts"""
     conn = get_db_connection()
     cursor = conn.cursor()
     try:
-        # First, let's check what tables exist in the current schema
-        cursor.execute("""
-            SELECT table_name
-            FROM information_schema.tables
-            WHERE table_schema = current_schema()
-        """)
-        tables = cursor.fetchall()
-        print("Available tables:", [table[0] for table in tables])
-
-        # Let's check the current schema
-        cursor.execute("SELECT current_schema()")
-        current_schema = cursor.fetchone()[0]
-        print("Current schema:", current_schema)
-
-        # Now let's check the columns in HERITAGE_SITES
-        cursor.execute("""
-            SELECT column_name
-            FROM information_schema.columns
-            WHERE table_schema = current_schema()
-            AND table_name = 'HERITAGE_SITES'
-            ORDER BY ordinal_position
-        """)
-        columns = cursor.fetchall()
-        print("HERITAGE_SITES columns:", [col[0] for col in columns])
-
-        # Let's try a query with the actual column names
-        if columns:
-            column_names = [col[0] for col in columns]
-            id_col = next((col for col in column_names if col.upper() in ['ID', 'SITE_ID', 'HERITAGE_ID']), None)
-            name_col = next((col for col in column_names if col.upper() in ['NAME', 'SITE_NAME', 'HERITAGE_NAME']), None)
-            location_col = next((col for col in column_names if col.upper() in ['LOCATION', 'SITE_LOCATION']), None)
-            state_col = next((col for col in column_names if col.upper() in ['STATE', 'SITE_STATE']), None)
+        # Resolve the actual column names from the cached schema catalog
+        if schema_catalog.has_table('HERITAGE_SITES'):
+            id_col = schema_catalog.find_column('HERITAGE_SITES', ['ID', 'SITE_ID', 'HERITAGE_ID'])
+            name_col = schema_catalog.find_column('HERITAGE_SITES', ['NAME', 'SITE_NAME', 'HERITAGE_NAME'])
+            location_col = schema_catalog.find_column('HERITAGE_SITES', ['LOCATION', 'SITE_LOCATION'])
+            state_col = schema_catalog.find_column('HERITAGE_SITES', ['STATE', 'SITE_STATE'])
 
             if all([id_col, name_col, location_col, state_col]):
                 query = f"""
@@ -54,7 +31,7 @@ def get_heritage_sites():
                         "{name_col}",
                         "{location_col}",
                         "{state_col}"
-                    FROM "{current_schema}"."HERITAGE_SITES"
+                    FROM "HERITAGE_SITES"
                     ORDER BY "{name_col}"
                 """
                 print("Executing query:", query)
@@ -66,20 +43,9 @@ def get_heritage_sites():
 
                 # Add visitor stats if available
                 try:
-                    cursor.execute("""
-                        SELECT column_name
-                        FROM information_schema.columns
-                        WHERE table_schema = current_schema()
-                        AND table_name = 'VISITOR_STATS'
-                        ORDER BY ordinal_position
-                    """)
-                    visitor_columns = cursor.fetchall()
-                    print("VISITOR_STATS columns:", [col[0] for col in visitor_columns])
-
-                    if visitor_columns:
-                        visitor_cols = [col[0] for col in visitor_columns]
-                        site_id_col = next((col for col in visitor_cols if col.upper() in ['SITE_ID', 'HERITAGE_ID']), None)
-                        visitor_count_col = next((col for col in visitor_cols if col.upper() in ['VISITOR_COUNT', 'COUNT', 'TOTAL_VISITORS']), None)
+                    if schema_catalog.has_table('VISITOR_STATS'):
+                        site_id_col = schema_catalog.find_column('VISITOR_STATS', ['SITE_ID', 'HERITAGE_ID'])
+                        visitor_count_col = schema_catalog.find_column('VISITOR_STATS', ['VISITOR_COUNT', 'COUNT', 'TOTAL_VISITORS'])
 
                         if site_id_col and visitor_count_col:
                             visitor_query = f"""
@@ -87,7 +53,7 @@ def get_heritage_sites():
                                     "{site_id_col}",
                                     COUNT(*) as visitor_count,
                                     AVG("{visitor_count_col}") as avg_visitors
-                                FROM "{current_schema}"."VISITOR_STATS"
+                                FROM "VISITOR_STATS"
                                 GROUP BY "{site_id_col}"
                             """
                             print("Executing visitor query:", visitor_query)
@@ -175,26 +141,56 @@ def get_site_observations(site_data, health_data, potential_data, seasonality_da
 
     return observations
 
+# Leaderboard columns: score column -> display name
+LEADERBOARD_COLUMNS = {
+    'site_id': 'ID',
+    'name': 'Name',
+    'location': 'Location',
+    'state': 'State',
+    'visitor_count': 'Total Visits',
+    'avg_visitors': 'Average Visitors',
+    'overall_health_score': 'Health Score',
+    'overall_potential_score': 'Tourism Potential',
+    'risk_assessment_score': 'Risk',
+    'resource_allocation_priority': 'Priority'
+}
+
+def get_site_leaderboard():
+    """Score every heritage site in one pass for the leaderboard"""
+    conn = get_db_connection()
+    try:
+        scores = HeritageAIAnalysis(conn).score_all_sites()
+    finally:
+        conn.close()
+    if scores.empty:
+        return pd.DataFrame(columns=list(LEADERBOARD_COLUMNS.values()))
+    return scores[list(LEADERBOARD_COLUMNS)].rename(columns=LEADERBOARD_COLUMNS)
+
 def render_heritage_sites_list():
     """Render the heritage sites list tab"""
-    st.subheader("Heritage Sites by Visitor Count")
-
-    # Get sites data
-    sites_df = get_heritage_sites()
-
-    # Add radio buttons for sorting
-    sort_order = st.radio(
-        "Sort by Visitor Count",
-        ["Low to High", "High to Low"],
-        horizontal=True,
-        index=0
-    )
+    st.subheader("Heritage Sites Leaderboard")
+
+    # Get sites data with scores for all sites
+    sites_df = get_site_leaderboard()
+
+    # Add controls for sorting
+    col1, col2 = st.columns([2, 3])
+    with col1:
+        sort_by = st.selectbox(
+            "Sort by",
+            ["Average Visitors", "Total Visits", "Health Score", "Tourism Potential", "Risk", "Priority"],
+            index=0
+        )
+    with col2:
+        sort_order = st.radio(
+            "Order",
+            ["Low to High", "High to Low"],
+            horizontal=True,
+            index=0
+        )
 
     # Sort the dataframe
-    if sort_order == "High to Low":
-        sites_df = sites_df.sort_values('Average Visitors', ascending=False)
-    else:
-        sites_df = sites_df.sort_values('Average Visitors', ascending=True)
+    sites_df = sites_df.sort_values(sort_by, ascending=(sort_order == "Low to High"))
 
     # Display the table
     st.dataframe(
@@ -205,7 +201,11 @@ def render_heritage_sites_list():
             "Location": st.column_config.TextColumn("Location", width="medium"),
             "State": st.column_config.TextColumn("State", width="small"),
             "Total Visits": st.column_config.NumberColumn("Total Visits", width="medium"),
-            "Average Visitors": st.column_config.NumberColumn("Average Visitors", width="medium", format="%.2f")
+            "Average Visitors": st.column_config.NumberColumn("Average Visitors", width="medium", format="%.2f"),
+            "Health Score": st.column_config.ProgressColumn("Health Score", min_value=0, max_value=1, format="%.2f"),
+            "Tourism Potential": st.column_config.ProgressColumn("Tourism Potential", min_value=0, max_value=1, format="%.2f"),
+            "Risk": st.column_config.NumberColumn("Risk", width="small", format="%.2f"),
+            "Priority": st.column_config.NumberColumn("Priority", width="small")
         },
         hide_index=True
     )
@@ -230,20 +230,27 @@ def render_site_insights():
         ai_analysis = HeritageAIAnalysis(conn)
 
         try:
-            # Get all analysis data
-            health_data = ai_analysis.calculate_health_score(site_id)
-            potential_data = ai_analysis.calculate_tourism_potential(site_id)
-            seasonality_data = ai_analysis.analyze_seasonality(site_id)
-            priority_data = ai_analysis.generate_preservation_priorities(site_id)
+            # Latest precomputed scorecard, or all analyses from one load of the site
+            analysis = get_site_report(site_id, ai_analysis)
+            health_data = analysis['health']
+            potential_data = analysis['potential']
+            seasonality_data = analysis['seasonality']
+            priority_data = analysis['priorities']
             site_data = sites_df[sites_df['ID'] == site_id].iloc[0].to_dict()
 
+            if analysis['source'] == 'scorecard':
+                st.caption(f"Scores from the assessment of {health_data['assessment_date']:%d %b %Y}")
+            else:
+                st.caption("No current scorecard for this site; scores computed live")
+
             # Create tabs for different insights
-            tab1, tab2, tab3, tab4, tab5 = st.tabs([
+            tab1, tab2, tab3, tab4, tab5, tab6 = st.tabs([
                 "Health Score",
                 "Tourism Potential",
                 "Seasonality",
                 "Preservation",
-                "Observations"
+                "Observations",
+                "History"
             ])
 
             with tab1:
@@ -275,6 +282,9 @@ def render_site_insights():
                         st.write("**Recommended Solution:**")
                         st.write(obs['solution'])
 
+            with tab6:
+                render_scorecard_history(get_scorecard_history(site_id))
+
         finally:
             conn.close()
 
@@ -1,40 +1,15 @@
 import streamlit as st
-from src.utils.database import get_all_art_forms
-from src.utils.config import UNSPLASH_ACCESS_KEY
-import requests
-
-def get_art_form_image(art_form_name):
-    """Fetch a relevant image for the art form from Unsplash."""
-    try:
-        response = requests.get(
-            "https://api.unsplash.com/search/photos",
-            params={
-                "query": f"{art_form_name} art form India",
-                "per_page": 1
-            },
-            headers={
-                "Authorization": f"Client-ID {UNSPLASH_ACCESS_KEY}"
-            },
-            timeout=5
-        )
-
-        # Check if response is successful
-        if response.status_code != 200:
-            return "https://images.unsplash.com/photo-1511795409834-ef04bbd61622?q=80&w=1000&auto=format&fit=crop"
-
-        data = response.json()
-        if data and 'results' in data and data['results']:
-            return data['results'][0]['urls']['regular']
+from src.components.image_gallery import fill_image_slots, image_slot
+from src.components.pagination import get_page_cursor, render_cursor_pagination
+from src.utils.database import count_art_forms, get_art_forms_page, get_distinct_values
+from src.utils.config import DISCOVERY_CONFIG
 
-    except requests.exceptions.RequestException as e:
-        print(f"Request error: {str(e)}")
-    except ValueError as e:
-        print(f"JSON parsing error: {str(e)}")
-    except Exception as e:
-        print(f"Unexpected error: {str(e)}")
+# Shown when Unsplash has no image
+DEFAULT_IMAGE = "https://images.unsplash.com/photo-1511795409834-ef04bbd61622?q=80&w=1000&auto=format&fit=crop"
 
-    # Return a default image if anything fails
-    return "https://images.unsplash.com/photo-1511795409834-ef04bbd61622?q=80&w=1000&auto=format&fit=crop"
+def art_form_image_query(art_form_name):
+    """Unsplash search query for an art form's image."""
+    return f"{art_form_name} art form India"
 
 def render_art_forms_page():
     """Render the art forms page with all available art forms."""
@@ -57,18 +32,15 @@ def render_art_forms_page():
 
     st.markdown("## Art Forms")
 
-    # Get all art forms
-    art_forms = get_all_art_forms()
-
-    if not art_forms:
+    if not count_art_forms():
         st.info("No art forms available at the moment.")
         return
 
     # Get unique states and categories for filters
-    states = sorted(list(set(art_form['origin_state'] for art_form in art_forms)))
+    states = get_distinct_values('ART_FORMS', 'origin_state')
     states.insert(0, "All States")  # Add "All States" as the first option
 
-    categories = sorted(list(set(art_form['category'] for art_form in art_forms)))
+    categories = get_distinct_values('ART_FORMS', 'category')
     categories.insert(0, "All Categories")  # Add "All Categories" as the first option
 
     # Create two columns for filters
@@ -90,21 +62,26 @@ def render_art_forms_page():
             index=0
         )
 
-    # Filter art forms by selected state
+    # Filter in the database; only the current page is fetched
+    filters = {}
     if selected_state != "All States":
-        art_forms = [art_form for art_form in art_forms if art_form['origin_state'] == selected_state]
-
-    # Filter art forms by selected category
+        filters['origin_state'] = selected_state
     if selected_category != "All Categories":
-        art_forms = [art_form for art_form in art_forms if art_form['category'] == selected_category]
+        filters['category'] = selected_category
+
+    total_art_forms = count_art_forms(filters)
+    cursor = get_page_cursor('art_forms', reset_on=tuple(sorted(filters.items())))
+    page = get_art_forms_page(filters, cursor=cursor)
+    art_forms = page['items']
 
     # Show count of art forms found
     if selected_state == "All States":
-        st.markdown(f"Found {len(art_forms)} art forms across India")
+        st.markdown(f"Found {total_art_forms} art forms across India")
     else:
-        st.markdown(f"Found {len(art_forms)} art forms in {selected_state}")
+        st.markdown(f"Found {total_art_forms} art forms in {selected_state}")
 
-    # Display art forms in rows of 4
+    # Display art forms in rows of 4; images are filled in once every card is laid out
+    image_slots = []
     for i in range(0, len(art_forms), 4):
         # Create a row of 4 columns
         cols = st.columns(4)
@@ -114,13 +91,8 @@ def render_art_forms_page():
             if i + j < len(art_forms):
                 art_form = art_forms[i + j]
                 with cols[j]:
-                    # Get art form image
-                    image_url = get_art_form_image(art_form['name'])
-                    if not image_url:
-                        image_url = "https://via.placeholder.com/400x200?text=No+Image+Available"
-
-                    # Display art form image
-                    st.image(image_url, use_container_width=True)
+                    # Art form image placeholder
+                    image_slots.append((art_form_image_query(art_form['name']), image_slot()))
 
                     # Display art form information
                     st.markdown(f"**{art_form['name']}**")
@@ -143,3 +115,7 @@ def render_art_forms_page():
                         st.session_state['current_view'] = 'art_form_details'
                         st.rerun()
         st.markdown(" ")
+
+    fill_image_slots(image_slots, DEFAULT_IMAGE)
+
+    render_cursor_pagination('art_forms', page['next_cursor'], total_art_forms, DISCOVERY_CONFIG['page_size'])
@@ -1,40 +1,15 @@
 import streamlit as st
-from src.utils.database import get_all_cultural_events
-from src.utils.config import UNSPLASH_ACCESS_KEY
-import requests
-
-def get_event_image(event_name):
-    """Fetch a relevant image for the cultural event from Unsplash."""
-    try:
-        response = requests.get(
-            "https://api.unsplash.com/search/photos",
-            params={
-                "query": f"{event_name} cultural event india",
-                "per_page": 1
-            },
-            headers={
-                "Authorization": f"Client-ID {UNSPLASH_ACCESS_KEY}"
-            },
-            timeout=5  # Add timeout
-        )
-
-        # Check if response is successful
-        if response.status_code != 200:
-            return "https://images.unsplash.com/photo-1511795409834-ef04bbd61622?q=80&w=1000&auto=format&fit=crop"
-
-        data = response.json()
-        if data and 'results' in data and data['results']:
-            return data['results'][0]['urls']['regular']
+from src.components.image_gallery import fill_image_slots, image_slot
+from src.components.pagination import get_page_cursor, render_cursor_pagination
+from src.utils.database import count_cultural_events, get_cultural_events_page, get_distinct_values
+from src.utils.config import DISCOVERY_CONFIG
 
-    except requests.exceptions.RequestException as e:
-        print(f"Request error: {str(e)}")
-    except ValueError as e:
-        print(f"JSON parsing error: {str(e)}")
-    except Exception as e:
-        print(f"Unexpected error: {str(e)}")
+# Shown when Unsplash has no image
+DEFAULT_IMAGE = "https://images.unsplash.com/photo-1511795409834-ef04bbd61622?q=80&w=1000&auto=format&fit=crop"
 
-    # Return a default image if anything fails
-    return "https://images.unsplash.com/photo-1511795409834-ef04bbd61622?q=80&w=1000&auto=format&fit=crop"
+def event_image_query(event_name):
+    """Unsplash search query for a cultural event's image."""
+    return f"{event_name} cultural event india"
 
 def render_cultural_events_page():
     """Render the cultural events page with all available events."""
@@ -57,15 +32,12 @@ def render_cultural_events_page():
 
     st.markdown("## Cultural Events")
 
-    # Get all cultural events
-    events = get_all_cultural_events()
-
-    if not events:
+    if not count_cultural_events():
         st.info("No cultural events available at the moment.")
         return
 
     # Get unique states for the filter
-    states = sorted(list(set(event['location'] for event in events)))
+    states = get_distinct_values('CULTURAL_EVENTS', 'location')
     states.insert(0, "All States")  # Add "All States" as the first option
 
     # Create two columns for filters
@@ -81,7 +53,7 @@ def render_cultural_events_page():
 
     # Add event type filter in second column
     with col2:
-        event_types = sorted(list(set(event['event_type'] for event in events)))
+        event_types = get_distinct_values('CULTURAL_EVENTS', 'event_type')
         event_types.insert(0, "All Types")
         selected_type = st.selectbox(
             "Event Type",
@@ -89,21 +61,26 @@ def render_cultural_events_page():
             index=0
         )
 
-    # Filter events by selected state
+    # Filter in the database; only the current page is fetched
+    filters = {}
     if selected_state != "All States":
-        events = [event for event in events if event['location'] == selected_state]
-
-    # Filter events by selected type
+        filters['location'] = selected_state
     if selected_type != "All Types":
-        events = [event for event in events if event['event_type'] == selected_type]
+        filters['event_type'] = selected_type
+
+    total_events = count_cultural_events(filters)
+    cursor = get_page_cursor('cultural_events', reset_on=tuple(sorted(filters.items())))
+    page = get_cultural_events_page(filters, cursor=cursor)
+    events = page['items']
 
     # Show count of events found
     if selected_state == "All States":
-        st.markdown(f"Found {len(events)} cultural events across India")
+        st.markdown(f"Found {total_events} cultural events across India")
     else:
-        st.markdown(f"Found {len(events)} cultural events in {selected_state}")
+        st.markdown(f"Found {total_events} cultural events in {selected_state}")
 
-    # Display events in rows of 4
+    # Display events in rows of 4; images are filled in once every card is laid out
+    image_slots = []
     for i in range(0, len(events), 4):
         # Create a row of 4 columns
         cols = st.columns(4)
@@ -113,13 +90,8 @@ def render_cultural_events_page():
             if i + j < len(events):
                 event = events[i + j]
                 with cols[j]:
-                    # Get event image
-                    image_url = get_event_image(event['name'])
-                    if not image_url:
-                        image_url = "https://via.placeholder.com/400x200?text=No+Image+Available"
-
-                    # Display event image
-                    st.image(image_url, use_container_width=True)
+                    # Event image placeholder
+                    image_slots.append((event_image_query(event['name']), image_slot()))
 
                     # Display event information
                     st.markdown(f"**{event['name']}**")
@@ -142,3 +114,7 @@ def render_cultural_events_page():
                         st.session_state['current_view'] = 'event_details'
                         st.rerun()
         st.markdown(" ")
+
+    fill_image_slots(image_slots, DEFAULT_IMAGE)
+
+    render_cursor_pagination('cultural_events', page['next_cursor'], total_events, DISCOVERY_CONFIG['page_size'])
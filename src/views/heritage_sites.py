@@ -1,27 +1,17 @@
 import streamlit as st
-from src.utils.database import get_all_heritage_sites
-from src.utils.config import UNSPLASH_ACCESS_KEY
-import requests
-
-def get_site_image(site_name):
-    """Fetch a relevant image for the heritage site from Unsplash."""
-    try:
-        response = requests.get(
-            "https://api.unsplash.com/search/photos",
-            params={
-                "query": f"{site_name}",
-                "per_page": 1
-            },
-            headers={
-                "Authorization": f"Client-ID {UNSPLASH_ACCESS_KEY}"
-            }
-        )
-        data = response.json()
-        if data['results']:
-            return data['results'][0]['urls']['regular']
-    except Exception as e:
-        st.warning(f"Could not fetch image: {str(e)}")
-    return None
+from src.components.image_gallery import fill_image_slots, image_slot
+from src.components.pagination import get_page_cursor, render_cursor_pagination
+from src.utils.database import count_heritage_sites, get_distinct_values, get_heritage_sites_page
+from src.utils.config import DISCOVERY_CONFIG
+
+# Shown when Unsplash has no image
+NO_IMAGE = "https://via.placeholder.com/400x200?text=No+Image+Available"
+
+# Sort option label -> get_heritage_sites_page order
+SORT_OPTIONS = {
+    "Name": 'name',
+    "Most Visited": 'popularity'
+}
 
 def render_heritage_sites_page():
     """Render the heritage sites page with all available sites."""
@@ -44,19 +34,16 @@ def render_heritage_sites_page():
 
     st.markdown("## Heritage Sites")
 
-    # Get all heritage sites
-    sites = get_all_heritage_sites()
-
-    if not sites:
+    if not count_heritage_sites():
         st.info("No heritage sites available at the moment.")
         return
 
     # Get unique states for the filter
-    states = sorted(list(set(site['state'] for site in sites)))
+    states = get_distinct_values('HERITAGE_SITES', 'state')
     states.insert(0, "All States")  # Add "All States" as the first option
 
-    # Create two columns for filters
-    col1, col2 = st.columns(2)
+    # Create columns for filters and sort order
+    col1, col2, col3 = st.columns([2, 2, 1])
 
     # Add state filter in first column
     with col1:
@@ -74,23 +61,32 @@ def render_heritage_sites_page():
             horizontal=True
         )
 
-    # Filter sites by selected state
-    if selected_state != "All States":
-        sites = [site for site in sites if site['state'] == selected_state]
+    with col3:
+        selected_sort = st.selectbox("Sort by", list(SORT_OPTIONS))
 
-    # Filter sites by UNESCO status
+    # Filter in the database; only the current page is fetched
+    filters = {}
+    if selected_state != "All States":
+        filters['state'] = selected_state
     if unesco_filter == "UNESCO Sites":
-        sites = [site for site in sites if site['unesco_status']]
+        filters['unesco_status'] = True
     elif unesco_filter == "Non-UNESCO Sites":
-        sites = [site for site in sites if not site['unesco_status']]
+        filters['unesco_status'] = False
+    order_by = SORT_OPTIONS[selected_sort]
+
+    total_sites = count_heritage_sites(filters)
+    cursor = get_page_cursor('heritage_sites', reset_on=(tuple(sorted(filters.items())), order_by))
+    page = get_heritage_sites_page(filters, order_by, cursor)
+    sites = page['items']
 
     # Show count of sites found
     if selected_state == "All States":
-        st.markdown(f"Found {len(sites)} heritage sites across India")
+        st.markdown(f"Found {total_sites} heritage sites across India")
     else:
-        st.markdown(f"Found {len(sites)} heritage sites in {selected_state}")
+        st.markdown(f"Found {total_sites} heritage sites in {selected_state}")
 
-    # Display sites in rows of 4
+    # Display sites in rows of 4; images are filled in once every card is laid out
+    image_slots = []
     for i in range(0, len(sites), 4):
         # Create a row of 4 columns
         cols = st.columns(4)
@@ -100,13 +96,8 @@ def render_heritage_sites_page():
             if i + j < len(sites):
                 site = sites[i + j]
                 with cols[j]:
-                    # Get site image
-                    image_url = get_site_image(site['name'])
-                    if not image_url:
-                        image_url = "https://via.placeholder.com/400x200?text=No+Image+Available"
-
-                    # Display site image
-                    st.image(image_url, use_container_width=True)
+                    # Site image placeholder
+                    image_slots.append((site['name'], image_slot()))
 
                     # Display site information
                     st.markdown(f"**{site['name']}**")
@@ -137,3 +128,7 @@ def render_heritage_sites_page():
                         st.session_state['current_view'] = 'site_details'
                         st.rerun()
         st.markdown(" ")
+
+    fill_image_slots(image_slots, NO_IMAGE)
+
+    render_cursor_pagination('heritage_sites', page['next_cursor'], total_sites, DISCOVERY_CONFIG['page_size'])
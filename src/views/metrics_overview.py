@@ -1,6 +1,7 @@
 import streamlit as st
 import pandas as pd
 from src.utils.dashboard_utils import DashboardUtils
+from src.utils.query_executor import run_concurrently
 from src.components.header import render_header
 from src.components.footer import render_footer
 
@@ -8,8 +9,22 @@ def render_metrics_overview():
     # Initialize dashboard utilities
     dashboard = DashboardUtils()
 
+    # Fetch every section at once; the page waits for the slowest query only
+    data = run_concurrently({
+        'metrics': dashboard.get_overview_metrics,
+        'visitor_trends': dashboard.get_visitor_trends,
+        'type_dist': dashboard.get_heritage_type_distribution,
+        'state_dist': dashboard.get_state_wise_distribution,
+        'trending_sites': dashboard.get_trending_sites,
+        'health_index': dashboard.get_health_index_summary
+    }, defaults={
+        'metrics': {'total_sites': 0, 'total_visitors': 0, 'total_revenue': 0, 'avg_health': 0},
+        'visitor_trends': [],
+        'trending_sites': []
+    })
+
     # Overview Metrics
-    metrics = dashboard.get_overview_metrics()
+    metrics = data['metrics']
     col1, col2, col3, col4 = st.columns(4)
 
     with col1:
@@ -23,7 +38,7 @@ def render_metrics_overview():
 
     # Visitor Trends
     st.subheader("Visitor Trends")
-    visitor_trends = dashboard.get_visitor_trends()
+    visitor_trends = data['visitor_trends']
     visitor_chart = dashboard.create_visitor_trend_chart(visitor_trends)
     if visitor_chart is not None:
         st.plotly_chart(visitor_chart, use_container_width=True)
@@ -34,7 +49,7 @@ def render_metrics_overview():
     col1, col2 = st.columns(2)
     with col1:
         st.subheader("Heritage Type Distribution")
-        type_dist = dashboard.get_heritage_type_distribution()
+        type_dist = data['type_dist']
         if type_dist:
             type_chart = dashboard.create_heritage_type_chart(type_dist)
             if type_chart is not None:
@@ -47,7 +62,7 @@ def render_metrics_overview():
     # State-wise Distribution
     with col2:
         st.subheader("State-wise Distribution")
-        state_dist = dashboard.get_state_wise_distribution()
+        state_dist = data['state_dist']
         if state_dist:
             state_chart = dashboard.create_state_distribution_chart(state_dist)
             if state_chart is not None:
@@ -59,7 +74,7 @@ def render_metrics_overview():
 
     # Trending Sites
     st.subheader("Trending Heritage Sites")
-    trending_sites = dashboard.get_trending_sites()
+    trending_sites = data['trending_sites']
     if trending_sites:
         for site in trending_sites:
             with st.container():
@@ -76,7 +91,7 @@ def render_metrics_overview():
 
     # Health Index
     st.subheader("Heritage Health Index")
-    health_index = dashboard.get_health_index_summary()
+    health_index = data['health_index']
     if health_index:
         health_chart = dashboard.create_health_index_chart(health_index)
         if health_chart is not None:
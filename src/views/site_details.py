@@ -2,8 +2,11 @@ import streamlit as st
 import pandas as pd
 import plotly.express as px
 from datetime import datetime, timedelta
-from src.utils.database import execute_query, get_art_forms
-from src.utils.unsplash import get_site_images
+from src.utils.database import execute_query, get_site_id_by_name, get_heritage_sites_by_ids
+from src.services.collaborative_filtering import item_recommender
+from src.utils.site_bundle import get_site_bundle
+from src.services.site_media import site_media
+from src.components.image_gallery import fill_photo_slots, image_slot
 from src.utils.llm import generate_site_story, generate_user_custom_site_story
 import docx
 from docx.shared import Inches
@@ -20,52 +23,36 @@ def render_site_details():
             st.rerun()
         return
 
-    # Get site details from database
-    site_query = """
-    SELECT
-        site_id,
-        name,
-        description,
-        location,
-        latitude,
-        longitude,
-        state,
-        city,
-        established_year,
-        heritage_type,
-        unesco_status,
-        risk_level,
-        health_index,
-        COALESCE(story, '') as story
-    FROM HERITAGE_SITES
-    WHERE name = %s
-    """
-    site_details = execute_query(site_query, (site_name,))
-
-    if not site_details:
+    # Get everything the page shows in one (cached) bundle
+    site_id = get_site_id_by_name(site_name)
+    bundle = get_site_bundle(site_id) if site_id is not None else None
+
+    if bundle is None:
         st.error("Site details not found.")
         return
+    if bundle.site is None:
+        st.error("Site details could not be loaded right now. Please try again.")
+        return
+    if bundle.failed:
+        st.warning("Some details of this site could not be loaded and are missing below.")
 
-    # Convert tuple to dictionary for easier access
     site = {
-        'site_id': site_details[0][0],
-        'name': site_details[0][1],
-        'description': site_details[0][2],
-        'location': site_details[0][3],
-        'latitude': site_details[0][4],
-        'longitude': site_details[0][5],
-        'state': site_details[0][6],
-        'city': site_details[0][7],
-        'year_built': site_details[0][8],
-        'type': site_details[0][9],
-        'unesco_status': site_details[0][10],
-        'risk_level': site_details[0][11],
-        'health_index': site_details[0][12],
-        'story': site_details[0][13]
+        'site_id': bundle.site_id,
+        'name': bundle.site['name'],
+        'description': bundle.site['description'],
+        'location': bundle.site['location'],
+        'latitude': bundle.site['latitude'],
+        'longitude': bundle.site['longitude'],
+        'state': bundle.site['state'],
+        'city': bundle.site['city'],
+        'year_built': bundle.site['established_year'],
+        'type': bundle.site['heritage_type'],
+        'unesco_status': bundle.site['unesco_status'],
+        'risk_level': bundle.site['risk_level'],
+        'health_index': bundle.site['health_index'],
+        'story': bundle.site['story'] or ''
     }
-
-    # Get associated art forms
-    art_forms = get_art_forms(site['site_id'])
+    art_forms = bundle.art_forms
 
     # Back button
     if st.button("← Back to Home"):
@@ -79,12 +66,23 @@ def render_site_details():
     tab1, tab2, tab3, tab4 = st.tabs(["Details", "Statistics", "Reviews", "Create Custom Story"])
 
     with tab1:
-        # Get images from Unsplash
-        images = get_site_images(site['name'], count=7)
+        # Site photos from its stored manifest: the first 7 here, all of them further down.
+        # They are laid out as placeholders and filled once the rest of the tab is drawn.
+        site_photos = site_media.photo_urls(site['site_id'], site['name'])
+        images = site_photos[:7]
+        photo_slots = []
         if images:
             # First row: Story and Image Grid
             col1, col2 = st.columns([4, 3])
 
+            with col2:
+                # Create a 2x3 grid of images
+                for i in range(0, 6, 2):
+                    cols = st.columns(2)
+                    for j in range(2):
+                        with cols[j]:
+                            photo_slots.append((images[i + j], image_slot()))
+
             with col1:
                 story_placeholder = st.empty()
 
@@ -125,14 +123,6 @@ def render_site_details():
                     if st.button("🔄 Re-generate Story", key="regen_story_details"):
                         generate_and_save_story()
 
-            with col2:
-                # Create a 2x3 grid of images
-                for i in range(0, 6, 2):
-                    cols = st.columns(2)
-                    for j in range(2):
-                        with cols[j]:
-                            st.image(images[i + j], use_container_width=True)
-
             st.markdown("---")
 
             # Second row: About and Single Image
@@ -155,14 +145,14 @@ def render_site_details():
                         st.markdown(f"- **{art_form['name']}**: {art_form['description']}")
 
             with col2:
-                st.image(images[6], use_container_width=True)
+                photo_slots.append((images[6], image_slot()))
 
         # Additional image galleries
         st.markdown("---")
         st.subheader("More related photos")
 
-        # Get more images for the additional galleries
-        more_images = get_site_images(site['name'], count=20)
+        # Same manifest as the gallery above
+        more_images = site_photos
 
         if more_images:
             # Display images in rows of 4
@@ -170,22 +160,28 @@ def render_site_details():
                 cols = st.columns(4)
                 for idx, img_url in enumerate(more_images[i:i+4]):
                     with cols[idx]:
-                        st.image(img_url, use_container_width=True)
+                        photo_slots.append((img_url, image_slot()))
+
+        # Sites liked by the visitors of this one
+        also_liked = item_recommender.also_liked(site['site_id'], limit=4)
+        if also_liked:
+            st.markdown("---")
+            st.subheader("Visitors who liked this also liked")
+            liked_sites = get_heritage_sites_by_ids([liked_id for liked_id, _ in also_liked])
+            cols = st.columns(4)
+            for col, liked_site in zip(cols, liked_sites):
+                with col:
+                    st.markdown(f"#### {liked_site['name']}")
+                    st.markdown(f"*{liked_site['location']}, {liked_site['state']}*")
+                    if st.button("Read More...", key=f"also_liked_{liked_site['site_id']}"):
+                        st.session_state['selected_site'] = liked_site['name']
+                        st.rerun()
 
     with tab2:
         # Get visitor statistics
-        stats_query = """
-        SELECT * FROM VISITOR_STATS
-        WHERE site_id = %s
-        ORDER BY VISIT_DATE DESC
-        """
-        visitor_stats = execute_query(stats_query, (site['site_id'],))
-
-        if visitor_stats:
-            df_stats = pd.DataFrame(visitor_stats, columns=[
-                'id', 'site_id', 'visit_date', 'visitors', 'revenue', 'season',
-                'created_at', 'updated_at'
-            ])
+        df_stats = bundle.visitor_stats.rename(columns={'visitor_count': 'visitors'})
+
+        if not df_stats.empty:
             df_stats['visit_date'] = pd.to_datetime(df_stats['visit_date'])
 
             # Summary statistics
@@ -215,19 +211,9 @@ def render_site_details():
 
     with tab3:
         try:
-            # Get user interactions
-            interactions_query = """
-            SELECT * FROM USER_INTERACTIONS
-            WHERE site_id = %s
-            ORDER BY interaction_date DESC
-            """
-            interactions = execute_query(interactions_query, (site['site_id'],))
-
-            if interactions:
-                df_interactions = pd.DataFrame(interactions, columns=[
-                    'id', 'user_id', 'site_id', 'interaction_type', 'interaction_date',
-                    'rating', 'review', 'created_at', 'updated_at'
-                ])
+            df_interactions = bundle.interactions
+
+            if not df_interactions.empty:
 
                 # Display interactions in rows of 3
                 for i in range(0, len(df_interactions), 3):
@@ -361,6 +347,9 @@ def render_site_details():
                         mime="application/vnd.openxmlformats-officedocument.wordprocessingml.document"
                     )
 
+    # Site photos last, so every tab is drawn before any image download
+    fill_photo_slots(photo_slots)
+
 
 if __name__ == "__main__":
     render_site_details()
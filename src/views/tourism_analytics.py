@@ -2,7 +2,8 @@ import streamlit as st
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
-from src.utils.database import execute_query
+from src.utils.database import fetch_dataframe
+from src.utils.config import DASHBOARD_CONFIG
 from datetime import datetime
 
 def render_overview_tab(df):
@@ -120,10 +121,9 @@ def render_seasonal_analysis_tab(df):
     ORDER BY month
     """
 
-    monthly_data = execute_query(query)
+    monthly_df = fetch_dataframe(query, ttl=DASHBOARD_CONFIG['refresh_interval'])
 
-    if monthly_data:
-        monthly_df = pd.DataFrame(monthly_data, columns=['month', 'monthly_visitors', 'monthly_revenue'])
+    if monthly_df is not None and not monthly_df.empty:
         monthly_df['month'] = pd.to_datetime(monthly_df['month'])
 
         # Create line chart for monthly trends
@@ -229,13 +229,9 @@ def render_art_forms_tab():
     GROUP BY a.name, a.category, a.origin_state, a.practitioners_count
     """
 
-    art_forms_data = execute_query(query)
+    art_df = fetch_dataframe(query, ttl=DASHBOARD_CONFIG['refresh_interval'])
 
-    if art_forms_data:
-        art_df = pd.DataFrame(art_forms_data, columns=[
-            'art_form', 'category', 'origin_state', 'practitioners_count',
-            'associated_sites', 'total_visitors'
-        ])
+    if art_df is not None and not art_df.empty:
 
         # Art forms by category
         category_stats = art_df.groupby('category').agg({
@@ -285,10 +281,9 @@ def render_predictive_analysis_tab(df):
     ORDER BY month
     """
 
-    monthly_data = execute_query(query)
+    monthly_df = fetch_dataframe(query, ttl=DASHBOARD_CONFIG['refresh_interval'])
 
-    if monthly_data:
-        monthly_df = pd.DataFrame(monthly_data, columns=['month', 'monthly_visitors'])
+    if monthly_df is not None and not monthly_df.empty:
         monthly_df['month'] = pd.to_datetime(monthly_df['month'])
         monthly_df['growth_rate'] = monthly_df['monthly_visitors'].pct_change() * 100
 
@@ -350,15 +345,9 @@ def render_tourism_analytics():
     ORDER BY total_visitors DESC
     """
 
-    results = execute_query(query)
+    df = fetch_dataframe(query, ttl=DASHBOARD_CONFIG['refresh_interval'])
 
-    if results:
-        # Convert to DataFrame
-        df = pd.DataFrame(results, columns=[
-            'site_name', 'state', 'heritage_type', 'unesco_status',
-            'visit_days', 'total_visitors', 'total_revenue',
-            'avg_daily_visitors', 'avg_daily_revenue'
-        ])
+    if df is not None and not df.empty:
 
         # Create tabs
         tab1, tab2, tab3, tab4, tab5 = st.tabs([